@@ -0,0 +1,180 @@
+"""
+Import-Time Benchmark
+
+Imports each pipeline module in a fresh interpreter and reports the median
+wall-clock import time and which heavy third-party dependencies got loaded.
+With --check it exits non-zero when a module is over its time budget or
+eagerly loads a dependency it should defer, so CI catches startup
+regressions.
+
+Usage:
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --check --runs 7
+    python -m benchmarks.import_time --profile content_pipeline.images
+"""
+
+import json
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from rich.console import Console
+from rich.table import Table
+
+console = Console()
+
+# Dependencies that must only be imported when a stage actually uses them
+HEAVY_MODULES = ("openai", "PIL", "git", "feedparser", "requests", "bs4", "yaml")
+
+
+@dataclass
+class Budget:
+    """Import budget of one module."""
+    milliseconds: float
+    deferred: Tuple[str, ...] = HEAVY_MODULES
+
+
+# Budgets leave headroom for slow CI runners; eager imports cost over 1s.
+TARGETS = {
+    "content_pipeline": Budget(50),
+    "content_pipeline.manifest": Budget(200),
+    "content_pipeline.publisher": Budget(250),
+    "content_pipeline.images": Budget(250),
+    "content_pipeline.generator": Budget(350),
+}
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+print(json.dumps({{"seconds": elapsed, "loaded": [n for n in {heavy!r} if n in sys.modules]}}))
+"""
+
+
+def measure(module: str, runs: int = 5) -> Dict[str, Any]:
+    """Import a module in fresh interpreters.
+
+    Args:
+        module: Dotted module name
+        runs: Number of interpreters to start
+
+    Returns:
+        Median and best import time in milliseconds, and the heavy modules loaded
+    """
+    samples: List[float] = []
+    loaded: List[str] = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY_MODULES)],
+            capture_output=True, text=True, check=True
+        )
+        data = json.loads(result.stdout.strip().splitlines()[-1])
+        samples.append(data["seconds"] * 1000)
+        loaded = data["loaded"]
+    return {
+        "module": module,
+        "median_ms": round(statistics.median(samples), 1),
+        "best_ms": round(min(samples), 1),
+        "loaded": loaded,
+    }
+
+
+def slowest_imports(module: str, limit: int = 15) -> List[Tuple[int, str]]:
+    """Rank the imports triggered by a module using ``-X importtime``.
+
+    Args:
+        module: Dotted module name
+        limit: Number of entries to return
+
+    Returns:
+        (cumulative microseconds, module name) pairs, slowest first
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def check(results: List[Dict[str, Any]], scale: float = 1.0) -> List[str]:
+    """Compare measurements against their budgets.
+
+    Args:
+        results: Output of :func:`measure` per target
+        scale: Multiplier applied to every time budget
+
+    Returns:
+        Budget violations, empty if every module is within budget
+    """
+    violations = []
+    for result in results:
+        budget = TARGETS[result["module"]]
+        limit = budget.milliseconds * scale
+        if result["median_ms"] > limit:
+            violations.append(f"{result['module']} took {result['median_ms']}ms (budget {limit:.0f}ms)")
+        eager = sorted(set(result["loaded"]) & set(budget.deferred))
+        if eager:
+            violations.append(f"{result['module']} eagerly imports {', '.join(eager)}")
+    return violations
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """CLI entry point for the import-time benchmark."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Measure import time of the pipeline modules")
+    parser.add_argument("modules", nargs="*", default=list(TARGETS), help="Modules to measure")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--check", action="store_true", help="Exit non-zero when a budget is exceeded")
+    parser.add_argument("--budget-scale", type=float, default=1.0, help="Multiply every time budget")
+    parser.add_argument("--profile", metavar="MODULE", help="List the slowest imports of one module")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    if args.profile:
+        for cumulative, name in slowest_imports(args.profile):
+            console.print(f"{cumulative / 1000:8.1f}ms  {name}")
+        return
+
+    unknown = [module for module in args.modules if module not in TARGETS]
+    if unknown:
+        parser.error(f"no budget for {', '.join(unknown)}")
+    results = [measure(module, args.runs) for module in args.modules]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        table = Table(title=f"Import time ({args.runs} runs)")
+        table.add_column("Module")
+        table.add_column("median (ms)", justify="right")
+        table.add_column("best (ms)", justify="right")
+        table.add_column("budget (ms)", justify="right")
+        table.add_column("Heavy modules loaded")
+        for result in results:
+            table.add_row(
+                result["module"], f"{result['median_ms']:.1f}", f"{result['best_ms']:.1f}",
+                f"{TARGETS[result['module']].milliseconds * args.budget_scale:.0f}",
+                ", ".join(result["loaded"]) or "-"
+            )
+        console.print(table)
+
+    if args.check:
+        violations = check(results, args.budget_scale)
+        for violation in violations:
+            console.print(f"[red]{violation}[/red]")
+        if violations:
+            sys.exit(1)
+        console.print("[green]All modules within their import budget[/green]")
+
+
+if __name__ == "__main__":
+    main()
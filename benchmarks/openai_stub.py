@@ -0,0 +1,472 @@
+"""
+OpenAI Stand-in Server
+
+Local HTTP server that speaks the chat-completions and images endpoints (plus
+RSS feeds and image downloads), with configurable latency, streaming, error
+injection and canned image bytes, so the pipeline can run fully offline.
+"""
+
+import base64
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from typing import Any, Dict, List, Optional, Tuple
+
+from PIL import Image
+
+WORDS = (
+    "rust kotlin python kubernetes serverless compiler database latency cache "
+    "vector search agents observability webassembly postgres streaming gpu "
+    "security supply chain edge runtime typescript deno llama quantization"
+).split()
+
+FILLER = (
+    "teams ship faster when feedback loops stay short and measurable while "
+    "tooling removes toil from every step of the delivery pipeline"
+).split()
+
+
+@dataclass
+class Latency:
+    """Log-normal response delay around a median (fixed when sigma is 0)."""
+    median: float = 0.0
+    sigma: float = 0.0
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw a delay in seconds."""
+        if self.median <= 0:
+            return 0.0
+        return self.median * math.exp(rng.gauss(0, self.sigma)) if self.sigma else self.median
+
+    @classmethod
+    def parse(cls, value: str) -> "Latency":
+        """Parse ``median[:sigma]`` in seconds, e.g. ``0.8:0.4``."""
+        median, _, sigma = value.partition(":")
+        return cls(float(median), float(sigma or 0))
+
+
+@dataclass
+class StubConfig:
+    """Behaviour of the stand-in server."""
+    chat_latency: Latency = field(default_factory=Latency)
+    image_latency: Latency = field(default_factory=Latency)
+    download_latency: Latency = field(default_factory=Latency)
+    chunk_delay: float = 0.0
+    chunk_chars: int = 40
+    article_words: int = 1200
+    error_rate: float = 0.0
+    error_status: int = 429
+    retry_after_ms: int = 50
+    image_size: Tuple[int, int] = (1792, 1024)
+    feed_entries: int = 20
+    seed: Optional[int] = None
+    # Prompt caching like the real API: prompts of at least this many tokens
+    # get their longest previously seen prefix cached, in 128-token steps
+    prompt_cache_min_tokens: int = 1024
+
+
+def _canned_image(size: Tuple[int, int]) -> bytes:
+    """Render a noisy PNG so downstream resizing and JPEG encoding do real work."""
+    noise = Image.effect_noise(size, 48)
+    gradient = Image.linear_gradient("L").resize(size)
+    image = Image.merge("RGB", (noise, gradient, noise.transpose(Image.Transpose.FLIP_LEFT_RIGHT)))
+    buffer = BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _topic(prompt: str) -> str:
+    """Extract the topic keyword from a pipeline prompt."""
+    match = re.search(r'about "([^"]+)"', prompt) or re.search(r"Topic: (.+)", prompt)
+    return match.group(1).strip() if match else "Technology"
+
+
+def _slug(text: str) -> str:
+    """Build a slug from text."""
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")[:50] or "post"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Request handler; the server instance carries the stub state."""
+
+    protocol_version = "HTTP/1.1"
+    server: "_StubHTTPServer"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Keep benchmark output quiet."""
+
+    def _send_json(self, status: int, payload: Dict[str, Any], headers: Dict[str, str] = None) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def _inject_error(self, endpoint: str) -> bool:
+        """Answer with the configured error status at the configured rate."""
+        stub = self.server.stub
+        if stub.config.error_rate <= 0 or stub.random() >= stub.config.error_rate:
+            return False
+        stub.record(endpoint + ".errors")
+        status = stub.config.error_status
+        headers = {"retry-after-ms": str(stub.config.retry_after_ms)} if status == 429 else {}
+        error_type = "rate_limit_exceeded" if status == 429 else "server_error"
+        self._send_json(status, {"error": {"message": "Injected error", "type": error_type, "code": error_type}}, headers)
+        return True
+
+    def do_GET(self) -> None:
+        stub = self.server.stub
+        if self.path.startswith("/images/"):
+            time.sleep(stub.config.download_latency.sample(stub.rng))
+            stub.record("downloads")
+            body = stub.image_bytes
+            self.send_response(200)
+            self.send_header("Content-Type", "image/png")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        elif self.path.startswith("/feeds/") and not self.path.endswith(".xml"):
+            time.sleep(stub.config.download_latency.sample(stub.rng))
+            stub.record("articles")
+            body = stub.render_article(self.path).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        elif self.path.startswith("/feeds/"):
+            stub.record("feeds")
+            body = stub.render_feed(self.path).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/rss+xml")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self._send_json(404, {"error": {"message": "Not found"}})
+
+    def do_POST(self) -> None:
+        stub = self.server.stub
+        if self.path.endswith("/chat/completions"):
+            params = self._read_json()
+            time.sleep(stub.config.chat_latency.sample(stub.rng))
+            if self._inject_error("chat"):
+                return
+            stub.record("chat")
+            content = stub.chat_content(params)
+            if params.get("stream"):
+                self._stream_chat(params, content)
+            else:
+                self._send_json(200, stub.chat_response(params, content))
+        elif self.path.endswith("/images/generations"):
+            params = self._read_json()
+            time.sleep(stub.config.image_latency.sample(stub.rng))
+            if self._inject_error("images"):
+                return
+            stub.record("images")
+            host = self.headers.get("Host", "127.0.0.1")
+            if params.get("response_format") == "b64_json":
+                item = {"b64_json": base64.b64encode(stub.image_bytes).decode("ascii")}
+            else:
+                item = {"url": f"http://{host}/images/{uuid.uuid4().hex}.png"}
+            item["revised_prompt"] = params.get("prompt", "")
+            self._send_json(200, {"created": int(time.time()), "data": [item]})
+        else:
+            self._send_json(404, {"error": {"message": "Not found"}})
+
+    def _stream_chat(self, params: Dict[str, Any], content: str) -> None:
+        """Send a completion as server-sent events, one chunk at a time."""
+        stub = self.server.stub
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        base = {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": params.get("model", "gpt-4o"),
+        }
+        size = stub.config.chunk_chars
+        pieces: List[Dict[str, Any]] = [{"role": "assistant", "content": ""}]
+        pieces.extend({"content": content[i:i + size]} for i in range(0, len(content), size))
+        for i, delta in enumerate(pieces):
+            if i and stub.config.chunk_delay:
+                time.sleep(stub.config.chunk_delay)
+            chunk = dict(base, choices=[{"index": 0, "delta": delta, "finish_reason": None}])
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+        done = dict(base, choices=[{"index": 0, "delta": {}, "finish_reason": "stop"}])
+        self.wfile.write(f"data: {json.dumps(done)}\n\n".encode("utf-8"))
+        if (params.get("stream_options") or {}).get("include_usage"):
+            usage = dict(base, choices=[], usage=stub.chat_response(params, content)["usage"])
+            self.wfile.write(f"data: {json.dumps(usage)}\n\n".encode("utf-8"))
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    """Threading HTTP server holding a reference to its StubOpenAIServer."""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], stub: "StubOpenAIServer"):
+        super().__init__(address, _Handler)
+        self.stub = stub
+
+
+class StubOpenAIServer:
+    """Stand-in for the OpenAI API, run in a background thread."""
+
+    def __init__(self, config: StubConfig = None, host: str = "127.0.0.1", port: int = 0):
+        """Initialize the server.
+
+        Args:
+            config: Latency, streaming and error behaviour
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+        """
+        self.config = config or StubConfig()
+        self.rng = random.Random(self.config.seed)
+        self.image_bytes = _canned_image(self.config.image_size)
+        self.counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._prefixes: set = set()
+        self._feed_serial = 0
+        self._httpd = _StubHTTPServer((host, port), self)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Root URL of the server."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def base_url(self) -> str:
+        """Base URL to pass to ``openai.OpenAI(base_url=...)``."""
+        return self.url + "/v1"
+
+    def feed_urls(self, count: int = 4) -> List[str]:
+        """Get URLs of stand-in RSS feeds.
+
+        Args:
+            count: Number of feeds
+
+        Returns:
+            Feed URLs served by this server
+        """
+        return [f"{self.url}/feeds/{i}.xml" for i in range(count)]
+
+    def start(self) -> "StubOpenAIServer":
+        """Start serving in a daemon thread."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "StubOpenAIServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def random(self) -> float:
+        """Draw from the server's random generator."""
+        with self._lock:
+            return self.rng.random()
+
+    def record(self, name: str) -> None:
+        """Count a request."""
+        with self._lock:
+            self.counts[name] = self.counts.get(name, 0) + 1
+
+    def render_feed(self, path: str) -> str:
+        """Render an RSS document with fresh headlines on every request."""
+        with self._lock:
+            self._feed_serial += 1
+            rng = random.Random(f"{path}-{self._feed_serial}")
+        items = []
+        for i in range(self.config.feed_entries):
+            title = " ".join(rng.sample(WORDS, 3)).title()
+            items.append(
+                f"<item><title>{title}</title>"
+                f"<link>{self.url}{path}/{self._feed_serial}/{i}</link>"
+                f"<description>{title} explained</description>"
+                f"<pubDate>{formatdate(usegmt=True)}</pubDate></item>"
+            )
+        return (
+            '<?xml version="1.0"?><rss version="2.0"><channel>'
+            f"<title>Stub feed {path}</title>{''.join(items)}</channel></rss>"
+        )
+
+    def render_article(self, path: str) -> str:
+        """Render the HTML page a feed entry links to."""
+        paragraphs = "".join(
+            f"<p>{' '.join(FILLER[(i + j) % len(FILLER)] for j in range(60)).capitalize()}.</p>"
+            for i in range(8)
+        )
+        return (
+            f"<html><head><title>{path}</title></head><body><nav><p>Home</p></nav>"
+            f"<article><h1>{path}</h1>{paragraphs}</article></body></html>"
+        )
+
+    def _paragraphs(self, words: int) -> str:
+        """Generate Markdown filler of roughly the given length."""
+        sections = []
+        per_section = 120
+        for i in range(max(1, words // per_section)):
+            body = " ".join(FILLER[(i + j) % len(FILLER)] for j in range(per_section))
+            sections.append(f"## Section {i + 1}\n\n{body.capitalize()}.")
+        return "\n\n".join(sections)
+
+    def _seo(self, keyword: str, categories: List[str] = None) -> Dict[str, Any]:
+        """Build SEO metadata for a keyword."""
+        return {
+            "title": f"{keyword}: A Practical Guide"[:60],
+            "slug": _slug(f"{keyword} guide"),
+            "meta_description": f"Everything tech professionals need to know about {keyword}, with practical tips."[:160],
+            "tweets": [f"New post on {keyword}", f"{keyword} in practice", f"Why {keyword} matters"],
+            "tags": [keyword.lower(), "tech", "productivity"],
+            "category": (categories or ["Tech News"])[0],
+            "summary": f"Practical insights about {keyword}."
+        }
+
+    def chat_content(self, params: Dict[str, Any]) -> str:
+        """Produce a plausible answer for a pipeline prompt.
+
+        Args:
+            params: Chat completion request
+
+        Returns:
+            Outline, article body, SEO JSON or structured post JSON
+        """
+        prompt = "\n".join(
+            message.get("content") or "" for message in params.get("messages", [])
+            if isinstance(message.get("content"), str)
+        )
+        keyword = _topic(prompt)
+        response_format = params.get("response_format") or {}
+        if response_format.get("type") == "json_schema":
+            schema = response_format["json_schema"]["schema"]
+            categories = schema["properties"].get("category", {}).get("enum")
+            post = self._seo(keyword, categories)
+            post["content"] = self._paragraphs(self.config.article_words)
+            return json.dumps(post)
+        if "JSON format" in prompt:
+            return json.dumps(self._seo(keyword))
+        if "outline" in prompt.lower() and "based on this outline" not in prompt:
+            return "\n".join(
+                [f"# {keyword}", "I. Introduction"]
+                + [f"{numeral}. Key Point" for numeral in ("II", "III", "IV", "V")]
+                + ["VI. Conclusion"]
+            )
+        return self._paragraphs(self.config.article_words)
+
+    def cached_tokens(self, params: Dict[str, Any]) -> int:
+        """Simulate the provider's prompt cache for a request.
+
+        Args:
+            params: Chat completion request
+
+        Returns:
+            Prompt tokens of the longest prefix an earlier request to the same
+            model already sent, counted in 128-token steps from the minimum
+        """
+        prompt = params.get("model", "") + "\0" + "\0".join(
+            message.get("content") or "" for message in params.get("messages", [])
+        )
+        tokens = len(prompt) // 4
+        cached = 0
+        hit = True
+        with self._lock:
+            for length in range(self.config.prompt_cache_min_tokens, tokens + 1, 128):
+                digest = hashlib.sha1(prompt[:length * 4].encode("utf-8")).digest()
+                hit = hit and digest in self._prefixes
+                if hit:
+                    cached = length
+                self._prefixes.add(digest)
+        return cached
+
+    def chat_response(self, params: Dict[str, Any], content: str) -> Dict[str, Any]:
+        """Wrap content in a chat completion object with usage."""
+        prompt_tokens = sum(
+            len(message.get("content") or "") for message in params.get("messages", [])
+        ) // 4
+        completion_tokens = len(content) // 4
+        cached_tokens = self.cached_tokens(params)
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": params.get("model", "gpt-4o"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+                "prompt_tokens_details": {"cached_tokens": min(cached_tokens, prompt_tokens)}
+            }
+        }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the stand-in server in the foreground."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Offline stand-in for the OpenAI API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--chat-latency", type=Latency.parse, default=Latency(), help="median[:sigma] seconds")
+    parser.add_argument("--image-latency", type=Latency.parse, default=Latency(), help="median[:sigma] seconds")
+    parser.add_argument("--chunk-delay", type=float, default=0.0, help="Seconds between streamed chunks")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of API requests that fail")
+    parser.add_argument("--error-status", type=int, default=429)
+    args = parser.parse_args(argv)
+
+    config = StubConfig(
+        chat_latency=args.chat_latency,
+        image_latency=args.image_latency,
+        chunk_delay=args.chunk_delay,
+        error_rate=args.error_rate,
+        error_status=args.error_status
+    )
+    server = StubOpenAIServer(config, host=args.host, port=args.port)
+    print(f"Serving OpenAI stand-in at {server.base_url} (feeds at {server.url}/feeds/0.xml)")
+    print(f"  export OPENAI_BASE_URL={server.base_url}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+"""
+Pipeline Benchmark
+
+Drives ContentGenerator (daily and batch runs) and ImageGenerator against the
+offline OpenAI stand-in and reports p50/p95 latency per stage and posts per
+minute.
+
+Rate limits come from the same OPENAI_* environment variables as production
+runs, so their effect on throughput can be measured too.
+
+Usage:
+    python -m benchmarks.pipeline --runs 5 --chat-latency 0.8:0.4
+    OPENAI_IMAGES_RPM=60 python -m benchmarks.pipeline --mode batch --batch 8 --json report.json
+"""
+
+import functools
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import openai
+from rich.console import Console
+from rich.table import Table
+
+from content_pipeline.api_client import RateLimitedClient
+from content_pipeline.dedup import DuplicateIndex
+from content_pipeline.enrichment import SourceEnricher
+from content_pipeline.generator import ContentGenerator
+from content_pipeline.images import ImageGenerator
+from content_pipeline.llm_cache import ResponseCache
+from content_pipeline.routing import ModelRouter
+from content_pipeline.telemetry import percentile, telemetry
+from content_pipeline.variants import VariantBuilder
+
+from .openai_stub import Latency, StubConfig, StubOpenAIServer
+
+console = Console()
+
+# Stage name -> (object attribute holding the instance, method name)
+STAGES = {
+    "feeds": ("generator", "fetch_trending_topics"),
+    "enrich": ("generator", "enrich_sources"),
+    "outline": ("generator", "generate_content_outline"),
+    "article": ("generator", "generate_full_article"),
+    "seo": ("generator", "generate_seo_metadata"),
+    "image": ("images", "generate_cover_image"),
+    "save": ("generator", "save_post"),
+    "post": ("generator", "generate_post"),
+}
+
+
+class StageTimer:
+    """Records wall-clock durations of wrapped methods."""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def wrap(self, stage: str, method: Callable[..., Any]) -> Callable[..., Any]:
+        """Wrap a bound method so every call is timed under ``stage``."""
+        @functools.wraps(method)
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            started = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - started
+                with self._lock:
+                    self.samples.setdefault(stage, []).append(elapsed)
+        return timed
+
+    def instrument(self, targets: Dict[str, Any]) -> None:
+        """Replace the stage methods of the target instances with timed versions."""
+        for stage, (target, name) in STAGES.items():
+            instance = targets.get(target)
+            if instance is not None:
+                setattr(instance, name, self.wrap(stage, getattr(instance, name)))
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Summarize samples per stage.
+
+        Returns:
+            Count, p50, p95 and max in seconds for each stage
+        """
+        return {
+            stage: {
+                "count": len(values),
+                "p50": round(percentile(values, 0.50), 4),
+                "p95": round(percentile(values, 0.95), 4),
+                "max": round(max(values), 4)
+            }
+            for stage, values in self.samples.items()
+        }
+
+
+@contextmanager
+def working_directory(path: Path) -> Iterator[None]:
+    """Run the pipeline inside a scratch directory so content/ and .cache/ stay untouched."""
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def run_benchmark(
+    config: StubConfig,
+    mode: str = "daily",
+    runs: int = 3,
+    batch: int = 4,
+    concurrency: int = 4,
+    images: bool = True,
+    image_response: str = "b64_json",
+    structured: bool = False,
+    feeds: int = 4
+) -> Dict[str, Any]:
+    """Run the pipeline against the stand-in server.
+
+    Args:
+        config: Stand-in server behaviour
+        mode: "daily" for generate_daily_post, "batch" for generate_batch
+        runs: Number of pipeline runs
+        batch: Posts per batch run
+        concurrency: Posts generated concurrently in batch mode
+        images: Generate a cover image per post
+        image_response: Image response format, "b64_json" or "url"
+        structured: Use single-call structured generation
+        feeds: Number of stand-in RSS feeds
+
+    Returns:
+        Report with per-stage percentiles, posts, errors, token usage and posts per minute
+    """
+    timer = StageTimer()
+    telemetry.reset()
+    with StubOpenAIServer(config) as server, tempfile.TemporaryDirectory() as scratch:
+        with working_directory(Path(scratch)):
+            # Same OPENAI_* limits as production runs, pointed at the stand-in
+            api_client = RateLimitedClient.from_env("stub")
+            api_client.client = openai.OpenAI(api_key="stub", base_url=server.base_url, max_retries=0)
+            router = ModelRouter()
+            image_generator = ImageGenerator(
+                "stub",
+                api_client=api_client,
+                router=router,
+                variants=VariantBuilder(Path("content/images")),
+                response_format=image_response
+            ) if images else None
+            generator = ContentGenerator(
+                "stub",
+                server.feed_urls(feeds),
+                response_cache=ResponseCache(enabled=False),
+                # Stand-in articles are shared filler text, so every post would be a duplicate
+                duplicate_index=DuplicateIndex(enabled=False),
+                api_client=api_client,
+                image_generator=image_generator,
+                structured=structured,
+                enricher=SourceEnricher(),
+                router=router
+            )
+            timer.instrument({"generator": generator, "images": image_generator})
+
+            posts = 0
+            started = time.perf_counter()
+            for _ in range(runs):
+                if mode == "batch":
+                    posts += len(generator.generate_batch(batch, max_concurrency=concurrency))
+                elif generator.generate_daily_post():
+                    posts += 1
+            elapsed = time.perf_counter() - started
+            generator.seen_index.close()
+
+        return {
+            "mode": mode,
+            "runs": runs,
+            "posts": posts,
+            "seconds": round(elapsed, 3),
+            "posts_per_minute": round(posts / elapsed * 60, 2) if elapsed else 0.0,
+            "stages": timer.summary(),
+            "requests": dict(server.counts),
+            "client": api_client.stats(),
+            "models": generator.router.stats(),
+            "tokens": telemetry.report()["tokens"],
+            "prompt_cache": telemetry.prompt_cache()
+        }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Print a benchmark report as a table."""
+    table = Table(title=f"Pipeline benchmark ({report['mode']}, {report['runs']} runs)")
+    table.add_column("Stage")
+    table.add_column("Calls", justify="right")
+    table.add_column("p50 (s)", justify="right")
+    table.add_column("p95 (s)", justify="right")
+    table.add_column("max (s)", justify="right")
+    for stage in STAGES:
+        stats = report["stages"].get(stage)
+        if stats:
+            table.add_row(stage, str(stats["count"]), f"{stats['p50']:.3f}", f"{stats['p95']:.3f}", f"{stats['max']:.3f}")
+    console.print(table)
+    console.print(
+        f"[green]{report['posts']} posts in {report['seconds']:.1f}s "
+        f"({report['posts_per_minute']:.1f} posts/min)[/green]"
+    )
+    console.print(f"[blue]Requests: {report['requests']}  Client: {report['client']}[/blue]")
+    console.print(f"[blue]Tokens: {report['tokens']}[/blue]")
+    console.print(f"[blue]Prompt cache: {report['prompt_cache']}[/blue]")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """CLI entry point for the pipeline benchmark."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark the content pipeline against an offline OpenAI stand-in")
+    parser.add_argument("--mode", choices=("daily", "batch"), default="daily")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--batch", type=int, default=4, help="Posts per batch run")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--no-images", action="store_true", help="Skip cover image generation")
+    parser.add_argument("--image-response", choices=("b64_json", "url"), default="b64_json", help="Cover retrieval mode")
+    parser.add_argument("--structured", action="store_true", help="Use single-call structured generation")
+    parser.add_argument("--chat-latency", type=Latency.parse, default=Latency(0.5, 0.3), help="median[:sigma] seconds")
+    parser.add_argument("--image-latency", type=Latency.parse, default=Latency(2.0, 0.3), help="median[:sigma] seconds")
+    parser.add_argument("--download-latency", type=Latency.parse, default=Latency(), help="Image and article downloads, median[:sigma] seconds")
+    parser.add_argument("--chunk-delay", type=float, default=0.005, help="Seconds between streamed chunks")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of API requests that fail")
+    parser.add_argument("--error-status", type=int, default=429)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--prompt-cache-min-tokens", type=int, default=1024, help="Shortest prompt the stand-in caches")
+    parser.add_argument("--json", type=Path, help="Also write the report to this file")
+    args = parser.parse_args(argv)
+
+    config = StubConfig(
+        chat_latency=args.chat_latency,
+        image_latency=args.image_latency,
+        download_latency=args.download_latency,
+        chunk_delay=args.chunk_delay,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        seed=args.seed,
+        prompt_cache_min_tokens=args.prompt_cache_min_tokens
+    )
+    report = run_benchmark(
+        config,
+        mode=args.mode,
+        runs=args.runs,
+        batch=args.batch,
+        concurrency=args.concurrency,
+        images=not args.no_images,
+        image_response=args.image_response,
+        structured=args.structured
+    )
+    print_report(report)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,13 +2,41 @@
 AI Blog Content Pipeline
 
 Automated content generation system for AI-powered blog publishing.
+
+The public classes are imported on first access, so ``import content_pipeline``
+and small CLI calls do not load the OpenAI SDK, Pillow or GitPython.
 """
 
+import importlib
+from typing import TYPE_CHECKING
+
 __version__ = "1.0.0"
 __author__ = "AI Blog Generator"
 
-from .generator import ContentGenerator
-from .images import ImageGenerator
-from .publisher import Publisher
+__all__ = ["ContentGenerator", "ImageGenerator", "Publisher"]
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    "ContentGenerator": ".generator",
+    "ImageGenerator": ".images",
+    "Publisher": ".publisher",
+}
+
+if TYPE_CHECKING:
+    from .generator import ContentGenerator
+    from .images import ImageGenerator
+    from .publisher import Publisher
+
+
+def __getattr__(name: str):
+    """Import public classes from their submodule on first access."""
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ["ContentGenerator", "ImageGenerator", "Publisher"] 
\ No newline at end of file
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
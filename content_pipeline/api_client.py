@@ -0,0 +1,471 @@
+"""
+API Client
+
+Shared OpenAI client layer with token-bucket rate limiting, per-endpoint
+concurrency caps and jittered exponential retry that honours Retry-After.
+"""
+
+import functools
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Iterator, Mapping, Optional
+
+from rich.console import Console
+
+from .lazy import lazy_import
+from .telemetry import telemetry
+
+openai = lazy_import("openai")
+
+console = Console()
+
+# Status codes worth retrying besides 429 and 5xx
+RETRYABLE_STATUS = {408, 409}
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at a per-minute rate."""
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        """Initialize the bucket.
+
+        Args:
+            per_minute: Sustained rate in units per minute
+            capacity: Maximum burst (defaults to one minute's worth)
+        """
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or per_minute
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        """Add the tokens accrued since the last update."""
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float = 1.0) -> float:
+        """Take tokens from the bucket, going into debt if necessary.
+
+        Reservations are served in call order: each caller waits until the
+        tokens it took have been refilled.
+
+        Args:
+            amount: Tokens to take (clamped to the bucket capacity)
+
+        Returns:
+            Seconds the caller must wait before proceeding
+        """
+        amount = min(amount, self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= amount
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._paused_until - now)
+
+    def acquire(self, amount: float = 1.0) -> float:
+        """Take tokens from the bucket, blocking until they are available.
+
+        Args:
+            amount: Tokens to take
+
+        Returns:
+            Seconds spent waiting
+        """
+        wait = self.reserve(amount)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def refund(self, amount: float) -> None:
+        """Return over-reserved tokens to the bucket.
+
+        Args:
+            amount: Tokens to give back
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self.capacity, self._tokens + amount)
+
+    def pause(self, seconds: float) -> None:
+        """Hold every caller back, e.g. after the server answered 429.
+
+        Args:
+            seconds: Time from now during which no tokens are handed out
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+@dataclass
+class EndpointLimits:
+    """Rate limits of one API endpoint."""
+    requests_per_minute: float
+    tokens_per_minute: Optional[float] = None
+    max_concurrency: int = 4
+
+
+DEFAULT_LIMITS = {
+    "chat": EndpointLimits(requests_per_minute=500, tokens_per_minute=30000, max_concurrency=8),
+    "images": EndpointLimits(requests_per_minute=5, max_concurrency=2),
+}
+
+
+@dataclass
+class RetryPolicy:
+    """Jittered exponential backoff for transient API errors."""
+    max_retries: int = 5
+    base_delay: float = 1.0
+    max_delay: float = 60.0
+
+    @staticmethod
+    def retry_after(error: Exception) -> Optional[float]:
+        """Read the server-requested delay from an API error.
+
+        Args:
+            error: Exception raised by the OpenAI client
+
+        Returns:
+            Delay in seconds from retry-after-ms or Retry-After, if present
+        """
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None)
+        if not headers:
+            return None
+
+        try:
+            value = headers.get("retry-after-ms")
+            if value:
+                return float(value) / 1000
+            value = headers.get("retry-after")
+            if not value:
+                return None
+            try:
+                return float(value)
+            except ValueError:
+                return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def is_retryable(error: Exception) -> bool:
+        """Check whether an error is transient.
+
+        Args:
+            error: Exception raised by the OpenAI client
+
+        Returns:
+            True for rate limits, timeouts, connection errors and 5xx responses
+        """
+        if getattr(error, "code", None) == "insufficient_quota":
+            return False  # Billing problem, retrying will not help
+        if isinstance(error, (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError)):
+            return True
+        status = getattr(error, "status_code", None)
+        return isinstance(status, int) and (status in RETRYABLE_STATUS or status >= 500)
+
+    def delay(self, attempt: int, error: Exception) -> float:
+        """Compute the wait before the next attempt.
+
+        Args:
+            attempt: Zero-based number of the failed attempt
+            error: Exception that caused the retry
+
+        Returns:
+            Server-requested delay if given, otherwise full-jitter backoff
+        """
+        retry_after = self.retry_after(error)
+        if retry_after is not None:
+            return retry_after + random.uniform(0, 0.1 * self.base_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+def estimate_tokens(params: Dict[str, Any]) -> int:
+    """Estimate the tokens a chat request will consume.
+
+    Args:
+        params: Parameters for chat.completions.create
+
+    Returns:
+        Prompt length at roughly four characters per token plus max_tokens
+    """
+    prompt_chars = sum(
+        len(message.get("content") or "") for message in params.get("messages", [])
+        if isinstance(message.get("content"), str)
+    )
+    return prompt_chars // 4 + int(params.get("max_tokens") or 0)
+
+
+class HeldStream:
+    """Streaming response that holds its endpoint's concurrency slot.
+
+    The slot is released once the stream is exhausted, raises or is closed,
+    including when the stream is dropped without ever being iterated. Use it
+    as a context manager to release the slot as soon as the caller is done.
+    """
+
+    def __init__(self, stream: Any, on_close: Callable[[Any], None]):
+        """Initialize the wrapper.
+
+        Args:
+            stream: Streamed response from the OpenAI SDK
+            on_close: Called once with the last chunk that carried token
+                usage (None if none arrived) when the stream ends
+        """
+        self._stream = stream
+        self._iterator: Optional[Iterator[Any]] = None
+        self._on_close = on_close
+        self._usage_chunk = None
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def __iter__(self) -> "HeldStream":
+        return self
+
+    def __next__(self) -> Any:
+        if self._closed:
+            raise StopIteration
+        if self._iterator is None:
+            self._iterator = iter(self._stream)
+        try:
+            chunk = next(self._iterator)
+        except BaseException:
+            self.close()
+            raise
+        if getattr(chunk, "usage", None) is not None:
+            # With stream_options={"include_usage": True} the final chunk carries the totals
+            self._usage_chunk = chunk
+        return chunk
+
+    def __enter__(self) -> "HeldStream":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the underlying response and release the slot; safe to call twice."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        try:
+            close = getattr(self._stream, "close", None)
+            if callable(close):
+                close()
+        finally:
+            self._on_close(self._usage_chunk)
+
+
+class RateLimitedClient:
+    """OpenAI client shared by every pipeline stage."""
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        limits: Optional[Dict[str, EndpointLimits]] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        client: Any = None
+    ):
+        """Initialize the shared client.
+
+        Args:
+            api_key: OpenAI API key
+            limits: Limits per endpoint name (defaults to DEFAULT_LIMITS)
+            retry_policy: Backoff settings for transient errors
+            client: Preconfigured OpenAI client (its own retries should be disabled);
+                built on first use when omitted, so constructing a generator
+                does not import the OpenAI SDK
+        """
+        self.api_key = api_key
+        self._client = client
+        self.limits = dict(DEFAULT_LIMITS, **(limits or {}))
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.retries = 0
+        self.throttled_seconds = 0.0
+        self._lock = threading.Lock()
+        self._requests: Dict[str, TokenBucket] = {}
+        self._tokens: Dict[str, TokenBucket] = {}
+        self._slots: Dict[str, threading.BoundedSemaphore] = {}
+        for endpoint, endpoint_limits in self.limits.items():
+            self._register(endpoint, endpoint_limits)
+
+    @property
+    def client(self) -> Any:
+        """Underlying OpenAI client."""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = openai.OpenAI(api_key=self.api_key, max_retries=0)
+        return self._client
+
+    @client.setter
+    def client(self, client: Any) -> None:
+        self._client = client
+
+    @classmethod
+    def from_env(cls, api_key: str, env: Optional[Mapping[str, str]] = None) -> "RateLimitedClient":
+        """Build a client from OPENAI_* environment variables.
+
+        Args:
+            api_key: OpenAI API key
+            env: Environment mapping (defaults to os.environ)
+
+        Returns:
+            Configured RateLimitedClient
+        """
+        env = os.environ if env is None else env
+        chat, images = DEFAULT_LIMITS["chat"], DEFAULT_LIMITS["images"]
+        limits = {
+            "chat": EndpointLimits(
+                requests_per_minute=float(env.get("OPENAI_CHAT_RPM", chat.requests_per_minute)),
+                tokens_per_minute=float(env.get("OPENAI_CHAT_TPM", chat.tokens_per_minute or 0)),
+                max_concurrency=int(env.get("OPENAI_CHAT_CONCURRENCY", chat.max_concurrency))
+            ),
+            "images": EndpointLimits(
+                requests_per_minute=float(env.get("OPENAI_IMAGES_RPM", images.requests_per_minute)),
+                max_concurrency=int(env.get("OPENAI_IMAGES_CONCURRENCY", images.max_concurrency))
+            ),
+        }
+        retry_policy = RetryPolicy(max_retries=int(env.get("OPENAI_MAX_RETRIES", "5")))
+        return cls(api_key, limits=limits, retry_policy=retry_policy)
+
+    def _register(self, endpoint: str, limits: EndpointLimits) -> None:
+        """Create the buckets and concurrency slots of an endpoint."""
+        self._requests[endpoint] = TokenBucket(limits.requests_per_minute)
+        if limits.tokens_per_minute:
+            self._tokens[endpoint] = TokenBucket(limits.tokens_per_minute)
+        self._slots[endpoint] = threading.BoundedSemaphore(limits.max_concurrency)
+
+    def _throttle(self, endpoint: str, tokens: int) -> None:
+        """Wait for request and token budget of an endpoint."""
+        waited = self._requests[endpoint].acquire(1)
+        if tokens and endpoint in self._tokens:
+            waited += self._tokens[endpoint].acquire(tokens)
+        if waited > 0:
+            with self._lock:
+                self.throttled_seconds += waited
+            telemetry.incr(f"api.{endpoint}.throttled_seconds", waited)
+
+    def _settle(self, endpoint: str, reserved: int, response: Any) -> None:
+        """Refund reserved tokens the request did not actually use."""
+        bucket = self._tokens.get(endpoint)
+        used = getattr(getattr(response, "usage", None), "total_tokens", None)
+        if bucket is not None and isinstance(used, int) and used < reserved:
+            bucket.refund(reserved - used)
+
+    def _refund(self, endpoint: str, reserved: int) -> None:
+        """Return the tokens reserved for a request that failed."""
+        bucket = self._tokens.get(endpoint)
+        if bucket is not None and reserved:
+            bucket.refund(reserved)
+
+    def call(self, endpoint: str, method: Callable[..., Any], tokens: int = 0, **params) -> Any:
+        """Call an API method within the endpoint's limits, retrying transient errors.
+
+        Streaming responses are returned as a HeldStream, which keeps the
+        concurrency slot until it is consumed or closed and then settles the
+        reserved tokens against the usage reported in the final chunk.
+
+        Args:
+            endpoint: Endpoint name used for limits ("chat", "images", ...)
+            method: Client method to call, e.g. client.chat.completions.create
+            tokens: Estimated tokens the request consumes
+            **params: Parameters passed to method
+
+        Returns:
+            The method's response
+
+        Raises:
+            Exception: The last error once retries are exhausted, or any
+                non-transient error immediately
+        """
+        if endpoint not in self._slots:
+            with self._lock:
+                if endpoint not in self._slots:
+                    self._register(endpoint, EndpointLimits(requests_per_minute=60))
+
+        slot = self._slots[endpoint]
+        attempt = 0
+        while True:
+            self._throttle(endpoint, tokens)
+            slot.acquire()
+            try:
+                response = method(**params)
+            except Exception as e:
+                slot.release()
+                # A failed request consumed nothing; give its reservation back
+                self._refund(endpoint, tokens)
+                if attempt >= self.retry_policy.max_retries or not self.retry_policy.is_retryable(e):
+                    raise
+                delay = self.retry_policy.delay(attempt, e)
+                if isinstance(e, openai.RateLimitError):
+                    # Slow down every caller of this endpoint, not just this one
+                    self._requests[endpoint].pause(delay)
+                attempt += 1
+                with self._lock:
+                    self.retries += 1
+                telemetry.incr(f"api.{endpoint}.retries")
+                console.print(
+                    f"[yellow]{endpoint} request failed ({e.__class__.__name__}), "
+                    f"retry {attempt}/{self.retry_policy.max_retries} in {delay:.1f}s[/yellow]"
+                )
+                time.sleep(delay)
+                continue
+
+            if params.get("stream"):
+                return HeldStream(response, functools.partial(self._finish_stream, endpoint, slot, tokens))
+            slot.release()
+            self._settle(endpoint, tokens, response)
+            return response
+
+    def _finish_stream(
+        self,
+        endpoint: str,
+        slot: threading.BoundedSemaphore,
+        reserved: int,
+        usage_chunk: Any
+    ) -> None:
+        """Release a finished stream's slot and settle its reserved tokens."""
+        slot.release()
+        self._settle(endpoint, reserved, usage_chunk)
+
+    def chat(self, **params) -> Any:
+        """Create a chat completion.
+
+        Args:
+            **params: Parameters for chat.completions.create
+
+        Returns:
+            Chat completion, or an iterator of chunks when stream=True
+        """
+        return self.call("chat", self.client.chat.completions.create, estimate_tokens(params), **params)
+
+    def images(self, **params) -> Any:
+        """Generate images.
+
+        Args:
+            **params: Parameters for images.generate
+
+        Returns:
+            Images response
+        """
+        return self.call("images", self.client.images.generate, **params)
+
+    def stats(self) -> Dict[str, float]:
+        """Get retry and throttling counters.
+
+        Returns:
+            Number of retries and total seconds spent waiting for rate limits
+        """
+        with self._lock:
+            return {"retries": self.retries, "throttled_seconds": round(self.throttled_seconds, 3)}
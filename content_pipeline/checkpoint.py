@@ -0,0 +1,285 @@
+"""
+Checkpoints
+
+Per-job stage outputs on disk so an interrupted generation run can resume
+at the first incomplete stage instead of starting over.
+"""
+
+import json
+import os
+import re
+import shutil
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from rich.console import Console
+
+console = Console()
+
+# Stage name -> file name; .md stages hold plain text, .json stages hold JSON
+STAGE_FILES = {
+    "keyword": "keyword.json",
+    "topics": "topics.json",
+    "sources": "sources.md",
+    "outline": "outline.md",
+    "article": "article.md",
+    "seo": "seo.json",
+    "image": "image.json",
+    # Post file chosen before it is written, so a resumed job rewrites its own file
+    "target": "target.json",
+    "post": "post.json",
+}
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    """Write a file so readers never see a partial checkpoint."""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    tmp_path.replace(path)
+
+
+def job_slug(keyword: str) -> str:
+    """Build a directory name for a keyword's job.
+
+    Args:
+        keyword: Topic keyword
+
+    Returns:
+        Lowercase, hyphenated name safe for the filesystem
+    """
+    return re.sub(r'[^a-z0-9]+', '-', keyword.lower()).strip('-') or "job"
+
+
+class JobCheckpoint:
+    """Stage outputs of a single post."""
+
+    def __init__(self, directory: Path):
+        """Initialize the job checkpoint.
+
+        Args:
+            directory: Directory holding one file per completed stage
+        """
+        self.directory = directory
+
+    def _path(self, stage: str) -> Path:
+        """Get the file of a stage."""
+        return self.directory / STAGE_FILES[stage]
+
+    def has(self, stage: str) -> bool:
+        """Check whether a stage has completed.
+
+        Args:
+            stage: Stage name from STAGE_FILES
+
+        Returns:
+            True if the stage output is on disk
+        """
+        return self._path(stage).exists()
+
+    def load(self, stage: str) -> Any:
+        """Load a stage output.
+
+        Args:
+            stage: Stage name from STAGE_FILES
+
+        Returns:
+            Stored value, or None if the stage has not completed
+        """
+        path = self._path(stage)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                if path.suffix == ".json":
+                    return json.load(f)
+                return f.read()
+        except FileNotFoundError:
+            return None
+        except ValueError as e:
+            console.print(f"[yellow]Warning: Ignoring corrupt checkpoint {path}: {e}[/yellow]")
+            return None
+
+    def save(self, stage: str, value: Any) -> None:
+        """Store a stage output.
+
+        Args:
+            stage: Stage name from STAGE_FILES
+            value: Text for .md stages, JSON-serializable value otherwise
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(stage)
+        if path.suffix == ".json":
+            _write_atomic(path, json.dumps(value, ensure_ascii=False, indent=2))
+        else:
+            _write_atomic(path, value)
+
+    @property
+    def done(self) -> bool:
+        """Whether the post has been saved."""
+        return self.has("post")
+
+
+class RunCheckpoint:
+    """Checkpoint of one generation run: its topics, keywords and jobs."""
+
+    def __init__(self, directory: Path):
+        """Initialize the run checkpoint.
+
+        Args:
+            directory: Run directory
+        """
+        self.directory = directory
+        self._state_path = directory / "run.json"
+
+    @property
+    def run_id(self) -> str:
+        """Name of the run directory."""
+        return self.directory.name
+
+    def _state(self) -> Dict[str, Any]:
+        """Read the run state file."""
+        try:
+            with open(self._state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def save_plan(self, topics: List[Dict[str, str]], keywords: List[str]) -> None:
+        """Store the topics and ranked keywords the run will generate posts for.
+
+        Args:
+            topics: Topics the keywords were selected from
+            keywords: Keywords in rank order, one job each
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        _write_atomic(self.directory / "topics.json", json.dumps(topics, ensure_ascii=False))
+        _write_atomic(self._state_path, json.dumps({
+            "created": datetime.now(timezone.utc).isoformat(),
+            "keywords": keywords,
+            "complete": False
+        }, indent=2))
+
+    def load_plan(self) -> Optional[Tuple[List[Dict[str, str]], List[str]]]:
+        """Load the run's topics and keywords.
+
+        Returns:
+            Topics and keywords, or None if the plan was never written
+        """
+        state = self._state()
+        if "keywords" not in state:
+            return None
+        try:
+            with open(self.directory / "topics.json", 'r', encoding='utf-8') as f:
+                topics = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        return topics, state["keywords"]
+
+    def job(self, keyword: str) -> JobCheckpoint:
+        """Get the checkpoint of a keyword's job.
+
+        Args:
+            keyword: Topic keyword
+
+        Returns:
+            JobCheckpoint under this run's jobs/ directory
+        """
+        return JobCheckpoint(self.directory / "jobs" / job_slug(keyword))
+
+    @property
+    def created(self) -> datetime:
+        """When the run's plan was saved, or the directory's mtime without one."""
+        try:
+            return datetime.fromisoformat(self._state()["created"])
+        except (KeyError, TypeError, ValueError):
+            try:
+                return datetime.fromtimestamp(self.directory.stat().st_mtime, timezone.utc)
+            except OSError:
+                return datetime.now(timezone.utc)
+
+    @property
+    def complete(self) -> bool:
+        """Whether every job of the run has finished."""
+        return bool(self._state().get("complete"))
+
+    def mark_complete(self) -> None:
+        """Record that every job of the run has finished."""
+        state = self._state()
+        state["complete"] = True
+        _write_atomic(self._state_path, json.dumps(state, indent=2))
+
+
+class CheckpointStore:
+    """Directory of run checkpoints, newest last."""
+
+    def __init__(self, root: Optional[Path] = None, keep: int = 20, max_age_days: float = 14):
+        """Initialize the checkpoint store.
+
+        Args:
+            root: Directory holding one subdirectory per run
+            keep: Number of completed runs kept for inspection, and of
+                unfinished runs kept for resuming
+            max_age_days: Age after which an unfinished run is deleted
+                instead of resumed
+        """
+        self.root = root or Path(".cache/checkpoints")
+        self.keep = keep
+        self.max_age = timedelta(days=max_age_days)
+
+    def _runs(self) -> List[RunCheckpoint]:
+        """List runs oldest first."""
+        if not self.root.exists():
+            return []
+        return [RunCheckpoint(path) for path in sorted(self.root.iterdir()) if path.is_dir()]
+
+    def new_run(self, topics: List[Dict[str, str]], keywords: List[str]) -> RunCheckpoint:
+        """Start a run checkpoint.
+
+        Args:
+            topics: Topics the keywords were selected from
+            keywords: Keywords in rank order
+
+        Returns:
+            New RunCheckpoint with its plan saved
+        """
+        self.prune()
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        directory = self.root / stamp
+        suffix = 1
+        while directory.exists():
+            suffix += 1
+            directory = self.root / f"{stamp}-{suffix}"
+        run = RunCheckpoint(directory)
+        run.save_plan(topics, keywords)
+        return run
+
+    def latest_unfinished(self) -> Optional[RunCheckpoint]:
+        """Find the most recent run that has jobs left.
+
+        Returns:
+            RunCheckpoint to resume, or None
+        """
+        for run in reversed(self._runs()):
+            if not run.complete and not self._expired(run) and run.load_plan() is not None:
+                return run
+        return None
+
+    def _expired(self, run: RunCheckpoint) -> bool:
+        """Whether a run is older than max_age."""
+        return datetime.now(timezone.utc) - run.created > self.max_age
+
+    def prune(self) -> None:
+        """Delete old runs.
+
+        Keeps the newest ``keep`` completed runs and the newest ``keep``
+        unfinished runs younger than max_age.
+        """
+        runs = self._runs()
+        completed = [run for run in runs if run.complete]
+        unfinished = [run for run in runs if not run.complete]
+        stale = completed[:max(0, len(completed) - self.keep)]
+        stale += unfinished[:max(0, len(unfinished) - self.keep)]
+        stale += [run for run in unfinished[max(0, len(unfinished) - self.keep):] if self._expired(run)]
+        for run in stale:
+            shutil.rmtree(run.directory, ignore_errors=True)
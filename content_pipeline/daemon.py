@@ -0,0 +1,454 @@
+"""
+Pipeline Daemon
+
+Long-running generator process: one ContentGenerator (OpenAI client, feed
+HTTP session, caches and SQLite indexes) is built at startup and reused for
+every job. Jobs run on a schedule and can be queued ad hoc through a small
+HTTP control endpoint that also serves /health and /metrics.
+"""
+
+import itertools
+import json
+import os
+import queue
+import re
+import signal
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from rich.console import Console
+
+from .telemetry import telemetry
+
+console = Console()
+
+JOB_KINDS = ("daily", "batch", "resume")
+
+INTERVAL_PATTERN = re.compile(r"^(\d+(?:\.\d+)?)\s*([smhd]?)$")
+INTERVAL_UNITS = {"": 1, "s": 1, "m": 60, "h": 3600, "d": 86400}
+TIME_PATTERN = re.compile(r"^([01]?\d|2[0-3]):([0-5]\d)$")
+
+
+class Schedule:
+    """When scheduled jobs run: a fixed interval or daily UTC times."""
+
+    def __init__(self, interval: Optional[float] = None, times: Optional[List[Tuple[int, int]]] = None):
+        """Initialize the schedule.
+
+        Args:
+            interval: Seconds between runs
+            times: (hour, minute) UTC times to run at every day
+        """
+        self.interval = interval
+        self.times = sorted(times or [])
+
+    @classmethod
+    def parse(cls, spec: str) -> "Schedule":
+        """Parse a schedule specification.
+
+        Args:
+            spec: Interval such as ``6h``, ``30m`` or ``900``, a comma-separated
+                list of UTC times such as ``06:00,18:00``, or ``off``
+
+        Returns:
+            Parsed schedule
+
+        Raises:
+            ValueError: If the specification is not understood
+        """
+        spec = spec.strip().lower()
+        if spec in ("", "off", "none"):
+            return cls()
+        match = INTERVAL_PATTERN.match(spec)
+        if match:
+            interval = float(match.group(1)) * INTERVAL_UNITS[match.group(2)]
+            if interval <= 0:
+                raise ValueError(f"Schedule interval must be positive: {spec!r}")
+            return cls(interval=interval)
+        times = []
+        for part in spec.split(","):
+            match = TIME_PATTERN.match(part.strip())
+            if not match:
+                raise ValueError(f"Invalid schedule: {spec!r}")
+            times.append((int(match.group(1)), int(match.group(2))))
+        return cls(times=times)
+
+    def next_run(self, after: datetime) -> Optional[datetime]:
+        """Get the first run time after a moment.
+
+        Args:
+            after: Timezone-aware reference time (usually the last run or now)
+
+        Returns:
+            Next run time, or None if nothing is scheduled
+        """
+        if self.interval:
+            return after + timedelta(seconds=self.interval)
+        for day in range(2):
+            date = (after + timedelta(days=day)).date()
+            for hour, minute in self.times:
+                candidate = datetime(date.year, date.month, date.day, hour, minute, tzinfo=timezone.utc)
+                if candidate > after:
+                    return candidate
+        return None
+
+    def __str__(self) -> str:
+        if self.interval:
+            return f"every {self.interval:g}s"
+        if self.times:
+            return "daily at " + ", ".join(f"{hour:02d}:{minute:02d}" for hour, minute in self.times) + " UTC"
+        return "off"
+
+
+@dataclass
+class Job:
+    """A generation job queued on the daemon."""
+    job_id: int
+    kind: str
+    count: int = 1
+    source: str = "api"
+    status: str = "queued"
+    created_at: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    posts: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+class PipelineDaemon:
+    """Runs generation jobs against a generator that stays warm between runs."""
+
+    def __init__(
+        self,
+        generator: Any,
+        schedule: Optional[Schedule] = None,
+        scheduled_kind: str = "daily",
+        scheduled_count: int = 1,
+        concurrency: int = 4,
+        host: str = "127.0.0.1",
+        port: int = 8081,
+        token: Optional[str] = None,
+        history: int = 50
+    ):
+        """Initialize the daemon.
+
+        Args:
+            generator: ContentGenerator reused by every job
+            schedule: When to queue scheduled jobs (defaults to none)
+            scheduled_kind: Job kind queued by the schedule
+            scheduled_count: Posts per scheduled batch job
+            concurrency: Maximum posts generated concurrently in batch jobs
+            host: Control endpoint bind address
+            port: Control endpoint port (0 picks a free one)
+            token: Bearer token required to queue jobs, if set
+            history: Number of finished jobs kept for /jobs
+        """
+        self.generator = generator
+        self.schedule = schedule or Schedule()
+        self.scheduled_kind = scheduled_kind
+        self.scheduled_count = scheduled_count
+        self.concurrency = concurrency
+        self.token = token
+        self.started_at = time.time()
+        self.next_run: Optional[datetime] = None
+        self._jobs: deque = deque(maxlen=history)
+        self._queue: "queue.Queue[Optional[Job]]" = queue.Queue()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._current: Optional[Job] = None
+        self._threads: List[threading.Thread] = []
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.server.daemon_threads = True
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """Bound (host, port) of the control endpoint."""
+        host, port = self.server.server_address[:2]
+        return str(host), port
+
+    def submit(self, kind: str, count: int = 1, source: str = "api") -> Job:
+        """Queue a job.
+
+        Args:
+            kind: One of JOB_KINDS
+            count: Posts to generate for batch jobs
+            source: Who queued the job ("api" or "schedule")
+
+        Returns:
+            The queued job
+
+        Raises:
+            ValueError: If the kind or count is invalid
+        """
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown job kind {kind!r}, expected one of {', '.join(JOB_KINDS)}")
+        if count < 1:
+            raise ValueError("count must be at least 1")
+        job = Job(next(self._ids), kind, count, source)
+        with self._lock:
+            self._jobs.append(job)
+        self._queue.put(job)
+        console.print(f"[blue]Queued {kind} job #{job.job_id} ({source})[/blue]")
+        return job
+
+    def jobs(self) -> List[Job]:
+        """Get recent jobs, newest first."""
+        with self._lock:
+            return list(reversed(self._jobs))
+
+    def job(self, job_id: int) -> Optional[Job]:
+        """Look up a recent job by id."""
+        with self._lock:
+            return next((job for job in self._jobs if job.job_id == job_id), None)
+
+    def _execute(self, job: Job) -> None:
+        """Run one job on the worker thread."""
+        with self._lock:
+            job.status = "running"
+            job.started_at = datetime.now(timezone.utc).isoformat()
+            self._current = job
+        telemetry.reset()
+        try:
+            with telemetry.span("daemon.job", kind=job.kind, source=job.source):
+                if job.kind == "batch":
+                    paths = self.generator.generate_batch(job.count, max_concurrency=self.concurrency)
+                elif job.kind == "resume":
+                    paths = self.generator.resume_run(max_concurrency=self.concurrency) or []
+                else:
+                    path = self.generator.generate_daily_post()
+                    paths = [path] if path else []
+            status, error = ("done", None) if paths or job.kind == "resume" else ("failed", "no post generated")
+        except Exception as e:
+            console.print(f"[red]Job #{job.job_id} failed: {e}[/red]")
+            paths, status, error = [], "failed", str(e)
+        with self._lock:
+            job.posts = [str(path) for path in paths]
+            job.status, job.error = status, error
+            job.finished_at = datetime.now(timezone.utc).isoformat()
+            self._current = None
+        telemetry.incr(f"daemon.jobs.{status}")
+        console.print(f"[{'green' if status == 'done' else 'red'}]Job #{job.job_id} {status}: {len(paths)} posts[/]")
+        self._write_telemetry()
+
+    @staticmethod
+    def _write_telemetry() -> None:
+        """Write the per-job report and metrics configured for CLI runs."""
+        try:
+            report_path = os.getenv("PIPELINE_REPORT")
+            if report_path:
+                telemetry.write_report(Path(report_path))
+            metrics_path = os.getenv("PIPELINE_METRICS")
+            if metrics_path:
+                telemetry.write_prometheus(Path(metrics_path))
+        except Exception as e:
+            console.print(f"[yellow]Warning: Could not write telemetry: {e}[/yellow]")
+
+    def _work(self) -> None:
+        """Worker loop: run queued jobs one at a time."""
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            self._execute(job)
+
+    def _tick(self) -> None:
+        """Scheduler loop: queue the scheduled job whenever it is due."""
+        self.next_run = self.schedule.next_run(datetime.now(timezone.utc))
+        while self.next_run is not None:
+            delay = (self.next_run - datetime.now(timezone.utc)).total_seconds()
+            if self._stop.wait(max(0.0, delay)):
+                return
+            try:
+                self.submit(self.scheduled_kind, self.scheduled_count, source="schedule")
+            except ValueError as e:
+                console.print(f"[red]Could not queue scheduled job: {e}[/red]")
+            self.next_run = self.schedule.next_run(max(self.next_run, datetime.now(timezone.utc)))
+        # Nothing scheduled: stay alive so /health reflects the daemon, not the schedule
+        self._stop.wait()
+
+    def health(self) -> Tuple[bool, Dict[str, Any]]:
+        """Check that the worker, scheduler and control threads are alive.
+
+        Returns:
+            (healthy, details) for the /health endpoint
+        """
+        alive = {thread.name: thread.is_alive() for thread in self._threads}
+        with self._lock:
+            finished = [job for job in self._jobs if job.finished_at]
+            details = {
+                "status": "ok",
+                "uptime_seconds": round(time.time() - self.started_at, 1),
+                "threads": alive,
+                "queued": self._queue.qsize(),
+                "running": self._current.job_id if self._current else None,
+                "last_job": asdict(finished[-1]) if finished else None,
+                "schedule": str(self.schedule),
+                "next_run": self.next_run.isoformat() if self.next_run else None,
+            }
+        healthy = bool(alive) and all(alive.values()) and not self._stop.is_set()
+        if not healthy:
+            details["status"] = "unhealthy"
+        return healthy, details
+
+    def _handler(self) -> type:
+        """Build the request handler class bound to this daemon."""
+        daemon = self
+
+        class Handler(BaseHTTPRequestHandler):
+            """Control endpoint: /health, /metrics and /jobs."""
+
+            def _send(self, status: int, body: Any, content_type: str = "application/json") -> None:
+                data = body.encode() if isinstance(body, str) else json.dumps(body, indent=2).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                path = self.path.split("?", 1)[0].rstrip("/")
+                if path == "/health":
+                    healthy, details = daemon.health()
+                    self._send(200 if healthy else 503, details)
+                elif path == "/metrics":
+                    self._send(200, telemetry.prometheus(), "text/plain; version=0.0.4")
+                elif path == "/jobs":
+                    self._send(200, [asdict(job) for job in daemon.jobs()])
+                elif path.startswith("/jobs/") and path[6:].isdigit():
+                    job = daemon.job(int(path[6:]))
+                    self._send(200, asdict(job)) if job else self._send(404, {"error": "unknown job"})
+                else:
+                    self._send(404, {"error": "not found"})
+
+            def do_POST(self):
+                if self.path.split("?", 1)[0].rstrip("/") != "/jobs":
+                    self._send(404, {"error": "not found"})
+                    return
+                if daemon.token and self.headers.get("Authorization") != f"Bearer {daemon.token}":
+                    self._send(401, {"error": "unauthorized"})
+                    return
+                try:
+                    length = int(self.headers.get("Content-Length") or 0)
+                    request = json.loads(self.rfile.read(length) or b"{}") if length else {}
+                    job = daemon.submit(str(request.get("kind", "daily")), int(request.get("count", 1)))
+                except (ValueError, TypeError, AttributeError) as e:
+                    self._send(400, {"error": str(e)})
+                    return
+                self._send(202, asdict(job))
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> None:
+        """Start the worker, scheduler and control endpoint threads."""
+        for name, target in (("worker", self._work), ("scheduler", self._tick), ("control", self.server.serve_forever)):
+            thread = threading.Thread(target=target, name=name, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        host, port = self.address
+        console.print(f"[green]Pipeline daemon listening on http://{host}:{port} (schedule: {self.schedule})[/green]")
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop accepting jobs and wait for the running job to finish.
+
+        Args:
+            timeout: Seconds to wait for the worker thread (None waits forever)
+        """
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self.server.shutdown()
+        self.server.server_close()
+        self._queue.put(None)
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def serve_forever(self) -> None:
+        """Run until SIGTERM or SIGINT."""
+        stopped = threading.Event()
+
+        def handle_signal(signum, frame):
+            console.print("[yellow]Stopping pipeline daemon after the current job...[/yellow]")
+            stopped.set()
+
+        signal.signal(signal.SIGTERM, handle_signal)
+        signal.signal(signal.SIGINT, handle_signal)
+        self.start()
+        stopped.wait()
+        self.stop()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """CLI entry point for the pipeline daemon."""
+    import argparse
+    import sys
+
+    from dotenv import load_dotenv
+
+    from .generator import build_generator
+
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Run the content pipeline as a long-running daemon")
+    parser.add_argument(
+        "--schedule", default=os.getenv("DAEMON_SCHEDULE", "06:00"),
+        help="Interval (6h, 30m) or UTC times (06:00,18:00) of scheduled runs, or 'off' (default: $DAEMON_SCHEDULE)"
+    )
+    parser.add_argument("--host", default=os.getenv("DAEMON_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("DAEMON_PORT", "8081")))
+    parser.add_argument(
+        "--batch", "-n", type=int, default=int(os.getenv("POSTS_PER_RUN", "1")),
+        help="Posts per scheduled run (default: $POSTS_PER_RUN or 1)"
+    )
+    parser.add_argument("--concurrency", type=int, default=int(os.getenv("GENERATION_CONCURRENCY", "4")))
+    parser.add_argument("--resume", action="store_true", help="Finish an interrupted run at startup")
+    parser.add_argument(
+        "--structured", action="store_true", default=os.getenv("STRUCTURED_OUTPUT", "off").lower() in ("1", "on", "true")
+    )
+    parser.add_argument(
+        "--cover-images", action="store_true", default=os.getenv("COVER_IMAGES", "off").lower() in ("1", "on", "true")
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        schedule = Schedule.parse(args.schedule)
+    except ValueError as e:
+        parser.error(str(e))
+
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        console.print("[red]OPENAI_API_KEY environment variable required[/red]")
+        sys.exit(1)
+
+    generator = build_generator(
+        api_key,
+        no_cache=os.getenv("LLM_CACHE", "on").lower() in ("0", "off", "false"),
+        structured=args.structured,
+        cover_images=args.cover_images
+    )
+    daemon = PipelineDaemon(
+        generator,
+        schedule=schedule,
+        scheduled_kind="batch" if args.batch > 1 else "daily",
+        scheduled_count=args.batch,
+        concurrency=args.concurrency,
+        host=args.host,
+        port=args.port,
+        token=os.getenv("DAEMON_TOKEN") or None
+    )
+    if args.resume:
+        daemon.submit("resume", source="startup")
+    daemon.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,570 @@
+"""
+Duplicate Index
+
+Persistent MinHash LSH index over the Markdown bodies under content/, so a
+post that covers the same ground as an existing one is rejected right after
+its outline, before the article and image calls are spent on it.
+
+Each document is reduced to its few most distinctive terms (term frequency
+weighted by inverse document frequency across the corpus). An outline and the
+article written from it share those topic terms even though their wording
+differs, so the same representation serves outline and body queries. The
+MinHash signature of the topic terms is split into bands; posts sharing a band
+bucket are candidates, and candidates whose estimated Jaccard similarity
+reaches the threshold are duplicates. A lookup signs only the query and runs
+one indexed SQLite query over its band buckets; its cost grows with the number
+of candidates sharing a bucket, not with a pass over the corpus.
+
+Posts and queries are weighted against the same snapshot of document
+frequencies, so each post is signed once when it is added. The snapshot is
+retaken automatically only while the index is small (it doubles in size below
+AUTO_REBUILD_POSTS posts); after that, recomputing it and re-signing every
+post is an explicit offline step: ``python -m content_pipeline.dedup --rebuild``.
+"""
+
+import functools
+import hashlib
+import heapq
+import math
+import re
+import sqlite3
+import threading
+from array import array
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from rich.console import Console
+
+from .keywords import STOPWORDS
+
+console = Console()
+
+TOKEN_PATTERN = re.compile(r"[a-z][a-z0-9+#]{2,}")
+FRONT_MATTER_FIELD = re.compile(r"^[A-Za-z][\w-]*:\s")
+TITLE_FIELD = re.compile(r"^title:\s*['\"]?(.*?)['\"]?\s*$", re.IGNORECASE | re.MULTILINE)
+SNIPPET_COMMENT = re.compile(r"<!--.*?-->", re.DOTALL)
+# Outline numbering such as "iii" or "viii"
+ROMAN_NUMERAL = re.compile(r"^[ivxl]+$")
+
+# Suffix -> replacement, longest first so "ations" wins over "s"
+SUFFIXES = (
+    ("ations", "ate"), ("ation", "ate"), ("ness", ""), ("ings", ""), ("ing", ""),
+    ("ies", "y"), ("ied", "y"), ("ed", ""), ("ss", "ss"), ("s", ""),
+)
+
+# Words every generated post uses regardless of topic
+CORPUS_STOPWORDS = STOPWORDS | frozenset({
+    'introduction', 'conclusion', 'section', 'sections', 'overview', 'summary',
+    'example', 'examples', 'practical', 'tips', 'key', 'takeaways', 'future',
+    'benefits', 'challenges', 'best', 'practices', 'understanding', 'guide',
+    'http', 'https', 'www', 'com',
+})
+
+# Distinctive terms that make up a document's topic
+TOPIC_TERMS = 16
+
+# Bumped when the stored representation changes; older indexes are rebuilt from content/
+SCHEMA_VERSION = 3
+
+# Index size up to which the IDF snapshot is retaken automatically as the corpus grows
+AUTO_REBUILD_POSTS = 200
+
+# Signature length is BANDS * ROWS; more rows per band means fewer, closer candidates
+BANDS = 30
+ROWS = 2
+NUM_PERM = BANDS * ROWS
+
+# An outline and its own article typically score 0.25-0.4, other posts on the same
+# subject around 0.05 and unrelated posts close to 0
+DEFAULT_THRESHOLD = 0.2
+
+_MAX_HASH = (1 << 32) - 1
+
+
+@dataclass
+class Duplicate:
+    """An indexed post that matches a query."""
+    path: str
+    similarity: float
+
+
+class DuplicatePostError(Exception):
+    """Raised when a new post is a near-duplicate of an existing one."""
+
+    def __init__(self, keyword: str, duplicate: Duplicate):
+        super().__init__(
+            f"{keyword} duplicates {duplicate.path} (similarity {duplicate.similarity:.2f})"
+        )
+        self.keyword = keyword
+        self.duplicate = duplicate
+
+
+def post_text(text: str) -> str:
+    """Extract the title and body of a Markdown post.
+
+    YAML or Pelican front matter is dropped except for the title, which is
+    the most topical line of a post, and tweet snippet comments are removed.
+
+    Args:
+        text: Markdown file contents
+
+    Returns:
+        Title and body
+    """
+    front_matter = ""
+    if text.startswith("---\n"):
+        end = text.find("\n---", 4)
+        if end != -1:
+            front_matter, text = text[4:end], text[end + 4:]
+    else:
+        lines = text.splitlines()
+        i = 0
+        while i < len(lines) and FRONT_MATTER_FIELD.match(lines[i]):
+            i += 1
+        if i and (i == len(lines) or not lines[i].strip()):
+            front_matter, text = "\n".join(lines[:i]), "\n".join(lines[i:])
+    title = TITLE_FIELD.search(front_matter)
+    body = SNIPPET_COMMENT.sub(" ", text)
+    return f"{title.group(1)}\n\n{body}" if title else body
+
+
+def stem(term: str) -> str:
+    """Strip common English suffixes so "borrowing" and "borrows" match "borrow".
+
+    Args:
+        term: Lowercase term
+
+    Returns:
+        Crude stem of the term
+    """
+    for suffix, replacement in SUFFIXES:
+        if term.endswith(suffix) and len(term) - len(suffix) >= 3:
+            return term[:-len(suffix)] + replacement
+    return term
+
+
+@functools.lru_cache(maxsize=65536)
+def _content_term(token: str) -> Optional[str]:
+    """Map a token to its stem, or None for stopwords and outline numbering."""
+    if token in CORPUS_STOPWORDS or ROMAN_NUMERAL.match(token):
+        return None
+    return stem(token)
+
+
+def tokenize(text: str) -> List[str]:
+    """Split a document into stemmed content terms.
+
+    Args:
+        text: Markdown text
+
+    Returns:
+        Lowercase stems without stopwords, in document order
+    """
+    return [term for term in map(_content_term, TOKEN_PATTERN.findall(text.lower())) if term]
+
+
+def minhash(terms: Iterable[str]) -> List[int]:
+    """Compute the MinHash signature of a term set.
+
+    Each term is hashed once with SHAKE-128 into NUM_PERM independent 32-bit
+    values, so the per-position minimum runs in C rather than as
+    NUM_PERM permutations per term in Python.
+
+    Args:
+        terms: Document terms
+
+    Returns:
+        NUM_PERM 32-bit minimum hash values
+    """
+    rows = []
+    for term in set(terms):
+        row = array("I")
+        row.frombytes(hashlib.shake_128(term.encode("utf-8")).digest(4 * NUM_PERM))
+        rows.append(row)
+    if not rows:
+        return [_MAX_HASH] * NUM_PERM
+    return list(map(min, zip(*rows)))
+
+
+def encode_counts(counts: Dict[str, int]) -> str:
+    """Serialize term counts as "term:count" pairs."""
+    return " ".join(f"{term}:{count}" for term, count in sorted(counts.items()))
+
+
+def decode_counts(text: str) -> Dict[str, int]:
+    """Parse term counts written by encode_counts()."""
+    counts = {}
+    for pair in text.split():
+        term, _, count = pair.rpartition(":")
+        counts[term] = int(count)
+    return counts
+
+
+def band_keys(signature: List[int]) -> List[int]:
+    """Hash each band of a signature to a bucket key.
+
+    Args:
+        signature: MinHash signature
+
+    Returns:
+        One 56-bit key per band (the band number is part of the hash)
+    """
+    keys = []
+    for band in range(BANDS):
+        rows = array("I", [band] + signature[band * ROWS:(band + 1) * ROWS]).tobytes()
+        keys.append(int.from_bytes(hashlib.blake2b(rows, digest_size=7).digest(), "big"))
+    return keys
+
+
+def similarity(left: List[int], right: List[int]) -> float:
+    """Estimate the Jaccard similarity of two term sets from their signatures.
+
+    Args:
+        left: MinHash signature
+        right: MinHash signature
+
+    Returns:
+        Fraction of matching signature positions
+    """
+    return sum(1 for a, b in zip(left, right) if a == b) / NUM_PERM
+
+
+class DuplicateIndex:
+    """SQLite-backed MinHash LSH index of the posts under content/."""
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        content_dir: Optional[Path] = None,
+        threshold: float = DEFAULT_THRESHOLD,
+        enabled: bool = True
+    ):
+        """Initialize the duplicate index.
+
+        Args:
+            path: SQLite database file
+            content_dir: Directory of Markdown posts to index
+            threshold: Estimated Jaccard similarity at which posts count as duplicates
+            enabled: When False, nothing is indexed and no post counts as a duplicate
+        """
+        self.path = path or Path(".cache/duplicates.sqlite3")
+        self.content_dir = content_dir or Path("content")
+        self.threshold = threshold
+        self.enabled = enabled
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._synced = False
+        self._count: Optional[int] = None
+        self._snapshot: Optional[Tuple[int, Dict[str, int]]] = None
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self._conn.executescript(
+                """
+                DROP TABLE IF EXISTS documents;
+                DROP TABLE IF EXISTS buckets;
+                DROP TABLE IF EXISTS terms;
+                DROP TABLE IF EXISTS snapshot;
+                """
+            )
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS documents (
+                path TEXT PRIMARY KEY,
+                mtime REAL NOT NULL,
+                size INTEGER NOT NULL,
+                terms TEXT NOT NULL,
+                signature BLOB NOT NULL
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS buckets (
+                key INTEGER NOT NULL,
+                path TEXT NOT NULL,
+                PRIMARY KEY (key, path)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS buckets_path ON buckets (path);
+            CREATE TABLE IF NOT EXISTS terms (
+                term TEXT PRIMARY KEY,
+                df INTEGER NOT NULL
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS snapshot (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                posts INTEGER NOT NULL
+            );
+            """
+        )
+        self._conn.commit()
+
+    def count(self) -> int:
+        """Number of indexed posts."""
+        with self._lock:
+            if self._count is None:
+                self._count = self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+            return self._count
+
+    def _idf_snapshot(self) -> Tuple[int, Dict[str, int]]:
+        """Post count and document frequencies that signatures are weighted with (lock held)."""
+        if self._snapshot is None:
+            row = self._conn.execute("SELECT posts FROM snapshot WHERE id = 1").fetchone()
+            self._snapshot = (row[0] if row else 0, dict(self._conn.execute("SELECT term, df FROM terms")))
+        return self._snapshot
+
+    def distinctive_terms(self, text: str, limit: int = TOPIC_TERMS) -> List[str]:
+        """Pick the terms that best characterize a document.
+
+        Args:
+            text: Markdown body or outline
+            limit: Number of terms to keep
+
+        Returns:
+            Up to ``limit`` terms ranked by TF-IDF
+        """
+        counts = Counter(tokenize(text))
+        with self._lock:
+            return self._topic_terms(counts, limit)
+
+    def _topic_terms(self, counts: Dict[str, int], limit: int = TOPIC_TERMS) -> List[str]:
+        """Rank term counts by TF-IDF against the IDF snapshot (lock held)."""
+        total, frequencies = self._idf_snapshot()
+        weights = {
+            term: (1 + math.log(count)) * math.log((total + 1) / (frequencies.get(term, 0) + 1) + 1)
+            for term, count in counts.items()
+        }
+        return heapq.nsmallest(limit, weights, key=lambda term: (-weights[term], term))
+
+    def _sign(self, path: str, counts: Dict[str, int], current: Optional[bytes] = None) -> bool:
+        """Write a document's signature and buckets from its term counts (lock held).
+
+        Args:
+            path: Document key
+            counts: Term counts of the document
+            current: Stored signature; nothing is written if it is unchanged,
+                and an empty one means the document has no buckets yet
+
+        Returns:
+            Whether the signature changed
+        """
+        signature = minhash(self._topic_terms(counts))
+        blob = array("I", signature).tobytes()
+        if blob == current:
+            return False
+        self._conn.execute("UPDATE documents SET signature = ? WHERE path = ?", (blob, path))
+        if current:
+            self._conn.execute("DELETE FROM buckets WHERE path = ?", (path,))
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO buckets (key, path) VALUES (?, ?)",
+            [(key, path) for key in band_keys(signature)]
+        )
+        return True
+
+    def _remove(self, path: str) -> None:
+        """Delete a document and its buckets (lock held)."""
+        if self._conn.execute("DELETE FROM documents WHERE path = ?", (path,)).rowcount:
+            self._conn.execute("DELETE FROM buckets WHERE path = ?", (path,))
+            self._count = self.count() - 1
+
+    def _add(self, path: str, text: str, mtime: float, size: int, replace: bool = True, sign: bool = True) -> None:
+        """Store a document's term counts and sign it against the IDF snapshot (lock held).
+
+        Args:
+            path: Document key
+            text: Document body
+            mtime: File modification time
+            size: File size
+            replace: Remove an earlier version first; False skips the lookup for new paths
+            sign: Compute the signature now; False leaves it to the next rebuild()
+        """
+        if replace:
+            self._remove(path)
+        total = self.count()
+        counts = Counter(tokenize(text))
+        self._conn.execute(
+            "INSERT INTO documents (path, mtime, size, terms, signature) VALUES (?, ?, ?, ?, ?)",
+            (path, mtime, size, encode_counts(counts), b"")
+        )
+        if sign:
+            self._sign(path, counts)
+        self._count = total + 1
+
+    def _needs_rebuild(self) -> bool:
+        """Whether a small index has outgrown its IDF snapshot (lock held).
+
+        The snapshot is taken automatically when the index is first built
+        and, up to AUTO_REBUILD_POSTS posts, again each time the corpus has
+        doubled; larger indexes keep their snapshot until rebuild() is run.
+        """
+        posts, _ = self._idf_snapshot()
+        count = self.count()
+        return count > 0 and (posts == 0 or (posts < AUTO_REBUILD_POSTS and count >= 2 * posts))
+
+    def rebuild(self) -> int:
+        """Take a new IDF snapshot of the corpus and re-sign every post.
+
+        This reads every stored post, so it belongs in an offline job
+        (``python -m content_pipeline.dedup --rebuild``) rather than on the
+        lookup path.
+
+        Returns:
+            Number of posts whose signature changed
+        """
+        with self._lock:
+            documents = [
+                (path, decode_counts(terms), blob)
+                for path, terms, blob in self._conn.execute("SELECT path, terms, signature FROM documents")
+            ]
+            frequencies: Counter = Counter()
+            for _, counts, _ in documents:
+                frequencies.update(counts.keys())
+            self._conn.execute("DELETE FROM terms")
+            self._conn.executemany("INSERT INTO terms (term, df) VALUES (?, ?)", frequencies.items())
+            self._conn.execute("INSERT OR REPLACE INTO snapshot (id, posts) VALUES (1, ?)", (len(documents),))
+            self._snapshot = (len(documents), dict(frequencies))
+            changed = sum(self._sign(path, counts, blob) for path, counts, blob in documents)
+            self._conn.commit()
+        return changed
+
+    def add(self, filepath: Path, body: Optional[str] = None) -> None:
+        """Index or re-index a post.
+
+        Args:
+            filepath: Markdown file of the post
+            body: Post body; read from the file when omitted
+        """
+        if not self.enabled:
+            return
+        if body is None:
+            body = post_text(filepath.read_text(encoding="utf-8"))
+        try:
+            stat = filepath.stat()
+            mtime, size = stat.st_mtime, stat.st_size
+        except OSError:
+            # Unknown file state: the next sync re-indexes it from disk
+            mtime, size = 0.0, -1
+        with self._lock:
+            self._add(str(filepath), body, mtime, size)
+            self._conn.commit()
+            if self._needs_rebuild():
+                self.rebuild()
+
+    def sync(self) -> Dict[str, int]:
+        """Bring the index in line with the Markdown files in content_dir.
+
+        New and modified files (by mtime and size) are indexed, deleted files
+        are dropped. The first sync of an empty index takes the IDF snapshot.
+
+        Returns:
+            Counts of added, updated and removed documents
+        """
+        counts = {"added": 0, "updated": 0, "removed": 0}
+        with self._lock:
+            known = {
+                path: (mtime, size)
+                for path, mtime, size in self._conn.execute("SELECT path, mtime, size FROM documents")
+            }
+            # Without a snapshot every signature is computed once by rebuild() below
+            sign = self._idf_snapshot()[0] > 0
+            present: Set[str] = set()
+            for filepath in sorted(self.content_dir.rglob("*.md")) if self.content_dir.exists() else []:
+                path = str(filepath)
+                present.add(path)
+                try:
+                    stat = filepath.stat()
+                    if known.get(path) == (stat.st_mtime, stat.st_size):
+                        continue
+                    body = post_text(filepath.read_text(encoding="utf-8"))
+                except OSError as e:
+                    console.print(f"[yellow]Warning: Could not index {filepath}: {e}[/yellow]")
+                    continue
+                self._add(path, body, stat.st_mtime, stat.st_size, replace=path in known, sign=sign)
+                counts["updated" if path in known else "added"] += 1
+            for path in set(known) - present:
+                self._remove(path)
+                counts["removed"] += 1
+            self._conn.commit()
+            if self._needs_rebuild():
+                self.rebuild()
+            self._synced = True
+        return counts
+
+    def find_duplicates(self, text: str, exclude: Optional[str] = None) -> List[Duplicate]:
+        """Find indexed posts that are near-duplicates of a document.
+
+        The index is synced with content_dir on the first query. The query is
+        signed against the same IDF snapshot as the indexed posts.
+
+        Args:
+            text: Post body or outline
+            exclude: Path to ignore, e.g. the file being overwritten
+
+        Returns:
+            Matching posts, most similar first
+        """
+        if not self.enabled:
+            return []
+        if not self._synced:
+            self.sync()
+        counts = Counter(tokenize(text))
+        with self._lock:
+            signature = minhash(self._topic_terms(counts))
+            keys = band_keys(signature)
+            placeholders = ",".join("?" * len(keys))
+            rows = self._conn.execute(
+                f"SELECT path, signature FROM documents WHERE path IN "
+                f"(SELECT path FROM buckets WHERE key IN ({placeholders}))",
+                keys
+            ).fetchall()
+        matches = []
+        for path, blob in rows:
+            if path == exclude:
+                continue
+            score = similarity(signature, array("I", blob).tolist())
+            if score >= self.threshold:
+                matches.append(Duplicate(path, round(score, 3)))
+        return sorted(matches, key=lambda match: -match.similarity)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """CLI entry point: sync the index and report near-duplicate posts."""
+    import argparse
+    import os
+
+    parser = argparse.ArgumentParser(description="Find near-duplicate posts under content/")
+    parser.add_argument("--content-dir", type=Path, default=Path("content"))
+    parser.add_argument("--index", type=Path, default=Path(os.getenv("PIPELINE_CACHE_DIR", ".cache")) / "duplicates.sqlite3")
+    parser.add_argument("--threshold", type=float, default=float(os.getenv("DEDUP_THRESHOLD", str(DEFAULT_THRESHOLD))))
+    parser.add_argument("--rebuild", action="store_true",
+                        help="Retake the document-frequency snapshot and re-sign every post")
+    args = parser.parse_args(argv)
+
+    index = DuplicateIndex(args.index, args.content_dir, threshold=args.threshold)
+    counts = index.sync()
+    if args.rebuild:
+        changed = index.rebuild()
+        console.print(f"[blue]Rebuilt the snapshot over {index.count()} posts ({changed} signatures changed)[/blue]")
+    console.print(
+        f"[blue]Indexed {index.count()} posts ({counts['added']} added, "
+        f"{counts['updated']} updated, {counts['removed']} removed)[/blue]"
+    )
+    reported = set()
+    for filepath in sorted(args.content_dir.rglob("*.md")):
+        body = post_text(filepath.read_text(encoding="utf-8"))
+        for match in index.find_duplicates(body, exclude=str(filepath)):
+            pair = tuple(sorted((str(filepath), match.path)))
+            if pair not in reported:
+                reported.add(pair)
+                console.print(f"[yellow]{pair[0]} ~ {pair[1]} ({match.similarity:.2f})[/yellow]")
+    if not reported:
+        console.print("[green]No near-duplicate posts found[/green]")
+    index.close()
+
+
+if __name__ == "__main__":
+    main()
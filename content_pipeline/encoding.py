@@ -0,0 +1,197 @@
+"""
+Image Encoding
+
+Size-targeted JPEG encoding: predicts a starting quality from the image's
+edge energy, then bisects on quality (narrowing the interval with the sizes
+it measures) until the best quality under the byte budget is found, usually
+in one to three encodes.
+"""
+
+import math
+from dataclasses import dataclass
+from io import BytesIO
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+from .lazy import lazy_import
+
+if TYPE_CHECKING:
+    from PIL import Image, ImageFilter, ImageStat
+else:
+    Image = lazy_import("PIL.Image")
+    ImageFilter = lazy_import("PIL.ImageFilter")
+    ImageStat = lazy_import("PIL.ImageStat")
+
+# Typical JPEG size at each quality relative to quality 85
+QUALITY_CURVE = ((30, 0.35), (40, 0.45), (50, 0.55), (60, 0.65), (70, 0.75), (80, 0.88), (85, 1.0), (90, 1.25), (95, 1.7))
+
+# Bytes per pixel at quality 85: a flat image plus a term per unit of mean edge strength
+BASE_BYTES_PER_PIXEL = 0.054
+EDGE_BYTES_PER_PIXEL = 0.0068
+
+# Aim a little under the budget so the first guess usually fits
+PREDICTION_MARGIN = 0.9
+
+
+@dataclass
+class EncodedImage:
+    """Result of a size-targeted encode."""
+    buffer: BytesIO
+    quality: int
+    encodes: int
+    fits: bool
+
+    @property
+    def size(self) -> int:
+        """Encoded size in bytes."""
+        return self.buffer.getbuffer().nbytes
+
+    def write(self, path) -> None:
+        """Write the encoded bytes to a file without copying the buffer.
+
+        Args:
+            path: Output file path
+        """
+        with open(path, 'wb') as f:
+            f.write(self.buffer.getbuffer())
+
+
+def _relative_size(quality: float) -> float:
+    """Interpolate QUALITY_CURVE at a quality."""
+    points = QUALITY_CURVE
+    if quality <= points[0][0]:
+        return points[0][1]
+    for (q0, r0), (q1, r1) in zip(points, points[1:]):
+        if quality <= q1:
+            return r0 + (r1 - r0) * (quality - q0) / (q1 - q0)
+    return points[-1][1]
+
+
+def edge_energy(image: "Image.Image") -> float:
+    """Measure how much fine detail an image has.
+
+    Args:
+        image: Image to measure
+
+    Returns:
+        Mean edge-filter response of the grayscale image (0-255)
+    """
+    return ImageStat.Stat(image.convert("L").filter(ImageFilter.FIND_EDGES)).mean[0]
+
+
+def _best_quality(estimate_85: float, max_bytes: float, low: int, high: int) -> int:
+    """Highest quality in [low, high] whose estimated size fits the budget."""
+    for quality in range(high, low - 1, -1):
+        if estimate_85 * _relative_size(quality) <= max_bytes:
+            return quality
+    return low
+
+
+def _interpolate(samples: List[Tuple[int, int]], max_bytes: int) -> float:
+    """Quality at which the budget is crossed, from the closest samples on each side.
+
+    Interpolates log(size) linearly in quality, which tracks JPEG size far
+    better than QUALITY_CURVE once the image's own sizes are known.
+    """
+    over = min((sample for sample in samples if sample[1] > max_bytes), default=None)
+    under = max((sample for sample in samples if sample[1] <= max_bytes), default=None)
+    if over is None or under is None:
+        raise ValueError("samples do not bracket the byte budget")
+    (q0, s0), (q1, s1) = under, over
+    if q1 == q0:
+        return q0
+    fraction = (math.log(max_bytes) - math.log(s0)) / (math.log(s1) - math.log(s0))
+    return q0 + fraction * (q1 - q0)
+
+
+def predict_quality(image: "Image.Image", max_bytes: int, min_quality: int = 30, max_quality: int = 85) -> int:
+    """Predict the highest JPEG quality that fits a byte budget.
+
+    Args:
+        image: Image to encode
+        max_bytes: Byte budget
+        min_quality: Lowest quality to consider
+        max_quality: Highest quality to consider
+
+    Returns:
+        Predicted quality
+    """
+    pixels = image.width * image.height
+    estimate_85 = pixels * (BASE_BYTES_PER_PIXEL + EDGE_BYTES_PER_PIXEL * edge_energy(image))
+    return _best_quality(estimate_85, max_bytes * PREDICTION_MARGIN, min_quality, max_quality)
+
+
+def _encode(image: "Image.Image", quality: int) -> BytesIO:
+    """Encode an image as an optimized JPEG into a new buffer."""
+    buffer = BytesIO()
+    image.save(buffer, format='JPEG', quality=quality, optimize=True)
+    return buffer
+
+
+def encode_jpeg(
+    image: "Image.Image",
+    max_bytes: int,
+    min_quality: int = 30,
+    max_quality: int = 85,
+    tolerance: int = 5,
+    max_encodes: int = 4
+) -> EncodedImage:
+    """Encode an image at the highest JPEG quality that fits a byte budget.
+
+    Starts at the predicted quality, then bisects between the best quality
+    known to fit and the lowest known not to, probing where the measured
+    sizes say the budget is crossed. Stops once the next probe would gain
+    less than ``tolerance`` quality points.
+
+    Args:
+        image: RGB image
+        max_bytes: Byte budget
+        min_quality: Lowest acceptable quality
+        max_quality: Highest quality to use
+        tolerance: Quality points the result may be below the optimum
+        max_encodes: Upper bound on encodes
+
+    Returns:
+        The best encode found; ``fits`` is False if even ``min_quality`` is
+        over budget
+    """
+    low, high = min_quality, max_quality
+    quality = predict_quality(image, max_bytes, min_quality, max_quality)
+    best: Optional[Tuple[int, BytesIO]] = None
+    smallest: Optional[Tuple[int, BytesIO]] = None
+    samples: List[Tuple[int, int]] = []
+    encodes = 0
+
+    while True:
+        buffer = _encode(image, quality)
+        encodes += 1
+        size = buffer.getbuffer().nbytes
+        samples.append((quality, size))
+        if size <= max_bytes:
+            best = (quality, buffer)
+            low = quality
+        else:
+            high = quality - 1
+            if smallest is None or quality < smallest[0]:
+                smallest = (quality, buffer)
+
+        if best is None and quality <= min_quality:
+            break
+        if encodes >= max_encodes:
+            break
+
+        # Re-estimate from the measured sizes, then keep the probe inside the interval
+        if best is not None and smallest is not None:
+            guess = int(_interpolate(samples, max_bytes)) - 1  # Err on the side that fits
+        else:
+            guess = _best_quality(size / _relative_size(quality), max_bytes, low, high)
+        if best is not None and min(guess, high) - best[0] < tolerance:
+            break  # Not worth another encode
+        floor = low + 1 if best is not None else low
+        quality = min(high, max(floor, guess))
+        if best is None and encodes == max_encodes - 1:
+            quality = min_quality  # Last try: make sure something fits if anything can
+
+    if best is not None:
+        return EncodedImage(best[1], best[0], encodes, True)
+    assert smallest is not None  # Every encode either fits or is over budget
+    return EncodedImage(smallest[1], smallest[0], encodes, False)
@@ -0,0 +1,407 @@
+"""
+Source Enrichment
+
+Fetches the articles behind the top trending topics in parallel, streams
+each page through a bounded HTML text extractor and condenses the result
+into a token-budgeted digest for the outline prompt.
+"""
+
+import codecs
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from rich.console import Console
+
+from .lazy import lazy_import
+from .telemetry import telemetry
+
+requests = lazy_import("requests")
+
+console = Console()
+
+# Elements whose text is never article content
+SKIP_TAGS = frozenset((
+    "script", "style", "noscript", "svg", "nav", "header", "footer", "aside",
+    "form", "button", "iframe", "template", "figure",
+))
+
+# Elements whose text forms one paragraph of the extracted article
+BLOCK_TAGS = frozenset(("p", "h1", "h2", "h3", "h4", "li", "blockquote", "pre", "dd"))
+
+# Elements that mark the main content when a page has them
+MAIN_TAGS = frozenset(("article", "main"))
+
+# Paragraphs shorter than this are usually bylines, captions or buttons
+MIN_PARAGRAPH_CHARS = 40
+
+CHARSET_PATTERN = re.compile(r"charset=[\"']?([\w.:-]+)", re.IGNORECASE)
+SENTENCE_PATTERN = re.compile(r"(?<=[.!?])\s+")
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Prompt tokens are estimated at four characters each, as for rate limiting
+CHARS_PER_TOKEN = 4
+
+
+class TextExtractor(HTMLParser):
+    """Incremental extractor of an HTML page's main text.
+
+    Fed chunk by chunk as the page downloads; ``done`` turns true once
+    ``max_chars`` of paragraph text have been collected so the caller can
+    stop reading.
+    """
+
+    def __init__(self, max_chars: int = 4000):
+        """Initialize the extractor.
+
+        Args:
+            max_chars: Characters of paragraph text to collect before stopping
+        """
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.description = ""
+        self._skip = 0
+        self._main = 0
+        self._block: List[str] = []
+        self._paragraphs: List[str] = []
+        self._main_paragraphs: List[str] = []
+        self._chars = 0
+
+    @property
+    def done(self) -> bool:
+        """Whether enough text has been collected."""
+        return self._chars >= self.max_chars
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self._skip += 1
+        elif tag in MAIN_TAGS:
+            self._main += 1
+        elif tag in BLOCK_TAGS:
+            self._flush()
+        elif tag == "meta" and not self.description:
+            values = dict(attrs)
+            if (values.get("name") or values.get("property") or "").lower() in ("description", "og:description"):
+                self.description = " ".join((values.get("content") or "").split())
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            self._skip = max(0, self._skip - 1)
+        elif tag in MAIN_TAGS:
+            self._flush()
+            self._main = max(0, self._main - 1)
+        elif tag in BLOCK_TAGS:
+            self._flush()
+
+    def handle_data(self, data):
+        if not self._skip and not self.done:
+            self._block.append(data)
+
+    def _flush(self) -> None:
+        """Close the current paragraph."""
+        text = " ".join("".join(self._block).split())
+        self._block = []
+        if len(text) < MIN_PARAGRAPH_CHARS:
+            return
+        self._paragraphs.append(text)
+        self._chars += len(text)
+        if self._main:
+            self._main_paragraphs.append(text)
+
+    def text(self) -> str:
+        """Get the extracted text.
+
+        Returns:
+            Paragraphs inside <article>/<main> if the page has enough of them,
+            otherwise all paragraphs, falling back to the meta description
+        """
+        self._flush()
+        paragraphs = self._main_paragraphs
+        if sum(map(len, paragraphs)) < MIN_PARAGRAPH_CHARS * 5:
+            paragraphs = self._paragraphs
+        text = "\n\n".join(paragraphs) or self.description
+        return text[:self.max_chars]
+
+
+def extract_text(html: str, max_chars: int = 4000) -> str:
+    """Extract the main text of an HTML page.
+
+    Args:
+        html: Page source
+        max_chars: Maximum characters returned
+
+    Returns:
+        Article text
+    """
+    extractor = TextExtractor(max_chars)
+    extractor.feed(html)
+    extractor.close()
+    return extractor.text()
+
+
+class ArticleCache:
+    """SQLite cache of extracted article text by URL."""
+
+    def __init__(self, path: Optional[Path] = None, ttl: float = 7 * 24 * 60 * 60):
+        """Initialize the cache.
+
+        Args:
+            path: SQLite database file
+            ttl: Maximum age of an entry in seconds
+        """
+        self.path = path or Path(".cache/articles.sqlite3")
+        self.ttl = ttl
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS articles ("
+            "url TEXT PRIMARY KEY, text TEXT NOT NULL, fetched_at REAL NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        self._conn.execute("DELETE FROM articles WHERE fetched_at < ?", (time.time() - self.ttl,))
+        self._conn.commit()
+
+    def get(self, url: str) -> Optional[str]:
+        """Get the cached text of an article.
+
+        Args:
+            url: Article URL
+
+        Returns:
+            Extracted text, or None if missing or expired
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT text FROM articles WHERE url = ? AND fetched_at >= ?",
+                (url, time.time() - self.ttl)
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, url: str, text: str) -> None:
+        """Store the extracted text of an article.
+
+        Args:
+            url: Article URL
+            text: Extracted text (empty for pages without usable text)
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO articles (url, text, fetched_at) VALUES (?, ?, ?)",
+                (url, text, time.time())
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def _terms(text: str) -> set:
+    """Lowercase word set of a text."""
+    return set(WORD_PATTERN.findall(text.lower()))
+
+
+def digest(keyword: str, sources: List[Dict[str, str]], token_budget: int = 600) -> str:
+    """Condense enriched sources into a prompt-sized digest.
+
+    Each source gets an equal share of the budget, filled with its sentences
+    that mention the keyword first and kept in their original order.
+
+    Args:
+        keyword: Topic keyword
+        sources: Topics with a ``text`` field
+        token_budget: Approximate prompt tokens the digest may use
+
+    Returns:
+        One Markdown bullet per source, or an empty string
+    """
+    sources = [source for source in sources if source.get("text")]
+    if not sources:
+        return ""
+    budget = token_budget * CHARS_PER_TOKEN
+    share = budget // len(sources)
+    terms = _terms(keyword)
+    lines = []
+    for source in sources:
+        header = f"- {source.get('title') or 'Untitled'} ({source.get('source') or 'unknown source'}): "
+        sentences = [s for s in SENTENCE_PATTERN.split(" ".join(source["text"].split())) if s]
+        ranked = sorted(range(len(sentences)), key=lambda i: -len(terms & _terms(sentences[i])))
+        chosen, used = set(), len(header)
+        for i in ranked:
+            if used + len(sentences[i]) + 1 > share:
+                continue
+            chosen.add(i)
+            used += len(sentences[i]) + 1
+        if not chosen and sentences:
+            # Even the first sentence is too long: use the start of it
+            sentences[0] = sentences[0][:max(0, share - len(header))]
+            chosen.add(0)
+        lines.append(header + " ".join(sentences[i] for i in sorted(chosen)))
+    return "\n".join(lines)[:budget]
+
+
+class SourceEnricher:
+    """Parallel, bounded fetcher of the articles behind trending topics."""
+
+    def __init__(
+        self,
+        session=None,
+        cache: Optional[ArticleCache] = None,
+        max_sources: int = 6,
+        max_workers: int = 8,
+        timeout: float = 4.0,
+        stage_timeout: float = 5.0,
+        max_bytes: int = 512 * 1024,
+        max_chars: int = 4000,
+        token_budget: int = 600,
+        chunk_size: int = 16 * 1024
+    ):
+        """Initialize the enricher.
+
+        Args:
+            session: requests session to reuse (e.g. the feed fetcher's pool)
+            cache: Cache of extracted text by URL
+            max_sources: Articles fetched per keyword
+            max_workers: Articles fetched at once
+            timeout: Per-article connect/read timeout and download deadline in seconds
+            stage_timeout: Wall-time budget of one enrich() call in seconds
+            max_bytes: Bytes read per article before giving up on the rest
+            max_chars: Characters of text extracted per article
+            token_budget: Approximate prompt tokens of the digest
+            chunk_size: Size of the chunks read from each response
+        """
+        self.session = session or requests.Session()
+        self.cache = cache or ArticleCache()
+        self.max_sources = max_sources
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.stage_timeout = stage_timeout
+        self.max_bytes = max_bytes
+        self.max_chars = max_chars
+        self.token_budget = token_budget
+        self.chunk_size = chunk_size
+
+    def fetch_text(self, url: str) -> str:
+        """Get the main text of an article, from the cache when possible.
+
+        The page is streamed through the extractor and reading stops at the
+        byte cap, the download deadline or once enough text was found.
+
+        Args:
+            url: Article URL
+
+        Returns:
+            Extracted text, empty for non-HTML responses
+        """
+        cached = self.cache.get(url)
+        if cached is not None:
+            telemetry.incr("enrich.cache_hits")
+            return cached
+
+        deadline = time.monotonic() + self.timeout
+        response = self.session.get(
+            url, timeout=self.timeout, stream=True,
+            headers={"Accept": "text/html,application/xhtml+xml"}
+        )
+        try:
+            response.raise_for_status()
+            content_type = response.headers.get("Content-Type", "")
+            if content_type and "html" not in content_type.lower():
+                text = ""
+            else:
+                match = CHARSET_PATTERN.search(content_type)
+                try:
+                    decoder = codecs.getincrementaldecoder(match.group(1) if match else "utf-8")(errors="replace")
+                except LookupError:
+                    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+                extractor = TextExtractor(self.max_chars)
+                read = 0
+                for chunk in response.iter_content(chunk_size=self.chunk_size):
+                    read += len(chunk)
+                    extractor.feed(decoder.decode(chunk))
+                    if extractor.done or read >= self.max_bytes or time.monotonic() > deadline:
+                        break
+                extractor.close()
+                text = extractor.text()
+        finally:
+            response.close()
+
+        self.cache.put(url, text)
+        return text
+
+    def enrich(self, topics: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """Fetch the articles of several topics concurrently.
+
+        Articles that fail or have not finished within ``stage_timeout`` are
+        left out.
+
+        Args:
+            topics: Topics with a ``link`` field
+
+        Returns:
+            Copies of the topics whose article yielded text, with a ``text`` field
+        """
+        candidates: Dict[str, Dict[str, str]] = {}
+        for topic in topics:
+            link = topic.get("link") or ""
+            if link.startswith(("http://", "https://")) and link not in candidates:
+                candidates[link] = topic
+            if len(candidates) >= self.max_sources:
+                break
+        if not candidates:
+            return []
+
+        texts: Dict[str, str] = {}
+        pool = ThreadPoolExecutor(max_workers=min(self.max_workers, len(candidates)))
+        futures = {pool.submit(self.fetch_text, link): link for link in candidates}
+        try:
+            for future in as_completed(futures, timeout=self.stage_timeout):
+                link = futures[future]
+                try:
+                    texts[link] = future.result()
+                except Exception as e:
+                    telemetry.incr("enrich.errors")
+                    console.print(f"[yellow]Warning: Could not fetch {link}: {e}[/yellow]")
+        except FuturesTimeoutError:
+            pending = [link for future, link in futures.items() if not future.done()]
+            telemetry.incr("enrich.timeouts", len(pending))
+            console.print(f"[yellow]Source enrichment timed out, skipping {len(pending)} articles[/yellow]")
+        finally:
+            # Stragglers stop on their own download deadline
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        return [dict(topic, text=texts[link]) for link, topic in candidates.items() if texts.get(link)]
+
+    def digest_for(self, keyword: str, topics: List[Dict[str, str]]) -> str:
+        """Build the source digest of a keyword.
+
+        Only topics whose headline or description shares a word with the
+        keyword are fetched, the most overlapping first.
+
+        Args:
+            keyword: Topic keyword
+            topics: Topics of the current run
+
+        Returns:
+            Digest for the outline prompt, empty if no source had usable text
+        """
+        terms = _terms(keyword)
+        scored = [
+            (len(terms & _terms(f"{topic.get('title', '')} {topic.get('description', '')}")), index, topic)
+            for index, topic in enumerate(topics)
+        ]
+        relevant = [topic for score, _, topic in sorted(scored, key=lambda item: (-item[0], item[1])) if score]
+        return digest(keyword, self.enrich(relevant), self.token_budget)
+
+    def close(self) -> None:
+        """Close the article cache."""
+        self.cache.close()
@@ -0,0 +1,501 @@
+"""
+Feed Fetcher
+
+Fetches RSS feeds concurrently and caches them with conditional GET requests.
+Each source has its own timeout and size cap, and a health registry puts
+failing or slow sources on an exponential cool-down.
+"""
+
+import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+
+from rich.console import Console
+from rich.progress import track
+
+from .lazy import lazy_import
+from .telemetry import telemetry
+
+if TYPE_CHECKING:
+    import feedparser
+    import requests
+else:
+    feedparser = lazy_import("feedparser")
+    requests = lazy_import("requests")
+
+console = Console()
+
+# Closing tags of RSS items and Atom entries, used to stop reading early
+ENTRY_END_PATTERN = re.compile(rb"</(?:item|entry)\s*>", re.IGNORECASE)
+
+
+class FeedTimeoutError(Exception):
+    """Raised when a feed does not finish downloading within its timeout."""
+
+
+@dataclass
+class FeedSource:
+    """Fetch limits for a single feed source."""
+    url: str
+    timeout: float = 10.0
+    max_bytes: int = 2 * 1024 * 1024
+    max_entries: int = 5
+    slow_threshold: float = 5.0
+
+
+@dataclass
+class FeedHealth:
+    """Latency and failure history for a single feed source."""
+    latencies: List[float] = field(default_factory=list)
+    fetches: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    cooldown_until: float = 0.0
+    last_error: Optional[str] = None
+
+    @property
+    def average_latency(self) -> Optional[float]:
+        """Average latency over the recorded history."""
+        if not self.latencies:
+            return None
+        return sum(self.latencies) / len(self.latencies)
+
+
+class FeedRegistry:
+    """Registry of feed sources with a health-based circuit breaker."""
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        sources: Iterable[FeedSource] = (),
+        defaults: Optional[FeedSource] = None,
+        failure_threshold: int = 2,
+        base_cooldown: float = 15 * 60,
+        max_cooldown: float = 24 * 60 * 60,
+        history_size: int = 20
+    ):
+        """Initialize the feed registry.
+
+        Args:
+            path: JSON file used to persist feed health
+            sources: Sources with custom fetch limits
+            defaults: Limits applied to sources that are not registered
+            failure_threshold: Consecutive failures before a source cools down
+            base_cooldown: First cool-down period in seconds
+            max_cooldown: Upper bound for the cool-down period in seconds
+            history_size: Number of latency samples kept per source
+        """
+        self.path = path or Path(".cache/feed_health.json")
+        self.defaults = defaults or FeedSource(url="")
+        self.failure_threshold = max(1, failure_threshold)
+        self.base_cooldown = base_cooldown
+        self.max_cooldown = max_cooldown
+        self.history_size = history_size
+        self._lock = threading.Lock()
+        self._sources: Dict[str, FeedSource] = {}
+        self._health = self._load()
+
+        for source in sources:
+            self.register(source)
+
+    def _load(self) -> Dict[str, FeedHealth]:
+        """Load feed health from disk.
+
+        Returns:
+            Mapping of feed URL to health history
+        """
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return {url: FeedHealth(**data) for url, data in json.load(f).items()}
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            console.print(f"[yellow]Warning: Ignoring unreadable feed health {self.path}: {e}[/yellow]")
+            return {}
+
+    def register(self, source: FeedSource) -> None:
+        """Register a source with custom fetch limits.
+
+        Args:
+            source: Feed source configuration
+        """
+        with self._lock:
+            self._sources[source.url] = source
+
+    def source(self, url: str) -> FeedSource:
+        """Get the fetch limits for a feed URL.
+
+        Args:
+            url: Feed URL
+
+        Returns:
+            Registered source, or the defaults applied to the URL
+        """
+        with self._lock:
+            registered = self._sources.get(url)
+        if registered:
+            return registered
+        return FeedSource(**{**asdict(self.defaults), "url": url})
+
+    def health(self, url: str) -> FeedHealth:
+        """Get the health history for a feed URL.
+
+        Args:
+            url: Feed URL
+
+        Returns:
+            Health history (empty for unknown sources)
+        """
+        with self._lock:
+            return self._health.setdefault(url, FeedHealth())
+
+    def is_available(self, url: str, now: Optional[float] = None) -> bool:
+        """Check whether a source is outside its cool-down period.
+
+        Args:
+            url: Feed URL
+            now: Current Unix time (defaults to time.time())
+
+        Returns:
+            True if the source may be fetched
+        """
+        now = time.time() if now is None else now
+        return self.health(url).cooldown_until <= now
+
+    def record_success(self, url: str, latency: float) -> None:
+        """Record a successful fetch.
+
+        Slow responses count as a strike so persistently slow sources
+        cool down like failing ones.
+
+        Args:
+            url: Feed URL
+            latency: Fetch duration in seconds
+        """
+        if latency > self.source(url).slow_threshold:
+            self._record(url, latency, f"slow response ({latency:.1f}s)")
+        else:
+            self._record(url, latency, None)
+
+    def record_failure(self, url: str, latency: float, error: Exception) -> None:
+        """Record a failed fetch.
+
+        Args:
+            url: Feed URL
+            latency: Time spent before the failure in seconds
+            error: The error raised while fetching
+        """
+        self._record(url, latency, str(error) or error.__class__.__name__)
+
+    def _record(self, url: str, latency: float, error: Optional[str]) -> None:
+        """Update the health history and cool-down of a source."""
+        health = self.health(url)
+        with self._lock:
+            health.fetches += 1
+            health.latencies = (health.latencies + [round(latency, 3)])[-self.history_size:]
+
+            if error is None:
+                health.consecutive_failures = 0
+                health.cooldown_until = 0.0
+                return
+
+            health.failures += 1
+            health.consecutive_failures += 1
+            health.last_error = error
+
+            strikes = health.consecutive_failures - self.failure_threshold
+            if strikes >= 0:
+                cooldown = min(self.base_cooldown * (2 ** strikes), self.max_cooldown)
+                health.cooldown_until = time.time() + cooldown
+
+    def save(self) -> None:
+        """Write feed health to disk atomically."""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with self._lock:
+                data = {url: asdict(health) for url, health in self._health.items()}
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            tmp_path.replace(self.path)
+        except Exception as e:
+            console.print(f"[yellow]Warning: Could not save feed health: {e}[/yellow]")
+
+
+class FeedCache:
+    """Persistent ETag/Last-Modified cache for RSS feeds."""
+
+    def __init__(self, path: Optional[Path] = None):
+        """Initialize the feed cache.
+
+        Args:
+            path: JSON file used to persist the cache
+        """
+        self.path = path or Path(".cache/feeds.json")
+        self._lock = threading.Lock()
+        self._feeds = self._load()
+
+    def _load(self) -> Dict[str, dict]:
+        """Load cached feed state from disk.
+
+        Returns:
+            Mapping of feed URL to cached validators and topics
+        """
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            console.print(f"[yellow]Warning: Ignoring unreadable feed cache {self.path}: {e}[/yellow]")
+            return {}
+
+    def get(self, url: str) -> Optional[dict]:
+        """Get cached state for a feed URL.
+
+        Args:
+            url: Feed URL
+
+        Returns:
+            Cached entry with etag, modified and topics, or None
+        """
+        with self._lock:
+            return self._feeds.get(url)
+
+    def put(self, url: str, etag: Optional[str], modified: Optional[str], topics: List[Dict[str, str]]) -> None:
+        """Store the validators and parsed topics for a feed URL.
+
+        Args:
+            url: Feed URL
+            etag: ETag response header
+            modified: Last-Modified response header
+            topics: Topics parsed from the feed
+        """
+        with self._lock:
+            self._feeds[url] = {
+                "etag": etag,
+                "modified": modified,
+                "topics": topics,
+                "fetched_at": datetime.now(timezone.utc).isoformat()
+            }
+
+    def save(self) -> None:
+        """Write the cache to disk atomically."""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with self._lock:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(self._feeds, f)
+            tmp_path.replace(self.path)
+        except Exception as e:
+            console.print(f"[yellow]Warning: Could not save feed cache: {e}[/yellow]")
+
+
+class FeedFetcher:
+    """Concurrent RSS fetcher with conditional GET support."""
+
+    def __init__(
+        self,
+        cache: Optional[FeedCache] = None,
+        registry: Optional[FeedRegistry] = None,
+        max_workers: int = 16,
+        stage_timeout: Optional[float] = None,
+        chunk_size: int = 16 * 1024
+    ):
+        """Initialize the feed fetcher.
+
+        Args:
+            cache: Feed cache for ETag/Last-Modified validators
+            registry: Feed source registry with limits and health history
+            max_workers: Maximum number of feeds fetched at once
+            stage_timeout: Overall time budget for a fetch() call in seconds
+            chunk_size: Size of the chunks read from each response
+        """
+        self.cache = cache or FeedCache()
+        self.registry = registry or FeedRegistry()
+        self.max_workers = max(1, max_workers)
+        self.stage_timeout = stage_timeout
+        self.chunk_size = chunk_size
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def fetch(self, feed_urls: List[str]) -> List[Dict[str, str]]:
+        """Fetch topics from all available feeds concurrently.
+
+        Sources in cool-down are skipped. If ``stage_timeout`` is set,
+        feeds that have not finished by then are abandoned.
+
+        Args:
+            feed_urls: List of RSS feed URLs
+
+        Returns:
+            Topics from all feeds, in feed order
+        """
+        available = [url for url in feed_urls if self.registry.is_available(url)]
+        for url in feed_urls:
+            if url not in available:
+                health = self.registry.health(url)
+                console.print(
+                    f"[yellow]Skipping {url} (cooling down after "
+                    f"{health.consecutive_failures} failures: {health.last_error})[/yellow]"
+                )
+
+        if not available:
+            return []
+
+        results = {}
+        pool = ThreadPoolExecutor(max_workers=min(self.max_workers, len(available)))
+        futures = {pool.submit(self.fetch_feed, url): url for url in available}
+        try:
+            for future in track(
+                as_completed(futures, timeout=self.stage_timeout),
+                total=len(futures),
+                description="Fetching RSS feeds..."
+            ):
+                feed_url = futures[future]
+                try:
+                    results[feed_url] = future.result()
+                except Exception as e:
+                    console.print(f"[red]Error fetching {feed_url}: {e}[/red]")
+        except FuturesTimeoutError:
+            pending = [url for future, url in futures.items() if not future.done()]
+            console.print(f"[yellow]Feed stage timed out, abandoning: {', '.join(pending)}[/yellow]")
+        finally:
+            # Stragglers stop on their own per-source deadline
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        self.cache.save()
+        self.registry.save()
+
+        # Keep the configured feed order regardless of completion order
+        return [topic for url in feed_urls for topic in results.get(url, [])]
+
+    def fetch_feed(self, feed_url: str) -> List[Dict[str, str]]:
+        """Fetch a single feed, reusing cached entries when it is unchanged.
+
+        Args:
+            feed_url: RSS feed URL
+
+        Returns:
+            Topics parsed from the feed
+        """
+        source = self.registry.source(feed_url)
+        started = time.monotonic()
+        try:
+            with telemetry.span("feeds.fetch", url=feed_url):
+                topics = self._fetch_source(source)
+        except Exception as e:
+            self.registry.record_failure(feed_url, time.monotonic() - started, e)
+            raise
+        self.registry.record_success(feed_url, time.monotonic() - started)
+        return topics
+
+    def _fetch_source(self, source: FeedSource) -> List[Dict[str, str]]:
+        """Download and parse a feed within the source's limits.
+
+        Args:
+            source: Feed source with timeout and size limits
+
+        Returns:
+            Topics parsed from the feed
+        """
+        cached = self.cache.get(source.url)
+        headers = {}
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("modified"):
+                headers["If-Modified-Since"] = cached["modified"]
+
+        response = self.session.get(
+            source.url, headers=headers, timeout=source.timeout, stream=True
+        )
+        try:
+            if response.status_code == 304 and cached:
+                telemetry.incr("feeds.not_modified")
+                return cached["topics"]
+
+            response.raise_for_status()
+            data = self._read_entries(response, source)
+        finally:
+            response.close()
+
+        topics = self.parse_topics(data, source.max_entries)
+        self.cache.put(
+            source.url,
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+            topics
+        )
+        return topics
+
+    def _read_entries(self, response: "requests.Response", source: FeedSource) -> bytes:
+        """Read a feed body until enough entries, the byte cap or the deadline.
+
+        Args:
+            response: Streaming HTTP response
+            source: Feed source with timeout and size limits
+
+        Returns:
+            Feed document, possibly truncated after the last needed entry
+        """
+        deadline = time.monotonic() + source.timeout
+        buffer = bytearray()
+        entries_seen = 0
+        counted_end = 0
+
+        for chunk in response.iter_content(chunk_size=self.chunk_size):
+            if time.monotonic() > deadline:
+                raise FeedTimeoutError(f"timed out after {source.timeout:.0f}s")
+
+            # Rescan a small overlap so tags split across chunks are found,
+            # but never past the end of a tag that was already counted
+            scan_from = max(counted_end, len(buffer) - 16)
+            buffer.extend(chunk)
+            for match in ENTRY_END_PATTERN.finditer(buffer, scan_from):
+                entries_seen += 1
+                counted_end = match.end()
+                if entries_seen >= source.max_entries:
+                    return bytes(buffer[:match.end()])
+
+            if len(buffer) >= source.max_bytes:
+                console.print(
+                    f"[yellow]Warning: {source.url} exceeded {source.max_bytes:,} bytes, "
+                    f"truncating[/yellow]"
+                )
+                return bytes(buffer[:source.max_bytes])
+
+        return bytes(buffer)
+
+    def parse_topics(self, data: bytes, max_entries: int = 5) -> List[Dict[str, str]]:
+        """Parse a feed document into topic dictionaries.
+
+        Args:
+            data: Raw (possibly truncated) feed document
+            max_entries: Number of entries kept
+
+        Returns:
+            Topics with title, description, link, published and source
+        """
+        feed = feedparser.parse(data)
+        source = feed.get('feed', {}).get('title', 'Unknown')
+
+        topics = []
+        for entry in feed.get('entries', [])[:max_entries]:
+            topics.append({
+                "title": entry.get('title', ''),
+                "description": entry.get('description', ''),
+                "link": entry.get('link', ''),
+                "published": entry.get('published', ''),
+                "source": source
+            })
+        return topics
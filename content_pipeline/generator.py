@@ -6,23 +6,48 @@ Fetches RSS headlines, selects topics, and generates AI-powered blog content.
 
 import os
 import re
-import yaml
 import json
 import hashlib
+import functools
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from contextlib import closing, nullcontext
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
+from io import StringIO
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, TypeVar
+from dataclasses import dataclass, field
 from pathlib import Path
 
-import feedparser
-import openai
-import requests
-from bs4 import BeautifulSoup
 from rich.console import Console
-from rich.progress import track
+
+from .api_client import RateLimitedClient
+from .checkpoint import CheckpointStore, JobCheckpoint, RunCheckpoint
+from .dedup import DEFAULT_THRESHOLD, Duplicate, DuplicateIndex, DuplicatePostError
+from .enrichment import ArticleCache, SourceEnricher
+from .feeds import FeedCache, FeedFetcher, FeedRegistry, FeedSource
+from .image_store import DEFAULT_MAX_DISTANCE, ImageStore
+from .images import ImageGenerator
+from .keywords import KeywordScorer
+from .lazy import lazy_import
+from .llm_cache import ResponseCache
+from .manifest import ContentManifest
+from .prompts import ARTICLE, OUTLINE, SEO, SOURCES_SECTION, STRUCTURED_ARTICLE
+from .routing import ModelRouter
+from .seen import SeenIndex, covered_topics
+from .telemetry import instrumented, telemetry
+from .trends import TrendStore
+from .variants import VariantBuilder
+
+openai = lazy_import("openai")
+yaml = lazy_import("yaml")
 
 console = Console()
 
+# SEO fields every post needs, shared by the SEO prompt and the structured schema
+SEO_FIELDS = ("title", "slug", "meta_description", "tweets", "tags", "category", "summary")
+SLUG_PATTERN = re.compile(r"^[a-z0-9]+(?:-[a-z0-9]+)*$")
+
+T = TypeVar("T")
+
 
 @dataclass
 class BlogPost:
@@ -35,28 +60,83 @@ class BlogPost:
     category: str
     tags: List[str]
     cover_image: Optional[str] = None
-    tweets: List[str] = None
-    date: datetime = None
-
-    def __post_init__(self):
-        if self.date is None:
-            self.date = datetime.now(timezone.utc)
-        if self.tweets is None:
-            self.tweets = []
+    cover_srcsets: Dict[str, str] = field(default_factory=dict)
+    tweets: List[str] = field(default_factory=list)
+    date: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
 
 
 class ContentGenerator:
     """AI-powered content generator for blog posts."""
 
-    def __init__(self, api_key: str, feed_sources: List[str]):
+    def __init__(
+        self,
+        api_key: str,
+        feed_sources: List[str],
+        cache_dir: Optional[Path] = None,
+        max_feed_workers: int = 16,
+        feed_fetcher: Optional[FeedFetcher] = None,
+        response_cache: Optional[ResponseCache] = None,
+        api_client: Optional[RateLimitedClient] = None,
+        allow_fallback: bool = False,
+        image_generator: Optional[ImageGenerator] = None,
+        checkpoints: Optional[CheckpointStore] = None,
+        structured: bool = False,
+        duplicate_index: Optional[DuplicateIndex] = None,
+        manifest: Optional[ContentManifest] = None,
+        enricher: Optional[SourceEnricher] = None,
+        trend_store: Optional[TrendStore] = None,
+        rank_by: str = "frequency",
+        router: Optional[ModelRouter] = None
+    ):
         """Initialize the content generator.
         
         Args:
             api_key: OpenAI API key
             feed_sources: List of RSS feed URLs
+            cache_dir: Directory for persistent pipeline caches
+            max_feed_workers: Maximum number of feeds fetched concurrently
+            feed_fetcher: Preconfigured feed fetcher (overrides max_feed_workers)
+            response_cache: Cache for LLM responses (defaults to one under cache_dir)
+            api_client: Rate-limited OpenAI client shared with other generators
+            allow_fallback: Return canned outline/article/SEO text when the API
+                still fails after retries, instead of raising
+            image_generator: Creates cover images for posts when given
+            checkpoints: Store for per-job stage outputs (defaults to one under cache_dir)
+            structured: Request the article body and SEO metadata in a single
+                JSON-schema response, using the separate calls only as fallback
+            duplicate_index: Near-duplicate index of the posts under content/
+                (defaults to one under cache_dir)
+            manifest: Front matter manifest updated by save_post (defaults to
+                one under cache_dir)
+            enricher: Fetches the source articles of a keyword's topics for
+                the outline prompt when given
+            trend_store: Daily keyword counts updated with every ingest when given
+            rank_by: "frequency" ranks keywords by the current batch only,
+                "trend" by their momentum in the trend store
+            router: Model, token and timeout settings per stage, with
+                latency and failure tracking (defaults to DEFAULT_ROUTES)
         """
-        self.client = openai.OpenAI(api_key=api_key)
+        self.api_client = api_client or RateLimitedClient(api_key)
+        self.allow_fallback = allow_fallback
         self.feed_sources = feed_sources
+        self.cache_dir = cache_dir or Path(".cache")
+        self.feed_fetcher = feed_fetcher or FeedFetcher(
+            cache=FeedCache(self.cache_dir / "feeds.json"),
+            registry=FeedRegistry(self.cache_dir / "feed_health.json"),
+            max_workers=max_feed_workers
+        )
+        self.seen_index = SeenIndex(self.cache_dir / "seen.sqlite3")
+        self.keyword_scorer = KeywordScorer()
+        self.response_cache = response_cache or ResponseCache(self.cache_dir / "llm")
+        self.image_generator = image_generator
+        self.checkpoints = checkpoints or CheckpointStore(self.cache_dir / "checkpoints")
+        self.structured = structured
+        self.duplicate_index = duplicate_index or DuplicateIndex(self.cache_dir / "duplicates.sqlite3")
+        self.manifest = manifest or ContentManifest(self.cache_dir / "manifest.sqlite3")
+        self.enricher = enricher
+        self.trend_store = trend_store
+        self.rank_by = rank_by
+        self.router = router or ModelRouter()
         self.categories = [
             "AI & Machine Learning",
             "Web Development", 
@@ -66,181 +146,302 @@ class ContentGenerator:
             "Data Science"
         ]
 
+    @property
+    def client(self) -> Any:
+        """Underlying OpenAI client."""
+        return self.api_client.client
+
+    @client.setter
+    def client(self, client: Any) -> None:
+        self.api_client.client = client
+
+    @telemetry.timed("feeds")
     def fetch_trending_topics(self) -> List[Dict[str, str]]:
         """Fetch trending topics from RSS feeds.
         
+        Feeds are fetched concurrently with conditional requests, so
+        unchanged feeds are served from the on-disk cache. Each source is
+        bounded by its own timeout and size cap, and failing sources are
+        skipped while they cool down.
+        
         Returns:
             List of trending topics with titles and descriptions
         """
-        topics = []
+        return self.feed_fetcher.fetch(self.feed_sources)
+
+    def rank_topic_keywords(
+        self,
+        topics: List[Dict[str, str]],
+        exclude: Optional[Set[str]] = None,
+        limit: Optional[int] = None
+    ) -> List[Tuple[str, float]]:
+        """Rank candidate keywords across all trending topics.
         
-        for feed_url in track(self.feed_sources, description="Fetching RSS feeds..."):
-            try:
-                feed = feedparser.parse(feed_url)
-                for entry in feed.entries[:5]:  # Top 5 from each feed
-                    topic = {
-                        "title": entry.title,
-                        "description": getattr(entry, 'description', ''),
-                        "link": getattr(entry, 'link', ''),
-                        "published": getattr(entry, 'published', ''),
-                        "source": feed.feed.get('title', 'Unknown')
-                    }
-                    topics.append(topic)
-            except Exception as e:
-                console.print(f"[red]Error fetching {feed_url}: {e}[/red]")
-                continue
+        Args:
+            topics: List of trending topics
+            exclude: Lowercase keywords that must not be selected (e.g. already published)
+            limit: Maximum number of keywords to return
+            
+        With ``rank_by="trend"`` the batch's keywords are reordered by their
+        z-score in the trend store, so a term that spikes today beats one
+        that is always frequent; keywords without enough recent mentions
+        follow in frequency order.
         
-        return topics
+        Returns:
+            List of (keyword, score) tuples, best first
+        """
+        if self.rank_by != "trend" or self.trend_store is None:
+            ranked = self.keyword_scorer.rank(topics, exclude=exclude, limit=limit)
+            return [(score.keyword.title(), score.score) for score in ranked]
+        
+        ranked = self.keyword_scorer.rank(topics, exclude=exclude)
+        try:
+            momentum = self.trend_store.momentum([score.keyword for score in ranked])
+        except Exception as e:
+            console.print(f"[yellow]Warning: Could not read trend store: {e}[/yellow]")
+            momentum = {}
+        trending = sorted(
+            (score for score in ranked if score.keyword in momentum),
+            key=lambda score: -momentum[score.keyword].z_score
+        )
+        ordered = trending + [score for score in ranked if score.keyword not in momentum]
+        return [(score.keyword.title(), score.score) for score in ordered[:limit]]
 
-    def select_topic_keyword(self, topics: List[Dict[str, str]]) -> str:
+    def select_topic_keyword(
+        self,
+        topics: List[Dict[str, str]],
+        exclude: Optional[Set[str]] = None
+    ) -> str:
         """Select optimal topic keyword using CTR-weighted heuristics.
         
         Args:
             topics: List of trending topics
+            exclude: Lowercase keywords that must not be selected (e.g. already published)
             
         Returns:
             Selected keyword for content generation
         """
-        # Extract keywords from titles and weight by frequency
-        keyword_counts = {}
-        
-        for topic in topics:
-            # Extract meaningful keywords (3+ chars, not common words)
-            words = re.findall(r'\b[a-zA-Z]{3,}\b', topic['title'].lower())
-            stopwords = {'the', 'and', 'for', 'are', 'but', 'not', 'you', 'all', 
-                        'can', 'had', 'her', 'was', 'one', 'our', 'out', 'day',
-                        'get', 'has', 'him', 'his', 'how', 'man', 'new', 'now',
-                        'old', 'see', 'two', 'way', 'who', 'boy', 'did', 'its',
-                        'let', 'put', 'say', 'she', 'too', 'use'}
-            
-            for word in words:
-                if word not in stopwords and len(word) > 2:
-                    keyword_counts[word] = keyword_counts.get(word, 0) + 1
-        
-        # Sort by frequency and select top keyword
-        if keyword_counts:
-            top_keyword = max(keyword_counts.items(), key=lambda x: x[1])[0]
-            return top_keyword.title()
+        ranked = self.rank_topic_keywords(topics, exclude=exclude, limit=1)
+        if ranked:
+            return ranked[0][0]
         
         # Fallback keywords
         return "Technology"
 
-    def generate_content_outline(self, keyword: str) -> str:
+    def _observe(self, stage: Optional[str], model: Optional[str]) -> Any:
+        """Track a model call in the router when it belongs to a routed stage."""
+        return self.router.observe(stage, model or "unknown") if stage else nullcontext()
+
+    def _routed(self, stage: str, call: Callable[..., T], **params) -> T:
+        """Run a completion on a stage's models, falling back in order.
+        
+        Args:
+            stage: Stage name in the router
+            call: _complete or _stream_complete (with its leading arguments bound)
+            **params: Request parameters; override the route's max_tokens
+                and temperature
+            
+        Returns:
+            Result of the first model that succeeds
+            
+        Raises:
+            Exception: The last model's error if every model fails
+        """
+        route = self.router.route(stage)
+        defaults = {"max_tokens": route.max_tokens, "temperature": route.temperature}
+        request = {name: value for name, value in defaults.items() if value is not None}
+        request.update(params)
+        
+        models = self.router.candidates(stage)
+        for index, model in enumerate(models):
+            try:
+                return call(stage=stage, timeout=route.timeout, model=model, **request)
+            except Exception as e:
+                if index == len(models) - 1:
+                    raise
+                console.print(
+                    f"[yellow]{stage} request to {model} failed ({e.__class__.__name__}), "
+                    f"trying {models[index + 1]}[/yellow]"
+                )
+        raise RuntimeError(f"No models configured for stage '{stage}'")
+
+    def _complete(
+        self,
+        validate: Optional[Callable[[str], Any]] = None,
+        stage: Optional[str] = None,
+        timeout: Optional[float] = None,
+        **params
+    ) -> str:
+        """Run a chat completion through the response cache.
+        
+        Args:
+            validate: Optional parser; responses it rejects are not cached
+            stage: Routed stage the request belongs to, for latency tracking
+            timeout: Request timeout in seconds (not part of the cache key)
+            **params: Parameters for chat.completions.create
+            
+        Returns:
+            Text content of the first choice
+        """
+        key = self.response_cache.make_key(params)
+        cached = self.response_cache.get(key)
+        if cached is not None:
+            telemetry.incr("llm_cache.hits")
+            return cached["content"]
+        
+        telemetry.incr("llm_cache.misses")
+        request = dict(params, timeout=timeout) if timeout else params
+        with self._observe(stage, params.get("model")):
+            response = self.api_client.chat(**request)
+        telemetry.record_usage(params.get("model"), getattr(response, "usage", None))
+        content = response.choices[0].message.content
+        
+        try:
+            if validate is not None:
+                validate(content)
+        except Exception:
+            return content
+        
+        self.response_cache.put(key, {"content": content, "model": params.get("model")})
+        return content
+
+    @telemetry.timed("enrich")
+    def enrich_sources(self, keyword: str, topics: List[Dict[str, str]]) -> str:
+        """Summarize the source articles of a keyword's topics.
+        
+        Args:
+            keyword: Topic keyword
+            topics: Topics the keyword was selected from
+            
+        Returns:
+            Token-budgeted digest of the articles, empty without an enricher
+        """
+        if self.enricher is None:
+            return ""
+        try:
+            return self.enricher.digest_for(keyword, topics)
+        except Exception as e:
+            console.print(f"[yellow]Warning: Source enrichment failed: {e}[/yellow]")
+            return ""
+
+    @telemetry.timed("outline")
+    def generate_content_outline(self, keyword: str, sources: str = "") -> str:
         """Generate content outline using OpenAI.
         
         Args:
             keyword: Topic keyword for content generation
+            sources: Digest of today's source articles to ground the outline
             
         Returns:
             Generated content outline
         """
-        prompt = f"""
-        Create a detailed outline for a 1200-word blog post about "{keyword}" 
-        targeting tech professionals and productivity enthusiasts.
-        
-        Requirements:
-        - Focus on actionable insights and practical applications
-        - Include 5-7 main sections with subpoints
-        - Add specific examples and case studies where relevant
-        - Maintain a concise, lightly opinionated tone
-        - Include relevant statistics or data points
-        
-        Format as a structured outline with Roman numerals and bullet points.
-        """
+        messages = OUTLINE.messages(
+            keyword=keyword,
+            sources=SOURCES_SECTION.format(sources=sources) if sources else ""
+        )
         
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.7,
-                max_tokens=1000
-            )
-            return response.choices[0].message.content
+            return self._routed("outline", self._complete, messages=messages)
         except Exception as e:
+            if not self.allow_fallback:
+                raise
             console.print(f"[red]Error generating outline: {e}[/red]")
             return f"# {keyword}: A Comprehensive Guide\n\nI. Introduction\nII. Key Concepts\nIII. Practical Applications\nIV. Best Practices\nV. Conclusion"
 
-    def generate_full_article(self, keyword: str, outline: str) -> BlogPost:
-        """Generate full blog article from outline.
+    def _stream_complete(
+        self,
+        draft_path: Path,
+        on_preview: Callable[[str], None],
+        preview_chars: int = 500,
+        stage: Optional[str] = None,
+        timeout: Optional[float] = None,
+        **params
+    ) -> str:
+        """Stream a chat completion into a buffer and an on-disk draft.
         
         Args:
-            keyword: Topic keyword
-            outline: Content outline
+            draft_path: File the partial response is written to as it arrives
+            on_preview: Called once with the first ``preview_chars`` characters
+            preview_chars: Length of the preview passed to on_preview
+            stage: Routed stage the request belongs to, for latency tracking
+            timeout: Request timeout in seconds (not part of the cache key)
+            **params: Parameters for chat.completions.create
             
         Returns:
-            Complete BlogPost object
-        """
-        # Generate main content
-        content_prompt = f"""
-        Write a comprehensive 1200-word blog post based on this outline:
-        
-        {outline}
-        
-        Topic: {keyword}
-        
-        Requirements:
-        - Write in Markdown format
-        - Use clear, engaging headers (##, ###)
-        - Include code examples where relevant (use ```language blocks)
-        - Add actionable takeaways and practical tips
-        - Maintain professional but conversational tone
-        - Include relevant statistics and data
-        - End with a strong conclusion and call-to-action
-        - Do not include title - just the body content
+            Full text content of the response
         """
+        key = self.response_cache.make_key(params)
+        cached = self.response_cache.get(key)
+        if cached is not None:
+            telemetry.incr("llm_cache.hits")
+            on_preview(cached["content"][:preview_chars])
+            return cached["content"]
         
-        try:
-            content_response = self.client.chat.completions.create(
-                model="gpt-4o",
-                messages=[{"role": "user", "content": content_prompt}],
-                temperature=0.7,
-                max_tokens=2500
-            )
-            content = content_response.choices[0].message.content
-        except Exception as e:
-            console.print(f"[red]Error generating content: {e}[/red]")
-            content = f"## Introduction\n\nThis article explores {keyword} and its applications.\n\n## Conclusion\n\nStay tuned for more insights!"
-
-        # Generate SEO metadata
-        seo_prompt = f"""
-        Based on this article content about "{keyword}", generate:
-        
-        1. SEO-optimized title (max 60 chars)
-        2. URL slug (lowercase, hyphens, max 50 chars)
-        3. Meta description (150-160 chars)
-        4. 3 tweetable snippets (max 280 chars each)
-        5. 3-5 relevant tags
-        6. Category from: {', '.join(self.categories)}
-        7. Brief summary (max 160 chars)
-        
-        Article preview:
-        {content[:500]}...
-        
-        Respond in JSON format:
-        {
-            "title": "...",
-            "slug": "...",
-            "meta_description": "...",
-            "tweets": ["...", "...", "..."],
-            "tags": ["...", "...", "..."],
-            "category": "...",
-            "summary": "..."
-        }
+        telemetry.incr("llm_cache.misses")
+        
+        buffer = StringIO()
+        length = 0
+        previewed = False
+        draft_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        request = dict(params, timeout=timeout) if timeout else params
+        with open(draft_path, 'w', encoding='utf-8') as draft, self._observe(stage, params.get("model")):
+            stream = self.api_client.chat(stream=True, stream_options={"include_usage": True}, **request)
+            with closing(stream):
+                for chunk in stream:
+                    if not chunk.choices:
+                        # The final chunk carries the token usage of the whole stream
+                        telemetry.record_usage(params.get("model"), getattr(chunk, "usage", None))
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if not delta:
+                        continue
+                    
+                    buffer.write(delta)
+                    draft.write(delta)
+                    length += len(delta)
+                    
+                    if not previewed and length >= preview_chars:
+                        draft.flush()
+                        on_preview(buffer.getvalue()[:preview_chars])
+                        previewed = True
+        
+        content = buffer.getvalue()
+        if not previewed:
+            on_preview(content[:preview_chars])
+        
+        self.response_cache.put(key, {"content": content, "model": params.get("model")})
+        draft_path.unlink()
+        return content
+
+    @telemetry.timed("seo")
+    def generate_seo_metadata(self, keyword: str, preview: str) -> Dict[str, Any]:
+        """Generate SEO metadata from the opening of an article.
+        
+        Args:
+            keyword: Topic keyword
+            preview: First characters of the article body
+            
+        Returns:
+            Dictionary with title, slug, meta_description, tweets, tags,
+            category and summary
         """
+        messages = SEO.messages(keyword=keyword, categories=", ".join(self.categories), preview=preview)
         
         try:
-            seo_response = self.client.chat.completions.create(
-                model="gpt-4o",
-                messages=[{"role": "user", "content": seo_prompt}],
-                temperature=0.3,
-                max_tokens=800
-            )
-            seo_data = json.loads(seo_response.choices[0].message.content)
+            return json.loads(self._routed(
+                "seo",
+                self._complete,
+                messages=messages,
+                validate=json.loads
+            ))
         except Exception as e:
+            if not self.allow_fallback:
+                raise
             console.print(f"[red]Error generating SEO data: {e}[/red]")
             # Fallback SEO data
             slug = re.sub(r'[^a-z0-9]+', '-', keyword.lower()).strip('-')
-            seo_data = {
+            return {
                 "title": f"{keyword}: Complete Guide",
                 "slug": slug,
                 "meta_description": f"Comprehensive guide to {keyword} with practical tips and insights.",
@@ -250,6 +451,157 @@ class ContentGenerator:
                 "summary": f"Essential insights and practical tips about {keyword}."
             }
 
+    def _post_schema(self) -> Dict[str, Any]:
+        """Build the JSON schema of a structured article response.
+        
+        Returns:
+            Strict JSON schema with the article body and every SEO field
+        """
+        string_list = {"type": "array", "items": {"type": "string"}}
+        properties = {
+            "content": {"type": "string", "description": "Article body in Markdown, without the title"},
+            "title": {"type": "string", "description": "SEO-optimized title, max 60 chars"},
+            "slug": {"type": "string", "description": "URL slug, lowercase with hyphens, max 50 chars"},
+            "meta_description": {"type": "string", "description": "Meta description, 150-160 chars"},
+            "tweets": dict(string_list, description="3 tweetable snippets, max 280 chars each"),
+            "tags": dict(string_list, description="3-5 relevant tags"),
+            "category": {"type": "string", "enum": self.categories},
+            "summary": {"type": "string", "description": "Brief summary, max 160 chars"},
+        }
+        return {
+            "type": "object",
+            "properties": properties,
+            "required": list(properties),
+            "additionalProperties": False
+        }
+
+    def _parse_structured_post(self, text: str) -> Dict[str, Any]:
+        """Parse and validate a structured article response.
+        
+        Args:
+            text: JSON response text
+            
+        Returns:
+            Parsed response
+            
+        Raises:
+            ValueError: If the response is not valid JSON or breaks the schema
+        """
+        if not text:
+            raise ValueError("empty response")
+        data = json.loads(text)
+        if not isinstance(data, dict):
+            raise ValueError("response is not a JSON object")
+        
+        missing = [field for field in ("content",) + SEO_FIELDS if field not in data]
+        if missing:
+            raise ValueError(f"missing fields: {', '.join(missing)}")
+        for field in ("content", "title", "slug", "meta_description", "category", "summary"):
+            if not isinstance(data[field], str) or not data[field].strip():
+                raise ValueError(f"{field} must be a non-empty string")
+        for field in ("tweets", "tags"):
+            if not isinstance(data[field], list) or not all(isinstance(item, str) for item in data[field]):
+                raise ValueError(f"{field} must be a list of strings")
+        if not SLUG_PATTERN.match(data["slug"]):
+            raise ValueError(f"invalid slug: {data['slug']!r}")
+        if data["category"] not in self.categories:
+            raise ValueError(f"unknown category: {data['category']!r}")
+        return data
+
+    @telemetry.timed("article.structured")
+    def generate_structured_article(self, keyword: str, outline: str) -> BlogPost:
+        """Generate the article body and SEO metadata in a single call.
+        
+        Args:
+            keyword: Topic keyword
+            outline: Content outline
+            
+        Returns:
+            Complete BlogPost object
+            
+        Raises:
+            ValueError: If the response does not match the schema
+        """
+        text = self._routed(
+            "article.structured",
+            self._complete,
+            messages=STRUCTURED_ARTICLE.messages(keyword=keyword, outline=outline),
+            response_format={
+                "type": "json_schema",
+                "json_schema": {"name": "blog_post", "strict": True, "schema": self._post_schema()}
+            },
+            validate=self._parse_structured_post
+        )
+        data = self._parse_structured_post(text)
+        return self._build_post(data["content"], data)
+
+    @telemetry.timed("article")
+    def generate_full_article(self, keyword: str, outline: str) -> BlogPost:
+        """Generate full blog article from outline.
+        
+        In structured mode the body and SEO metadata come from one
+        JSON-schema response. Otherwise, or if that response fails
+        validation, the article is streamed to a draft under
+        ``cache_dir/drafts`` and the SEO metadata request starts as soon as
+        the first 500 characters have arrived, so both calls overlap.
+        
+        Args:
+            keyword: Topic keyword
+            outline: Content outline
+            
+        Returns:
+            Complete BlogPost object
+        """
+        if self.structured:
+            try:
+                return self.generate_structured_article(keyword, outline)
+            except ValueError as e:
+                console.print(
+                    f"[yellow]Structured response for {keyword} failed validation ({e}), "
+                    f"falling back to separate article and SEO calls[/yellow]"
+                )
+        
+        messages = ARTICLE.messages(keyword=keyword, outline=outline)
+        draft_slug = re.sub(r'[^a-z0-9]+', '-', keyword.lower()).strip('-') or "draft"
+        draft_path = self.cache_dir / "drafts" / f"{draft_slug}.md"
+        
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            seo_futures: List[Future] = []
+            
+            def start_seo(preview: str) -> None:
+                if not seo_futures:
+                    seo_futures.append(pool.submit(self.generate_seo_metadata, keyword, preview))
+            
+            try:
+                with telemetry.span("article.body", keyword=keyword):
+                    content = self._routed(
+                        "article",
+                        functools.partial(self._stream_complete, draft_path, start_seo),
+                        messages=messages
+                    )
+            except Exception as e:
+                if not self.allow_fallback:
+                    raise
+                console.print(f"[red]Error generating content: {e}[/red]")
+                content = f"## Introduction\n\nThis article explores {keyword} and its applications.\n\n## Conclusion\n\nStay tuned for more insights!"
+            
+            # Generate SEO metadata (already running unless the article failed early)
+            start_seo(content[:500])
+            seo_data = seo_futures[0].result()
+
+        return self._build_post(content, seo_data)
+
+    @staticmethod
+    def _build_post(content: str, seo_data: Dict[str, Any]) -> BlogPost:
+        """Assemble a BlogPost from its body and SEO metadata.
+        
+        Args:
+            content: Article body
+            seo_data: Output of generate_seo_metadata()
+            
+        Returns:
+            BlogPost object
+        """
         return BlogPost(
             title=seo_data["title"],
             slug=seo_data["slug"],
@@ -261,28 +613,80 @@ class ContentGenerator:
             tweets=seo_data["tweets"]
         )
 
-    def save_post(self, post: BlogPost, content_dir: Path = None) -> Path:
-        """Save blog post to content directory.
+    @staticmethod
+    def _seo_data(post: BlogPost) -> Dict[str, Any]:
+        """Extract the SEO metadata of a post for checkpointing."""
+        return {field: getattr(post, field) for field in SEO_FIELDS}
+
+    def check_duplicate(self, keyword: str, text: str, exclude: Optional[str] = None) -> None:
+        """Reject a post that is a near-duplicate of one under content/.
         
         Args:
-            post: BlogPost object to save
+            keyword: Topic keyword of the new post
+            text: Outline or body of the new post
+            exclude: Path of the post's own file, e.g. one written by an
+                interrupted run, which never counts as a duplicate
+            
+        Raises:
+            DuplicatePostError: If an existing post is too similar
+        """
+        with telemetry.span("dedup", keyword=keyword):
+            duplicates = self.duplicate_index.find_duplicates(text, exclude=exclude)
+        if duplicates:
+            telemetry.incr("dedup.rejected")
+            raise DuplicatePostError(keyword, duplicates[0])
+
+    def post_path(self, post: BlogPost, content_dir: Optional[Path] = None) -> Path:
+        """Choose the file a new post is saved to.
+        
+        A slug already taken by a different post gets a numeric suffix
+        instead of overwriting it.
+        
+        Args:
+            post: BlogPost object to save; its slug is updated to match
             content_dir: Content directory path
             
         Returns:
-            Path to saved file
+            Path under content_dir/<year>/<month>/ that does not exist yet
         """
         if content_dir is None:
             content_dir = Path("content")
+        post_dir = content_dir / str(post.date.year) / f"{post.date.month:02d}"
+        
+        base_slug = post.slug
+        suffix = 2
+        while (post_dir / f"{post.slug}.md").exists():
+            post.slug = f"{base_slug}-{suffix}"
+            suffix += 1
+        return post_dir / f"{post.slug}.md"
+    
+    @telemetry.timed("save")
+    def save_post(self, post: BlogPost, content_dir: Optional[Path] = None, filepath: Optional[Path] = None) -> Path:
+        """Save blog post to content directory.
         
-        # Create year/month directory structure
-        year = post.date.year
-        month = f"{post.date.month:02d}"
-        post_dir = content_dir / str(year) / month
-        post_dir.mkdir(parents=True, exist_ok=True)
+        The body is checked against the duplicate index first, and a post
+        whose slug is already taken by a different post gets a numeric
+        suffix instead of overwriting it.
         
-        # Generate filename
-        filename = f"{post.slug}.md"
-        filepath = post_dir / filename
+        Args:
+            post: BlogPost object to save
+            content_dir: Content directory path
+            filepath: File from post_path() to write, overwritten if an
+                interrupted run already wrote it; chosen here when omitted
+            
+        Returns:
+            Path to saved file
+            
+        Raises:
+            DuplicatePostError: If an existing post is too similar
+        """
+        if filepath is None:
+            self.check_duplicate(post.title, f"{post.title}\n\n{post.content}")
+            filepath = self.post_path(post, content_dir)
+        else:
+            self.check_duplicate(post.title, f"{post.title}\n\n{post.content}", exclude=str(filepath))
+            post.slug = filepath.stem
+        filepath.parent.mkdir(parents=True, exist_ok=True)
         
         # Create front matter
         front_matter = {
@@ -297,6 +701,8 @@ class ContentGenerator:
         
         if post.cover_image:
             front_matter["cover_image"] = post.cover_image
+        for name, srcset in sorted(post.cover_srcsets.items()):
+            front_matter[f"cover_srcset_{name}"] = srcset
         
         # Write file
         with open(filepath, 'w', encoding='utf-8') as f:
@@ -312,9 +718,146 @@ class ContentGenerator:
                     f.write(f"{i}. {tweet}\n")
                 f.write("-->\n")
         
+        self.duplicate_index.add(filepath, f"{post.title}\n\n{post.content}")
+        try:
+            self.manifest.record(filepath, front_matter)
+        except OSError as e:
+            console.print(f"[yellow]Warning: Could not update content manifest: {e}[/yellow]")
         console.print(f"[green]Saved post: {filepath}[/green]")
         return filepath
 
+    def collect_new_topics(self) -> List[Dict[str, str]]:
+        """Fetch trending topics and drop the ones already covered.
+        
+        Returns:
+            Topics that no earlier post has covered
+        """
+        topics = self.fetch_trending_topics()
+        if not topics:
+            console.print("[red]No topics found from RSS feeds[/red]")
+            return []
+        
+        console.print(f"[green]Found {len(topics)} trending topics[/green]")
+        
+        if self.trend_store is not None:
+            try:
+                self.trend_store.ingest(topics)
+            except Exception as e:
+                console.print(f"[yellow]Warning: Could not update trend store: {e}[/yellow]")
+        
+        # Skip headlines that earlier posts already covered
+        self.seen_index.record_entries(topics)
+        topics = self.seen_index.filter_unseen(topics)
+        if not topics:
+            console.print("[yellow]All trending topics were already covered[/yellow]")
+        
+        return topics
+
+    @telemetry.timed("post")
+    def generate_post(
+        self,
+        keyword: str,
+        topics: List[Dict[str, str]],
+        checkpoint: Optional[JobCheckpoint] = None
+    ) -> Path:
+        """Run the outline, article, image and save stages for one keyword.
+        
+        With a checkpoint, each stage's output is written to disk as it
+        completes and stages that already completed are loaded instead of
+        being run again.
+        
+        Args:
+            keyword: Topic keyword
+            topics: Topics the keyword was selected from
+            checkpoint: Job checkpoint to resume from and write to
+            
+        Returns:
+            Path to the saved post file
+        """
+        if checkpoint is not None:
+            saved = checkpoint.load("post")
+            if saved and saved.get("duplicate_of"):
+                raise DuplicatePostError(keyword, Duplicate(saved["duplicate_of"], saved["similarity"]))
+            if saved:
+                console.print(f"[blue]Already generated post for {keyword}: {saved['path']}[/blue]")
+                return Path(saved["path"])
+            checkpoint.save("keyword", keyword)
+        
+        def stage(name: str, produce: Callable[[], Any]) -> Any:
+            if checkpoint is not None and checkpoint.has(name):
+                console.print(f"[blue]Resuming {keyword}: loaded {name} from checkpoint[/blue]")
+                return checkpoint.load(name)
+            value = produce()
+            if checkpoint is not None:
+                checkpoint.save(name, value)
+            return value
+        
+        covered = stage("topics", lambda: covered_topics(keyword, topics))
+        
+        # Ground the outline in the source articles
+        sources = stage("sources", lambda: self.enrich_sources(keyword, topics))
+        
+        # Generate outline
+        outline = stage("outline", lambda: self.generate_content_outline(keyword, sources))
+        console.print(f"[blue]Generated content outline for {keyword}[/blue]")
+        
+        # A file written by an interrupted run of this job is its own, not a duplicate
+        target = checkpoint.load("target") if checkpoint is not None else None
+        
+        # Stop before the article and image calls if an existing post covers this
+        try:
+            self.check_duplicate(keyword, outline, exclude=target)
+        except DuplicatePostError as e:
+            self.seen_index.record_post(keyword, Path(e.duplicate.path).stem, covered)
+            if checkpoint is not None:
+                checkpoint.save("post", {
+                    "path": None,
+                    "duplicate_of": e.duplicate.path,
+                    "similarity": e.duplicate.similarity
+                })
+            raise
+        
+        # Generate full article (body and SEO metadata)
+        content = checkpoint.load("article") if checkpoint is not None else None
+        if content is None:
+            post = self.generate_full_article(keyword, outline)
+            if checkpoint is not None:
+                checkpoint.save("article", post.content)
+                checkpoint.save("seo", self._seo_data(post))
+        else:
+            seo_data = stage("seo", lambda: self.generate_seo_metadata(keyword, content[:500]))
+            post = self._build_post(content, seo_data)
+        console.print(f"[green]Generated article: {post.title}[/green]")
+        
+        # Generate cover image
+        images = self.image_generator
+        if images is not None:
+            def cover() -> Dict[str, Any]:
+                path = images.generate_cover_image(post.title, post.category, post.tags)
+                return {"path": path, "srcsets": images.srcsets(path)}
+            
+            image = stage("image", cover)
+            post.cover_image = image["path"]
+            post.cover_srcsets = image.get("srcsets", {})
+        
+        # Save post, recording its file first so a crash mid-save resumes into it
+        filepath = Path(target) if target else self.post_path(post)
+        if checkpoint is not None and not target:
+            checkpoint.save("target", str(filepath))
+        filepath = self.save_post(post, filepath=filepath)
+        self.seen_index.record_post(keyword, post.slug, covered)
+        if checkpoint is not None:
+            checkpoint.save("post", {"path": str(filepath)})
+        
+        if self.response_cache.enabled:
+            stats = self.response_cache.stats()
+            console.print(
+                f"[blue]LLM cache: {stats['hits']} hits, {stats['misses']} misses, "
+                f"{stats['bytes'] / 1024:.0f}KB[/blue]"
+            )
+        
+        return filepath
+
     def generate_daily_post(self) -> Optional[Path]:
         """Generate and save a daily blog post.
         
@@ -325,47 +868,150 @@ class ContentGenerator:
             console.print("[blue]Starting daily content generation...[/blue]")
             
             # Fetch trending topics
-            topics = self.fetch_trending_topics()
+            topics = self.collect_new_topics()
             if not topics:
-                console.print("[red]No topics found from RSS feeds[/red]")
                 return None
             
-            console.print(f"[green]Found {len(topics)} trending topics[/green]")
-            
             # Select topic keyword
-            keyword = self.select_topic_keyword(topics)
+            keyword = self.select_topic_keyword(
+                topics, exclude=self.seen_index.published_keywords()
+            )
             console.print(f"[blue]Selected keyword: {keyword}[/blue]")
             
-            # Generate outline
-            outline = self.generate_content_outline(keyword)
-            console.print("[blue]Generated content outline[/blue]")
+            run = self.checkpoints.new_run(topics, [keyword])
+            try:
+                filepath = self.generate_post(keyword, topics, checkpoint=run.job(keyword))
+            except DuplicatePostError as e:
+                console.print(f"[yellow]Skipped {keyword}: {e}[/yellow]")
+                run.mark_complete()
+                return None
+            run.mark_complete()
+            return filepath
             
-            # Generate full article
-            post = self.generate_full_article(keyword, outline)
-            console.print(f"[green]Generated article: {post.title}[/green]")
+        except Exception as e:
+            console.print(f"[red]Error in daily post generation: {e}[/red]")
+            return None
+
+    def generate_batch(self, n: int, max_concurrency: int = 4) -> List[Path]:
+        """Generate and save several posts from the top-ranked keywords.
+        
+        Each post runs its outline, article and save stages in order, while
+        up to ``max_concurrency`` posts are generated at the same time.
+        
+        Args:
+            n: Number of posts to generate
+            max_concurrency: Maximum number of posts generated concurrently
             
-            # Save post
-            filepath = self.save_post(post)
+        Returns:
+            Paths to the generated post files, in keyword rank order
+        """
+        try:
+            console.print(f"[blue]Starting batch generation of {n} posts...[/blue]")
             
-            return filepath
+            topics = self.collect_new_topics()
+            if not topics:
+                return []
             
+            ranked = self.rank_topic_keywords(
+                topics, exclude=self.seen_index.published_keywords(), limit=n
+            )
+            keywords = [keyword for keyword, _ in ranked] or ["Technology"]
+            console.print(f"[blue]Selected keywords: {', '.join(keywords)}[/blue]")
+            run = self.checkpoints.new_run(topics, keywords)
         except Exception as e:
-            console.print(f"[red]Error in daily post generation: {e}[/red]")
+            console.print(f"[red]Error in batch generation: {e}[/red]")
+            return []
+        
+        return self._run_jobs(run, topics, keywords, max_concurrency)
+
+    def resume_run(self, max_concurrency: int = 4) -> Optional[List[Path]]:
+        """Finish the most recent interrupted run.
+        
+        Jobs whose post was already saved are skipped, the others pick up at
+        their first incomplete stage with the keyword chosen originally.
+        
+        Args:
+            max_concurrency: Maximum number of posts generated concurrently
+            
+        Returns:
+            Paths to the run's post files in keyword rank order, or None if
+            there is no unfinished run that can be resumed
+        """
+        run = self.checkpoints.latest_unfinished()
+        if run is None:
+            console.print("[blue]No interrupted run to resume[/blue]")
+            return None
+        
+        plan = run.load_plan()
+        if plan is None:
+            console.print(f"[yellow]Run {run.run_id} has lost its plan and cannot be resumed[/yellow]")
             return None
+        topics, keywords = plan
+        console.print(f"[blue]Resuming run {run.run_id}: {', '.join(keywords)}[/blue]")
+        return self._run_jobs(run, topics, keywords, max_concurrency)
 
+    def _run_jobs(
+        self,
+        run: RunCheckpoint,
+        topics: List[Dict[str, str]],
+        keywords: List[str],
+        max_concurrency: int
+    ) -> List[Path]:
+        """Generate the posts of a run concurrently.
+        
+        Args:
+            run: Run checkpoint holding one job per keyword
+            topics: Topics the keywords were selected from
+            keywords: Keywords in rank order
+            max_concurrency: Maximum number of posts generated concurrently
+            
+        Returns:
+            Paths to the generated post files, in keyword rank order
+        """
+        results: Dict[str, Path] = {}
+        skipped = 0
+        with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(keywords)))) as pool:
+            futures = {
+                pool.submit(self.generate_post, keyword, topics, checkpoint=run.job(keyword)): keyword
+                for keyword in keywords
+            }
+            for future in as_completed(futures):
+                keyword = futures[future]
+                try:
+                    results[keyword] = future.result()
+                except DuplicatePostError as e:
+                    skipped += 1
+                    console.print(f"[yellow]Skipped {keyword}: {e}[/yellow]")
+                except Exception as e:
+                    console.print(f"[red]Error generating post for {keyword}: {e}[/red]")
+        
+        console.print(f"[green]Generated {len(results)}/{len(keywords)} posts[/green]")
+        if len(results) + skipped == len(keywords):
+            run.mark_complete()
+        return [results[keyword] for keyword in keywords if keyword in results]
 
-def main():
-    """CLI entry point for content generation."""
-    import sys
-    from dotenv import load_dotenv
-    
-    load_dotenv()
+
+def build_generator(
+    api_key: str,
+    no_cache: bool = False,
+    structured: bool = False,
+    cover_images: bool = False
+) -> ContentGenerator:
+    """Build a generator configured from the environment.
     
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        console.print("[red]OPENAI_API_KEY environment variable required[/red]")
-        sys.exit(1)
+    Shared by the one-shot CLI and the daemon, which keeps the returned
+    generator (and its HTTP sessions, OpenAI client and caches) for its
+    whole lifetime.
     
+    Args:
+        api_key: OpenAI API key
+        no_cache: Bypass the LLM response cache
+        structured: Use single-call structured generation
+        cover_images: Generate a cover image for each post
+        
+    Returns:
+        Configured content generator
+    """
     feed_sources = os.getenv("FEED_SOURCES", "").split(",")
     feed_sources = [url.strip() for url in feed_sources if url.strip()]
     
@@ -378,7 +1024,139 @@ def main():
             "https://www.wired.com/feed/rss"
         ]
     
-    generator = ContentGenerator(api_key, feed_sources)
+    cache_dir = Path(os.getenv("PIPELINE_CACHE_DIR", ".cache"))
+    feed_defaults = FeedSource(
+        url="",
+        timeout=float(os.getenv("FEED_TIMEOUT", "10")),
+        max_bytes=int(os.getenv("FEED_MAX_BYTES", str(2 * 1024 * 1024)))
+    )
+    feed_fetcher = FeedFetcher(
+        cache=FeedCache(cache_dir / "feeds.json"),
+        registry=FeedRegistry(cache_dir / "feed_health.json", defaults=feed_defaults),
+        stage_timeout=float(os.getenv("FEED_STAGE_TIMEOUT", "60"))
+    )
+    
+    response_cache = ResponseCache(
+        cache_dir / "llm",
+        ttl=float(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 60 * 60))),
+        max_bytes=int(float(os.getenv("LLM_CACHE_MAX_MB", "100")) * 1024 * 1024),
+        enabled=not no_cache
+    )
+    
+    enricher = None
+    if os.getenv("ENRICH", "on").lower() not in ("0", "off", "false"):
+        enricher = SourceEnricher(
+            session=feed_fetcher.session,
+            cache=ArticleCache(cache_dir / "articles.sqlite3"),
+            max_sources=int(os.getenv("ENRICH_MAX_SOURCES", "6")),
+            stage_timeout=float(os.getenv("ENRICH_STAGE_TIMEOUT", "5")),
+            token_budget=int(os.getenv("ENRICH_TOKEN_BUDGET", "600"))
+        )
+    
+    trend_store = None
+    if os.getenv("TRENDS", "on").lower() not in ("0", "off", "false"):
+        trend_store = TrendStore(cache_dir / "trends.sqlite3")
+    
+    api_client = RateLimitedClient.from_env(api_key)
+    router = ModelRouter.from_env()
+    return ContentGenerator(
+        api_key,
+        feed_sources,
+        cache_dir=cache_dir,
+        feed_fetcher=feed_fetcher,
+        response_cache=response_cache,
+        api_client=api_client,
+        image_generator=ImageGenerator(
+            api_key,
+            api_client=api_client,
+            router=router,
+            source=os.getenv("COVER_IMAGE_SOURCE", "dalle").lower(),
+            response_format=os.getenv("COVER_IMAGE_RESPONSE", "b64_json").lower(),
+            image_store=ImageStore(
+                cache_dir / "images.sqlite3",
+                Path("content/images"),
+                max_distance=int(os.getenv("IMAGE_DEDUP_DISTANCE", str(DEFAULT_MAX_DISTANCE)))
+            ) if os.getenv("IMAGE_STORE", "on").lower() not in ("0", "off", "false") else None,
+            variants=VariantBuilder.from_env(Path("content/images"))
+        ) if cover_images else None,
+        structured=structured,
+        duplicate_index=DuplicateIndex(
+            cache_dir / "duplicates.sqlite3",
+            threshold=float(os.getenv("DEDUP_THRESHOLD", str(DEFAULT_THRESHOLD))),
+            enabled=os.getenv("DEDUP", "on").lower() not in ("0", "off", "false")
+        ),
+        enricher=enricher,
+        trend_store=trend_store,
+        rank_by=os.getenv("TOPIC_RANKING", "frequency").lower(),
+        router=router
+    )
+
+
+@instrumented("generator")
+def main(argv: Optional[List[str]] = None):
+    """CLI entry point for content generation.
+    
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+    """
+    import sys
+    import argparse
+    from dotenv import load_dotenv
+    
+    load_dotenv()
+    
+    parser = argparse.ArgumentParser(description="Generate AI blog posts from trending topics")
+    parser.add_argument(
+        "--batch", "-n", type=int, default=int(os.getenv("POSTS_PER_RUN", "1")),
+        help="Number of posts to generate (default: $POSTS_PER_RUN or 1)"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=int(os.getenv("GENERATION_CONCURRENCY", "4")),
+        help="Maximum posts generated concurrently in batch mode"
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", default=os.getenv("LLM_CACHE", "on").lower() in ("0", "off", "false"),
+        help="Bypass the LLM response cache (default: $LLM_CACHE)"
+    )
+    parser.add_argument(
+        "--resume", action="store_true",
+        help="Finish the most recent interrupted run, or start a new one if there is none"
+    )
+    parser.add_argument(
+        "--structured", action="store_true", default=os.getenv("STRUCTURED_OUTPUT", "off").lower() in ("1", "on", "true"),
+        help="Generate article and SEO metadata in one JSON-schema call (default: $STRUCTURED_OUTPUT)"
+    )
+    parser.add_argument(
+        "--cover-images", action="store_true", default=os.getenv("COVER_IMAGES", "off").lower() in ("1", "on", "true"),
+        help="Generate a cover image for each post (default: $COVER_IMAGES)"
+    )
+    args = parser.parse_args(argv)
+    
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        console.print("[red]OPENAI_API_KEY environment variable required[/red]")
+        sys.exit(1)
+    
+    generator = build_generator(
+        api_key,
+        no_cache=args.no_cache,
+        structured=args.structured,
+        cover_images=args.cover_images
+    )
+    
+    filepaths = generator.resume_run(max_concurrency=args.concurrency) if args.resume else None
+    if filepaths is None and args.batch > 1:
+        filepaths = generator.generate_batch(args.batch, max_concurrency=args.concurrency)
+    
+    if filepaths is not None:
+        if filepaths:
+            for path in filepaths:
+                console.print(f"[green]Success! Generated post at: {path}[/green]")
+        else:
+            console.print("[red]Failed to generate posts[/red]")
+            sys.exit(1)
+        return
+    
     filepath = generator.generate_daily_post()
     
     if filepath:
@@ -0,0 +1,231 @@
+"""
+Image Store
+
+SQLite index of the cover images under ``content/images``. Covers are named
+by a digest of their encoded bytes, so identical images share one file;
+each generated cover is also indexed by the prompt that produced it, so
+regenerating a post reuses its cover instead of paying for another image
+call, and by a perceptual hash, so a new image that looks like an existing
+one is replaced by it.
+"""
+
+import hashlib
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Optional, Set, Union
+
+from rich.console import Console
+
+from .lazy import lazy_import
+
+if TYPE_CHECKING:
+    from PIL import Image
+else:
+    Image = lazy_import("PIL.Image")
+
+console = Console()
+
+# Differing bits out of 64 below which two covers count as the same picture
+DEFAULT_MAX_DISTANCE = 4
+
+
+def prompt_key(prompt: str, category: str) -> str:
+    """Key of an image prompt.
+
+    Args:
+        prompt: Image prompt
+        category: Post category
+
+    Returns:
+        Hex digest of the category and whitespace-normalized prompt
+    """
+    text = f"{category or ''}\n{' '.join(prompt.split())}"
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def content_digest(data: Union[bytes, memoryview]) -> str:
+    """Digest of encoded image bytes, used as the file name.
+
+    Args:
+        data: Encoded image (bytes or a buffer view)
+
+    Returns:
+        20 hex characters
+    """
+    return hashlib.blake2b(data, digest_size=10).hexdigest()
+
+
+def perceptual_hash(image: "Image.Image") -> str:
+    """Difference hash of an image.
+
+    Compares each pixel of a 9x8 grayscale thumbnail with its right-hand
+    neighbour, so re-encodes, resizes and small edits change few bits.
+
+    Args:
+        image: Image to hash
+
+    Returns:
+        64-bit hash as 16 hex characters
+    """
+    pixels = image.convert("L").resize((9, 8), Image.Resampling.BOX).tobytes()
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            bits = (bits << 1) | (pixels[row * 9 + col] > pixels[row * 9 + col + 1])
+    return f"{bits:016x}"
+
+
+def hamming(a: str, b: str) -> int:
+    """Number of differing bits between two hex hashes."""
+    return (int(a, 16) ^ int(b, 16)).bit_count()
+
+
+class ImageStore:
+    """SQLite-backed index of cover files by prompt, content and appearance."""
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        images_dir: Optional[Path] = None,
+        max_distance: int = DEFAULT_MAX_DISTANCE
+    ):
+        """Initialize the image store.
+
+        Args:
+            path: SQLite database file
+            images_dir: Directory holding the cover files
+            max_distance: Largest perceptual hash distance treated as the same
+                image (negative disables perceptual dedup)
+        """
+        self.path = path or Path(".cache/images.sqlite3")
+        self.images_dir = images_dir or Path("content/images")
+        self.max_distance = max_distance
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.create_function("hamming", 2, hamming, deterministic=True)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS assets (
+                name TEXT PRIMARY KEY,
+                phash TEXT,
+                bytes INTEGER NOT NULL,
+                created_at TEXT NOT NULL
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS prompts (
+                key TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                created_at TEXT NOT NULL
+            ) WITHOUT ROWID;
+            """
+        )
+        self._conn.commit()
+
+    def _exists(self, name: str) -> bool:
+        """Check an asset's file exists, dropping the rows of a deleted one; caller holds the lock."""
+        if (self.images_dir / name).exists():
+            return True
+        self._conn.execute("DELETE FROM assets WHERE name = ?", (name,))
+        self._conn.execute("DELETE FROM prompts WHERE name = ?", (name,))
+        self._conn.commit()
+        return False
+
+    def lookup(self, key: str) -> Optional[str]:
+        """Find the cover generated for a prompt.
+
+        Args:
+            key: Prompt key from prompt_key()
+
+        Returns:
+            File name of the cover, or None
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT name FROM prompts WHERE key = ?", (key,)).fetchone()
+            if row is None or not self._exists(row[0]):
+                return None
+            return row[0]
+
+    def find_similar(self, phash: str) -> Optional[str]:
+        """Find an existing cover that looks like an image.
+
+        Args:
+            phash: Perceptual hash of the image
+
+        Returns:
+            File name of the closest cover within max_distance, or None
+        """
+        if self.max_distance < 0:
+            return None
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name FROM assets WHERE phash IS NOT NULL AND hamming(phash, ?) <= ? "
+                "ORDER BY hamming(phash, ?), created_at",
+                (phash, self.max_distance, phash)
+            ).fetchall()
+            for (name,) in rows:
+                if self._exists(name):
+                    return name
+        return None
+
+    def add(self, name: str, size: int, phash: Optional[str] = None, key: Optional[str] = None) -> None:
+        """Record a cover file and, optionally, the prompt that produced it.
+
+        Args:
+            name: File name in the images directory
+            size: File size in bytes
+            phash: Perceptual hash; covers without one are never matched
+                by find_similar()
+            key: Prompt key to map to the cover
+        """
+        now = datetime.now(timezone.utc).isoformat()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO assets (name, phash, bytes, created_at) VALUES (?, ?, ?, ?)",
+                (name, phash, size, now)
+            )
+            if key:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO prompts (key, name, created_at) VALUES (?, ?, ?)",
+                    (key, name, now)
+                )
+            self._conn.commit()
+
+    def link(self, key: str, name: str) -> None:
+        """Map a prompt to an existing cover.
+
+        Args:
+            key: Prompt key
+            name: File name of the cover
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO prompts (key, name, created_at) VALUES (?, ?, ?)",
+                (key, name, datetime.now(timezone.utc).isoformat())
+            )
+            self._conn.commit()
+
+    def names(self) -> Set[str]:
+        """File names of every recorded cover, including those linked to a prompt."""
+        with self._lock:
+            rows = self._conn.execute("SELECT name FROM assets UNION SELECT name FROM prompts").fetchall()
+        return {name for (name,) in rows}
+
+    def stats(self) -> Dict[str, Any]:
+        """Get store size statistics.
+
+        Returns:
+            Number of assets and prompts and total asset bytes
+        """
+        with self._lock:
+            assets, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM assets").fetchone()
+            prompts = self._conn.execute("SELECT COUNT(*) FROM prompts").fetchone()[0]
+        return {"assets": assets, "prompts": prompts, "bytes": total}
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -5,41 +5,132 @@ Creates AI-generated cover images using DALL·E and optimizes them for web use.
 """
 
 import os
+import time
 import base64
 import hashlib
-import requests
+import threading
 from io import BytesIO
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import TYPE_CHECKING, Any, BinaryIO, Dict, Optional, Tuple, Union
 from datetime import datetime
 
-import openai
-from PIL import Image, ImageOps
 from rich.console import Console
 
+from .api_client import RateLimitedClient
+from .covers import CATEGORY_STYLES, DEFAULT_STYLE, render_cover
+from .encoding import encode_jpeg
+from .image_store import ImageStore, content_digest, perceptual_hash, prompt_key
+from .lazy import lazy_import
+from .routing import ModelRouter
+from .telemetry import instrumented, telemetry
+from .variants import MANIFEST_NAME, VariantBuilder, VariantManifest
+
+if TYPE_CHECKING:
+    import openai
+    import requests
+    from PIL import Image, ImageOps
+else:
+    Image = lazy_import("PIL.Image")
+    ImageOps = lazy_import("PIL.ImageOps")
+    openai = lazy_import("openai")
+    requests = lazy_import("requests")
+
 console = Console()
 
+# "b64_json" returns the image in the generation response; "url" needs a second download
+RESPONSE_FORMATS = ("b64_json", "url")
+
 
 class ImageGenerator:
     """AI-powered image generator for blog cover images."""
 
-    def __init__(self, api_key: str, output_dir: Path = None):
+    def __init__(
+        self,
+        api_key: str,
+        output_dir: Optional[Path] = None,
+        api_client: Optional[RateLimitedClient] = None,
+        router: Optional[ModelRouter] = None,
+        source: str = "dalle",
+        fallback: bool = True,
+        variants: Optional[VariantBuilder] = None,
+        response_format: str = "b64_json",
+        download_timeout: float = 30.0,
+        max_download_bytes: int = 32 * 1024 * 1024,
+        chunk_size: int = 64 * 1024,
+        session: Optional["requests.Session"] = None,
+        image_store: Optional[ImageStore] = None
+    ):
         """Initialize the image generator.
         
         Args:
             api_key: OpenAI API key
             output_dir: Directory to save generated images
+            api_client: Rate-limited OpenAI client shared with other generators
+            router: Model router whose "image" route picks the model and timeout
+            source: "dalle" to generate covers with the image API,
+                "procedural" to render them locally without an API call
+            fallback: Render a procedural cover when DALL·E fails
+            variants: Renders responsive variants of each cover when given
+            response_format: "b64_json" to receive the image in the generation
+                response, "url" to download it from the returned URL
+            download_timeout: Connect/read timeout and overall deadline of a
+                URL download in seconds
+            max_download_bytes: Size above which a download is abandoned
+            chunk_size: Size of the chunks read from a download
+            session: HTTP session for URL downloads (defaults to a pooled
+                session sized to the image endpoint's concurrency)
+            image_store: Index of the covers in output_dir; when given, covers
+                are named by content, reused for repeated prompts and
+                deduplicated by appearance
         """
-        self.client = openai.OpenAI(api_key=api_key)
+        if response_format not in RESPONSE_FORMATS:
+            raise ValueError(f"Unknown response format: {response_format}")
+        self.api_client = api_client or RateLimitedClient(api_key)
+        self.router = router or ModelRouter()
+        self.source = source
+        self.fallback = fallback
         self.output_dir = output_dir or Path("content/images")
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.max_file_size = 400 * 1024  # 400KB limit
+        self.variants = variants
+        self.response_format = response_format
+        self.download_timeout = download_timeout
+        self.max_download_bytes = max_download_bytes
+        self.chunk_size = chunk_size
+        self._session = session
+        self.image_store = image_store
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        """Underlying OpenAI client."""
+        return self.api_client.client
+
+    @client.setter
+    def client(self, client) -> None:
+        self.api_client.client = client
 
+    @property
+    def session(self) -> "requests.Session":
+        """HTTP session for URL downloads, pooled to the image endpoint's concurrency."""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    limits = self.api_client.limits.get("images")
+                    pool_size = max(1, limits.max_concurrency if limits else 1)
+                    session = requests.Session()
+                    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    self._session = session
+        return self._session
+
+    @telemetry.timed("image")
     def generate_cover_image(
         self, 
         title: str, 
         category: str, 
-        keywords: list = None
+        keywords: Optional[list] = None
     ) -> Optional[str]:
         """Generate a cover image for a blog post.
         
@@ -51,30 +142,43 @@ class ImageGenerator:
         Returns:
             Relative path to generated image file, or None if failed
         """
+        if self.source == "procedural":
+            return self.generate_placeholder_image(title, category=category)
+        
         try:
             # Create descriptive prompt for DALL·E
             prompt = self._create_image_prompt(title, category, keywords)
+            
+            # Reuse the cover of an identical earlier prompt
+            key = None
+            if self.image_store is not None:
+                key = prompt_key(prompt, category)
+                stored = self.image_store.lookup(key)
+                if stored is not None:
+                    self._touch(stored)
+                    telemetry.incr("image_store.hits")
+                    console.print(f"[green]Reusing cover image for this prompt: {stored}[/green]")
+                    return f"images/{stored}"
+                telemetry.incr("image_store.misses")
+            
             console.print(f"[blue]Generating image with prompt: {prompt[:100]}...[/blue]")
             
             # Generate image using DALL·E
-            response = self.client.images.generate(
-                model="dall-e-3",
-                prompt=prompt,
-                size="1792x1024",  # High resolution for better quality
-                quality="standard",
-                n=1
-            )
+            with telemetry.span("image.generate"):
+                response = self._generate(prompt)
             
-            # Download the generated image
-            image_url = response.data[0].url
-            image_data = requests.get(image_url).content
+            # Decode the inline image, or download it from the returned URL
+            with telemetry.span("image.download", format=self.response_format):
+                image_file = self._read_image(response.data[0])
+            response = None  # Release the base64 payload before decoding
             
             # Process and optimize the image
             filename = self._create_filename(title)
             optimized_path = self._process_and_save_image(
-                image_data, 
+                image_file, 
                 filename,
-                target_size=(1200, 630)  # Social media optimized size
+                target_size=(1200, 630),  # Social media optimized size
+                key=key
             )
             
             if optimized_path:
@@ -82,17 +186,89 @@ class ImageGenerator:
                 # Return relative path for use in markdown
                 return f"images/{optimized_path.name}"
             
-            return None
-            
         except Exception as e:
             console.print(f"[red]Error generating cover image: {e}[/red]")
-            return None
+        
+        if self.fallback:
+            return self.generate_placeholder_image(title, category=category)
+        return None
+
+    def _generate(self, prompt: str):
+        """Generate an image on the routed models, falling back in order.
+        
+        Args:
+            prompt: Image prompt
+            
+        Returns:
+            Images response
+        """
+        route = self.router.route("image")
+        models = self.router.candidates("image")
+        for index, model in enumerate(models):
+            try:
+                with self.router.observe("image", model):
+                    return self.api_client.images(
+                        model=model,
+                        prompt=prompt,
+                        size="1792x1024",  # High resolution for better quality
+                        quality="standard",
+                        n=1,
+                        response_format=self.response_format,
+                        timeout=route.timeout
+                    )
+            except Exception as e:
+                if index == len(models) - 1:
+                    raise
+                console.print(f"[yellow]Image request to {model} failed ({e.__class__.__name__}), trying {models[index + 1]}[/yellow]")
+
+    def _read_image(self, item: Any) -> BinaryIO:
+        """Get the encoded image of a generation result as a file object.
+        
+        Args:
+            item: Entry of the images response's ``data`` list
+            
+        Returns:
+            Buffer holding the encoded image
+        """
+        if getattr(item, "b64_json", None):
+            return BytesIO(base64.b64decode(item.b64_json))
+        return self._download(item.url)
+
+    def _download(self, url: str) -> BinaryIO:
+        """Stream an image download into a buffer within the time and size limits.
+        
+        Args:
+            url: Image URL
+            
+        Returns:
+            Buffer holding the encoded image
+            
+        Raises:
+            TimeoutError: If the download does not finish within download_timeout
+            ValueError: If the image exceeds max_download_bytes
+        """
+        deadline = time.monotonic() + self.download_timeout
+        buffer = BytesIO()
+        response = self.session.get(url, timeout=self.download_timeout, stream=True)
+        try:
+            response.raise_for_status()
+            for chunk in response.iter_content(chunk_size=self.chunk_size):
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"image download timed out after {self.download_timeout:.0f}s")
+                buffer.write(chunk)
+                if buffer.tell() > self.max_download_bytes:
+                    raise ValueError(f"image larger than {self.max_download_bytes:,} bytes")
+        finally:
+            response.close()
+        telemetry.incr("image.download_bytes", buffer.tell())
+        buffer.seek(0)
+        return buffer
 
     def _create_image_prompt(
         self, 
         title: str, 
         category: str, 
-        keywords: list = None
+        keywords: Optional[list] = None
     ) -> str:
         """Create a descriptive prompt for DALL·E image generation.
         
@@ -108,16 +284,7 @@ class ImageGenerator:
         base_style = "modern, clean, professional, tech-inspired, minimalist"
         
         # Category-specific visual elements
-        category_styles = {
-            "AI & Machine Learning": "neural networks, data visualization, blue and purple gradients",
-            "Web Development": "code elements, browser interfaces, geometric patterns",
-            "Productivity": "organized layouts, productivity tools, calm colors",
-            "Tech News": "digital interface, news layout, modern typography",
-            "Software Engineering": "code snippets, development tools, structured design",
-            "Data Science": "charts, graphs, data visualization, analytical themes"
-        }
-        
-        category_style = category_styles.get(category, "technology, digital, modern")
+        category_style = CATEGORY_STYLES.get(category, DEFAULT_STYLE)
         
         # Clean title for prompt (remove special chars)
         clean_title = title.replace('"', '').replace("'", "")
@@ -158,25 +325,35 @@ class ImageGenerator:
         
         return f"{timestamp}-{safe_title}-{title_hash}.jpg"
 
+    @telemetry.timed("image.optimize")
     def _process_and_save_image(
         self, 
-        image_data: bytes, 
+        image_data: Union[bytes, BinaryIO], 
         filename: str,
-        target_size: Tuple[int, int] = (1200, 630)
+        target_size: Tuple[int, int] = (1200, 630),
+        key: Optional[str] = None
     ) -> Optional[Path]:
         """Process and optimize image for web use.
         
         Args:
-            image_data: Raw image data
-            filename: Target filename
+            image_data: Encoded image, as bytes or a file object (closed
+                once decoded)
+            filename: Target filename (replaced by a content digest with an
+                image store)
             target_size: Target dimensions (width, height)
+            key: Key of the prompt that produced the image, recorded in the
+                image store
             
         Returns:
-            Path to saved optimized image, or None if failed
+            Path to saved optimized image (an existing cover if the image
+            store holds one that looks the same), or None if failed
         """
         try:
-            # Load image
-            image = Image.open(BytesIO(image_data))
+            # Decode, then free the encoded bytes before resizing
+            source = BytesIO(image_data) if isinstance(image_data, (bytes, bytearray)) else image_data
+            image: "Image.Image" = Image.open(source)
+            image.load()
+            source.close()
             
             # Convert to RGB if necessary
             if image.mode != 'RGB':
@@ -185,72 +362,65 @@ class ImageGenerator:
             # Resize to target dimensions while maintaining aspect ratio
             image = ImageOps.fit(image, target_size, Image.Resampling.LANCZOS)
             
-            # Save with optimization
-            output_path = self.output_dir / filename
+            # An existing cover that looks the same replaces the new image
+            phash = None
+            if self.image_store is not None:
+                phash = perceptual_hash(image)
+                similar = self.image_store.find_similar(phash)
+                if similar is not None:
+                    self._touch(similar)
+                    if key:
+                        self.image_store.link(key, similar)
+                    telemetry.incr("image_store.similar")
+                    console.print(f"[blue]Generated image matches existing cover {similar}, reusing it[/blue]")
+                    return self.output_dir / similar
             
-            # Start with high quality and reduce if file is too large
-            quality = 85
-            while quality > 30:
-                buffer = BytesIO()
-                image.save(buffer, format='JPEG', quality=quality, optimize=True)
-                
-                if len(buffer.getvalue()) <= self.max_file_size:
-                    # File size is acceptable, save it
-                    with open(output_path, 'wb') as f:
-                        f.write(buffer.getvalue())
-                    
-                    console.print(
-                        f"[green]Optimized image: {len(buffer.getvalue())/1024:.1f}KB "
-                        f"at {quality}% quality[/green]"
-                    )
-                    return output_path
-                
-                quality -= 10
+            # Save with optimization: the highest quality under max_file_size
+            encoded = encode_jpeg(image, self.max_file_size)
+            telemetry.incr("image.encodes", encoded.encodes)
+            output_path = self._save(image, encoded.buffer.getbuffer(), filename, phash, key)
             
-            # If we can't get under size limit, save with minimum quality
-            with open(output_path, 'wb') as f:
-                image.save(f, format='JPEG', quality=30, optimize=True)
-            
-            console.print(
-                f"[yellow]Warning: Image saved at minimum quality to meet size limit[/yellow]"
-            )
+            if encoded.fits:
+                console.print(
+                    f"[green]Optimized image: {encoded.size/1024:.1f}KB "
+                    f"at {encoded.quality}% quality ({encoded.encodes} encodes)[/green]"
+                )
+            else:
+                console.print(
+                    f"[yellow]Warning: Image saved at minimum quality ({encoded.size/1024:.1f}KB), "
+                    f"still over the size limit[/yellow]"
+                )
             return output_path
             
         except Exception as e:
             console.print(f"[red]Error processing image: {e}[/red]")
             return None
 
+    @telemetry.timed("image.placeholder")
     def generate_placeholder_image(
         self, 
         title: str, 
-        size: Tuple[int, int] = (1200, 630)
+        size: Tuple[int, int] = (1200, 630),
+        category: Optional[str] = None
     ) -> Optional[str]:
-        """Generate a simple placeholder image when DALL·E is unavailable.
+        """Render a procedural cover when DALL·E is unavailable or not wanted.
         
         Args:
             title: Blog post title
             size: Image dimensions
+            category: Post category, which picks the gradient palette
             
         Returns:
             Relative path to placeholder image, or None if failed
         """
         try:
-            # Create simple gradient placeholder
-            width, height = size
-            image = Image.new('RGB', size, color='#1a1a1a')
-            
-            # Add some visual interest with a gradient effect
-            for y in range(height):
-                for x in range(width):
-                    # Simple gradient from dark to slightly lighter
-                    intensity = int(26 + (y / height) * 40)  # 26 to 66
-                    image.putpixel((x, y), (intensity, intensity, intensity))
+            image = render_cover(title, category, size)
             
             # Save placeholder
+            buffer = BytesIO()
+            image.save(buffer, format='JPEG', quality=80)
             filename = self._create_filename(f"placeholder-{title}")
-            output_path = self.output_dir / filename
-            
-            image.save(output_path, format='JPEG', quality=80)
+            output_path = self._save(image, buffer.getbuffer(), filename)
             
             console.print(f"[yellow]Created placeholder image: {output_path}[/yellow]")
             return f"images/{output_path.name}"
@@ -259,19 +429,106 @@ class ImageGenerator:
             console.print(f"[red]Error creating placeholder image: {e}[/red]")
             return None
 
+    def _save(
+        self,
+        image: "Image.Image",
+        data: Union[bytes, memoryview],
+        filename: str,
+        phash: Optional[str] = None,
+        key: Optional[str] = None
+    ) -> Path:
+        """Write an encoded cover and its variants.
+        
+        With an image store the file is named by a digest of its bytes, so
+        an identical cover is written only once, and recorded in the store.
+        
+        Args:
+            image: Decoded cover, for the responsive variants
+            data: Encoded JPEG (bytes or a buffer view)
+            filename: File name to use without an image store
+            phash: Perceptual hash of the cover
+            key: Key of the prompt that produced the cover
+            
+        Returns:
+            Path of the cover file
+        """
+        if self.image_store is not None:
+            filename = f"{content_digest(data)}.jpg"
+        output_path = self.output_dir / filename
+        if self.image_store is not None and output_path.exists():
+            self._touch(filename)
+            telemetry.incr("image_store.identical")
+        else:
+            with open(output_path, 'wb') as f:
+                f.write(data)
+            self._build_variants(image, filename)
+        if self.image_store is not None:
+            self.image_store.add(filename, len(data), phash, key)
+        return output_path
+
+    def _touch(self, filename: str) -> None:
+        """Mark a reused cover as recently used so cleanup_old_images keeps it."""
+        try:
+            os.utime(self.output_dir / filename)
+        except OSError as e:
+            console.print(f"[yellow]Warning: Could not touch {filename}: {e}[/yellow]")
+
+    def _build_variants(self, image: "Image.Image", filename: str) -> None:
+        """Render the responsive variants of a saved cover from its decoded image.
+        
+        Args:
+            image: Decoded cover
+            filename: Cover file name
+        """
+        if self.variants is None:
+            return
+        try:
+            variants = self.variants.build(image, filename)
+            console.print(
+                f"[green]Rendered {len(variants)} responsive variants "
+                f"({sum(v.bytes for v in variants) / 1024:.0f}KB)[/green]"
+            )
+        except Exception as e:
+            console.print(f"[yellow]Warning: Could not render responsive variants: {e}[/yellow]")
+
+    def srcsets(self, cover_path: Optional[str]) -> Dict[str, str]:
+        """Get the ``srcset`` values of a cover's responsive variants.
+        
+        Args:
+            cover_path: Relative cover path as returned by generate_cover_image
+            
+        Returns:
+            srcset per format, empty without variants
+        """
+        if not cover_path or self.variants is None:
+            return {}
+        return self.variants.manifest.srcsets(Path(cover_path).name)
+
     def cleanup_old_images(self, days_old: int = 30) -> None:
         """Remove old generated images to save space.
         
+        Covers recorded in the image store and covers or variants listed in
+        the variants manifest are still referenced and are kept.
+        
         Args:
             days_old: Remove images older than this many days
         """
         try:
-            import time
             current_time = time.time()
             cutoff_time = current_time - (days_old * 24 * 60 * 60)
             
+            referenced = set()
+            if self.image_store is not None:
+                referenced |= self.image_store.names()
+            if self.variants is not None:
+                referenced |= self.variants.manifest.files()
+            else:
+                referenced |= VariantManifest(self.output_dir / MANIFEST_NAME).files()
+            
             removed_count = 0
-            for image_file in self.output_dir.glob("*.jpg"):
+            for image_file in self.output_dir.iterdir():
+                if image_file.suffix not in (".jpg", ".webp", ".avif") or image_file.name in referenced:
+                    continue
                 if image_file.stat().st_mtime < cutoff_time:
                     image_file.unlink()
                     removed_count += 1
@@ -283,6 +540,7 @@ class ImageGenerator:
             console.print(f"[red]Error during image cleanup: {e}[/red]")
 
 
+@instrumented("images")
 def main():
     """CLI entry point for image generation testing."""
     import sys
@@ -0,0 +1,274 @@
+"""
+Keyword Scoring
+
+Ranks candidate topic keywords (single words and two-word phrases) across a
+whole batch of headlines, weighted by recency and source diversity.
+"""
+
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# A whole batch is joined with this separator and tokenized in one regex pass
+DOC_SEPARATOR = " \x1e "
+TOKEN_PATTERN = re.compile(r"\b[a-z]{3,}\b|\x1e")
+TAG_PATTERN = re.compile(r"<[^>\x1e]*>")
+
+# Token that stops bigrams from spanning stopwords and document boundaries
+BREAK = ""
+
+STOPWORDS = frozenset({
+    'the', 'and', 'for', 'are', 'but', 'not', 'you', 'all', 'can', 'had',
+    'her', 'was', 'one', 'our', 'out', 'day', 'get', 'has', 'him', 'his',
+    'how', 'man', 'new', 'now', 'old', 'see', 'two', 'way', 'who', 'boy',
+    'did', 'its', 'let', 'put', 'say', 'she', 'too', 'use', 'with', 'from',
+    'into', 'this', 'that', 'what', 'when', 'where', 'why', 'will', 'your',
+    'about', 'after', 'over', 'more', 'most', 'than', 'then', 'they', 'them',
+    'their', 'there', 'these', 'those', 'been', 'being', 'have', 'just',
+    'like', 'could', 'would', 'should', 'says', 'said', 'also', 'here',
+    'only', 'some', 'such', 'very', 'were', 'which', 'while',
+    'year', 'years', 'week', 'today', 'off', 'any', 'back', 'first', 'last',
+    'make', 'makes', 'made', 'may', 'many', 'much', 'via', 'amp', 'nbsp',
+    'quot', 'read', 'full', 'story', 'continue', 'reading', 'news',
+})
+
+
+@dataclass
+class KeywordScore:
+    """Score of a candidate keyword within a batch of topics."""
+    keyword: str
+    score: float
+    mentions: int
+    sources: int
+
+
+@lru_cache(maxsize=4096)
+def parse_published(value: str) -> Optional[datetime]:
+    """Parse an RSS/Atom publication date.
+
+    Args:
+        value: RFC 822 or ISO 8601 date string
+
+    Returns:
+        Timezone-aware datetime, or None if the value cannot be parsed
+    """
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+class KeywordScorer:
+    """Batch keyword scoring over unigrams and bigrams."""
+
+    def __init__(
+        self,
+        stopwords: Iterable[str] = STOPWORDS,
+        description_weight: float = 0.3,
+        bigram_weight: float = 1.5,
+        min_bigram_mentions: int = 2,
+        half_life_hours: float = 24.0,
+        min_recency_weight: float = 0.05,
+        candidate_pool: int = 500
+    ):
+        """Initialize the keyword scorer.
+
+        Args:
+            stopwords: Words that never form or start/end a keyword
+            description_weight: Weight of terms found only in the description
+            bigram_weight: Multiplier applied to two-word phrases
+            min_bigram_mentions: Minimum headlines a phrase must appear in
+            half_life_hours: Age at which an entry counts half as much
+            min_recency_weight: Floor for the recency weight of old entries
+            candidate_pool: Number of most-mentioned terms that get fully scored
+        """
+        self.stopwords = frozenset(stopwords)
+        self.description_weight = description_weight
+        self.bigram_weight = bigram_weight
+        self.min_bigram_mentions = min_bigram_mentions
+        self.half_life_hours = half_life_hours
+        self.min_recency_weight = min_recency_weight
+        self.candidate_pool = candidate_pool
+
+    def _tokenize(self, texts: List[str]) -> Tuple[List[str], List[str], List[int]]:
+        """Tokenize a batch of texts in a single pass.
+
+        Args:
+            texts: Headlines or descriptions
+
+        Returns:
+            Tokens and bigrams of the whole batch (stopwords and document
+            boundaries replaced by an empty break token), and the token
+            offset where each text starts
+        """
+        batch = TAG_PATTERN.sub(" ", DOC_SEPARATOR.join(texts).lower())
+        stopwords = self.stopwords
+        tokens = [BREAK if token in stopwords else token for token in TOKEN_PATTERN.findall(batch)]
+
+        starts = [0]
+        starts.extend(i + 1 for i, token in enumerate(tokens) if token == "\x1e")
+        tokens = [BREAK if token == "\x1e" else token for token in tokens]
+
+        bigrams = list(map("{} {}".format, tokens, tokens[1:]))
+        bigrams.append(BREAK)
+        return tokens, bigrams, starts
+
+    @staticmethod
+    def _document_terms(tokens: List[str], bigrams: List[str], starts: List[int]) -> List[Set[str]]:
+        """Split batch tokens back into per-document term sets.
+
+        Args:
+            tokens: Batch tokens from _tokenize()
+            bigrams: Batch bigrams from _tokenize()
+            starts: Token offsets from _tokenize()
+
+        Returns:
+            Set of unigrams and bigrams for each document
+        """
+        ends = starts[1:] + [len(tokens)]
+        documents = []
+        for start, end in zip(starts, ends):
+            terms = set(tokens[start:end])
+            terms.update(bigrams[start:end])
+            documents.append(terms)
+        return documents
+
+    def document_terms(self, topics: List[Dict[str, str]]) -> List[Set[str]]:
+        """Get the candidate keywords of each topic's headline.
+
+        Args:
+            topics: Topics with a title
+
+        Returns:
+            Unigrams and bigrams (without stopwords) of each headline
+        """
+        documents = self._document_terms(*self._tokenize([topic.get('title', '') for topic in topics]))
+        return [
+            {term for term in terms if term and term[0] != " " and term[-1] != " "}
+            for terms in documents
+        ]
+
+    def _recency_weight(self, published: str, now: datetime) -> float:
+        """Weight an entry by its age.
+
+        Args:
+            published: Publication date string
+            now: Reference time
+
+        Returns:
+            Exponential decay weight; 1.0 when the date is unknown
+        """
+        parsed = parse_published(published)
+        if parsed is None:
+            return 1.0
+        age_hours = max(0.0, (now - parsed).total_seconds() / 3600)
+        return max(self.min_recency_weight, 0.5 ** (age_hours / self.half_life_hours))
+
+    def rank(
+        self,
+        topics: List[Dict[str, str]],
+        exclude: Optional[Set[str]] = None,
+        limit: Optional[int] = None,
+        now: Optional[datetime] = None
+    ) -> List[KeywordScore]:
+        """Rank candidate keywords across a batch of topics.
+
+        Each headline counts once per term. The most-mentioned terms are
+        weighted by entry recency, boosted by the number of distinct sources
+        mentioning them, and keywords that overlap a better-ranked keyword
+        are dropped.
+
+        Args:
+            topics: Topics with title, description, published and source
+            exclude: Lowercase keywords that must not be returned
+            limit: Maximum number of keywords to return
+            now: Reference time for recency weighting
+
+        Returns:
+            Keyword scores, best first
+        """
+        now = now or datetime.now(timezone.utc)
+        exclude = exclude or set()
+        if not topics:
+            return []
+
+        # First pass: tokenize the batch and count every term with C-level Counters
+        title_batch = self._tokenize([topic.get('title', '') for topic in topics])
+        description_batch = self._tokenize([topic.get('description', '') for topic in topics])
+
+        occurrences = Counter(title_batch[0])
+        occurrences.update(title_batch[1])
+        occurrences.update(description_batch[0])
+        occurrences.update(description_batch[1])
+
+        candidates = set()
+        for term, count in occurrences.most_common(self.candidate_pool):
+            if not term or term[0] == " " or term[-1] == " " or term in exclude:
+                continue
+            if " " in term and count < self.min_bigram_mentions:
+                continue
+            candidates.add(term)
+
+        # Second pass: weight candidate terms once per document
+        weights: Dict[str, float] = dict.fromkeys(candidates, 0.0)
+        mentions: Dict[str, int] = dict.fromkeys(candidates, 0)
+        sources: Dict[str, Set[str]] = {term: set() for term in candidates}
+        documents = zip(
+            topics,
+            self._document_terms(*title_batch),
+            self._document_terms(*description_batch)
+        )
+        for topic, title_terms, description_terms in documents:
+            title_terms &= candidates
+            description_terms &= candidates
+            description_terms -= title_terms
+            if not title_terms and not description_terms:
+                continue
+
+            recency = self._recency_weight(topic.get('published', ''), now)
+            source = topic.get('source', '')
+            for terms, weight in (
+                (title_terms, recency),
+                (description_terms, recency * self.description_weight)
+            ):
+                for term in terms:
+                    weights[term] += weight
+                    mentions[term] += 1
+                    sources[term].add(source)
+
+        scores = []
+        for term, weight in weights.items():
+            if " " in term and mentions[term] < self.min_bigram_mentions:
+                continue
+            score = weight * (1 + math.log(len(sources[term])))
+            if " " in term:
+                score *= self.bigram_weight
+            scores.append(KeywordScore(term, round(score, 4), mentions[term], len(sources[term])))
+
+        scores.sort(key=lambda s: (-s.score, -s.mentions, s.keyword))
+
+        ranked: List[KeywordScore] = []
+        used_tokens: Set[str] = set()
+        for candidate in scores:
+            tokens = set(candidate.keyword.split())
+            if tokens & used_tokens:
+                continue
+            ranked.append(candidate)
+            used_tokens |= tokens
+            if limit and len(ranked) >= limit:
+                break
+
+        return ranked
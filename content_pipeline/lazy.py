@@ -0,0 +1,85 @@
+"""
+Lazy Imports
+
+Defers loading heavy third-party modules (openai, PIL, git, feedparser, ...)
+until an attribute is first used, so small CLI calls and the package import
+do not pay for the whole dependency graph.
+"""
+
+import importlib
+import sys
+import threading
+from types import ModuleType
+from typing import Dict
+
+_lock = threading.RLock()
+_proxies: Dict[str, "LazyModule"] = {}
+
+
+class LazyModule(ModuleType):
+    """Stand-in for a module that is imported on first attribute access.
+
+    Attribute reads are forwarded to the real module on every access, so
+    patches applied to the module (``patch("yaml.dump")``) are seen through
+    the proxy, and patches applied to the proxy shadow the module's attribute.
+    One proxy is shared per module name, so every pipeline module sees the
+    same patched attributes.
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_module"] = None
+
+    def _load(self) -> ModuleType:
+        """Import the real module (thread-safe, once)."""
+        module = self.__dict__["_module"]
+        if module is None:
+            with _lock:
+                module = self.__dict__["_module"]
+                if module is None:
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__["_module"] = module
+        return module
+
+    def __getattr__(self, attribute: str):
+        return getattr(self._load(), attribute)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__dict__["_module"] is not None else "not loaded"
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+def lazy_import(name: str) -> ModuleType:
+    """Import a module on first attribute access.
+
+    A module that is already imported is returned as is.
+
+    Args:
+        name: Dotted module name
+
+    Returns:
+        The module, or a shared lazy proxy for it
+    """
+    with _lock:
+        module = sys.modules.get(name)
+        if module is not None:
+            return module
+        proxy = _proxies.get(name)
+        if proxy is None:
+            proxy = _proxies[name] = LazyModule(name)
+        return proxy
+
+
+def is_loaded(name: str) -> bool:
+    """Check whether a module has actually been imported.
+
+    Args:
+        name: Dotted module name
+
+    Returns:
+        True if the module is in ``sys.modules``
+    """
+    return name in sys.modules
@@ -0,0 +1,196 @@
+"""
+LLM Response Cache
+
+Content-addressed disk cache for chat completion responses with TTL and
+LRU eviction under a byte budget.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from rich.console import Console
+
+console = Console()
+
+
+class ResponseCache:
+    """Disk-backed cache of LLM responses keyed by model, parameters and prompt."""
+
+    def __init__(
+        self,
+        directory: Optional[Path] = None,
+        ttl: float = 7 * 24 * 60 * 60,
+        max_bytes: int = 100 * 1024 * 1024,
+        enabled: bool = True
+    ):
+        """Initialize the response cache.
+
+        Args:
+            directory: Directory holding one JSON file per cached response
+            ttl: Maximum age of a cached response in seconds
+            max_bytes: Total size budget before least-recently-used entries are evicted
+            enabled: Set to False to bypass the cache entirely
+        """
+        self.directory = directory or Path(".cache/llm")
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._size: Optional[int] = None
+
+    @staticmethod
+    def make_key(params: Dict[str, Any]) -> str:
+        """Build a content-addressed key for a request.
+
+        Args:
+            params: Request parameters (model, messages, temperature, ...)
+
+        Returns:
+            SHA-256 hex digest of the canonical request
+        """
+        canonical = json.dumps(params, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        """Get the file path for a cache key."""
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached response.
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Cached payload, or None on a miss, expiry or when disabled
+        """
+        if not self.enabled:
+            return None
+
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (FileNotFoundError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        if time.time() - entry.get("created", 0) > self.ttl:
+            self._remove(path)
+            with self._lock:
+                self.misses += 1
+            return None
+
+        # Touch the file so eviction sees it as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        with self._lock:
+            self.hits += 1
+        return entry["value"]
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        """Store a response.
+
+        Args:
+            key: Cache key from make_key()
+            value: JSON-serializable payload
+        """
+        if not self.enabled:
+            return
+
+        path = self._path(key)
+        with self._lock:
+            self._current_size()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            data = json.dumps({"created": time.time(), "value": value}, ensure_ascii=False).encode("utf-8")
+            tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            previous = path.stat().st_size if path.exists() else 0
+            tmp_path.replace(path)
+        except Exception as e:
+            console.print(f"[yellow]Warning: Could not write LLM cache entry: {e}[/yellow]")
+            return
+
+        with self._lock:
+            self._size = self._current_size() + len(data) - previous
+            over_budget = self._size > self.max_bytes
+        if over_budget:
+            self._evict()
+
+    def _current_size(self) -> int:
+        """Get the total cache size, scanning the directory once per process."""
+        if self._size is None:
+            self._size = sum(path.stat().st_size for path in self.directory.glob("*/*.json"))
+        return self._size
+
+    def _remove(self, path: Path) -> None:
+        """Delete a cache file and account for its size."""
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except OSError:
+            return
+        with self._lock:
+            if self._size is not None:
+                self._size -= size
+
+    def _evict(self) -> None:
+        """Remove least-recently-used entries until the cache fits its budget."""
+        entries = []
+        for path in self.directory.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)  # Leave headroom so eviction is not run on every put
+        removed = 0
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+
+        with self._lock:
+            self._size = total
+            self.evictions += removed
+
+    def clear(self) -> None:
+        """Remove every cached response."""
+        for path in self.directory.glob("*/*.json"):
+            self._remove(path)
+
+    def stats(self) -> Dict[str, int]:
+        """Get cache counters.
+
+        Returns:
+            Hits, misses, evictions and current size in bytes
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "bytes": self._current_size()
+            }
@@ -0,0 +1,340 @@
+"""
+Content Manifest
+
+SQLite index of every post under content/ with its mtime, size, content hash
+and parsed front matter, so metadata consumers query one table instead of
+re-reading and re-parsing Markdown files.
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from rich.console import Console
+
+from .lazy import lazy_import
+
+yaml = lazy_import("yaml")
+
+console = Console()
+
+PELICAN_FIELD = re.compile(r"^([A-Za-z][\w-]*):\s*(.*)$")
+
+# Pelican metadata fields holding comma-separated lists
+LIST_FIELDS = ("tags", "authors")
+
+
+@dataclass
+class ManifestEntry:
+    """Manifest record of one post."""
+    # content_dir joined with the stored key
+    path: str
+    mtime: float
+    size: int
+    sha256: str
+    front_matter: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def title(self) -> Optional[str]:
+        """Post title from the front matter."""
+        title = self.front_matter.get("title")
+        return str(title) if title is not None else None
+
+
+def parse_front_matter(text: str) -> Dict[str, Any]:
+    """Parse YAML (``---`` delimited) or Pelican (``Key: value``) front matter.
+
+    Args:
+        text: Markdown file contents
+
+    Returns:
+        Front matter fields, empty if the file has none or it does not parse
+    """
+    if text.startswith("---"):
+        end = text.find("\n---", 3)
+        if end == -1:
+            return {}
+        try:
+            loaded = yaml.safe_load(text[3:end])
+        except yaml.YAMLError:
+            return {}
+        return loaded if isinstance(loaded, dict) else {}
+
+    data: Dict[str, Any] = {}
+    for line in text.splitlines():
+        match = PELICAN_FIELD.match(line)
+        if not match:
+            break
+        key, value = match.group(1).lower(), match.group(2).strip()
+        data[key] = [item.strip() for item in value.split(",") if item.strip()] if key in LIST_FIELDS else value
+    return data
+
+
+def _json_default(value: Any) -> str:
+    """Serialize dates YAML parsed from front matter."""
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+
+class ContentManifest:
+    """SQLite-backed manifest of the posts under content/."""
+
+    def __init__(self, path: Optional[Path] = None, content_dir: Optional[Path] = None):
+        """Initialize the manifest.
+
+        Args:
+            path: SQLite database file
+            content_dir: Directory of Markdown posts
+        """
+        self.path = path or Path(".cache/manifest.sqlite3")
+        self.content_dir = content_dir or Path("content")
+        self._root = self.content_dir.resolve()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS posts (
+                path TEXT PRIMARY KEY,
+                mtime REAL NOT NULL,
+                size INTEGER NOT NULL,
+                sha256 TEXT NOT NULL,
+                front_matter TEXT NOT NULL,
+                indexed_at TEXT NOT NULL
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS posts_mtime ON posts (mtime);
+            """
+        )
+        self._conn.commit()
+
+    def _key(self, filepath: Path) -> str:
+        """Key of a post: its path relative to content_dir.
+
+        Absolute and relative spellings of the same file (the publisher
+        roots content_dir at the repository, the generator uses ``content``)
+        map to one row.
+        """
+        try:
+            return filepath.relative_to(self.content_dir).as_posix()
+        except ValueError:
+            pass
+        try:
+            return filepath.resolve().relative_to(self._root).as_posix()
+        except ValueError:
+            return str(filepath)
+
+    def _entry(self, row: tuple) -> ManifestEntry:
+        """Build an entry from a posts row."""
+        key, mtime, size, sha256, front_matter = row
+        return ManifestEntry(str(self.content_dir / key), mtime, size, sha256, json.loads(front_matter))
+
+    def _write(self, entry: ManifestEntry) -> None:
+        """Insert or replace an entry (lock held, caller commits)."""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO posts (path, mtime, size, sha256, front_matter, indexed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                self._key(Path(entry.path)), entry.mtime, entry.size, entry.sha256,
+                json.dumps(entry.front_matter, default=_json_default),
+                datetime.now(timezone.utc).isoformat()
+            )
+        )
+
+    def _read(self, filepath: Path, front_matter: Optional[Dict[str, Any]] = None) -> ManifestEntry:
+        """Hash a post file and parse its front matter unless it is given.
+
+        Raises:
+            OSError: If the file cannot be read
+        """
+        stat = filepath.stat()
+        data = filepath.read_bytes()
+        if front_matter is None:
+            front_matter = parse_front_matter(data.decode("utf-8", errors="replace"))
+        return ManifestEntry(
+            str(self.content_dir / self._key(filepath)), stat.st_mtime, stat.st_size, hashlib.sha256(data).hexdigest(),
+            json.loads(json.dumps(front_matter, default=_json_default))
+        )
+
+    def record(self, filepath: Path, front_matter: Optional[Dict[str, Any]] = None) -> ManifestEntry:
+        """Add or refresh a post.
+
+        Args:
+            filepath: Markdown file of the post
+            front_matter: Front matter the caller just wrote; parsed from the file when omitted
+
+        Returns:
+            The post's manifest entry
+        """
+        entry = self._read(filepath, front_matter)
+        with self._lock:
+            self._write(entry)
+            self._conn.commit()
+        return entry
+
+    def get(self, filepath: Path) -> Optional[ManifestEntry]:
+        """Look up a post without touching the file.
+
+        Args:
+            filepath: Markdown file of the post
+
+        Returns:
+            Manifest entry, or None if the post is not in the manifest
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT path, mtime, size, sha256, front_matter FROM posts WHERE path = ?",
+                (self._key(filepath),)
+            ).fetchone()
+        return self._entry(row) if row else None
+
+    def lookup(self, filepath: Path) -> Optional[ManifestEntry]:
+        """Get a post's entry, re-parsing the file only if it changed.
+
+        Costs one ``stat`` when the manifest is current.
+
+        Args:
+            filepath: Markdown file of the post
+
+        Returns:
+            Current manifest entry, or None if the file does not exist
+        """
+        try:
+            stat = filepath.stat()
+        except OSError:
+            return None
+        entry = self.get(filepath)
+        if entry is not None and (entry.mtime, entry.size) == (stat.st_mtime, stat.st_size):
+            return entry
+        return self.record(filepath)
+
+    def entries(self) -> List[ManifestEntry]:
+        """Get every post, most recently modified first.
+
+        Returns:
+            Manifest entries
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path, mtime, size, sha256, front_matter FROM posts ORDER BY mtime DESC"
+            ).fetchall()
+        return [self._entry(row) for row in rows]
+
+    def recent(self, seconds: float) -> List[ManifestEntry]:
+        """Get the posts modified within the last ``seconds``.
+
+        Args:
+            seconds: Age limit
+
+        Returns:
+            Manifest entries, most recently modified first
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path, mtime, size, sha256, front_matter FROM posts WHERE mtime > ? ORDER BY mtime DESC",
+                (time.time() - seconds,)
+            ).fetchall()
+        return [self._entry(row) for row in rows]
+
+    def count(self) -> int:
+        """Number of posts in the manifest."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+
+    def rescan(self) -> Dict[str, int]:
+        """Bring the manifest in line with the Markdown files in content_dir.
+
+        Files whose mtime and size match their entry are not opened; changed
+        files are hashed and only re-parsed if their content hash differs.
+
+        Returns:
+            Counts of added, updated, touched (new mtime, same content),
+            unchanged and removed posts
+        """
+        counts = {"added": 0, "updated": 0, "touched": 0, "unchanged": 0, "removed": 0}
+        with self._lock:
+            known = {
+                path: (mtime, size, sha256, front_matter)
+                for path, mtime, size, sha256, front_matter in self._conn.execute(
+                    "SELECT path, mtime, size, sha256, front_matter FROM posts"
+                )
+            }
+        present = set()
+        changed: List[ManifestEntry] = []
+        for filepath in self.content_dir.rglob("*.md") if self.content_dir.exists() else []:
+            key = filepath.relative_to(self.content_dir).as_posix()
+            present.add(key)
+            previous = known.get(key)
+            try:
+                stat = filepath.stat()
+                if previous and previous[:2] == (stat.st_mtime, stat.st_size):
+                    counts["unchanged"] += 1
+                    continue
+                data = filepath.read_bytes()
+            except OSError as e:
+                console.print(f"[yellow]Warning: Could not read {filepath}: {e}[/yellow]")
+                continue
+            sha256 = hashlib.sha256(data).hexdigest()
+            if previous and previous[2] == sha256:
+                front_matter = json.loads(previous[3])
+                counts["touched"] += 1
+            else:
+                front_matter = json.loads(json.dumps(
+                    parse_front_matter(data.decode("utf-8", errors="replace")), default=_json_default
+                ))
+                counts["updated" if previous else "added"] += 1
+            changed.append(ManifestEntry(str(filepath), stat.st_mtime, stat.st_size, sha256, front_matter))
+
+        removed = set(known) - present
+        with self._lock:
+            for entry in changed:
+                self._write(entry)
+            self._conn.executemany("DELETE FROM posts WHERE path = ?", [(path,) for path in removed])
+            self._conn.commit()
+        counts["removed"] = len(removed)
+        return counts
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """CLI entry point: rescan content/ and report what changed."""
+    import argparse
+    import os
+
+    parser = argparse.ArgumentParser(description="Rescan the content manifest")
+    parser.add_argument("--content-dir", type=Path, default=Path("content"))
+    parser.add_argument(
+        "--manifest", type=Path,
+        default=Path(os.getenv("PIPELINE_CACHE_DIR", ".cache")) / "manifest.sqlite3"
+    )
+    parser.add_argument("--list", action="store_true", help="List every post after the rescan")
+    args = parser.parse_args(argv)
+
+    manifest = ContentManifest(args.manifest, args.content_dir)
+    started = time.perf_counter()
+    counts = manifest.rescan()
+    elapsed = time.perf_counter() - started
+    console.print(
+        f"[green]Rescanned {sum(counts.values()) - counts['removed']} posts in {elapsed:.2f}s: "
+        f"{counts['added']} added, {counts['updated']} updated, {counts['touched']} touched, "
+        f"{counts['removed']} removed[/green]"
+    )
+    if args.list:
+        for entry in manifest.entries():
+            console.print(f"{entry.path}  {entry.title or '(untitled)'}")
+    manifest.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Prompt Templates
+
+Versioned prompts for every chat stage. Each prompt is a static system
+message (the house style shared by all stages, then the stage's
+instructions) followed by a user message carrying only the per-post values,
+so the static part forms an identical prefix across requests that the API
+can serve from its prompt cache. Bump a template's version whenever its
+text changes; renders are counted per version in the run report.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List
+
+from .telemetry import telemetry
+
+# Shared by every stage, so it is the longest common prefix of all requests
+HOUSE_STYLE = """You write for a tech blog read by software engineers, tech professionals and
+productivity enthusiasts.
+
+House style:
+- Concise, lightly opinionated, professional but conversational
+- Actionable insights and practical applications over hype
+- Specific examples, case studies, statistics and data points where relevant
+- American English, no filler, no clickbait"""
+
+SOURCES_SECTION = """Source material from today's coverage (use its facts, figures and examples;
+do not copy sentences):
+{sources}"""
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    """A versioned prompt: static instructions plus a per-request template."""
+    name: str
+    version: int
+    instructions: str
+    request: str
+
+    @property
+    def id(self) -> str:
+        """Template name and version, e.g. "outline@v2"."""
+        return f"{self.name}@v{self.version}"
+
+    @property
+    def system(self) -> str:
+        """Static system message: house style, then the stage instructions."""
+        return f"{HOUSE_STYLE}\n\n{self.instructions}"
+
+    def messages(self, **values: str) -> List[Dict[str, str]]:
+        """Render the chat messages of one request.
+
+        Args:
+            **values: Fields of the request template
+
+        Returns:
+            System message followed by the user message
+        """
+        telemetry.incr(f"prompts.{self.id}")
+        return [
+            {"role": "system", "content": self.system},
+            {"role": "user", "content": self.request.format(**values).strip()},
+        ]
+
+
+OUTLINE = PromptTemplate(
+    name="outline",
+    version=2,
+    instructions="""Create a detailed outline for a 1200-word blog post about the topic given by the user.
+
+Requirements:
+- Focus on actionable insights and practical applications
+- Include 5-7 main sections with subpoints
+- Add specific examples and case studies where relevant
+- Include relevant statistics or data points
+- Ground the outline in the source material when the user provides it
+
+Format as a structured outline with Roman numerals and bullet points.""",
+    request="""Write the outline for a blog post about "{keyword}".
+
+{sources}"""
+)
+
+ARTICLE_REQUIREMENTS = """Write a comprehensive 1200-word blog post based on this outline; the user gives the topic
+and the outline.
+
+Requirements:
+- Write in Markdown format
+- Use clear, engaging headers (##, ###)
+- Include code examples where relevant (use ```language blocks)
+- Add actionable takeaways and practical tips
+- Include relevant statistics and data
+- End with a strong conclusion and call-to-action
+- Do not include title - just the body content"""
+
+ARTICLE = PromptTemplate(
+    name="article",
+    version=2,
+    instructions=ARTICLE_REQUIREMENTS,
+    request="""Topic: {keyword}
+
+Outline:
+{outline}"""
+)
+
+STRUCTURED_ARTICLE = PromptTemplate(
+    name="article.structured",
+    version=2,
+    instructions=f"""{ARTICLE_REQUIREMENTS}
+
+Also provide SEO metadata for the post: an SEO-optimized title (max 60 chars),
+a URL slug (lowercase, hyphens, max 50 chars), a meta description (150-160 chars),
+3 tweetable snippets (max 280 chars each), 3-5 relevant tags, a category and a
+brief summary (max 160 chars).""",
+    request=ARTICLE.request
+)
+
+SEO = PromptTemplate(
+    name="seo",
+    version=2,
+    instructions="""Based on the opening of an article given by the user, generate:
+
+1. SEO-optimized title (max 60 chars)
+2. URL slug (lowercase, hyphens, max 50 chars)
+3. Meta description (150-160 chars)
+4. 3 tweetable snippets (max 280 chars each)
+5. 3-5 relevant tags
+6. Category from the list given by the user
+7. Brief summary (max 160 chars)
+
+Respond in JSON format:
+{
+    "title": "...",
+    "slug": "...",
+    "meta_description": "...",
+    "tweets": ["...", "...", "..."],
+    "tags": ["...", "...", "..."],
+    "category": "...",
+    "summary": "..."
+}""",
+    request="""Article about "{keyword}".
+Categories: {categories}
+
+Article preview:
+{preview}..."""
+)
+
+PROMPTS = {template.name: template for template in (OUTLINE, ARTICLE, STRUCTURED_ARTICLE, SEO)}
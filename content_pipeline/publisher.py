@@ -10,27 +10,45 @@ from pathlib import Path
 from typing import Optional, List
 from datetime import datetime
 
-import git
 from rich.console import Console
 from rich.prompt import Confirm
 
+from .lazy import lazy_import
+from .manifest import ContentManifest
+from .telemetry import instrumented, telemetry
+
+git = lazy_import("git")
+
 console = Console()
 
 
 class Publisher:
     """Git-based publisher for blog content."""
 
-    def __init__(self, repo_path: Path = None, remote_name: str = "origin", branch: str = "main"):
+    def __init__(
+        self,
+        repo_path: Optional[Path] = None,
+        remote_name: str = "origin",
+        branch: str = "main",
+        manifest: Optional[ContentManifest] = None,
+        cache_dir: Optional[Path] = None
+    ):
         """Initialize the publisher.
         
         Args:
             repo_path: Path to Git repository (defaults to current directory)
             remote_name: Name of Git remote
             branch: Branch to push to
+            manifest: Content manifest for post metadata (defaults to the
+                one the generator maintains for the repository's content)
+            cache_dir: Directory of the pipeline caches (defaults to
+                ``.cache`` in the repository)
         """
         self.repo_path = repo_path or Path.cwd()
         self.remote_name = remote_name
         self.branch = branch
+        cache_dir = cache_dir or self.repo_path / ".cache"
+        self.manifest = manifest or ContentManifest(cache_dir / "manifest.sqlite3", self.repo_path / "content")
         
         try:
             self.repo = git.Repo(self.repo_path)
@@ -65,6 +83,7 @@ class Publisher:
             console.print(f"[red]Error checking Git status: {e}[/red]")
             return {}
 
+    @telemetry.timed("publish.stage")
     def stage_files(self, file_paths: List[Path]) -> bool:
         """Stage specific files for commit.
         
@@ -88,7 +107,13 @@ class Publisher:
             console.print(f"[red]Error staging files: {e}[/red]")
             return False
 
-    def commit_changes(self, message: str, author_name: str = None, author_email: str = None) -> Optional[str]:
+    @telemetry.timed("publish.commit")
+    def commit_changes(
+        self,
+        message: str,
+        author_name: Optional[str] = None,
+        author_email: Optional[str] = None
+    ) -> Optional[str]:
         """Commit staged changes.
         
         Args:
@@ -114,6 +139,7 @@ class Publisher:
             console.print(f"[red]Error committing changes: {e}[/red]")
             return None
 
+    @telemetry.timed("publish.push")
     def push_to_remote(self, force: bool = False) -> bool:
         """Push commits to remote repository.
         
@@ -143,7 +169,7 @@ class Publisher:
     def publish_content(
         self, 
         content_files: List[Path], 
-        commit_message: str = None,
+        commit_message: Optional[str] = None,
         auto_push: bool = True
     ) -> bool:
         """Publish content by staging, committing, and pushing.
@@ -205,25 +231,13 @@ class Publisher:
             # Get file information
             file_info = []
             for file_path in content_files:
-                if file_path.exists():
-                    # Try to extract title from markdown front matter
-                    title = "New Content"
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            content = f.read()
-                            if content.startswith('---'):
-                                front_matter_end = content.find('---', 3)
-                                if front_matter_end > 0:
-                                    import yaml
-                                    front_matter = yaml.safe_load(content[3:front_matter_end])
-                                    title = front_matter.get('title', title)
-                    except:
-                        pass
-                    
+                # Title and size come from the manifest; the file is only re-read if it changed
+                entry = self.manifest.lookup(file_path)
+                if entry is not None:
                     file_info.append({
                         "path": str(file_path),
-                        "title": title,
-                        "size": file_path.stat().st_size
+                        "title": entry.title or "New Content",
+                        "size": entry.size
                     })
             
             # Generate PR details
@@ -304,6 +318,7 @@ class Publisher:
             console.print(f"[red]Error analyzing old commits: {e}[/red]")
 
 
+@instrumented("publisher")
 def main():
     """CLI entry point for publishing operations."""
     import argparse
@@ -316,11 +331,16 @@ def main():
     parser.add_argument("--message", "-m", help="Commit message")
     parser.add_argument("--no-push", action="store_true", help="Don't push to remote")
     parser.add_argument("--dry-run", action="store_true", help="Show what would be done")
+    parser.add_argument(
+        "--rescan", action="store_true",
+        help="Rescan content/ first, for posts written outside the generator"
+    )
     
     args = parser.parse_args()
     
     try:
-        publisher = Publisher()
+        cache_dir = Path(os.getenv("PIPELINE_CACHE_DIR", ".cache"))
+        publisher = Publisher(cache_dir=cache_dir)
         
         # Check Git status
         status = publisher.check_git_status()
@@ -338,15 +358,15 @@ def main():
             content_files = [Path(f) for f in args.files]
         else:
             # Find recent content files
-            content_dir = Path("content")
+            content_dir = publisher.manifest.content_dir
             if content_dir.exists():
-                # Get files modified in the last hour
-                import time
-                recent_time = time.time() - 3600  # 1 hour ago
-                content_files = []
-                for md_file in content_dir.rglob("*.md"):
-                    if md_file.stat().st_mtime > recent_time:
-                        content_files.append(md_file)
+                # Posts modified in the last hour, as recorded by save_post
+                if args.rescan:
+                    publisher.manifest.rescan()
+                content_files = [
+                    Path(entry.path) for entry in publisher.manifest.recent(3600)
+                    if Path(entry.path).exists()
+                ]
             else:
                 console.print("[red]No content directory found and no files specified[/red]")
                 sys.exit(1)
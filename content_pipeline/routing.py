@@ -0,0 +1,247 @@
+"""
+Model Routing
+
+Per-stage model configuration (model, fallbacks, max tokens, temperature and
+timeout budget) plus live latency and failure tracking per stage and model,
+so light stages run on cheaper models and a model that keeps failing or
+drifting towards its timeout is demoted behind its fallbacks for a while.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from typing import Any, Deque, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from rich.console import Console
+
+from .telemetry import percentile, telemetry
+
+console = Console()
+
+# A model is demoted once its p95 latency reaches this fraction of the stage timeout
+SLOW_FRACTION = 0.8
+
+
+@dataclass(frozen=True)
+class StageRoute:
+    """Model settings of one pipeline stage."""
+    model: str
+    fallbacks: Tuple[str, ...] = ()
+    max_tokens: Optional[int] = None
+    temperature: Optional[float] = None
+    timeout: float = 60.0
+
+    @property
+    def models(self) -> Tuple[str, ...]:
+        """Primary model followed by its fallbacks."""
+        return (self.model,) + tuple(model for model in self.fallbacks if model != self.model)
+
+
+# The article keeps the full model; outline and SEO are short, low-risk
+# requests that a small model answers in a fraction of the time and cost.
+DEFAULT_ROUTES = {
+    "outline": StageRoute("gpt-4o-mini", fallbacks=("gpt-4o",), max_tokens=1000, temperature=0.7, timeout=30),
+    "article": StageRoute("gpt-4o", max_tokens=2500, temperature=0.7, timeout=120),
+    "article.structured": StageRoute("gpt-4o", max_tokens=3500, temperature=0.7, timeout=180),
+    "seo": StageRoute("gpt-4o-mini", fallbacks=("gpt-4o",), max_tokens=800, temperature=0.3, timeout=20),
+    "image": StageRoute("dall-e-3", timeout=90),
+}
+
+
+@dataclass
+class ModelHealth:
+    """Recent latency and failures of one model in one stage."""
+    latencies: Deque[float] = field(default_factory=deque)
+    calls: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    demotions: int = 0
+    demoted_until: float = 0.0
+
+
+class ModelRouter:
+    """Thread-safe stage-to-model router shared by the pipeline's API calls."""
+
+    def __init__(
+        self,
+        routes: Optional[Dict[str, StageRoute]] = None,
+        window: int = 20,
+        min_samples: int = 5,
+        failure_threshold: int = 3,
+        cooldown: float = 15 * 60
+    ):
+        """Initialize the router.
+
+        Args:
+            routes: Routes per stage name, merged over DEFAULT_ROUTES
+            window: Number of recent latencies kept per stage and model
+            min_samples: Latencies needed before a model can be demoted as slow
+            failure_threshold: Consecutive failures that demote a model
+            cooldown: Seconds a demoted model stays behind its fallbacks
+        """
+        self.routes = dict(DEFAULT_ROUTES, **(routes or {}))
+        self.window = window
+        self.min_samples = min_samples
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._health: Dict[Tuple[str, str], ModelHealth] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, env: Optional[Mapping[str, str]] = None) -> "ModelRouter":
+        """Build a router from MODEL_* environment variables.
+
+        ``MODEL_<STAGE>`` takes a comma-separated model list (primary first,
+        then fallbacks) and ``MODEL_<STAGE>_MAX_TOKENS``,
+        ``MODEL_<STAGE>_TEMPERATURE`` and ``MODEL_<STAGE>_TIMEOUT`` override the
+        rest of the route. Dots in stage names become underscores, e.g.
+        ``MODEL_ARTICLE_STRUCTURED``.
+
+        Args:
+            env: Environment mapping (defaults to os.environ)
+
+        Returns:
+            Configured ModelRouter
+        """
+        env = os.environ if env is None else env
+        routes = {}
+        for stage, route in DEFAULT_ROUTES.items():
+            prefix = "MODEL_" + stage.upper().replace(".", "_")
+            models = [model.strip() for model in env.get(prefix, "").split(",") if model.strip()]
+            if models:
+                route = replace(route, model=models[0], fallbacks=tuple(models[1:]))
+            if env.get(f"{prefix}_MAX_TOKENS"):
+                route = replace(route, max_tokens=int(env[f"{prefix}_MAX_TOKENS"]))
+            if env.get(f"{prefix}_TEMPERATURE"):
+                route = replace(route, temperature=float(env[f"{prefix}_TEMPERATURE"]))
+            if env.get(f"{prefix}_TIMEOUT"):
+                route = replace(route, timeout=float(env[f"{prefix}_TIMEOUT"]))
+            routes[stage] = route
+        return cls(
+            routes,
+            failure_threshold=int(env.get("MODEL_FAILURE_THRESHOLD", "3")),
+            cooldown=float(env.get("MODEL_DEMOTION_COOLDOWN", str(15 * 60)))
+        )
+
+    def route(self, stage: str) -> StageRoute:
+        """Get the configured route of a stage.
+
+        Args:
+            stage: Stage name, e.g. "outline"
+
+        Returns:
+            The stage's route
+
+        Raises:
+            KeyError: If the stage has no route
+        """
+        return self.routes[stage]
+
+    def _entry(self, stage: str, model: str) -> ModelHealth:
+        """Get the health record of a stage and model; caller holds the lock."""
+        key = (stage, model)
+        if key not in self._health:
+            self._health[key] = ModelHealth(latencies=deque(maxlen=self.window))
+        return self._health[key]
+
+    def candidates(self, stage: str) -> List[str]:
+        """List the models to try for a stage, in order.
+
+        Demoted models move behind the healthy ones but stay in the list as
+        a last resort.
+
+        Args:
+            stage: Stage name
+
+        Returns:
+            Model names
+        """
+        now = time.monotonic()
+        with self._lock:
+            models = self.routes[stage].models
+            demoted = [model for model in models if self._entry(stage, model).demoted_until > now]
+        return [model for model in models if model not in demoted] + demoted
+
+    def _demote(self, stage: str, model: str, health: ModelHealth, reason: str) -> None:
+        """Move a model behind its fallbacks for the cooldown; caller holds the lock."""
+        health.demoted_until = time.monotonic() + self.cooldown
+        health.demotions += 1
+        health.consecutive_failures = 0
+        health.latencies.clear()
+        telemetry.incr(f"routing.{stage}.demotions")
+        if len(self.routes[stage].models) > 1:
+            console.print(
+                f"[yellow]Demoting {model} for {stage} for {self.cooldown / 60:.0f} min ({reason})[/yellow]"
+            )
+
+    def record(self, stage: str, model: str, seconds: float, failed: bool = False) -> None:
+        """Record the outcome of one call.
+
+        Args:
+            stage: Stage name
+            model: Model that served the call
+            seconds: Wall-clock duration of the call
+            failed: Whether the call raised
+        """
+        with self._lock:
+            health = self._entry(stage, model)
+            health.calls += 1
+            if failed:
+                health.failures += 1
+                health.consecutive_failures += 1
+                if health.consecutive_failures >= self.failure_threshold:
+                    self._demote(stage, model, health, f"{health.consecutive_failures} failures in a row")
+                return
+
+            health.consecutive_failures = 0
+            health.latencies.append(seconds)
+            if len(health.latencies) >= self.min_samples:
+                p95 = percentile(list(health.latencies), 0.95)
+                budget = self.routes[stage].timeout * SLOW_FRACTION
+                if p95 > budget:
+                    self._demote(stage, model, health, f"p95 {p95:.1f}s over {budget:.1f}s")
+
+    @contextmanager
+    def observe(self, stage: str, model: str) -> Iterator[None]:
+        """Time a call to a model and record its outcome.
+
+        The call is also reported as a ``model.<name>`` telemetry span, so
+        the run report carries per-model latency percentiles.
+
+        Args:
+            stage: Stage name
+            model: Model being called
+        """
+        started = time.perf_counter()
+        try:
+            with telemetry.span(f"model.{model}", stage=stage):
+                yield
+        except Exception:
+            self.record(stage, model, time.perf_counter() - started, failed=True)
+            raise
+        self.record(stage, model, time.perf_counter() - started)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get latency and failure statistics.
+
+        Returns:
+            Per "stage/model" call and failure counts, p50/p95 latency and
+            whether the model is currently demoted
+        """
+        now = time.monotonic()
+        with self._lock:
+            return {
+                f"{stage}/{model}": {
+                    "calls": health.calls,
+                    "failures": health.failures,
+                    "p50": round(percentile(list(health.latencies), 0.50), 3),
+                    "p95": round(percentile(list(health.latencies), 0.95), 3),
+                    "demotions": health.demotions,
+                    "demoted": health.demoted_until > now,
+                }
+                for (stage, model), health in sorted(self._health.items())
+                if health.calls
+            }
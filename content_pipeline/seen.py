@@ -0,0 +1,237 @@
+"""
+Seen Index
+
+Persistent SQLite index of ingested feed entries and published keywords,
+so headlines that were already covered never reach the LLM again.
+"""
+
+import hashlib
+import re
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from rich.console import Console
+
+console = Console()
+
+# Query parameters that only track the click and never identify the story
+TRACKING_PARAMS = re.compile(r"^(utm_\w+|fbclid|gclid|mc_cid|mc_eid|ref|cmpid|ncid)$", re.IGNORECASE)
+
+# SQLite limits the number of bound parameters per statement
+QUERY_CHUNK_SIZE = 500
+
+
+def normalize_link(link: str) -> str:
+    """Normalize an article URL so trivially different links compare equal.
+
+    Args:
+        link: Article URL
+
+    Returns:
+        URL without scheme, ``www.``, fragment, tracking parameters or trailing slash
+    """
+    parts = urlsplit(link.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not TRACKING_PARAMS.match(key)
+    ))
+    path = parts.path.rstrip("/")
+    return urlunsplit(("", host, path, query, "")).lstrip("/")
+
+
+def normalize_title(title: str) -> str:
+    """Normalize a headline for hashing.
+
+    Args:
+        title: Headline text
+
+    Returns:
+        Lowercase headline with punctuation and extra whitespace removed
+    """
+    return " ".join(re.findall(r"[a-z0-9]+", title.lower()))
+
+
+def _digest(value: str) -> str:
+    """Hash a normalized value to a compact fixed-size key."""
+    return hashlib.blake2b(value.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def entry_keys(topic: Dict[str, str]) -> List[str]:
+    """Build the index keys for a feed entry.
+
+    Args:
+        topic: Topic dictionary with title and link
+
+    Returns:
+        Link key and title key (either may be missing for sparse entries)
+    """
+    keys = []
+    link = topic.get("link") or ""
+    if link:
+        keys.append("l:" + _digest(normalize_link(link)))
+    title = normalize_title(topic.get("title") or "")
+    if title:
+        keys.append("t:" + _digest(title))
+    return keys
+
+
+class SeenIndex:
+    """SQLite-backed index of seen entries and published keywords."""
+
+    def __init__(self, path: Optional[Path] = None):
+        """Initialize the seen index.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = path or Path(".cache/seen.sqlite3")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                first_seen TEXT NOT NULL,
+                covered_by TEXT
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS published (
+                keyword TEXT PRIMARY KEY,
+                slug TEXT NOT NULL,
+                published_at TEXT NOT NULL
+            ) WITHOUT ROWID;
+            """
+        )
+        self._conn.commit()
+
+    def _covered_keys(self, keys: List[str]) -> Set[str]:
+        """Look up which keys belong to already covered entries.
+
+        Args:
+            keys: Entry keys to check
+
+        Returns:
+            Subset of keys that are marked as covered
+        """
+        covered: Set[str] = set()
+        with self._lock:
+            for i in range(0, len(keys), QUERY_CHUNK_SIZE):
+                chunk = keys[i:i + QUERY_CHUNK_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key FROM entries WHERE covered_by IS NOT NULL AND key IN ({placeholders})",
+                    chunk
+                )
+                covered.update(row[0] for row in rows)
+        return covered
+
+    def filter_unseen(self, topics: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """Drop topics whose link or headline was already turned into a post.
+
+        Args:
+            topics: Topics from the current run
+
+        Returns:
+            Topics that have not been covered yet, in their original order
+        """
+        topic_keys = [entry_keys(topic) for topic in topics]
+        covered = self._covered_keys([key for keys in topic_keys for key in keys])
+        return [
+            topic for topic, keys in zip(topics, topic_keys)
+            if not any(key in covered for key in keys)
+        ]
+
+    def record_entries(self, topics: Iterable[Dict[str, str]]) -> None:
+        """Add the entries ingested by a run to the index.
+
+        Args:
+            topics: Topics from the current run
+        """
+        now = datetime.now(timezone.utc).isoformat()
+        rows = [(key, now) for topic in topics for key in entry_keys(topic)]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO entries (key, first_seen) VALUES (?, ?)", rows
+            )
+            self._conn.commit()
+
+    def record_post(self, keyword: str, slug: str, topics: Iterable[Dict[str, str]] = ()) -> None:
+        """Record a published post and the entries it covered.
+
+        Args:
+            keyword: Keyword the post was written about
+            slug: Slug of the published post
+            topics: Feed entries the post covered
+        """
+        now = datetime.now(timezone.utc).isoformat()
+        rows = [(key, now, slug) for topic in topics for key in entry_keys(topic)]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO entries (key, first_seen, covered_by) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET covered_by = excluded.covered_by",
+                rows
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO published (keyword, slug, published_at) VALUES (?, ?, ?)",
+                (keyword.lower(), slug, now)
+            )
+            self._conn.commit()
+
+    def published_keywords(self) -> Set[str]:
+        """Get all keywords that already have a post.
+
+        Returns:
+            Lowercase published keywords
+        """
+        with self._lock:
+            return {row[0] for row in self._conn.execute("SELECT keyword FROM published")}
+
+    def published_slug(self, keyword: str) -> Optional[str]:
+        """Get the slug of the post written about a keyword.
+
+        Args:
+            keyword: Topic keyword
+
+        Returns:
+            Slug of the existing post, or None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT slug FROM published WHERE keyword = ?", (keyword.lower(),)
+            ).fetchone()
+        return row[0] if row else None
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def covered_topics(keyword: str, topics: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    """Select the topics that mention a keyword.
+
+    Args:
+        keyword: Selected topic keyword
+        topics: Topics from the current run
+
+    Returns:
+        Topics whose headline or description mentions the keyword
+    """
+    needle = f" {normalize_title(keyword)} "
+    if not needle.strip():
+        return []
+    return [
+        topic for topic in topics
+        if needle in " {} ".format(normalize_title(
+            f"{topic.get('title', '')} {topic.get('description', '')}"
+        ))
+    ]
@@ -0,0 +1,381 @@
+"""
+Telemetry
+
+Lightweight run instrumentation: span timings, token usage and event
+counters collected across the pipeline, written as a JSON run report and an
+optional Prometheus textfile, plus an opt-in sampling profiler for CLI entry
+points.
+"""
+
+import functools
+import json
+import os
+import re
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from rich.console import Console
+
+console = Console()
+
+# Keep at most this many individual spans in the report; aggregates cover all of them
+MAX_REPORTED_SPANS = 2000
+
+METRIC_PREFIX = "aiblog"
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile.
+
+    Args:
+        values: Samples
+        fraction: Percentile as a fraction, e.g. 0.95
+
+    Returns:
+        Percentile value, or 0.0 without samples
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+
+def _usage_value(usage: Any, name: str) -> Optional[int]:
+    """Read a token count from a usage object or dict."""
+    value = usage.get(name) if isinstance(usage, dict) else getattr(usage, name, None)
+    return value if isinstance(value, int) else None
+
+
+class Telemetry:
+    """Thread-safe collector of spans, token usage and counters for one run."""
+
+    def __init__(self):
+        """Initialize an empty collector."""
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard everything recorded so far and restart the run clock."""
+        with self._lock:
+            self.started = time.time()
+            self._started_monotonic = time.perf_counter()
+            self.spans: List[Dict[str, Any]] = []
+            self.durations: Dict[str, List[float]] = {}
+            self.tokens: Dict[str, Counter] = {}
+            self.counters: Dict[str, float] = {}
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Dict[str, Any]]:
+        """Time a block of work.
+
+        Args:
+            name: Stage name, e.g. "outline" or "image.download"
+            **attributes: Extra context stored with the span (keyword, model, ...)
+
+        Yields:
+            The span's attribute dict, which the block may add to
+        """
+        started = time.perf_counter()
+        error = None
+        try:
+            yield attributes
+        except BaseException as e:
+            error = e.__class__.__name__
+            raise
+        finally:
+            duration = time.perf_counter() - started
+            record = {
+                "name": name,
+                "start": round(started - self._started_monotonic, 6),
+                "duration": round(duration, 6),
+                "thread": threading.current_thread().name,
+            }
+            if attributes:
+                record["attributes"] = attributes
+            if error:
+                record["error"] = error
+            with self._lock:
+                self.durations.setdefault(name, []).append(duration)
+                if len(self.spans) < MAX_REPORTED_SPANS:
+                    self.spans.append(record)
+                if error:
+                    key = f"{name}.errors"
+                    self.counters[key] = self.counters.get(key, 0) + 1
+
+    def timed(self, name: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        """Decorator that wraps every call of a function in a span.
+
+        Args:
+            name: Stage name
+
+        Returns:
+            Decorator
+        """
+        def decorate(function: Callable[..., Any]) -> Callable[..., Any]:
+            @functools.wraps(function)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                with self.span(name):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def incr(self, name: str, amount: float = 1) -> None:
+        """Increase an event counter (retries, cache hits, ...).
+
+        Args:
+            name: Counter name
+            amount: Increment
+        """
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def record_usage(self, model: Optional[str], usage: Any) -> None:
+        """Add the token usage of an API response.
+
+        Args:
+            model: Model name
+            usage: ``response.usage`` object or dict; ignored when missing
+        """
+        if usage is None:
+            return
+        counts = {
+            name: _usage_value(usage, name)
+            for name in ("prompt_tokens", "completion_tokens", "total_tokens")
+        }
+        details = usage.get("prompt_tokens_details") if isinstance(usage, dict) else getattr(usage, "prompt_tokens_details", None)
+        if details is not None:
+            counts["cached_tokens"] = _usage_value(details, "cached_tokens")
+
+        with self._lock:
+            totals = self.tokens.setdefault(model or "unknown", Counter())
+            for name, value in counts.items():
+                if value is not None:
+                    totals[name] += value
+            totals["requests"] += 1
+
+    def prompt_cache(self) -> Dict[str, Dict[str, Any]]:
+        """Summarize how much of each model's input was served from the prompt cache.
+
+        Returns:
+            Per model: prompt tokens, cached prompt tokens and their ratio
+        """
+        with self._lock:
+            return {
+                model: {
+                    "prompt_tokens": counts["prompt_tokens"],
+                    "cached_tokens": counts["cached_tokens"],
+                    "ratio": round(counts["cached_tokens"] / counts["prompt_tokens"], 4)
+                    if counts["prompt_tokens"] else 0.0
+                }
+                for model, counts in self.tokens.items()
+            }
+
+    def report(self) -> Dict[str, Any]:
+        """Build the run report.
+
+        Returns:
+            Run timing, per-stage aggregates, token usage, prompt cache
+            ratios, counters and spans
+        """
+        prompt_cache = self.prompt_cache()
+        with self._lock:
+            stages = {
+                name: {
+                    "count": len(values),
+                    "total": round(sum(values), 4),
+                    "p50": round(percentile(values, 0.50), 4),
+                    "p95": round(percentile(values, 0.95), 4),
+                    "max": round(max(values), 4)
+                }
+                for name, values in self.durations.items()
+            }
+            return {
+                "started": datetime.fromtimestamp(self.started, timezone.utc).isoformat(),
+                "duration": round(time.perf_counter() - self._started_monotonic, 4),
+                "stages": stages,
+                "tokens": {model: dict(counts) for model, counts in self.tokens.items()},
+                "prompt_cache": prompt_cache,
+                "counters": dict(self.counters),
+                "spans": list(self.spans)
+            }
+
+    def write_report(self, path: Path) -> None:
+        """Write the run report as JSON.
+
+        Args:
+            path: Output file
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        tmp_path.write_text(json.dumps(self.report(), indent=2), encoding="utf-8")
+        tmp_path.replace(path)
+
+    def prometheus(self) -> str:
+        """Render the run's metrics in Prometheus text exposition format.
+
+        Returns:
+            Metrics text for a node_exporter textfile collector
+        """
+        report = self.report()
+        duration = f"{METRIC_PREFIX}_stage_duration_seconds"
+        lines = [
+            f"# HELP {METRIC_PREFIX}_run_duration_seconds Wall-clock duration of the last run.",
+            f"# TYPE {METRIC_PREFIX}_run_duration_seconds gauge",
+            f"{METRIC_PREFIX}_run_duration_seconds {report['duration']}",
+            f"# HELP {METRIC_PREFIX}_run_timestamp_seconds Start time of the last run.",
+            f"# TYPE {METRIC_PREFIX}_run_timestamp_seconds gauge",
+            f"{METRIC_PREFIX}_run_timestamp_seconds {self.started:.0f}",
+            f"# HELP {duration} Duration of pipeline stages in the last run.",
+            f"# TYPE {duration} summary",
+        ]
+        for stage, stats in sorted(report["stages"].items()):
+            label = f'stage="{_label(stage)}"'
+            lines.append(f'{duration}{{{label},quantile="0.5"}} {stats["p50"]}')
+            lines.append(f'{duration}{{{label},quantile="0.95"}} {stats["p95"]}')
+            lines.append(f"{duration}_sum{{{label}}} {stats['total']}")
+            lines.append(f"{duration}_count{{{label}}} {stats['count']}")
+
+        lines.append(f"# HELP {METRIC_PREFIX}_tokens Tokens used by the last run.")
+        lines.append(f"# TYPE {METRIC_PREFIX}_tokens gauge")
+        for model, counts in sorted(report["tokens"].items()):
+            for kind, value in sorted(counts.items()):
+                lines.append(f'{METRIC_PREFIX}_tokens{{model="{_label(model)}",kind="{_label(kind)}"}} {value}')
+
+        lines.append(f"# HELP {METRIC_PREFIX}_prompt_cache_ratio Share of prompt tokens served from the provider's prompt cache.")
+        lines.append(f"# TYPE {METRIC_PREFIX}_prompt_cache_ratio gauge")
+        for model, cache in sorted(report["prompt_cache"].items()):
+            lines.append(f'{METRIC_PREFIX}_prompt_cache_ratio{{model="{_label(model)}"}} {cache["ratio"]}')
+
+        lines.append(f"# HELP {METRIC_PREFIX}_events Event counts of the last run (retries, cache hits, ...).")
+        lines.append(f"# TYPE {METRIC_PREFIX}_events gauge")
+        for name, value in sorted(report["counters"].items()):
+            lines.append(f'{METRIC_PREFIX}_events{{name="{_label(name)}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: Path) -> None:
+        """Write metrics to a Prometheus textfile, atomically.
+
+        Args:
+            path: Output ``.prom`` file
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        tmp_path.write_text(self.prometheus(), encoding="utf-8")
+        tmp_path.replace(path)
+
+
+def _label(value: str) -> str:
+    """Escape a Prometheus label value."""
+    return re.sub(r'(["\\])', r"\\\1", str(value)).replace("\n", " ")
+
+
+class SamplingProfiler:
+    """Stack-sampling profiler writing collapsed stacks for flame graphs."""
+
+    def __init__(self, interval: float = 0.005):
+        """Initialize the profiler.
+
+        Args:
+            interval: Seconds between samples
+        """
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _sample(self) -> None:
+        """Record the current stack of every other thread."""
+        own = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            stack = [
+                f"{entry.name} ({Path(entry.filename).name}:{entry.lineno})"
+                for entry in traceback.extract_stack(frame)
+            ]
+            self.samples[";".join([names.get(ident, str(ident))] + stack)] += 1
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self) -> None:
+        """Start sampling in a daemon thread."""
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def write(self, path: Path) -> None:
+        """Write collapsed stacks (``frame;frame;frame count``), one per line.
+
+        Args:
+            path: Output file, readable by flamegraph.pl and speedscope
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+# Shared collector for the current process
+telemetry = Telemetry()
+
+
+def instrumented(name: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorator for CLI entry points: run span, outputs and opt-in profiling.
+
+    Outputs are controlled by environment variables so every entry point
+    behaves the same:
+
+    - ``PIPELINE_REPORT``: path of the JSON run report
+    - ``PIPELINE_METRICS``: path of the Prometheus textfile
+    - ``PIPELINE_PROFILE``: path of collapsed profiler stacks (enables sampling)
+    - ``PIPELINE_PROFILE_INTERVAL``: seconds between profiler samples
+
+    Args:
+        name: Span name of the entry point, e.g. "generator"
+
+    Returns:
+        Decorator
+    """
+    def decorate(main: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(main)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            profile_path = os.getenv("PIPELINE_PROFILE")
+            profiler = None
+            if profile_path:
+                profiler = SamplingProfiler(float(os.getenv("PIPELINE_PROFILE_INTERVAL", "0.005")))
+                profiler.start()
+            try:
+                with telemetry.span(name):
+                    return main(*args, **kwargs)
+            finally:
+                try:
+                    if profiler is not None:
+                        profiler.stop()
+                        profiler.write(Path(str(profile_path)))
+                        console.print(f"[blue]Profile written to {profile_path}[/blue]")
+                    report_path = os.getenv("PIPELINE_REPORT")
+                    if report_path:
+                        telemetry.write_report(Path(report_path))
+                        console.print(f"[blue]Run report written to {report_path}[/blue]")
+                    metrics_path = os.getenv("PIPELINE_METRICS")
+                    if metrics_path:
+                        telemetry.write_prometheus(Path(metrics_path))
+                except Exception as e:
+                    console.print(f"[yellow]Warning: Could not write telemetry: {e}[/yellow]")
+        return wrapper
+    return decorate
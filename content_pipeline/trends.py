@@ -0,0 +1,349 @@
+"""
+Trend Store
+
+Append-only SQLite time series of keyword mentions per day, fed with every
+ingested feed entry exactly once, and a query API that ranks keywords by how
+far their recent mention rate rises above their own baseline.
+"""
+
+import math
+import sqlite3
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from rich.console import Console
+
+from .keywords import KeywordScorer, parse_published
+from .seen import QUERY_CHUNK_SIZE, entry_keys
+
+console = Console()
+
+EPOCH = date(1970, 1, 1)
+
+
+def day_number(moment: datetime) -> int:
+    """Days since 1970-01-01 (UTC) of a moment."""
+    return (moment.astimezone(timezone.utc).date() - EPOCH).days
+
+
+@dataclass
+class TrendScore:
+    """Momentum of a keyword: recent mention rate against its baseline."""
+    keyword: str
+    recent: int
+    baseline: int
+    z_score: float
+    velocity: float
+
+
+class TrendStore:
+    """SQLite-backed daily keyword counts with rising-keyword queries."""
+
+    def __init__(self, path: Optional[Path] = None, scorer: Optional[KeywordScorer] = None):
+        """Initialize the trend store.
+
+        Args:
+            path: SQLite database file
+            scorer: Tokenizer shared with keyword ranking, so counted terms
+                match the candidate keywords
+        """
+        self.path = path or Path(".cache/trends.sqlite3")
+        self.scorer = scorer or KeywordScorer()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS counts (
+                day INTEGER NOT NULL,
+                term TEXT NOT NULL,
+                mentions INTEGER NOT NULL,
+                PRIMARY KEY (day, term)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS counts_term ON counts (term, day);
+            CREATE TABLE IF NOT EXISTS days (
+                day INTEGER PRIMARY KEY,
+                documents INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS ingested (
+                key TEXT PRIMARY KEY,
+                day INTEGER NOT NULL
+            ) WITHOUT ROWID;
+            """
+        )
+        self._conn.commit()
+
+    def _new_keys(self, keys: List[str]) -> set:
+        """Filter out entry keys that were already counted (lock held)."""
+        known: Set[str] = set()
+        for i in range(0, len(keys), QUERY_CHUNK_SIZE):
+            chunk = keys[i:i + QUERY_CHUNK_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            known.update(
+                row[0] for row in self._conn.execute(f"SELECT key FROM ingested WHERE key IN ({placeholders})", chunk)
+            )
+        return set(keys) - known
+
+    def ingest(self, topics: Iterable[Dict[str, str]], now: Optional[datetime] = None) -> int:
+        """Count the keywords of newly seen feed entries.
+
+        Entries already ingested by an earlier run (same link or headline)
+        are skipped. Each entry is counted on its publication day, or on the
+        current day if it has no usable date.
+
+        Args:
+            topics: Topics from the current run
+            now: Reference time (defaults to now)
+
+        Returns:
+            Number of entries counted
+        """
+        now = now or datetime.now(timezone.utc)
+        today = day_number(now)
+        topics = list(topics)
+        keyed = [(topic, entry_keys(topic)) for topic in topics]
+        with self._lock:
+            fresh = self._new_keys([key for _, keys in keyed for key in keys])
+            new_topics: List[Tuple[Dict, int]] = []
+            rows: List[Tuple[str, int]] = []
+            seen: Set[str] = set()
+            for topic, keys in keyed:
+                if not keys or not all(key in fresh for key in keys) or seen.intersection(keys):
+                    continue
+                seen.update(keys)
+                published = parse_published(topic.get("published", ""))
+                day = min(today, day_number(published)) if published else today
+                new_topics.append((topic, day))
+                rows.extend((key, day) for key in keys)
+            if not new_topics:
+                return 0
+
+            counts: Counter = Counter()
+            documents: Counter = Counter()
+            terms = self.scorer.document_terms([topic for topic, _ in new_topics])
+            for (_, day), document in zip(new_topics, terms):
+                documents[day] += 1
+                counts.update((day, term) for term in document)
+
+            self._conn.executemany("INSERT OR IGNORE INTO ingested (key, day) VALUES (?, ?)", rows)
+            self._conn.executemany(
+                "INSERT INTO counts (day, term, mentions) VALUES (?, ?, ?) "
+                "ON CONFLICT(day, term) DO UPDATE SET mentions = mentions + excluded.mentions",
+                [(day, term, mentions) for (day, term), mentions in counts.items()]
+            )
+            self._conn.executemany(
+                "INSERT INTO days (day, documents) VALUES (?, ?) "
+                "ON CONFLICT(day) DO UPDATE SET documents = documents + excluded.documents",
+                list(documents.items())
+            )
+            self._conn.commit()
+        return len(new_topics)
+
+    def _documents(self, start: int, end: int) -> int:
+        """Number of entries counted from day ``start`` to ``end`` inclusive (lock held)."""
+        return self._conn.execute(
+            "SELECT COALESCE(SUM(documents), 0) FROM days WHERE day BETWEEN ? AND ?", (start, end)
+        ).fetchone()[0]
+
+    @staticmethod
+    def _score(recent: int, baseline: int, recent_documents: int, baseline_documents: int) -> Tuple[float, float]:
+        """Compare a keyword's recent mention rate with its baseline rate.
+
+        The baseline rate is smoothed with one pseudo-mention so keywords
+        never seen before get a finite score, and the z-score uses the
+        binomial standard error of the recent rate under the baseline rate.
+        Without any baseline entries there is no momentum to measure.
+
+        Returns:
+            (z-score, velocity as recent rate over baseline rate)
+        """
+        if not baseline_documents:
+            return 0.0, 1.0
+        expected = min((baseline + 1) / (baseline_documents + 1), 0.999)
+        observed = recent / recent_documents
+        error = math.sqrt(expected * (1 - expected) / recent_documents)
+        return (observed - expected) / error, observed / expected
+
+    def rising(
+        self,
+        limit: int = 20,
+        recent_days: int = 1,
+        baseline_days: int = 28,
+        min_mentions: int = 3,
+        now: Optional[datetime] = None
+    ) -> List[TrendScore]:
+        """Rank keywords whose recent mention rate rises above their baseline.
+
+        Only the rows of the recent and baseline windows are read (a range
+        scan on the day key), so the query cost does not grow with history.
+
+        Args:
+            limit: Maximum number of keywords to return
+            recent_days: Days in the recent window, ending today
+            baseline_days: Days in the baseline window before it
+            min_mentions: Minimum recent mentions of a returned keyword
+            now: Reference time (defaults to now)
+
+        Returns:
+            Trend scores, highest z-score first
+        """
+        scores = self._window_scores(recent_days, baseline_days, min_mentions, now)
+        scores.sort(key=lambda score: (-score.z_score, -score.recent, score.keyword))
+        return scores[:limit]
+
+    def momentum(
+        self,
+        keywords: Iterable[str],
+        recent_days: int = 1,
+        baseline_days: int = 28,
+        min_mentions: int = 2,
+        now: Optional[datetime] = None
+    ) -> Dict[str, TrendScore]:
+        """Get the trend scores of specific keywords.
+
+        Args:
+            keywords: Keywords to look up (case-insensitive)
+            recent_days: Days in the recent window, ending today
+            baseline_days: Days in the baseline window before it
+            min_mentions: Minimum recent mentions for a keyword to be scored
+            now: Reference time (defaults to now)
+
+        Returns:
+            Trend score per lowercase keyword; keywords with too few recent
+            mentions are missing
+        """
+        terms = {keyword.lower() for keyword in keywords}
+        if not terms:
+            return {}
+        return {
+            score.keyword: score
+            for score in self._window_scores(recent_days, baseline_days, min_mentions, now, terms)
+        }
+
+    def _window_scores(
+        self,
+        recent_days: int,
+        baseline_days: int,
+        min_mentions: int,
+        now: Optional[datetime],
+        terms: Optional[set] = None
+    ) -> List[TrendScore]:
+        """Score every keyword (or the given ones) over the two windows."""
+        today = day_number(now or datetime.now(timezone.utc))
+        recent_start = today - recent_days + 1
+        baseline_start = recent_start - baseline_days
+        query = (
+            "SELECT term, "
+            "SUM(CASE WHEN day >= :recent THEN mentions ELSE 0 END) AS recent, "
+            "SUM(CASE WHEN day < :recent THEN mentions ELSE 0 END) AS baseline "
+            "FROM counts WHERE day BETWEEN :start AND :today {filter}"
+            "GROUP BY term HAVING recent >= :min_mentions"
+        )
+        params = {"recent": recent_start, "start": baseline_start, "today": today, "min_mentions": min_mentions}
+        with self._lock:
+            recent_documents = self._documents(recent_start, today)
+            baseline_documents = self._documents(baseline_start, recent_start - 1)
+            if not recent_documents:
+                return []
+            if terms is None:
+                rows = self._conn.execute(query.format(filter=""), params).fetchall()
+            else:
+                rows = []
+                ordered = sorted(terms)
+                for i in range(0, len(ordered), QUERY_CHUNK_SIZE):
+                    chunk = ordered[i:i + QUERY_CHUNK_SIZE]
+                    names = {f"t{j}": term for j, term in enumerate(chunk)}
+                    rows.extend(self._conn.execute(
+                        query.format(filter=f"AND term IN ({','.join(':' + name for name in names)}) "),
+                        dict(params, **names)
+                    ).fetchall())
+        scores = []
+        for term, recent, baseline in rows:
+            z_score, velocity = self._score(recent, baseline, recent_documents, baseline_documents)
+            scores.append(TrendScore(term, recent, baseline, round(z_score, 3), round(velocity, 3)))
+        return scores
+
+    def series(self, keyword: str, days: int = 30, now: Optional[datetime] = None) -> List[Tuple[date, int]]:
+        """Get a keyword's daily mention counts.
+
+        Args:
+            keyword: Keyword (case-insensitive)
+            days: Number of days, ending today
+            now: Reference time (defaults to now)
+
+        Returns:
+            (day, mentions) for every day in the range, zero-filled
+        """
+        today = day_number(now or datetime.now(timezone.utc))
+        start = today - days + 1
+        with self._lock:
+            counts = dict(self._conn.execute(
+                "SELECT day, mentions FROM counts WHERE term = ? AND day BETWEEN ? AND ?",
+                (keyword.lower(), start, today)
+            ).fetchall())
+        return [(EPOCH + timedelta(days=day), counts.get(day, 0)) for day in range(start, today + 1)]
+
+    def compact(self, keep_days: int = 365, now: Optional[datetime] = None) -> int:
+        """Drop counts and ingested entry keys older than ``keep_days``.
+
+        Args:
+            keep_days: Days of history to keep
+            now: Reference time (defaults to now)
+
+        Returns:
+            Number of count rows deleted
+        """
+        cutoff = day_number(now or datetime.now(timezone.utc)) - keep_days
+        with self._lock:
+            deleted = self._conn.execute("DELETE FROM counts WHERE day < ?", (cutoff,)).rowcount
+            self._conn.execute("DELETE FROM days WHERE day < ?", (cutoff,))
+            self._conn.execute("DELETE FROM ingested WHERE day < ?", (cutoff,))
+            self._conn.commit()
+        return deleted
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """CLI entry point: list rising keywords or one keyword's history."""
+    import argparse
+    import os
+
+    parser = argparse.ArgumentParser(description="Query the keyword trend store")
+    parser.add_argument(
+        "--store", type=Path,
+        default=Path(os.getenv("PIPELINE_CACHE_DIR", ".cache")) / "trends.sqlite3"
+    )
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--recent-days", type=int, default=1)
+    parser.add_argument("--baseline-days", type=int, default=28)
+    parser.add_argument("--series", metavar="KEYWORD", help="Print the daily counts of one keyword")
+    parser.add_argument("--compact", type=int, metavar="DAYS", help="Drop history older than DAYS")
+    args = parser.parse_args(argv)
+
+    store = TrendStore(args.store)
+    if args.compact:
+        console.print(f"[green]Deleted {store.compact(args.compact)} rows[/green]")
+    elif args.series:
+        for day, mentions in store.series(args.series, args.baseline_days + args.recent_days):
+            console.print(f"{day.isoformat()}  {mentions:4d}  {'#' * mentions}")
+    else:
+        for score in store.rising(args.limit, args.recent_days, args.baseline_days):
+            console.print(
+                f"{score.keyword:30s} z={score.z_score:7.2f}  x{score.velocity:6.2f}  "
+                f"recent={score.recent}  baseline={score.baseline}"
+            )
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
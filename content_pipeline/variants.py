@@ -0,0 +1,350 @@
+"""
+Responsive Image Variants
+
+Renders every responsive width of a cover in JPEG, WebP and (when Pillow was
+built with it) AVIF from one decoded image: widths are produced largest first,
+each downscaled from the previous one, so the chain resamples progressively
+smaller images instead of the full-size source every time. Bulk runs spread
+covers over a process pool. Generated files are listed in a JSON manifest
+that the pipeline turns into ``srcset`` front matter.
+"""
+
+import json
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterator, List, Mapping, Optional, Sequence, Set, Tuple
+
+from rich.console import Console
+
+from .encoding import encode_jpeg
+from .lazy import lazy_import
+from .telemetry import instrumented, telemetry
+
+if TYPE_CHECKING:
+    from PIL import Image, features
+else:
+    Image = lazy_import("PIL.Image")
+    features = lazy_import("PIL.features")
+
+console = Console()
+
+# Mirrors OPTIMIZE_IMAGES_RESPONSIVE_SIZES in publishconf.py
+RESPONSIVE_SIZES = (300, 600, 900, 1200)
+
+# Preferred order, best compression first; JPEG is the universal fallback
+FORMATS = ("avif", "webp", "jpeg")
+EXTENSIONS = {"avif": "avif", "webp": "webp", "jpeg": "jpg"}
+SAVE_OPTIONS = {
+    "avif": {"quality": 55, "speed": 8},
+    "webp": {"quality": 80, "method": 4},
+}
+
+MANIFEST_NAME = "variants.json"
+
+# Variant files are named "<cover stem>-<width>w.<ext>"
+VARIANT_NAME = re.compile(r"-\d+w\.(?:jpg|webp|avif)$")
+
+
+@dataclass
+class Variant:
+    """One rendered width and format of a cover."""
+    width: int
+    height: int
+    format: str
+    path: str
+    bytes: int
+
+
+def available_formats() -> Tuple[str, ...]:
+    """Variant formats this Pillow build can encode.
+
+    Returns:
+        Format names in preference order
+    """
+    supported = []
+    for name in FORMATS:
+        try:
+            if name == "jpeg" or features.check(name):
+                supported.append(name)
+        except Exception:  # Older Pillow versions do not know the feature
+            continue
+    return tuple(supported)
+
+
+def downscale_chain(image: "Image.Image", widths: Sequence[int]) -> Iterator[Tuple[int, "Image.Image"]]:
+    """Downscale an image to each width, largest first, each from the previous.
+
+    Widths above the image's own width are skipped rather than upscaled.
+
+    Args:
+        image: Source image
+        widths: Target widths
+
+    Yields:
+        (width, image) pairs in descending width
+    """
+    current = image
+    for width in sorted({w for w in widths if w <= image.width}, reverse=True):
+        if width != current.width:
+            height = max(1, round(image.height * width / image.width))
+            current = current.resize((width, height), Image.Resampling.LANCZOS)
+        yield width, current
+
+
+def render_variants(
+    image: "Image.Image",
+    stem: str,
+    output_dir: Path,
+    widths: Sequence[int] = RESPONSIVE_SIZES,
+    formats: Optional[Sequence[str]] = None,
+    max_bytes: int = 400 * 1024,
+    source: Optional[str] = None
+) -> List[Variant]:
+    """Render every width and format of a decoded image.
+
+    Args:
+        image: Decoded RGB source image
+        stem: File name stem shared by the variants
+        output_dir: Directory to write the variants to
+        widths: Responsive widths
+        formats: Formats to encode (defaults to every available one)
+        max_bytes: JPEG byte budget at the source width, scaled by area
+            for smaller widths
+        source: Name of an existing JPEG of the image in ``output_dir``,
+            listed as the full-width JPEG variant instead of re-encoding it
+
+    Returns:
+        The written variants
+    """
+    formats = formats or available_formats()
+    variants = []
+    for width, scaled in downscale_chain(image, widths):
+        for name in formats:
+            path = output_dir / f"{stem}-{width}w.{EXTENSIONS[name]}"
+            if name == "jpeg" and source and width == image.width:
+                path = output_dir / source
+                size = path.stat().st_size
+            elif name == "jpeg":
+                budget = max(1024, int(max_bytes * (width / image.width) ** 2))
+                encoded = encode_jpeg(scaled, budget)
+                encoded.write(path)
+                size = encoded.size
+            else:
+                scaled.save(path, format=name.upper(), **SAVE_OPTIONS[name])
+                size = path.stat().st_size
+            variants.append(Variant(width, scaled.height, name, path.name, size))
+    return variants
+
+
+def _render_file(
+    source: Path,
+    output_dir: Path,
+    widths: Sequence[int],
+    formats: Sequence[str],
+    max_bytes: int
+) -> Tuple[str, List[Variant]]:
+    """Decode a cover file once and render its variants; runs in pool workers."""
+    with Image.open(source) as opened:
+        image = opened.convert("RGB")
+    return source.name, render_variants(image, source.stem, output_dir, widths, formats, max_bytes, source.name)
+
+
+class VariantManifest:
+    """JSON index of the variants rendered for each cover."""
+
+    def __init__(self, path: Path):
+        """Initialize the manifest.
+
+        Args:
+            path: Manifest file, loaded if it exists
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            self.entries: Dict[str, List[Dict]] = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def __contains__(self, cover: str) -> bool:
+        return cover in self.entries
+
+    def update(self, rendered: Dict[str, List[Variant]]) -> None:
+        """Replace the variants of covers and write the manifest.
+
+        Args:
+            rendered: Rendered variants per cover file name
+        """
+        with self._lock:
+            for cover, variants in rendered.items():
+                self.entries[cover] = [asdict(variant) for variant in variants]
+            self._write()
+
+    def _write(self) -> None:
+        """Write the manifest atomically; caller holds the lock."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(self.entries, indent=2, sort_keys=True), encoding="utf-8")
+        tmp_path.replace(self.path)
+
+    def files(self) -> Set[str]:
+        """File names of every listed cover and variant."""
+        with self._lock:
+            return set(self.entries) | {
+                variant["path"] for variants in self.entries.values() for variant in variants
+            }
+
+    def srcsets(self, cover: str, prefix: str = "images/") -> Dict[str, str]:
+        """Build ``srcset`` attribute values for a cover.
+
+        Args:
+            cover: Cover file name
+            prefix: Path prefix of the image directory, relative to the site
+
+        Returns:
+            srcset per format, e.g. {"webp": "images/a-300w.webp 300w, ..."};
+            empty if the cover has no variants
+        """
+        by_format: Dict[str, List[Dict]] = {}
+        for variant in self.entries.get(cover, []):
+            by_format.setdefault(variant["format"], []).append(variant)
+        return {
+            name: ", ".join(f"{prefix}{v['path']} {v['width']}w" for v in sorted(items, key=lambda v: v["width"]))
+            for name, items in by_format.items()
+        }
+
+
+class VariantBuilder:
+    """Renders responsive variants of covers and keeps their manifest."""
+
+    def __init__(
+        self,
+        output_dir: Path,
+        widths: Sequence[int] = RESPONSIVE_SIZES,
+        formats: Optional[Sequence[str]] = None,
+        max_bytes: int = 400 * 1024,
+        workers: Optional[int] = None
+    ):
+        """Initialize the builder.
+
+        Args:
+            output_dir: Image directory holding the covers and their variants
+            widths: Responsive widths
+            formats: Formats to encode (defaults to every available one)
+            max_bytes: JPEG byte budget at full width
+            workers: Processes for bulk runs (defaults to the CPU count)
+        """
+        self.output_dir = output_dir
+        self.widths = tuple(widths)
+        self.formats = tuple(formats or available_formats())
+        self.max_bytes = max_bytes
+        self.workers = workers or os.cpu_count() or 1
+        self.manifest = VariantManifest(output_dir / MANIFEST_NAME)
+
+    @classmethod
+    def from_env(cls, output_dir: Path, env: Optional[Mapping[str, str]] = None) -> Optional["VariantBuilder"]:
+        """Build a builder from RESPONSIVE_* environment variables.
+
+        Args:
+            output_dir: Image directory
+            env: Environment mapping (defaults to os.environ)
+
+        Returns:
+            Configured builder, or None if RESPONSIVE_IMAGES is off
+        """
+        env = os.environ if env is None else env
+        if env.get("RESPONSIVE_IMAGES", "on").lower() in ("0", "off", "false"):
+            return None
+        widths = [int(w) for w in env.get("RESPONSIVE_SIZES", "").split(",") if w.strip()]
+        formats = [f.strip().lower() for f in env.get("RESPONSIVE_FORMATS", "").split(",") if f.strip()]
+        return cls(
+            output_dir,
+            widths=widths or RESPONSIVE_SIZES,
+            formats=[f for f in formats if f in available_formats()] or None,
+            workers=int(env["RESPONSIVE_WORKERS"]) if env.get("RESPONSIVE_WORKERS") else None
+        )
+
+    @telemetry.timed("image.variants")
+    def build(self, image: "Image.Image", cover: str) -> List[Variant]:
+        """Render the variants of a cover that is already decoded.
+
+        Args:
+            image: Decoded RGB cover
+            cover: Cover file name in the output directory
+
+        Returns:
+            The written variants
+        """
+        variants = render_variants(
+            image, Path(cover).stem, self.output_dir, self.widths, self.formats, self.max_bytes, source=cover
+        )
+        self.manifest.update({cover: variants})
+        telemetry.incr("image.variants", len(variants))
+        return variants
+
+    def build_all(self, paths: Sequence[Path]) -> Dict[str, List[Variant]]:
+        """Render the variants of many cover files on a process pool.
+
+        Args:
+            paths: Cover files
+
+        Returns:
+            Variants per cover file name
+        """
+        if not paths:
+            return {}
+        args = [(path, self.output_dir, self.widths, self.formats, self.max_bytes) for path in paths]
+        with telemetry.span("image.variants.bulk", covers=len(paths)):
+            if self.workers == 1 or len(paths) == 1:
+                rendered = [_render_file(*arg) for arg in args]
+            else:
+                with ProcessPoolExecutor(max_workers=min(self.workers, len(paths))) as pool:
+                    rendered = list(pool.map(_render_file, *zip(*args)))
+        results = dict(rendered)
+        self.manifest.update(results)
+        telemetry.incr("image.variants", sum(len(variants) for variants in results.values()))
+        return results
+
+    def pending(self, force: bool = False) -> List[Path]:
+        """List the covers in the output directory without variants.
+
+        Args:
+            force: List every cover, including those already rendered
+
+        Returns:
+            Cover files
+        """
+        return sorted(
+            path for path in self.output_dir.glob("*.jpg")
+            if not VARIANT_NAME.search(path.name) and (force or path.name not in self.manifest)
+        )
+
+
+@instrumented("variants")
+def main():
+    """CLI entry point: render the variants of existing covers in bulk."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Render responsive cover variants")
+    parser.add_argument("--images-dir", type=Path, default=Path("content/images"))
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="Re-render covers that already have variants")
+    args = parser.parse_args()
+
+    builder = VariantBuilder.from_env(args.images_dir) or VariantBuilder(args.images_dir)
+    if args.workers:
+        builder.workers = args.workers
+    paths = builder.pending(force=args.force)
+    results = builder.build_all(paths)
+    total = sum(variant.bytes for variants in results.values() for variant in variants)
+    console.print(
+        f"[green]Rendered {sum(len(v) for v in results.values())} variants of {len(results)} covers "
+        f"({total / 1024:.0f}KB, {', '.join(builder.formats)})[/green]"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+Tests for the shared rate-limited API client.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import openai
+import pytest
+from unittest.mock import Mock
+
+from content_pipeline.api_client import (
+    EndpointLimits,
+    RateLimitedClient,
+    RetryPolicy,
+    TokenBucket,
+    estimate_tokens,
+)
+
+
+def make_error(error_class, status_code, headers=None):
+    """Build an OpenAI API status error."""
+    response = Mock(status_code=status_code, headers=headers or {}, request=Mock())
+    return error_class("error", response=response, body=None)
+
+
+@pytest.fixture
+def api_client():
+    """Create a client with fast retries around a mocked OpenAI client."""
+    return RateLimitedClient(
+        client=Mock(),
+        retry_policy=RetryPolicy(max_retries=3, base_delay=0.01)
+    )
+
+
+class TestTokenBucket:
+    """Test TokenBucket accounting."""
+
+    def test_burst_then_wait(self):
+        """Test callers wait once the burst capacity is used up."""
+        bucket = TokenBucket(per_minute=60, capacity=2)
+
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == 0
+        assert 0.9 < bucket.reserve() <= 1.0
+
+    def test_refund(self):
+        """Test refunded tokens are available again."""
+        bucket = TokenBucket(per_minute=60, capacity=10)
+        bucket.reserve(10)
+        bucket.refund(5)
+
+        assert bucket.reserve(5) == 0
+
+    def test_pause_holds_back_callers(self):
+        """Test a pause delays callers even with tokens left."""
+        bucket = TokenBucket(per_minute=600)
+        bucket.pause(2.0)
+
+        assert 1.9 < bucket.reserve() <= 2.0
+
+
+class TestRetryPolicy:
+    """Test retry classification and delays."""
+
+    def test_retry_after_ms_header(self):
+        """Test retry-after-ms takes precedence."""
+        error = make_error(openai.RateLimitError, 429, {"retry-after-ms": "250", "retry-after": "9"})
+
+        assert RetryPolicy.retry_after(error) == 0.25
+
+    def test_retry_after_seconds(self):
+        """Test the delay honours Retry-After."""
+        error = make_error(openai.RateLimitError, 429, {"retry-after": "3"})
+
+        assert 3.0 <= RetryPolicy(base_delay=1.0).delay(0, error) <= 3.1
+
+    def test_backoff_is_capped(self):
+        """Test jittered backoff never exceeds max_delay."""
+        policy = RetryPolicy(base_delay=1.0, max_delay=5.0)
+        error = make_error(openai.InternalServerError, 500)
+
+        assert all(0 <= policy.delay(10, error) <= 5.0 for _ in range(50))
+
+    def test_is_retryable(self):
+        """Test only transient errors are retried."""
+        assert RetryPolicy.is_retryable(make_error(openai.RateLimitError, 429))
+        assert RetryPolicy.is_retryable(make_error(openai.InternalServerError, 503))
+        assert not RetryPolicy.is_retryable(make_error(openai.AuthenticationError, 401))
+        assert not RetryPolicy.is_retryable(ValueError("bad"))
+
+
+class TestRateLimitedClient:
+    """Test retries, throttling and concurrency caps."""
+
+    def test_retries_rate_limit_then_succeeds(self, api_client):
+        """Test a 429 is retried and the response returned."""
+        api_client.client.chat.completions.create.side_effect = [
+            make_error(openai.RateLimitError, 429, {"retry-after-ms": "10"}),
+            "response"
+        ]
+
+        assert api_client.chat(model="gpt-4o", messages=[]) == "response"
+        assert api_client.stats()["retries"] == 1
+
+    def test_non_retryable_error_raises_immediately(self, api_client):
+        """Test permanent errors are not retried."""
+        api_client.client.chat.completions.create.side_effect = make_error(openai.AuthenticationError, 401)
+
+        with pytest.raises(openai.AuthenticationError):
+            api_client.chat(model="gpt-4o", messages=[])
+
+        assert api_client.client.chat.completions.create.call_count == 1
+
+    def test_exhausted_retries_raise(self, api_client):
+        """Test the last error surfaces once retries run out."""
+        api_client.client.chat.completions.create.side_effect = make_error(openai.InternalServerError, 500)
+
+        with pytest.raises(openai.InternalServerError):
+            api_client.chat(model="gpt-4o", messages=[])
+
+        assert api_client.client.chat.completions.create.call_count == 4
+
+    def test_failed_attempts_refund_tokens(self):
+        """Test retried and finally failed requests leave the token bucket as they found it."""
+        api_client = RateLimitedClient(
+            client=Mock(),
+            limits={"chat": EndpointLimits(requests_per_minute=6000, tokens_per_minute=600)},
+            retry_policy=RetryPolicy(max_retries=2, base_delay=0.001)
+        )
+        api_client.client.chat.completions.create.side_effect = make_error(openai.InternalServerError, 500)
+        params = {"messages": [{"role": "user", "content": "x" * 400}], "max_tokens": 100}
+
+        with pytest.raises(openai.InternalServerError):
+            api_client.chat(model="gpt-4o", **params)
+
+        assert api_client.client.chat.completions.create.call_count == 3
+        assert api_client._tokens["chat"]._tokens == pytest.approx(600, abs=2)
+
+    def test_concurrency_cap(self):
+        """Test no more than max_concurrency requests run at once."""
+        api_client = RateLimitedClient(
+            client=Mock(),
+            limits={"images": EndpointLimits(requests_per_minute=6000, max_concurrency=2)}
+        )
+        lock = threading.Lock()
+        active = []
+        peak = []
+
+        def generate(**params):
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(0.05)
+            with lock:
+                active.pop()
+            return "image"
+
+        api_client.client.images.generate.side_effect = generate
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            results = list(pool.map(lambda _: api_client.images(prompt="x"), range(6)))
+
+        assert results == ["image"] * 6
+        assert max(peak) == 2
+
+    def test_stream_holds_slot_until_consumed(self):
+        """Test a streaming response keeps its concurrency slot until exhausted."""
+        api_client = RateLimitedClient(
+            client=Mock(),
+            limits={"chat": EndpointLimits(requests_per_minute=6000, max_concurrency=1)}
+        )
+        api_client.client.chat.completions.create.return_value = iter(["a", "b"])
+
+        stream = api_client.chat(model="gpt-4o", messages=[], stream=True)
+        assert next(stream) == "a"
+        assert not api_client._slots["chat"].acquire(blocking=False)
+
+        assert list(stream) == ["b"]
+        assert api_client._slots["chat"].acquire(blocking=False)
+
+    def test_unconsumed_stream_releases_slot(self):
+        """Test a stream that is closed early or never iterated gives its slot back."""
+        api_client = RateLimitedClient(
+            client=Mock(),
+            limits={"chat": EndpointLimits(requests_per_minute=6000, max_concurrency=1)}
+        )
+        api_client.client.chat.completions.create.side_effect = lambda **params: iter(["a", "b"])
+
+        with api_client.chat(model="gpt-4o", messages=[], stream=True) as stream:
+            assert next(stream) == "a"
+        assert list(stream) == []
+
+        stream = api_client.chat(model="gpt-4o", messages=[], stream=True)
+        assert not api_client._slots["chat"].acquire(blocking=False)
+        del stream
+        assert api_client._slots["chat"].acquire(blocking=False)
+
+    def test_stream_settles_from_usage_chunk(self):
+        """Test a consumed stream refunds the tokens its final usage chunk did not use."""
+        api_client = RateLimitedClient(
+            client=Mock(),
+            limits={"chat": EndpointLimits(requests_per_minute=6000, tokens_per_minute=600)}
+        )
+        chunks = [
+            SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content="a"))], usage=None),
+            SimpleNamespace(choices=[], usage=SimpleNamespace(total_tokens=50)),
+        ]
+        api_client.client.chat.completions.create.return_value = iter(chunks)
+        params = {"messages": [{"role": "user", "content": "x" * 400}], "max_tokens": 100}
+
+        stream = api_client.chat(model="gpt-4o", stream=True, **params)
+        assert api_client._tokens["chat"]._tokens == pytest.approx(400, abs=2)
+        list(stream)
+
+        assert api_client._tokens["chat"]._tokens == pytest.approx(550, abs=2)
+
+    def test_estimate_tokens(self):
+        """Test token estimates include prompt and completion budget."""
+        params = {"messages": [{"role": "user", "content": "x" * 400}], "max_tokens": 100}
+
+        assert estimate_tokens(params) == 200
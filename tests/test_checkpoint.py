@@ -0,0 +1,86 @@
+"""
+Tests for run and job checkpoints.
+"""
+
+import json
+from datetime import datetime, timedelta, timezone
+
+from content_pipeline.checkpoint import CheckpointStore, JobCheckpoint
+
+
+class TestJobCheckpoint:
+    """Test JobCheckpoint stage storage."""
+
+    def test_round_trip(self, tmp_path):
+        """Test text and JSON stages are stored in their own files."""
+        job = JobCheckpoint(tmp_path / "job")
+        job.save("outline", "I. Introduction")
+        job.save("seo", {"title": "AI", "tags": ["ai"]})
+
+        assert (tmp_path / "job" / "outline.md").read_text() == "I. Introduction"
+        assert job.load("seo") == {"title": "AI", "tags": ["ai"]}
+        assert job.has("outline")
+        assert not job.has("article")
+        assert job.load("article") is None
+        assert not job.done
+
+    def test_corrupt_stage_is_redone(self, tmp_path):
+        """Test a corrupt JSON stage loads as missing."""
+        job = JobCheckpoint(tmp_path / "job")
+        job.save("seo", {})
+        (tmp_path / "job" / "seo.json").write_text("{broken")
+
+        assert job.load("seo") is None
+
+
+class TestCheckpointStore:
+    """Test run bookkeeping."""
+
+    def test_latest_unfinished(self, tmp_path):
+        """Test only runs that are not complete are resumed."""
+        store = CheckpointStore(tmp_path)
+        first = store.new_run([{"title": "Rust"}], ["Rust"])
+        second = store.new_run([{"title": "Go"}], ["Go"])
+
+        assert store.latest_unfinished().directory == second.directory
+
+        second.mark_complete()
+        run = store.latest_unfinished()
+
+        assert run.directory == first.directory
+        assert run.load_plan() == ([{"title": "Rust"}], ["Rust"])
+
+    def test_job_directories_per_keyword(self, tmp_path):
+        """Test each keyword gets its own job directory."""
+        run = CheckpointStore(tmp_path).new_run([], ["Machine Learning", "Rust"])
+
+        assert run.job("Machine Learning").directory.name == "machine-learning"
+        assert run.job("Rust").directory != run.job("Machine Learning").directory
+
+    def test_prune_keeps_recent_complete_runs(self, tmp_path):
+        """Test old completed runs are deleted while unfinished ones stay."""
+        store = CheckpointStore(tmp_path, keep=1)
+        unfinished = store.new_run([], ["A"])
+        for keyword in ("B", "C"):
+            store.new_run([], [keyword]).mark_complete()
+
+        store.prune()
+
+        remaining = sorted(path.name for path in tmp_path.iterdir())
+        assert len(remaining) == 2
+        assert unfinished.directory.name in remaining
+
+    def test_prune_expires_unfinished_runs(self, tmp_path):
+        """Test unfinished runs beyond keep or past max_age are deleted and never resumed."""
+        store = CheckpointStore(tmp_path, keep=2, max_age_days=7)
+        old = store.new_run([], ["A"])
+        state = json.loads((old.directory / "run.json").read_text())
+        state["created"] = (datetime.now(timezone.utc) - timedelta(days=30)).isoformat()
+        (old.directory / "run.json").write_text(json.dumps(state))
+
+        assert store.latest_unfinished() is None
+
+        runs = [store.new_run([], [keyword]) for keyword in ("B", "C", "D")]
+        store.prune()
+
+        assert sorted(path.name for path in tmp_path.iterdir()) == [run.directory.name for run in runs[1:]]
@@ -0,0 +1,88 @@
+"""
+Tests for procedural cover rendering.
+"""
+
+import time
+from unittest.mock import Mock
+
+from PIL import Image
+
+from content_pipeline.covers import CATEGORY_PALETTES, render_background, render_cover
+from content_pipeline.images import ImageGenerator
+
+
+class TestCovers:
+    """Test the procedural cover renderer."""
+
+    def test_background_gradient_uses_category_palette(self):
+        """Test the gradient runs from the palette's start to its end colour."""
+        start, end, _ = CATEGORY_PALETTES["Web Development"]
+        background = render_background("Web Development", (240, 126))
+
+        assert background.size == (240, 126)
+        assert background.getpixel((0, 0)) == start
+        assert background.getpixel((0, 0)) != render_background("Tech News", (240, 126)).getpixel((0, 0))
+        assert sum(background.getpixel((0, 0))) < sum(background.getpixel((239, 125)))
+
+    def test_background_cached(self):
+        """Test backgrounds are rendered once per category and size."""
+        assert render_background("Data Science", (300, 158)) is render_background("Data Science", (300, 158))
+        assert render_background("Data Science", (300, 158)) is not render_background("Data Science", (600, 315))
+
+    def test_cover_does_not_modify_cached_background(self):
+        """Test the title is drawn on a copy of the shared background."""
+        background = render_background("Productivity", (600, 315))
+        before = background.tobytes()
+
+        cover = render_cover("Ten Habits of Effective Engineers", "Productivity", (600, 315))
+
+        assert background.tobytes() == before
+        assert cover.tobytes() != before
+
+    def test_cover_renders_fast(self):
+        """Test a full-size cover takes milliseconds once its background is cached."""
+        render_cover("Warm-up", "AI & Machine Learning")
+
+        started = time.perf_counter()
+        for _ in range(5):
+            render_cover("Why Vector Databases Are Eating Search", "AI & Machine Learning")
+        elapsed = (time.perf_counter() - started) / 5
+
+        assert elapsed < 0.1
+
+    def test_long_title_is_wrapped(self):
+        """Test very long titles still render within the image."""
+        cover = render_cover("word " * 60, "Unknown Category", (400, 210))
+
+        assert cover.size == (400, 210)
+
+
+class TestPlaceholderImages:
+    """Test ImageGenerator's procedural covers."""
+
+    def test_placeholder_written(self, tmp_path):
+        """Test the placeholder is saved as a JPEG under the output directory."""
+        generator = ImageGenerator("test_key", output_dir=tmp_path)
+
+        path = generator.generate_placeholder_image("Rust in Production", category="Software Engineering")
+
+        saved = tmp_path / path.split("/", 1)[1]
+        assert Image.open(saved).size == (1200, 630)
+
+    def test_procedural_source_skips_api(self, tmp_path):
+        """Test procedural mode never calls the image API."""
+        generator = ImageGenerator("test_key", output_dir=tmp_path, api_client=Mock(), source="procedural")
+
+        assert generator.generate_cover_image("Rust", "Tech News").startswith("images/")
+        generator.api_client.images.assert_not_called()
+
+    def test_failed_generation_falls_back(self, tmp_path):
+        """Test a failed DALL·E call still produces a cover."""
+        api_client = Mock()
+        api_client.images.side_effect = RuntimeError("content policy")
+        generator = ImageGenerator("test_key", output_dir=tmp_path, api_client=api_client)
+
+        assert generator.generate_cover_image("Rust", "Tech News").startswith("images/")
+
+        generator.fallback = False
+        assert generator.generate_cover_image("Rust", "Tech News") is None
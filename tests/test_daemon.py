@@ -0,0 +1,143 @@
+"""
+Tests for the pipeline daemon.
+"""
+
+import json
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from content_pipeline.daemon import PipelineDaemon, Schedule
+
+
+def request(daemon, path, body=None, token=None):
+    """Send a request to the daemon's control endpoint."""
+    host, port = daemon.address
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(f"http://{host}:{port}{path}", data=data, method="POST" if data else "GET")
+    if token:
+        req.add_header("Authorization", f"Bearer {token}")
+    try:
+        with urllib.request.urlopen(req, timeout=5) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def wait_for(job, timeout=5.0):
+    """Wait until a job has finished."""
+    deadline = time.time() + timeout
+    while job.finished_at is None and time.time() < deadline:
+        time.sleep(0.01)
+    return job
+
+
+@pytest.fixture
+def generator():
+    """Mock generator returning one post per call."""
+    generator = Mock()
+    generator.generate_daily_post.return_value = Path("content/2024/01/post.md")
+    generator.generate_batch.return_value = [Path("a.md"), Path("b.md")]
+    return generator
+
+
+@pytest.fixture
+def daemon(generator):
+    """Running daemon on a free port without a schedule."""
+    daemon = PipelineDaemon(generator, port=0, token="secret")
+    daemon.start()
+    yield daemon
+    daemon.stop(timeout=5)
+
+
+class TestSchedule:
+    """Test schedule parsing."""
+
+    def test_interval(self):
+        """Test intervals with units."""
+        schedule = Schedule.parse("6h")
+        now = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+        assert schedule.interval == 6 * 3600
+        assert schedule.next_run(now) == datetime(2024, 1, 1, 18, 0, tzinfo=timezone.utc)
+
+    def test_daily_times(self):
+        """Test the next daily time wraps to the following day."""
+        schedule = Schedule.parse("06:00,18:30")
+
+        assert schedule.next_run(datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)) == datetime(
+            2024, 1, 1, 18, 30, tzinfo=timezone.utc
+        )
+        assert schedule.next_run(datetime(2024, 1, 1, 19, 0, tzinfo=timezone.utc)) == datetime(
+            2024, 1, 2, 6, 0, tzinfo=timezone.utc
+        )
+
+    def test_off_and_invalid(self):
+        """Test disabled and malformed schedules."""
+        assert Schedule.parse("off").next_run(datetime.now(timezone.utc)) is None
+        with pytest.raises(ValueError):
+            Schedule.parse("noon")
+
+
+class TestPipelineDaemon:
+    """Test job execution and the control endpoint."""
+
+    def test_health(self, daemon):
+        """Test /health reports live threads."""
+        status, body = request(daemon, "/health")
+
+        assert status == 200
+        assert body["status"] == "ok"
+        assert body["threads"] == {"worker": True, "scheduler": True, "control": True}
+
+    def test_submit_batch_job(self, daemon, generator):
+        """Test an ad-hoc batch job runs on the shared generator."""
+        status, body = request(daemon, "/jobs", {"kind": "batch", "count": 2}, token="secret")
+
+        assert status == 202
+        job = wait_for(daemon.job(body["job_id"]))
+        assert job.status == "done"
+        assert job.posts == ["a.md", "b.md"]
+        generator.generate_batch.assert_called_once_with(2, max_concurrency=4)
+        assert request(daemon, f"/jobs/{job.job_id}")[1]["status"] == "done"
+
+    def test_submit_requires_token(self, daemon):
+        """Test queuing a job needs the bearer token."""
+        assert request(daemon, "/jobs", {"kind": "daily"})[0] == 401
+        assert request(daemon, "/jobs", {"kind": "weekly"}, token="secret")[0] == 400
+
+    def test_failed_job_keeps_daemon_alive(self, daemon, generator):
+        """Test a failing job is recorded and later jobs still run."""
+        generator.generate_daily_post.side_effect = [RuntimeError("API down"), Path("ok.md")]
+
+        first = wait_for(daemon.submit("daily"))
+        second = wait_for(daemon.submit("daily"))
+
+        assert (first.status, first.error) == ("failed", "API down")
+        assert second.status == "done"
+        assert request(daemon, "/health")[0] == 200
+
+    def test_scheduled_job(self, generator):
+        """Test the schedule queues jobs on its own."""
+        daemon = PipelineDaemon(generator, schedule=Schedule(interval=0.05), port=0)
+        daemon.start()
+        deadline = time.time() + 5
+        while generator.generate_daily_post.call_count < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        daemon.stop(timeout=5)
+
+        assert generator.generate_daily_post.call_count >= 2
+        assert all(job.source == "schedule" for job in daemon.jobs())
+
+    def test_unhealthy_after_stop(self, generator):
+        """Test health fails once the daemon is stopping."""
+        daemon = PipelineDaemon(generator, port=0)
+        daemon.start()
+        daemon.stop(timeout=5)
+
+        assert daemon.health()[0] is False
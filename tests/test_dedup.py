@@ -0,0 +1,255 @@
+"""
+Tests for the near-duplicate post index.
+"""
+
+import pytest
+
+from content_pipeline.dedup import DuplicateIndex, minhash, post_text, similarity, tokenize
+
+RUST_POST = """---
+title: Rust Memory Safety in Practice
+slug: rust-memory-safety
+---
+
+Rust's ownership model gives systems programmers memory safety without a garbage collector.
+The borrow checker enforces that every value has a single owner and that references never
+outlive the data they point to.
+
+## Ownership and Borrowing
+
+Each value has one owner; when the owner goes out of scope the value is dropped. Borrowing
+lets functions use references without taking ownership. Mutable borrows are exclusive, which
+eliminates data races at compile time.
+
+## Lifetimes
+
+Lifetimes annotate how long references are valid. The compiler infers most lifetimes, but
+structs holding references need explicit lifetime parameters.
+
+## Unsafe Rust
+
+Unsafe blocks allow raw pointer dereferencing and FFI calls. Keep unsafe code small, audited
+and wrapped in safe abstractions.
+"""
+
+RUST_OUTLINE = """I. Introduction
+   - Why memory safety matters for systems programming
+   - Rust's promise: safety without a garbage collector
+II. Ownership and Borrowing
+   - Single owner rule and drop semantics
+   - Borrow checker, mutable vs shared references
+III. Lifetimes
+   - Lifetime annotations and inference
+   - Structs holding references
+IV. Unsafe Rust
+   - Raw pointers and FFI
+   - Wrapping unsafe code in safe abstractions
+V. Conclusion
+"""
+
+POSTGRES_POST = """Title: Postgres Query Performance
+Slug: postgres-query-performance
+
+Slow queries hurt application latency. Postgres offers EXPLAIN ANALYZE, indexes and vacuum
+tuning to keep queries fast.
+
+## Indexes
+
+B-tree indexes serve equality and range predicates; GIN indexes serve jsonb and full-text
+search. Partial indexes keep index size small.
+
+## Vacuum and Bloat
+
+Autovacuum reclaims dead tuples. Tune autovacuum thresholds on write-heavy tables to avoid
+table bloat, and use pgbouncer to cap connections.
+"""
+
+ASYNC_RUST_POST = """---
+title: Async Rust Web Services with Tokio
+---
+
+Tokio is the async runtime behind most Rust web services. Futures are polled by an executor,
+and async functions compile to state machines.
+
+## Axum Handlers
+
+Axum routes HTTP requests to async handlers and extracts JSON bodies, path parameters and
+shared state. Middleware from tower adds timeouts, tracing and rate limiting.
+
+## Spawning Tasks
+
+Spawn tasks for background work, use channels to pass messages between them, and avoid
+blocking calls inside async code; move CPU-heavy work to spawn_blocking.
+"""
+
+KUBERNETES_POST = """Kubernetes can scale workloads automatically. The horizontal pod autoscaler adjusts
+replica counts based on CPU, memory or custom metrics, the vertical pod autoscaler tunes
+resource requests, and the cluster autoscaler adds nodes when pods are pending. Watch
+scaling events in Prometheus and Grafana dashboards.
+"""
+
+
+@pytest.fixture
+def content_dir(tmp_path):
+    """Content directory with three unrelated posts."""
+    root = tmp_path / "content" / "2024" / "01"
+    root.mkdir(parents=True)
+    (root / "rust-memory-safety.md").write_text(RUST_POST)
+    (root / "postgres-query-performance.md").write_text(POSTGRES_POST)
+    (root / "kubernetes-autoscaling.md").write_text(KUBERNETES_POST)
+    return tmp_path / "content"
+
+
+@pytest.fixture
+def index(tmp_path, content_dir):
+    """Duplicate index over the content directory."""
+    index = DuplicateIndex(tmp_path / "duplicates.sqlite3", content_dir)
+    yield index
+    index.close()
+
+
+class TestText:
+    """Test text normalization."""
+
+    def test_yaml_front_matter(self):
+        """Test YAML front matter is reduced to the title."""
+        text = post_text(RUST_POST)
+
+        assert "slug:" not in text
+        assert text.startswith("Rust Memory Safety in Practice\n\n")
+        assert "Rust's ownership model" in text
+
+    def test_pelican_front_matter(self):
+        """Test Pelican metadata lines are reduced to the title."""
+        text = post_text(POSTGRES_POST)
+
+        assert "Slug:" not in text
+        assert text.startswith("Postgres Query Performance\n\n")
+
+    def test_strip_tweet_snippets(self):
+        """Test tweetable snippet comments are removed."""
+        text = post_text("Body text\n\n<!-- Tweetable Snippets:\n1. Tweet\n-->\n")
+
+        assert "Tweet" not in text
+
+    def test_tokenize_stems_and_drops_stopwords(self):
+        """Test inflections share a term and stopwords are dropped."""
+        assert tokenize("The borrowing borrows, borrowed") == ["borrow", "borrow", "borrow"]
+        assert tokenize("II. Introduction") == []
+
+    def test_signature_similarity(self):
+        """Test identical term sets match exactly and disjoint ones do not."""
+        signature = minhash(["rust", "borrow", "lifetime"])
+
+        assert similarity(signature, minhash(["lifetime", "rust", "borrow"])) == 1.0
+        assert similarity(signature, minhash(["postgres", "vacuum", "index"])) < 0.2
+
+
+class TestDuplicateIndex:
+    """Test indexing and lookups."""
+
+    def test_sync_indexes_content(self, index):
+        """Test sync picks up every Markdown post once."""
+        assert index.sync() == {"added": 3, "updated": 0, "removed": 0}
+        assert index.sync() == {"added": 0, "updated": 0, "removed": 0}
+        assert index.count() == 3
+
+    def test_reworded_body_is_duplicate(self, index):
+        """Test a lightly reworded copy of a post is found."""
+        reworded = post_text(RUST_POST).replace("gives", "offers").replace("Keep", "Make")
+
+        matches = index.find_duplicates(reworded)
+
+        assert matches[0].path.endswith("rust-memory-safety.md")
+        assert matches[0].similarity > 0.9
+
+    def test_outline_of_existing_post_is_duplicate(self, index):
+        """Test an outline covering an existing post's topic is found."""
+        matches = index.find_duplicates(RUST_OUTLINE)
+
+        assert [match.path.rsplit("/", 1)[1] for match in matches] == ["rust-memory-safety.md"]
+
+    def test_unrelated_text_is_not_duplicate(self, index):
+        """Test a post on a new topic has no matches."""
+        text = "Fine-tuning language models with LoRA adapters reduces GPU memory during training."
+
+        assert index.find_duplicates(text) == []
+
+    def test_distinct_post_on_same_topic_is_not_duplicate(self, index, content_dir):
+        """Test a different Rust post is accepted and does not shadow the first one."""
+        assert index.find_duplicates(post_text(ASYNC_RUST_POST)) == []
+
+        path = content_dir / "2024" / "01" / "async-rust.md"
+        path.write_text(ASYNC_RUST_POST)
+        index.add(path)
+
+        assert [match.path.rsplit("/", 1)[1] for match in index.find_duplicates(RUST_OUTLINE)] == [
+            "rust-memory-safety.md"
+        ]
+
+    def test_lookups_never_resign(self, index, content_dir, monkeypatch):
+        """Test an added post is signed once and later lookups sign only the query."""
+        monkeypatch.setattr("content_pipeline.dedup.AUTO_REBUILD_POSTS", 3)
+        index.sync()
+        signed = []
+        sign = index._sign
+        monkeypatch.setattr(index, "_sign", lambda path, *args: signed.append(path) or sign(path, *args))
+        path = content_dir / "2024" / "01" / "async-rust.md"
+        path.write_text(ASYNC_RUST_POST)
+
+        index.add(path)
+        index.find_duplicates(RUST_OUTLINE)
+        index.find_duplicates(post_text(ASYNC_RUST_POST))
+
+        assert signed == [str(path)]
+
+    def test_rebuild_matches_fresh_index(self, tmp_path, index, content_dir, monkeypatch):
+        """Test an explicit rebuild signs posts added one by one like a fresh index of the corpus."""
+        monkeypatch.setattr("content_pipeline.dedup.AUTO_REBUILD_POSTS", 3)
+        index.sync()
+        path = content_dir / "2024" / "01" / "async-rust.md"
+        path.write_text(ASYNC_RUST_POST)
+        index.add(path)
+
+        index.rebuild()
+
+        fresh = DuplicateIndex(tmp_path / "fresh.sqlite3", content_dir)
+        fresh.sync()
+        query = "SELECT path, signature FROM documents ORDER BY path"
+        assert index._conn.execute(query).fetchall() == fresh._conn.execute(query).fetchall()
+        fresh.close()
+
+    def test_exclude(self, index):
+        """Test the excluded path is never reported."""
+        path = str(next(index.content_dir.rglob("rust-memory-safety.md")))
+
+        assert index.find_duplicates(post_text(RUST_POST), exclude=path) == []
+
+    def test_sync_tracks_changes(self, index, content_dir):
+        """Test modified posts are re-indexed and deleted ones dropped."""
+        index.sync()
+        rust = next(content_dir.rglob("rust-memory-safety.md"))
+        rust.write_text(POSTGRES_POST.replace("Postgres", "MySQL") + "\nInnoDB buffer pool sizing.\n")
+        next(content_dir.rglob("kubernetes-autoscaling.md")).unlink()
+
+        assert index.sync() == {"added": 0, "updated": 1, "removed": 1}
+        assert index.find_duplicates(RUST_OUTLINE) == []
+
+    def test_add_new_post(self, index, content_dir):
+        """Test posts added after the first sync are found."""
+        index.sync()
+        path = content_dir / "2024" / "02" / "llm-fine-tuning.md"
+        path.parent.mkdir()
+        body = "Fine-tuning language models with LoRA adapters, QLoRA quantization and evaluation sets."
+        path.write_text(body)
+
+        index.add(path, body)
+
+        assert index.find_duplicates(body)[0].path == str(path)
+
+    def test_disabled(self, tmp_path, content_dir):
+        """Test a disabled index never reports duplicates."""
+        index = DuplicateIndex(tmp_path / "off.sqlite3", content_dir, enabled=False)
+
+        assert index.find_duplicates(post_text(RUST_POST)) == []
+        index.close()
@@ -0,0 +1,89 @@
+"""
+Tests for size-targeted JPEG encoding.
+"""
+
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from content_pipeline.encoding import encode_jpeg, predict_quality
+from content_pipeline.images import ImageGenerator
+
+
+@pytest.fixture(scope="module")
+def noisy():
+    """Detailed image whose quality-85 JPEG is about 300KB."""
+    noise = Image.effect_noise((1200, 630), 24)
+    return Image.merge("RGB", (noise, noise.rotate(180), noise.transpose(Image.Transpose.FLIP_LEFT_RIGHT)))
+
+
+def jpeg_size(image, quality):
+    """Encode an image and return its size in bytes."""
+    buffer = BytesIO()
+    image.save(buffer, format="JPEG", quality=quality, optimize=True)
+    return buffer.tell()
+
+
+class TestEncodeJpeg:
+    """Test encode_jpeg()."""
+
+    def test_simple_image_takes_one_encode(self):
+        """Test an image well under budget is encoded once at the maximum quality."""
+        image = Image.linear_gradient("L").convert("RGB").resize((1200, 630))
+
+        encoded = encode_jpeg(image, 400 * 1024)
+
+        assert (encoded.quality, encoded.encodes, encoded.fits) == (85, 1, True)
+
+    @pytest.mark.parametrize("budget_kb", [100, 150, 250])
+    def test_finds_near_optimal_quality(self, noisy, budget_kb):
+        """Test the result fits and is within tolerance of the best fitting quality."""
+        budget = budget_kb * 1024
+
+        encoded = encode_jpeg(noisy, budget, tolerance=5)
+
+        optimum = next(q for q in range(85, 29, -1) if jpeg_size(noisy, q) <= budget)
+        assert encoded.fits
+        assert encoded.size <= budget
+        assert optimum - 5 <= encoded.quality <= optimum
+        assert encoded.encodes <= 3
+
+    def test_unreachable_budget(self, noisy):
+        """Test a budget below the minimum quality's size returns the smallest encode."""
+        encoded = encode_jpeg(noisy, 1024)
+
+        assert not encoded.fits
+        assert encoded.quality == 30
+        assert encoded.encodes <= 4
+
+    def test_prediction_lowers_quality_for_detail(self, noisy):
+        """Test detailed images get a lower starting quality than flat ones."""
+        flat = Image.new("RGB", (1200, 630), (40, 40, 40))
+
+        assert predict_quality(noisy, 150 * 1024) < predict_quality(flat, 150 * 1024) == 85
+
+    def test_write(self, noisy, tmp_path):
+        """Test the accepted buffer is written unchanged."""
+        encoded = encode_jpeg(noisy, 200 * 1024)
+        path = tmp_path / "cover.jpg"
+
+        encoded.write(path)
+
+        assert path.read_bytes() == encoded.buffer.getvalue()
+
+
+class TestProcessAndSave:
+    """Test ImageGenerator._process_and_save_image()."""
+
+    def test_saved_under_size_limit(self, noisy, tmp_path):
+        """Test the optimized cover respects max_file_size."""
+        generator = ImageGenerator("test_key", output_dir=tmp_path)
+        generator.max_file_size = 120 * 1024
+        buffer = BytesIO()
+        noisy.save(buffer, format="PNG")
+
+        path = generator._process_and_save_image(buffer.getvalue(), "cover.jpg")
+
+        assert path.stat().st_size <= 120 * 1024
+        assert Image.open(path).size == (1200, 630)
@@ -0,0 +1,166 @@
+"""
+Tests for source enrichment.
+"""
+
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from content_pipeline.enrichment import ArticleCache, SourceEnricher, TextExtractor, digest, extract_text
+
+PARAGRAPH = "Rust 1.80 stabilizes lazy cells, which removes a common dependency from many crates."
+
+PAGE = f"""<html><head>
+<meta name="description" content="Rust release notes">
+<script>var tracking = "ignore me and everything in this script block";</script>
+</head><body>
+<nav><p>Home / News / Programming languages and compilers overview</p></nav>
+<article>
+<h1>Rust 1.80 is out with lazy cells and exclusive ranges</h1>
+<p>{PARAGRAPH}</p>
+<p>Exclusive range patterns are now allowed in match arms &amp; slices, closing a long-standing gap.</p>
+<p>The compiler also checks cfg names and values at compile time to catch typos in feature flags.</p>
+<p>Cargo gains faster dependency resolution on large workspaces with hundreds of member crates.</p>
+</article>
+<footer><p>Copyright and newsletter signup text that should never reach the prompt</p></footer>
+</body></html>"""
+
+
+def make_response(content=b"", headers=None, chunk_size=64, delay=0.0):
+    """Build a mock streaming HTTP response."""
+    def chunks(chunk_size):
+        for i in range(0, len(content), chunk_size):
+            time.sleep(delay)
+            yield content[i:i + chunk_size]
+
+    response = Mock(headers=headers or {"Content-Type": "text/html; charset=utf-8"})
+    response.iter_content.side_effect = chunks
+    return response
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Article cache in a temporary directory."""
+    cache = ArticleCache(tmp_path / "articles.sqlite3")
+    yield cache
+    cache.close()
+
+
+class TestTextExtractor:
+    """Test HTML text extraction."""
+
+    def test_main_text(self):
+        """Test article paragraphs are kept and page chrome is dropped."""
+        text = extract_text(PAGE)
+
+        assert text.startswith("Rust 1.80 is out")
+        assert PARAGRAPH in text
+        assert "match arms & slices" in text
+        assert "tracking" not in text
+        assert "Home / News" not in text
+        assert "newsletter" not in text
+
+    def test_incremental_feed_stops_at_limit(self):
+        """Test the extractor reports done once enough text is collected."""
+        extractor = TextExtractor(max_chars=100)
+        for i in range(0, len(PAGE), 7):
+            extractor.feed(PAGE[i:i + 7])
+            if extractor.done:
+                break
+
+        assert extractor.done
+        assert len(extractor.text()) <= 100
+
+    def test_description_fallback(self):
+        """Test pages without paragraphs fall back to the meta description."""
+        assert extract_text('<meta property="og:description" content="Short  summary">') == "Short summary"
+
+
+class TestDigest:
+    """Test prompt digests."""
+
+    def test_budget_and_relevance(self):
+        """Test the digest respects the budget and prefers keyword sentences."""
+        sources = [{
+            "title": "Rust 1.80", "source": "Blog",
+            "text": "Weather was nice. " * 20 + "Rust lazy cells are stable. " + "Lunch was good. " * 20
+        }]
+
+        text = digest("Rust", sources, token_budget=20)
+
+        assert len(text) <= 80
+        assert text.startswith("- Rust 1.80 (Blog): ")
+        assert "Rust lazy cells are stable." in text
+
+    def test_no_text(self):
+        """Test sources without text give an empty digest."""
+        assert digest("Rust", [{"title": "A", "text": ""}]) == ""
+
+
+class TestSourceEnricher:
+    """Test fetching and caching source articles."""
+
+    def test_fetch_caches_by_url(self, cache):
+        """Test an article is downloaded once."""
+        session = Mock()
+        session.get.return_value = make_response(PAGE.encode())
+        enricher = SourceEnricher(session=session, cache=cache)
+
+        first = enricher.fetch_text("https://example.com/rust")
+        second = enricher.fetch_text("https://example.com/rust")
+
+        assert PARAGRAPH in first
+        assert second == first
+        session.get.assert_called_once()
+
+    def test_byte_cap(self, cache):
+        """Test reading stops at the byte cap."""
+        response = make_response(PAGE.encode() * 100)
+        session = Mock()
+        session.get.return_value = response
+        enricher = SourceEnricher(session=session, cache=cache, max_bytes=256, chunk_size=64)
+
+        enricher.fetch_text("https://example.com/big")
+
+        assert response.close.called
+        assert cache.get("https://example.com/big") is not None
+
+    def test_non_html_is_skipped(self, cache):
+        """Test non-HTML responses yield no text."""
+        session = Mock()
+        session.get.return_value = make_response(b"%PDF-1.7", {"Content-Type": "application/pdf"})
+
+        assert SourceEnricher(session=session, cache=cache).fetch_text("https://example.com/a.pdf") == ""
+
+    def test_parallel_with_stage_timeout(self, cache):
+        """Test articles are fetched concurrently and slow ones are dropped."""
+        def get(url, **kwargs):
+            return make_response(PAGE.encode(), delay=2.0 if "slow" in url else 0.05)
+
+        session = Mock()
+        session.get.side_effect = get
+        enricher = SourceEnricher(session=session, cache=cache, stage_timeout=0.5)
+        topics = [{"title": f"Rust {i}", "link": f"https://example.com/{i}"} for i in range(5)]
+        topics.append({"title": "Rust slow", "link": "https://example.com/slow"})
+
+        started = time.monotonic()
+        enriched = enricher.enrich(topics)
+
+        assert time.monotonic() - started < 1.5
+        assert [topic["link"] for topic in enriched] == [f"https://example.com/{i}" for i in range(5)]
+
+    def test_digest_for_relevant_topics_only(self, cache):
+        """Test only topics sharing a word with the keyword are fetched."""
+        session = Mock()
+        session.get.side_effect = lambda url, **kwargs: make_response(PAGE.encode())
+        enricher = SourceEnricher(session=session, cache=cache)
+        topics = [
+            {"title": "Postgres vacuum tuning", "link": "https://example.com/pg"},
+            {"title": "Rust 1.80 released", "link": "https://example.com/rust", "source": "Blog"},
+        ]
+
+        text = enricher.digest_for("Rust", topics)
+
+        assert text.startswith("- Rust 1.80 released (Blog): ")
+        assert [call.args[0] for call in session.get.call_args_list] == ["https://example.com/rust"]
@@ -0,0 +1,255 @@
+"""
+Tests for the feed fetcher module.
+"""
+
+import time
+
+import pytest
+from unittest.mock import Mock
+
+from content_pipeline.feeds import FeedCache, FeedFetcher, FeedRegistry, FeedSource
+
+
+RSS_TEMPLATE = """<?xml version="1.0"?>
+<rss version="2.0"><channel><title>{source}</title>
+{items}
+</channel></rss>"""
+
+
+def make_rss(source, titles):
+    """Build a small RSS document."""
+    items = "".join(
+        f"<item><title>{title}</title><link>https://example.com/{i}</link></item>"
+        for i, title in enumerate(titles)
+    )
+    return RSS_TEMPLATE.format(source=source, items=items).encode()
+
+
+def make_response(status_code=200, content=b"", headers=None, chunk_size=64):
+    """Build a mock streaming HTTP response."""
+    response = Mock(status_code=status_code, headers=headers or {})
+    response.iter_content.return_value = [
+        content[i:i + chunk_size] for i in range(0, len(content), chunk_size)
+    ]
+    if status_code >= 400:
+        response.raise_for_status.side_effect = Exception(f"HTTP {status_code}")
+    return response
+
+
+class TestFeedCache:
+    """Test FeedCache persistence."""
+
+    def test_round_trip(self, tmp_path):
+        """Test cached validators survive a reload."""
+        cache = FeedCache(tmp_path / "feeds.json")
+        cache.put("https://example.com/rss", '"abc"', "Mon, 01 Jan 2024 00:00:00 GMT", [{"title": "A"}])
+        cache.save()
+
+        reloaded = FeedCache(tmp_path / "feeds.json")
+        entry = reloaded.get("https://example.com/rss")
+
+        assert entry["etag"] == '"abc"'
+        assert entry["topics"] == [{"title": "A"}]
+
+    def test_corrupt_file(self, tmp_path):
+        """Test an unreadable cache file starts empty."""
+        path = tmp_path / "feeds.json"
+        path.write_text("{not json")
+
+        assert FeedCache(path).get("https://example.com/rss") is None
+
+
+class TestFeedRegistry:
+    """Test FeedRegistry limits and circuit breaker."""
+
+    @pytest.fixture
+    def registry(self, tmp_path):
+        """Create a FeedRegistry with a short cool-down."""
+        return FeedRegistry(tmp_path / "health.json", failure_threshold=2, base_cooldown=60)
+
+    def test_unregistered_source_uses_defaults(self, tmp_path):
+        """Test unknown URLs get the default limits."""
+        registry = FeedRegistry(tmp_path / "health.json", defaults=FeedSource(url="", timeout=3.0))
+        registry.register(FeedSource(url="https://slow.example/rss", timeout=20.0))
+
+        assert registry.source("https://other.example/rss").timeout == 3.0
+        assert registry.source("https://slow.example/rss").timeout == 20.0
+
+    def test_cooldown_after_consecutive_failures(self, registry):
+        """Test a source cools down once it keeps failing."""
+        url = "https://bad.example/rss"
+        registry.record_failure(url, 1.0, Exception("boom"))
+        assert registry.is_available(url)
+
+        registry.record_failure(url, 1.0, Exception("boom"))
+        assert not registry.is_available(url)
+        assert registry.is_available(url, now=time.time() + 61)
+
+    def test_cooldown_grows_exponentially(self, registry):
+        """Test each further failure doubles the cool-down."""
+        url = "https://bad.example/rss"
+        for _ in range(3):
+            registry.record_failure(url, 1.0, Exception("boom"))
+
+        remaining = registry.health(url).cooldown_until - time.time()
+        assert 110 < remaining <= 120
+
+    def test_slow_responses_count_as_strikes(self, registry):
+        """Test persistently slow sources cool down too."""
+        url = "https://slow.example/rss"
+        registry.record_success(url, 30.0)
+        registry.record_success(url, 30.0)
+
+        assert not registry.is_available(url)
+        assert "slow" in registry.health(url).last_error
+
+    def test_success_resets_failures(self, registry):
+        """Test a healthy response clears the failure streak."""
+        url = "https://flaky.example/rss"
+        registry.record_failure(url, 1.0, Exception("boom"))
+        registry.record_success(url, 0.2)
+
+        assert registry.health(url).consecutive_failures == 0
+        assert registry.health(url).fetches == 2
+
+    def test_health_persists(self, registry, tmp_path):
+        """Test health history survives a reload."""
+        url = "https://bad.example/rss"
+        registry.record_failure(url, 1.0, Exception("boom"))
+        registry.record_failure(url, 1.0, Exception("boom"))
+        registry.save()
+
+        reloaded = FeedRegistry(tmp_path / "health.json")
+        assert not reloaded.is_available(url)
+        assert reloaded.health(url).latencies == [1.0, 1.0]
+
+
+class TestFeedFetcher:
+    """Test FeedFetcher concurrency and conditional requests."""
+
+    @pytest.fixture
+    def fetcher(self, tmp_path):
+        """Create a FeedFetcher with a mocked session."""
+        fetcher = FeedFetcher(
+            cache=FeedCache(tmp_path / "feeds.json"),
+            registry=FeedRegistry(tmp_path / "health.json"),
+            max_workers=4
+        )
+        fetcher.session = Mock()
+        return fetcher
+
+    def test_fetch_preserves_feed_order(self, fetcher):
+        """Test topics come back in configured feed order."""
+        documents = {
+            "https://a.example/rss": make_rss("Feed A", ["First A", "Second A"]),
+            "https://b.example/rss": make_rss("Feed B", ["First B"]),
+        }
+        fetcher.session.get.side_effect = lambda url, **kwargs: make_response(content=documents[url])
+
+        topics = fetcher.fetch(list(documents))
+
+        assert [t["title"] for t in topics] == ["First A", "Second A", "First B"]
+        assert topics[2]["source"] == "Feed B"
+
+    def test_entries_per_feed_limit(self, fetcher):
+        """Test only the configured number of entries is kept."""
+        fetcher.session.get.return_value = make_response(
+            content=make_rss("Feed", [f"Story {i}" for i in range(10)])
+        )
+
+        topics = fetcher.fetch(["https://a.example/rss"])
+
+        assert len(topics) == 5
+
+    def test_conditional_request_reuses_cache(self, fetcher):
+        """Test a 304 response reuses cached topics."""
+        url = "https://a.example/rss"
+        fetcher.session.get.return_value = make_response(
+            content=make_rss("Feed", ["Cached story"]),
+            headers={"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}
+        )
+        fetcher.fetch([url])
+
+        fetcher.session.get.return_value = make_response(status_code=304)
+        topics = fetcher.fetch([url])
+
+        headers = fetcher.session.get.call_args.kwargs["headers"]
+        assert headers["If-None-Match"] == '"v1"'
+        assert headers["If-Modified-Since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+        assert [t["title"] for t in topics] == ["Cached story"]
+
+    def test_failed_feed_is_skipped(self, fetcher):
+        """Test one failing feed does not drop the others."""
+        def get(url, **kwargs):
+            if "bad" in url:
+                return make_response(status_code=500)
+            return make_response(content=make_rss("Good", ["Story"]))
+
+        fetcher.session.get.side_effect = get
+
+        topics = fetcher.fetch(["https://bad.example/rss", "https://good.example/rss"])
+
+        assert [t["title"] for t in topics] == ["Story"]
+
+    def test_stops_reading_after_enough_entries(self, fetcher):
+        """Test the body is not read past the last needed entry."""
+        response = make_response(content=make_rss("Feed", [f"Story {i}" for i in range(50)]))
+        chunks = response.iter_content.return_value
+        fetcher.session.get.return_value = response
+        consumed = []
+
+        def iter_content(chunk_size):
+            for chunk in chunks:
+                consumed.append(chunk)
+                yield chunk
+
+        response.iter_content.side_effect = iter_content
+
+        topics = fetcher.fetch(["https://a.example/rss"])
+
+        assert [t["title"] for t in topics] == [f"Story {i}" for i in range(5)]
+        assert len(consumed) < len(chunks)
+        response.close.assert_called_once()
+
+    @pytest.mark.parametrize("chunk_size", range(7, 21))
+    def test_small_chunks_count_each_entry_once(self, fetcher, chunk_size):
+        """Test an entry end tag inside the rescanned overlap is not counted twice."""
+        fetcher.session.get.return_value = make_response(
+            content=make_rss("Feed", [f"Story {i}" for i in range(10)]), chunk_size=chunk_size
+        )
+
+        topics = fetcher.fetch(["https://a.example/rss"])
+
+        assert [t["title"] for t in topics] == [f"Story {i}" for i in range(5)]
+
+    def test_byte_cap(self, fetcher):
+        """Test oversized feeds are truncated at the byte cap."""
+        url = "https://big.example/rss"
+        fetcher.registry.register(FeedSource(url=url, max_bytes=300, max_entries=50))
+        fetcher.session.get.return_value = make_response(
+            content=make_rss("Feed", [f"Story {i}" for i in range(50)])
+        )
+
+        topics = fetcher.fetch([url])
+
+        assert 0 < len(topics) < 50
+
+    def test_cooling_down_source_is_skipped(self, fetcher):
+        """Test sources in cool-down are not requested."""
+        url = "https://bad.example/rss"
+        fetcher.registry.health(url).cooldown_until = time.time() + 600
+
+        topics = fetcher.fetch([url])
+
+        assert topics == []
+        fetcher.session.get.assert_not_called()
+
+    def test_fetch_records_health(self, fetcher):
+        """Test fetch outcomes are recorded in the registry."""
+        fetcher.session.get.return_value = make_response(status_code=500)
+
+        fetcher.fetch(["https://bad.example/rss"])
+
+        health = fetcher.registry.health("https://bad.example/rss")
+        assert health.failures == 1
+        assert "500" in health.last_error
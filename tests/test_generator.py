@@ -4,12 +4,27 @@ Tests for the content generator module.
 
 import os
 import json
+import time
 import pytest
 from unittest.mock import Mock, patch, mock_open
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+from content_pipeline.api_client import RateLimitedClient, RetryPolicy
+from content_pipeline.dedup import DuplicateIndex, DuplicatePostError
 from content_pipeline.generator import ContentGenerator, BlogPost
+from content_pipeline.trends import TrendStore
+
+
+def make_stream(text, chunk_size=50):
+    """Build a mock streamed chat completion."""
+    chunks = []
+    for i in range(0, len(text), chunk_size):
+        chunk = Mock()
+        chunk.choices = [Mock()]
+        chunk.choices[0].delta.content = text[i:i + chunk_size]
+        chunks.append(chunk)
+    return iter(chunks)
 
 
 class TestBlogPost:
@@ -54,11 +69,13 @@ class TestContentGenerator:
     """Test ContentGenerator class."""
     
     @pytest.fixture
-    def generator(self):
+    def generator(self, tmp_path):
         """Create a ContentGenerator instance for testing."""
         return ContentGenerator(
             api_key="test_key",
-            feed_sources=["https://example.com/feed.xml"]
+            feed_sources=["https://example.com/feed.xml"],
+            cache_dir=tmp_path / ".cache",
+            api_client=RateLimitedClient("test_key", retry_policy=RetryPolicy(base_delay=0.01))
         )
     
     @pytest.fixture
@@ -88,10 +105,14 @@ class TestContentGenerator:
         assert len(generator.categories) == 6
         assert "AI & Machine Learning" in generator.categories
     
-    @patch('content_pipeline.generator.feedparser.parse')
+    @patch('content_pipeline.feeds.feedparser.parse')
     def test_fetch_trending_topics(self, mock_parse, generator, mock_feed_data):
         """Test fetching trending topics from RSS feeds."""
         mock_parse.return_value = mock_feed_data
+        generator.feed_fetcher.session = Mock()
+        response = Mock(status_code=200, headers={})
+        response.iter_content.return_value = [b"<rss></rss>"]
+        generator.feed_fetcher.session.get.return_value = response
         
         topics = generator.fetch_trending_topics()
         
@@ -100,10 +121,10 @@ class TestContentGenerator:
         assert topics[0]['source'] == 'Test Feed'
         assert topics[1]['title'] == 'Python Web Development'
     
-    @patch('content_pipeline.generator.feedparser.parse')
-    def test_fetch_trending_topics_with_error(self, mock_parse, generator):
-        """Test fetching topics when feed parsing fails."""
-        mock_parse.side_effect = Exception("Network error")
+    def test_fetch_trending_topics_with_error(self, generator):
+        """Test fetching topics when the feed request fails."""
+        generator.feed_fetcher.session = Mock()
+        generator.feed_fetcher.session.get.side_effect = Exception("Network error")
         
         topics = generator.fetch_trending_topics()
         
@@ -119,9 +140,57 @@ class TestContentGenerator:
         
         keyword = generator.select_topic_keyword(topics)
         
-        # Should select the most frequent meaningful word
-        assert keyword in ['Machine', 'Learning', 'AI', 'Python', 'Data', 'Science']
+        # Should select the most frequent meaningful word or phrase
+        assert keyword in ['Machine Learning', 'Machine', 'Learning', 'AI', 'Python', 'Data', 'Science']
+    
+    def test_select_topic_keyword_excludes_published(self, generator):
+        """Test already published keywords are never selected."""
+        topics = [
+            {'title': 'Python Python Python'},
+            {'title': 'Rust tooling'}
+        ]
+        
+        keyword = generator.select_topic_keyword(topics, exclude={'python'})
+        
+        assert keyword in ['Rust', 'Tooling']
     
+    def test_rank_topic_keywords(self, generator):
+        """Test keyword ranking returns scored, non-overlapping keywords."""
+        topics = [
+            {'title': 'Rust compiler speeds up', 'source': 'A'},
+            {'title': 'Rust compiler adds async', 'source': 'B'},
+            {'title': 'Kotlin gets faster', 'source': 'A'}
+        ]
+        
+        ranked = generator.rank_topic_keywords(topics)
+        
+        assert ranked[0][0] == 'Rust Compiler'
+        assert all(score > 0 for _, score in ranked)
+        assert 'Rust' not in [keyword for keyword, _ in ranked]
+    
+    def test_rank_topic_keywords_by_trend(self, generator, tmp_path):
+        """Test trend ranking prefers a spiking keyword over an always-frequent one."""
+        now = datetime.now(timezone.utc)
+        generator.trend_store = TrendStore(tmp_path / "trends.sqlite3")
+        for day in range(1, 15):
+            generator.trend_store.ingest([
+                {'title': f'Apple store report {day}', 'published': (now - timedelta(days=day)).isoformat()},
+                {'title': f'Apple stock update {day}', 'published': (now - timedelta(days=day)).isoformat()},
+                {'title': f'Cloud pricing notes {day}', 'published': (now - timedelta(days=day)).isoformat()},
+            ])
+        topics = [
+            {'title': 'Apple earnings beat', 'source': 'A'},
+            {'title': 'Apple opens store', 'source': 'B'},
+            {'title': 'Apple watch review', 'source': 'C'},
+            {'title': 'Mojo language hits beta', 'source': 'A'},
+            {'title': 'Mojo compiler internals', 'source': 'B'},
+        ]
+        generator.trend_store.ingest(topics)
+
+        assert generator.rank_topic_keywords(topics, limit=1)[0][0] == 'Apple'
+        generator.rank_by = "trend"
+        assert generator.rank_topic_keywords(topics, limit=1)[0][0] == 'Mojo'
+
     def test_select_topic_keyword_fallback(self, generator):
         """Test keyword selection fallback."""
         topics = [
@@ -138,7 +207,10 @@ class TestContentGenerator:
         mock_client = Mock()
         mock_openai_class.return_value = mock_client
         
+        generator.client = mock_client
+        
         mock_response = Mock()
+        mock_response.choices = [Mock()]
         mock_response.choices[0].message.content = "I. Introduction\nII. Main Content\nIII. Conclusion"
         mock_client.chat.completions.create.return_value = mock_response
         
@@ -155,24 +227,237 @@ class TestContentGenerator:
         mock_client = Mock()
         mock_openai_class.return_value = mock_client
         mock_client.chat.completions.create.side_effect = Exception("API Error")
+        generator.client = mock_client
         
+        with pytest.raises(Exception, match="API Error"):
+            generator.generate_content_outline("AI")
+        
+        generator.allow_fallback = True
         outline = generator.generate_content_outline("AI")
         
         assert "AI: A Comprehensive Guide" in outline
         assert "Introduction" in outline
     
+    def test_generate_content_outline_cached(self, generator):
+        """Test identical outline requests are served from the response cache."""
+        response = Mock()
+        response.choices = [Mock()]
+        response.choices[0].message.content = "I. Introduction\nII. Conclusion"
+        generator.client = Mock()
+        generator.client.chat.completions.create.return_value = response
+        
+        first = generator.generate_content_outline("AI")
+        second = generator.generate_content_outline("AI")
+        
+        assert first == second
+        generator.client.chat.completions.create.assert_called_once()
+        assert generator.response_cache.stats()["hits"] == 1
+
+    def test_outline_routed_to_stage_model(self, generator):
+        """Test the outline uses its route's model and timeout and falls back on failure."""
+        response = Mock()
+        response.choices = [Mock()]
+        response.choices[0].message.content = "I. Introduction"
+        
+        def create(**params):
+            if params["model"] == "gpt-4o-mini":
+                raise RuntimeError("model unavailable")
+            return response
+        
+        generator.client = Mock()
+        generator.client.chat.completions.create.side_effect = create
+        
+        assert generator.generate_content_outline("AI") == "I. Introduction"
+        calls = [call.kwargs for call in generator.client.chat.completions.create.call_args_list]
+        assert [params["model"] for params in calls] == ["gpt-4o-mini", "gpt-4o"]
+        assert calls[0]["timeout"] == generator.router.route("outline").timeout
+        assert calls[0]["max_tokens"] == 1000
+        assert generator.router.stats()["outline/gpt-4o-mini"]["failures"] == 1
+    
+    def test_outline_prompt_includes_source_digest(self, generator):
+        """Test the enricher's digest is added to the outline prompt."""
+        response = Mock()
+        response.choices = [Mock()]
+        response.choices[0].message.content = "I. Introduction"
+        generator.client = Mock()
+        generator.client.chat.completions.create.return_value = response
+        generator.enricher = Mock()
+        generator.enricher.digest_for.return_value = "- Rust 1.80 (Blog): Lazy cells are stable."
+        topics = [{"title": "Rust 1.80 released", "link": "https://example.com/rust"}]
+
+        sources = generator.enrich_sources("Rust", topics)
+        generator.generate_content_outline("Rust", sources)
+
+        generator.enricher.digest_for.assert_called_once_with("Rust", topics)
+        prompt = generator.client.chat.completions.create.call_args.kwargs["messages"][-1]["content"]
+        assert "Lazy cells are stable." in prompt
+
+    def test_invalid_seo_json_is_not_cached(self, generator):
+        """Test SEO responses that fail to parse are retried on the next run."""
+        broken = Mock()
+        broken.choices = [Mock()]
+        broken.choices[0].message.content = "not json"
+        generator.client = Mock()
+        generator.client.chat.completions.create.side_effect = [make_stream("Body"), broken, broken]
+        generator.allow_fallback = True
+        
+        generator.generate_full_article("AI", "Outline")
+        generator.generate_full_article("AI", "Outline")
+        
+        # Body is cached after the first run, the broken SEO response is not
+        assert generator.client.chat.completions.create.call_count == 3
+    
+    def make_completion(self, content):
+        """Build a mock non-streamed chat completion."""
+        response = Mock()
+        response.choices = [Mock()]
+        response.choices[0].message.content = content
+        return response
+    
+    def test_structured_article_single_call(self, generator):
+        """Test structured mode returns body and SEO metadata from one response."""
+        generator.structured = True
+        generator.client = Mock()
+        generator.client.chat.completions.create.return_value = self.make_completion(json.dumps({
+            "content": "## Introduction\n\nBody",
+            "title": "AI Guide",
+            "slug": "ai-guide",
+            "meta_description": "Meta",
+            "tweets": ["Tweet"],
+            "tags": ["ai"],
+            "category": "AI & Machine Learning",
+            "summary": "Summary"
+        }))
+        
+        post = generator.generate_full_article("AI", "Outline")
+        
+        assert post.slug == "ai-guide"
+        assert post.content == "## Introduction\n\nBody"
+        generator.client.chat.completions.create.assert_called_once()
+        params = generator.client.chat.completions.create.call_args.kwargs
+        schema = params["response_format"]["json_schema"]["schema"]
+        assert schema["properties"]["category"]["enum"] == generator.categories
+        assert set(schema["required"]) == set(schema["properties"])
+    
+    def test_structured_article_invalid_falls_back(self, generator):
+        """Test a response that breaks the schema falls back to separate calls."""
+        generator.structured = True
+        invalid = self.make_completion(json.dumps({"content": "Body", "title": "AI"}))
+        seo = self.make_completion(json.dumps({
+            "title": "AI", "slug": "ai", "meta_description": "d", "tweets": [],
+            "tags": [], "category": "Tech News", "summary": "s"
+        }))
+        
+        def create(stream=False, **params):
+            if "response_format" in params:
+                return invalid
+            return make_stream("Streamed body") if stream else seo
+        
+        generator.client = Mock()
+        generator.client.chat.completions.create.side_effect = create
+        
+        post = generator.generate_full_article("AI", "Outline")
+        
+        assert post.content == "Streamed body"
+        assert post.slug == "ai"
+        assert generator.client.chat.completions.create.call_count == 3
+        assert generator.response_cache.stats()["bytes"] > 0
+    
+    def test_structured_validation(self, generator):
+        """Test slugs and categories outside the schema are rejected."""
+        data = {
+            "content": "Body", "title": "AI", "slug": "Not A Slug", "meta_description": "d",
+            "tweets": [], "tags": [], "category": "Tech News", "summary": "s"
+        }
+        
+        with pytest.raises(ValueError, match="slug"):
+            generator._parse_structured_post(json.dumps(data))
+        with pytest.raises(ValueError, match="category"):
+            generator._parse_structured_post(json.dumps(dict(data, slug="ai", category="Cooking")))
+        with pytest.raises(ValueError):
+            generator._parse_structured_post('{"content": "truncated')
+    
+    def test_seo_starts_before_article_finishes(self, generator):
+        """Test SEO metadata is requested once the article preview has streamed."""
+        events = []
+        seo_response = Mock()
+        seo_response.choices = [Mock()]
+        seo_response.choices[0].message.content = json.dumps({
+            "title": "AI", "slug": "ai", "meta_description": "d", "tweets": [],
+            "tags": [], "category": "Tech News", "summary": "s"
+        })
+        
+        def stream():
+            for i, chunk in enumerate(make_stream("x" * 2000, chunk_size=100)):
+                events.append(f"chunk {i}")
+                yield chunk
+                if i == 5:
+                    time.sleep(0.2)  # Give the SEO worker a chance to run
+        
+        def create(stream=False, **params):
+            if stream:
+                return stream_iter
+            events.append("seo")
+            return seo_response
+        
+        stream_iter = stream()
+        generator.client = Mock()
+        generator.client.chat.completions.create.side_effect = create
+        
+        post = generator.generate_full_article("AI", "Outline")
+        
+        assert post.content == "x" * 2000
+        assert events.index("seo") < events.index("chunk 19")
+        
+        seo_prompt = [
+            call.kwargs for call in generator.client.chat.completions.create.call_args_list
+            if not call.kwargs.get("stream")
+        ][0]["messages"][-1]["content"]
+        assert "x" * 500 in seo_prompt
+    
+    def test_stream_draft_written_and_removed(self, generator):
+        """Test the article streams to a draft that is removed once complete."""
+        draft = generator.cache_dir / "drafts" / "ai-agents.md"
+        text = "## Heading\n\n" + "Body text. " * 100
+        drafts = []
+        generator.client = Mock()
+        generator.client.chat.completions.create.return_value = make_stream(text)
+        
+        content = generator._stream_complete(
+            draft, lambda preview: drafts.append(draft.read_text()), model="gpt-4o", messages=[]
+        )
+        
+        assert content == text
+        assert drafts[0].startswith(text[:500])
+        assert not draft.exists()
+    
+    def test_cached_article_skips_streaming(self, generator):
+        """Test a cached article body is reused without a new stream."""
+        draft = generator.cache_dir / "drafts" / "ai.md"
+        previews = []
+        generator.client = Mock()
+        generator.client.chat.completions.create.return_value = make_stream("Body")
+        
+        generator._stream_complete(draft, previews.append, model="gpt-4o", messages=[])
+        generator._stream_complete(draft, previews.append, model="gpt-4o", messages=[])
+        
+        generator.client.chat.completions.create.assert_called_once()
+        assert previews == ["Body", "Body"]
+    
     @patch('content_pipeline.generator.openai.OpenAI')
     def test_generate_full_article(self, mock_openai_class, generator):
         """Test full article generation."""
         mock_client = Mock()
         mock_openai_class.return_value = mock_client
         
+        generator.client = mock_client
+        
         # Mock content response
-        content_response = Mock()
-        content_response.choices[0].message.content = "## Introduction\n\nThis is test content.\n\n## Conclusion\n\nTest conclusion."
+        content_response = make_stream("## Introduction\n\nThis is test content.\n\n## Conclusion\n\nTest conclusion.")
         
         # Mock SEO response
         seo_response = Mock()
+        seo_response.choices = [Mock()]
         seo_response.choices[0].message.content = json.dumps({
             "title": "AI Test Article",
             "slug": "ai-test-article",
@@ -201,8 +486,10 @@ class TestContentGenerator:
         mock_client = Mock()
         mock_openai_class.return_value = mock_client
         
-        content_response = Mock()
-        content_response.choices[0].message.content = "Test content"
+        generator.client = mock_client
+        generator.allow_fallback = True
+        
+        content_response = make_stream("Test content")
         
         # SEO response fails
         mock_client.chat.completions.create.side_effect = [
@@ -265,12 +552,260 @@ class TestContentGenerator:
         result = generator.generate_daily_post()
         
         assert result == Path("test.md")
+        assert generator.seen_index.published_keywords() == {"ai"}
         mock_topics.assert_called_once()
         mock_keyword.assert_called_once()
         mock_outline.assert_called_once()
         mock_article.assert_called_once()
         mock_save.assert_called_once()
     
+    @patch('content_pipeline.generator.ContentGenerator.fetch_trending_topics')
+    @patch('content_pipeline.generator.ContentGenerator.generate_content_outline')
+    @patch('content_pipeline.generator.ContentGenerator.generate_full_article')
+    @patch('content_pipeline.generator.ContentGenerator.save_post')
+    def test_generate_batch(self, mock_save, mock_article, mock_outline, mock_topics, generator):
+        """Test batch generation runs posts concurrently, each in stage order."""
+        mock_topics.return_value = [
+            {'title': 'Rust compiler news', 'source': 'A'},
+            {'title': 'Kotlin coroutines guide', 'source': 'B'},
+            {'title': 'Swift macros deep dive', 'source': 'C'}
+        ]
+        stages = []
+        
+        def outline(keyword, sources=""):
+            stages.append(('outline', keyword))
+            time.sleep(0.2)
+            return f"Outline for {keyword}"
+        
+        def article(keyword, outline_text):
+            stages.append(('article', keyword))
+            assert outline_text == f"Outline for {keyword}"
+            return BlogPost(
+                title=keyword, slug=keyword.lower().replace(' ', '-'), content="content",
+                summary="summary", meta_description="meta", category="Tech", tags=[]
+            )
+        
+        mock_outline.side_effect = outline
+        mock_article.side_effect = article
+        mock_save.side_effect = lambda post, **kwargs: Path(f"{post.slug}.md")
+        
+        started = time.monotonic()
+        result = generator.generate_batch(3, max_concurrency=3)
+        elapsed = time.monotonic() - started
+        
+        assert len(result) == 3
+        assert len(set(result)) == 3
+        assert elapsed < 0.5  # Three 0.2s outlines overlap
+        for keyword in {keyword for _, keyword in stages}:
+            assert stages.index(('outline', keyword)) < stages.index(('article', keyword))
+        assert len(generator.seen_index.published_keywords()) == 3
+    
+    @patch('content_pipeline.generator.ContentGenerator.fetch_trending_topics')
+    @patch('content_pipeline.generator.ContentGenerator.generate_post')
+    def test_generate_batch_partial_failure(self, mock_post, mock_topics, generator):
+        """Test one failing post does not drop the rest of the batch."""
+        mock_topics.return_value = [
+            {'title': 'Rust'},
+            {'title': 'Rust'},
+            {'title': 'Kotlin'}
+        ]
+        
+        def generate_post(keyword, topics, checkpoint=None):
+            if keyword == "Kotlin":
+                raise Exception("API Error")
+            return Path(f"{keyword}.md")
+        
+        mock_post.side_effect = generate_post
+        
+        result = generator.generate_batch(2)
+        
+        assert result == [Path("Rust.md")]
+    
+    def test_resume_run_without_plan(self, generator):
+        """Test a run whose plan vanished is reported instead of crashing."""
+        run = generator.checkpoints.new_run([{'title': 'Rust'}], ["Rust"])
+        generator.checkpoints.latest_unfinished = Mock(return_value=run)
+        (run.directory / "topics.json").unlink()
+        
+        assert generator.resume_run() is None
+    
+    @patch('content_pipeline.generator.ContentGenerator.fetch_trending_topics')
+    @patch('content_pipeline.generator.ContentGenerator.generate_content_outline')
+    @patch('content_pipeline.generator.ContentGenerator.generate_full_article')
+    @patch('content_pipeline.generator.ContentGenerator.save_post')
+    def test_resume_continues_at_failed_stage(self, mock_save, mock_article, mock_outline,
+                                              mock_topics, generator):
+        """Test a resumed run keeps its keyword and skips completed stages."""
+        mock_topics.return_value = [{'title': 'Rust'}]
+        mock_outline.return_value = "Outline"
+        mock_article.side_effect = Exception("Connection reset")
+        mock_save.side_effect = lambda post, **kwargs: Path(f"{post.slug}.md")
+        
+        assert generator.generate_daily_post() is None
+        
+        mock_topics.return_value = [{'title': 'Kotlin'}]
+        mock_article.side_effect = None
+        mock_article.return_value = BlogPost(
+            title="Rust", slug="rust", content="content",
+            summary="summary", meta_description="meta", category="Tech", tags=[]
+        )
+        
+        assert generator.resume_run() == [Path("rust.md")]
+        mock_outline.assert_called_once_with("Rust", "")
+        mock_article.assert_called_with("Rust", "Outline")
+        assert generator.resume_run() is None
+    
+    @patch('content_pipeline.generator.ContentGenerator.fetch_trending_topics')
+    @patch('content_pipeline.generator.ContentGenerator.generate_content_outline')
+    @patch('content_pipeline.generator.ContentGenerator.generate_full_article')
+    @patch('content_pipeline.generator.ContentGenerator.save_post')
+    def test_resume_batch_redoes_only_unfinished_jobs(self, mock_save, mock_article, mock_outline,
+                                                      mock_topics, generator):
+        """Test a resumed batch only reruns the jobs that did not finish."""
+        mock_topics.return_value = [{'title': 'Rust'}, {'title': 'Rust'}, {'title': 'Kotlin'}]
+        mock_outline.side_effect = lambda keyword, sources="": f"Outline for {keyword}"
+        failing = {"Kotlin"}
+        
+        def article(keyword, outline_text):
+            if keyword in failing:
+                raise Exception("API Error")
+            return BlogPost(
+                title=keyword, slug=keyword.lower(), content="content",
+                summary="summary", meta_description="meta", category="Tech", tags=[]
+            )
+        
+        mock_article.side_effect = article
+        mock_save.side_effect = lambda post, **kwargs: Path(f"{post.slug}.md")
+        
+        assert generator.generate_batch(2) == [Path("rust.md")]
+        
+        failing.clear()
+        mock_article.reset_mock()
+        mock_outline.reset_mock()
+        
+        assert generator.resume_run() == [Path("rust.md"), Path("kotlin.md")]
+        mock_article.assert_called_once_with("Kotlin", "Outline for Kotlin")
+        mock_outline.assert_not_called()
+    
+    @patch('content_pipeline.generator.ContentGenerator.fetch_trending_topics')
+    @patch('content_pipeline.generator.ContentGenerator.generate_content_outline')
+    @patch('content_pipeline.generator.ContentGenerator.generate_full_article')
+    def test_duplicate_outline_skips_article(self, mock_article, mock_outline, mock_topics,
+                                             generator, tmp_path):
+        """Test an outline matching an existing post stops before the article call."""
+        content_dir = tmp_path / "content"
+        content_dir.mkdir()
+        (content_dir / "rust-ownership.md").write_text(
+            "---\ntitle: Rust Ownership Explained\n---\n\n"
+            "Rust ownership and borrowing: the borrow checker tracks references and lifetimes. "
+            "References never outlive their owner, lifetimes say for how long. Unsafe Rust "
+            "and unsafe blocks opt out of the borrow checker, so memory safety rests on you."
+        )
+        (content_dir / "postgres-vacuum.md").write_text(
+            "Postgres autovacuum reclaims dead tuples; tune thresholds to avoid table bloat and slow indexes."
+        )
+        (content_dir / "kubernetes-autoscaling.md").write_text(
+            "Kubernetes autoscaling: the horizontal pod autoscaler adjusts replicas from CPU and memory metrics."
+        )
+        generator.duplicate_index = DuplicateIndex(tmp_path / "duplicates.sqlite3", content_dir)
+        mock_topics.return_value = [{'title': 'Rust'}]
+        mock_outline.return_value = (
+            "I. Rust ownership\nII. Borrow checker and references\n"
+            "III. Lifetimes\nIV. Unsafe Rust and memory safety"
+        )
+        
+        assert generator.generate_daily_post() is None
+        mock_article.assert_not_called()
+        assert generator.seen_index.published_keywords() == {"rust"}
+        assert generator.resume_run() is None
+    
+    @patch('content_pipeline.generator.ContentGenerator.fetch_trending_topics')
+    @patch('content_pipeline.generator.ContentGenerator.generate_content_outline')
+    @patch('content_pipeline.generator.ContentGenerator.generate_full_article')
+    def test_resume_after_save_is_not_own_duplicate(self, mock_article, mock_outline, mock_topics,
+                                                    generator, tmp_path, monkeypatch):
+        """Test a job interrupted after writing its post resumes into the same file."""
+        monkeypatch.chdir(tmp_path)
+        generator.duplicate_index = DuplicateIndex(tmp_path / "duplicates.sqlite3", Path("content"))
+        mock_topics.return_value = [{'title': 'Rust'}]
+        mock_outline.return_value = "I. Rust ownership\nII. Borrow checker and references\nIII. Lifetimes"
+        mock_article.return_value = BlogPost(
+            title="Rust Ownership", slug="rust-ownership",
+            content="Rust ownership and borrowing: the borrow checker tracks references and lifetimes.",
+            summary="summary", meta_description="meta", category="Tech", tags=[]
+        )
+        record_post = generator.seen_index.record_post
+        generator.seen_index.record_post = Mock(side_effect=OSError("disk full"))
+        
+        assert generator.generate_daily_post() is None
+        
+        generator.seen_index.record_post = record_post
+        resumed = generator.resume_run()
+        
+        assert len(resumed) == 1 and resumed[0].name == "rust-ownership.md"
+        assert len(list(Path("content").rglob("*.md"))) == 1
+    
+    def test_save_post_keeps_post_with_same_slug(self, generator, tmp_path):
+        """Test a different post with a taken slug is saved next to it."""
+        generator.duplicate_index = DuplicateIndex(tmp_path / "duplicates.sqlite3", tmp_path / "content")
+        first = BlogPost(
+            title="Rust Ownership", slug="guide", content="Rust ownership, borrowing and lifetimes.",
+            summary="summary", meta_description="meta", category="Tech", tags=[]
+        )
+        second = BlogPost(
+            title="Postgres Vacuum", slug="guide", content="Postgres autovacuum, bloat and indexes.",
+            summary="summary", meta_description="meta", category="Tech", tags=[]
+        )
+        
+        first_path = generator.save_post(first, tmp_path / "content")
+        second_path = generator.save_post(second, tmp_path / "content")
+        
+        assert first_path.name == "guide.md"
+        assert second_path.name == "guide-2.md"
+        assert second.slug == "guide-2"
+        assert "Rust ownership" in first_path.read_text()
+    
+    def test_save_post_updates_manifest(self, generator, tmp_path):
+        """Test saved posts are recorded in the content manifest."""
+        post = BlogPost(
+            title="Rust Ownership", slug="rust-ownership", content="Rust ownership, borrowing and lifetimes.",
+            summary="summary", meta_description="meta", category="Tech", tags=["rust"]
+        )
+        
+        filepath = generator.save_post(post, tmp_path / "content")
+        entry = generator.manifest.get(filepath)
+        
+        assert entry.title == "Rust Ownership"
+        assert entry.front_matter["tags"] == ["rust"]
+        assert entry.size == filepath.stat().st_size
+
+    def test_save_post_writes_cover_srcsets(self, generator, tmp_path):
+        """Test responsive cover variants are written as srcset front matter."""
+        post = BlogPost(
+            title="Rust Ownership", slug="rust-ownership", content="Rust ownership, borrowing and lifetimes.",
+            summary="summary", meta_description="meta", category="Tech", tags=[],
+            cover_image="images/a.jpg",
+            cover_srcsets={"webp": "images/a-300w.webp 300w, images/a-600w.webp 600w"}
+        )
+
+        filepath = generator.save_post(post, tmp_path / "content")
+
+        front_matter = generator.manifest.get(filepath).front_matter
+        assert front_matter["cover_srcset_webp"] == "images/a-300w.webp 300w, images/a-600w.webp 600w"
+
+    def test_save_post_rejects_duplicate_body(self, generator, tmp_path):
+        """Test a body that repeats an existing post is not saved."""
+        generator.duplicate_index = DuplicateIndex(tmp_path / "duplicates.sqlite3", tmp_path / "content")
+        post = BlogPost(
+            title="Rust Ownership", slug="rust-ownership", content="Rust ownership, borrowing and lifetimes.",
+            summary="summary", meta_description="meta", category="Tech", tags=[]
+        )
+        generator.save_post(post, tmp_path / "content")
+        post.slug = "rust-ownership-again"
+        
+        with pytest.raises(DuplicatePostError):
+            generator.save_post(post, tmp_path / "content")
+    
     @patch('content_pipeline.generator.ContentGenerator.fetch_trending_topics')
     def test_generate_daily_post_no_topics(self, mock_topics, generator):
         """Test daily post generation when no topics are found."""
@@ -303,18 +838,33 @@ class TestGeneratorCLI:
         mock_generator.generate_daily_post.return_value = Path("test.md")
         mock_generator_class.return_value = mock_generator
         
-        main()
+        main([])
         
         mock_generator_class.assert_called_once()
         mock_generator.generate_daily_post.assert_called_once()
     
+    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test_key'})
+    @patch('content_pipeline.generator.ContentGenerator')
+    def test_main_batch(self, mock_generator_class):
+        """Test main function in batch mode."""
+        from content_pipeline.generator import main
+        
+        mock_generator = Mock()
+        mock_generator.generate_batch.return_value = [Path("a.md"), Path("b.md")]
+        mock_generator_class.return_value = mock_generator
+        
+        main(["--batch", "2", "--concurrency", "2"])
+        
+        mock_generator.generate_batch.assert_called_once_with(2, max_concurrency=2)
+        mock_generator.generate_daily_post.assert_not_called()
+    
     @patch.dict(os.environ, {}, clear=True)
     @patch('sys.exit')
     def test_main_without_api_key(self, mock_exit):
         """Test main function without API key."""
         from content_pipeline.generator import main
         
-        main()
+        main([])
         
         mock_exit.assert_called_with(1)
     
@@ -329,6 +879,6 @@ class TestGeneratorCLI:
         mock_generator.generate_daily_post.return_value = None
         mock_generator_class.return_value = mock_generator
         
-        main()
+        main([])
         
         mock_exit.assert_called_with(1) 
\ No newline at end of file
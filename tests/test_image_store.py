@@ -0,0 +1,177 @@
+"""
+Tests for the content-addressed cover image store.
+"""
+
+import base64
+import os
+import time
+from io import BytesIO
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+from PIL import Image, ImageFilter
+
+from content_pipeline.covers import render_cover
+from content_pipeline.image_store import ImageStore, hamming, perceptual_hash, prompt_key
+from content_pipeline.images import ImageGenerator
+from content_pipeline.variants import VariantBuilder
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Image store over an empty images directory."""
+    (tmp_path / "images").mkdir()
+    store = ImageStore(tmp_path / "images.sqlite3", tmp_path / "images")
+    yield store
+    store.close()
+
+
+def png_response(image):
+    """Images API response carrying an image as b64_json."""
+    buffer = BytesIO()
+    image.save(buffer, format="PNG")
+    item = SimpleNamespace(b64_json=base64.b64encode(buffer.getvalue()).decode("ascii"), url=None)
+    return SimpleNamespace(data=[item])
+
+
+class TestHashes:
+    """Test prompt keys and perceptual hashes."""
+
+    def test_prompt_key_ignores_whitespace(self):
+        """Test reflowed prompts share a key but categories do not."""
+        assert prompt_key("a  cover\nof Rust", "Tech") == prompt_key("a cover of Rust", "Tech")
+        assert prompt_key("a cover of Rust", "Tech") != prompt_key("a cover of Rust", "Productivity")
+
+    def test_perceptual_hash_survives_reencoding(self):
+        """Test a resized, re-encoded copy hashes close to the original."""
+        image = render_cover("Rust in Production", "Software Engineering")
+        buffer = BytesIO()
+        image.resize((600, 315)).save(buffer, format="JPEG", quality=40)
+        copy = Image.open(buffer)
+
+        assert hamming(perceptual_hash(image), perceptual_hash(copy)) <= 4
+
+    def test_perceptual_hash_separates_different_images(self):
+        """Test unrelated images are far apart."""
+        gradient = Image.linear_gradient("L").convert("RGB")
+        flipped = gradient.transpose(Image.Transpose.FLIP_TOP_BOTTOM).rotate(90)
+
+        assert hamming(perceptual_hash(gradient), perceptual_hash(flipped)) > 16
+
+
+class TestImageStore:
+    """Test ImageStore."""
+
+    def test_lookup_by_prompt(self, store):
+        """Test a recorded prompt resolves to its cover file."""
+        (store.images_dir / "abc.jpg").write_bytes(b"jpeg")
+        store.add("abc.jpg", 4, "0" * 16, key="k1")
+
+        assert store.lookup("k1") == "abc.jpg"
+        assert store.lookup("k2") is None
+        assert store.stats() == {"assets": 1, "prompts": 1, "bytes": 4}
+
+    def test_deleted_file_is_forgotten(self, store):
+        """Test covers removed from disk are no longer returned."""
+        (store.images_dir / "abc.jpg").write_bytes(b"jpeg")
+        store.add("abc.jpg", 4, "0" * 16, key="k1")
+        (store.images_dir / "abc.jpg").unlink()
+
+        assert store.lookup("k1") is None
+        assert store.find_similar("0" * 16) is None
+        assert store.stats()["assets"] == 0
+
+    def test_find_similar_within_distance(self, store):
+        """Test only covers within max_distance bits match, closest first."""
+        for name in ("near.jpg", "nearer.jpg", "far.jpg"):
+            (store.images_dir / name).write_bytes(b"jpeg")
+        store.add("near.jpg", 4, "000000000000000f")
+        store.add("nearer.jpg", 4, "0000000000000001")
+        store.add("far.jpg", 4, "00000000000000ff")
+
+        assert store.find_similar("0000000000000000") == "nearer.jpg"
+        assert store.find_similar("ffffffffffffffff") is None
+
+
+class TestImageGeneratorStore:
+    """Test ImageGenerator with an image store."""
+
+    @pytest.fixture
+    def generator(self, store):
+        """Generator whose image API returns a DALL·E-sized picture."""
+        api_client = Mock()
+        api_client.images.return_value = png_response(render_cover("Rust", "Data Science", (1792, 1024)))
+        return ImageGenerator(
+            "test_key", output_dir=store.images_dir, api_client=api_client, image_store=store, fallback=False
+        )
+
+    def test_repeated_prompt_skips_api(self, generator):
+        """Test regenerating a post reuses its cover without an image call."""
+        first = generator.generate_cover_image("Rust in Production", "Software Engineering", ["rust"])
+        second = generator.generate_cover_image("Rust in Production", "Software Engineering", ["rust"])
+
+        assert first == second
+        assert generator.api_client.images.call_count == 1
+        assert first.split("/", 1)[1][:-4].isalnum()  # Named by content digest
+
+    def test_lookalike_image_reused(self, generator):
+        """Test a new prompt whose image looks like an existing cover reuses it."""
+        first = generator.generate_cover_image("Rust in Production", "Software Engineering")
+        blurred = Image.open(generator.output_dir / first.split("/", 1)[1]).filter(ImageFilter.GaussianBlur(1))
+        generator.api_client.images.return_value = png_response(blurred.resize((1792, 1024)))
+
+        second = generator.generate_cover_image("Go in Production", "Software Engineering")
+
+        assert second == first
+        assert len(list(generator.output_dir.glob("*.jpg"))) == 1
+        assert generator.image_store.lookup(
+            prompt_key(generator._create_image_prompt("Go in Production", "Software Engineering"), "Software Engineering")
+        ) == first.split("/", 1)[1]
+
+    def test_identical_placeholders_share_a_file(self, generator):
+        """Test byte-identical procedural covers are written once."""
+        first = generator.generate_placeholder_image("Rust", category="Productivity")
+        second = generator.generate_placeholder_image("Rust", category="Productivity")
+
+        assert first == second
+        assert len(list(generator.output_dir.glob("*.jpg"))) == 1
+
+    def test_reuse_refreshes_mtime(self, generator):
+        """Test a cover reused for a prompt counts as recently used."""
+        name = generator.generate_cover_image("Rust", "Software Engineering").split("/", 1)[1]
+        path = generator.output_dir / name
+        old = time.time() - 40 * 24 * 60 * 60
+        os.utime(path, (old, old))
+
+        generator.generate_cover_image("Rust", "Software Engineering")
+
+        assert path.stat().st_mtime > old + 24 * 60 * 60
+
+    def test_cleanup_keeps_referenced_images(self, store):
+        """Test old covers and variants still in the store or variants manifest survive cleanup."""
+        generator = ImageGenerator(
+            "test_key",
+            output_dir=store.images_dir,
+            image_store=store,
+            variants=VariantBuilder(store.images_dir, widths=(300, 1200), formats=("jpeg",))
+        )
+        name = generator.generate_placeholder_image("Rust", category="Productivity").split("/", 1)[1]
+        cover = generator.output_dir / name
+        orphan = generator.output_dir / "20240101-orphan.jpg"
+        orphan.write_bytes(b"jpeg")
+        old = time.time() - 40 * 24 * 60 * 60
+        for path in generator.output_dir.iterdir():
+            os.utime(path, (old, old))
+
+        generator.cleanup_old_images(30)
+
+        assert sorted(path.name for path in generator.output_dir.glob("*.jpg")) == sorted(
+            [cover.name, f"{cover.stem}-300w.jpg"]
+        )
+        assert not orphan.exists()
+
+        # Without the store, the variants manifest on disk still protects its files
+        ImageGenerator("test_key", output_dir=store.images_dir).cleanup_old_images(30)
+
+        assert cover.exists()
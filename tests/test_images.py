@@ -0,0 +1,84 @@
+"""
+Tests for cover image retrieval.
+"""
+
+import base64
+from io import BytesIO
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+from PIL import Image
+
+from content_pipeline.images import ImageGenerator
+
+
+@pytest.fixture(scope="module")
+def png_bytes():
+    """Encoded DALL·E-sized PNG."""
+    buffer = BytesIO()
+    Image.linear_gradient("L").convert("RGB").resize((1792, 1024)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def images_response(**item):
+    """Images API response with one result."""
+    return SimpleNamespace(data=[SimpleNamespace(**dict({"url": None, "b64_json": None}, **item))])
+
+
+def streamed(body, chunk=1000):
+    """Streaming HTTP response whose body arrives in chunks."""
+    response = Mock()
+    response.iter_content.return_value = [body[i:i + chunk] for i in range(0, len(body), chunk)]
+    return response
+
+
+class TestRetrieval:
+    """Test how ImageGenerator gets the generated image."""
+
+    def test_b64_json_needs_no_download(self, png_bytes, tmp_path):
+        """Test the default mode decodes the image from the generation response."""
+        api_client = Mock()
+        api_client.images.return_value = images_response(b64_json=base64.b64encode(png_bytes).decode("ascii"))
+        session = Mock()
+        generator = ImageGenerator("test_key", output_dir=tmp_path, api_client=api_client, session=session)
+
+        path = generator.generate_cover_image("Rust", "Tech News")
+
+        assert api_client.images.call_args.kwargs["response_format"] == "b64_json"
+        session.get.assert_not_called()
+        assert Image.open(tmp_path / path.split("/", 1)[1]).size == (1200, 630)
+
+    def test_url_streamed_through_session(self, png_bytes, tmp_path):
+        """Test URL mode streams the download with a timeout."""
+        api_client = Mock()
+        api_client.images.return_value = images_response(url="https://images.example/cover.png")
+        session = Mock()
+        session.get.return_value = response = streamed(png_bytes, chunk=64 * 1024)
+        generator = ImageGenerator(
+            "test_key", output_dir=tmp_path, api_client=api_client, session=session,
+            response_format="url", download_timeout=5, fallback=False
+        )
+
+        path = generator.generate_cover_image("Rust", "Tech News")
+
+        assert path is not None
+        assert session.get.call_args.kwargs == {"timeout": 5, "stream": True}
+        response.close.assert_called_once()
+
+    def test_oversized_download_abandoned(self, png_bytes, tmp_path):
+        """Test a download over max_download_bytes stops early."""
+        session = Mock()
+        session.get.return_value = response = streamed(png_bytes)
+        generator = ImageGenerator(
+            "test_key", output_dir=tmp_path, api_client=Mock(), session=session, max_download_bytes=len(png_bytes) // 2
+        )
+
+        with pytest.raises(ValueError):
+            generator._download("https://images.example/cover.png")
+        response.close.assert_called_once()
+
+    def test_unknown_response_format(self, tmp_path):
+        """Test response formats other than b64_json and url are rejected."""
+        with pytest.raises(ValueError):
+            ImageGenerator("test_key", output_dir=tmp_path, response_format="png")
@@ -0,0 +1,128 @@
+"""
+Tests for the keyword scoring engine.
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from content_pipeline.keywords import KeywordScorer, parse_published
+
+
+NOW = datetime(2024, 1, 15, 12, 0, tzinfo=timezone.utc)
+
+
+class TestParsePublished:
+    """Test publication date parsing."""
+
+    def test_rfc822(self):
+        """Test RSS-style dates."""
+        assert parse_published("Mon, 15 Jan 2024 10:00:00 GMT") == datetime(2024, 1, 15, 10, 0, tzinfo=timezone.utc)
+
+    def test_iso8601(self):
+        """Test Atom-style dates."""
+        assert parse_published("2024-01-15T10:00:00Z") == datetime(2024, 1, 15, 10, 0, tzinfo=timezone.utc)
+
+    def test_invalid(self):
+        """Test unparseable dates."""
+        assert parse_published("yesterday-ish") is None
+        assert parse_published("") is None
+
+
+class TestKeywordScorer:
+    """Test KeywordScorer ranking."""
+
+    @pytest.fixture
+    def scorer(self):
+        """Create a KeywordScorer."""
+        return KeywordScorer()
+
+    def test_empty_batch(self, scorer):
+        """Test an empty batch yields no keywords."""
+        assert scorer.rank([]) == []
+
+    def test_bigram_beats_its_words(self, scorer):
+        """Test a repeated phrase outranks and suppresses its own words."""
+        topics = [
+            {'title': 'Vector databases explained', 'source': 'A'},
+            {'title': 'Why vector databases matter', 'source': 'B'},
+        ]
+
+        ranked = scorer.rank(topics, now=NOW)
+
+        assert ranked[0].keyword == 'vector databases'
+        assert 'vector' not in [score.keyword for score in ranked]
+
+    def test_single_mention_bigrams_are_ignored(self, scorer):
+        """Test phrases seen in only one headline are not candidates."""
+        ranked = scorer.rank([{'title': 'Quantum networking arrives'}], now=NOW)
+
+        assert all(' ' not in score.keyword for score in ranked)
+
+    def test_stopwords_break_bigrams(self, scorer):
+        """Test phrases never span a stopword."""
+        topics = [{'title': 'Python and Rust'}, {'title': 'Python and Rust'}]
+
+        keywords = [score.keyword for score in scorer.rank(topics, now=NOW)]
+
+        assert 'python rust' not in keywords
+        assert 'and' not in keywords
+
+    def test_source_diversity(self, scorer):
+        """Test terms reported by more sources rank higher."""
+        topics = [
+            {'title': 'Kotlin release', 'source': 'A'},
+            {'title': 'Kotlin update', 'source': 'A'},
+            {'title': 'Swift release', 'source': 'A'},
+            {'title': 'Swift update', 'source': 'B'},
+        ]
+
+        keywords = [score.keyword for score in scorer.rank(topics, now=NOW)]
+
+        assert keywords.index('swift') < keywords.index('kotlin')
+
+    def test_recency(self, scorer):
+        """Test fresh headlines outweigh stale ones."""
+        topics = [
+            {'title': 'Deno released', 'published': 'Mon, 15 Jan 2024 11:00:00 GMT'},
+            {'title': 'Bun rewrite', 'published': 'Mon, 08 Jan 2024 11:00:00 GMT'},
+            {'title': 'Bun benchmarks', 'published': 'Mon, 08 Jan 2024 11:00:00 GMT'},
+        ]
+
+        ranked = scorer.rank(topics, now=NOW)
+
+        assert ranked[0].keyword == 'deno'
+
+    def test_description_counts_less_than_title(self, scorer):
+        """Test description-only terms are down-weighted and HTML is stripped."""
+        topics = [
+            {'title': 'Zig compiler', 'description': '<p>Notes on <b>wasm</b></p>'},
+        ]
+
+        scores = {score.keyword: score.score for score in scorer.rank(topics, now=NOW)}
+
+        assert scores['wasm'] < scores['zig']
+        assert 'notes' in scores
+        assert not any('<' in keyword or keyword == 'p' for keyword in scores)
+
+    def test_exclude_and_limit(self, scorer):
+        """Test excluded keywords are skipped and the limit is honoured."""
+        topics = [{'title': 'Alpha Beta Gamma Delta'}]
+
+        ranked = scorer.rank(topics, exclude={'alpha'}, limit=2, now=NOW)
+
+        assert len(ranked) == 2
+        assert 'alpha' not in [score.keyword for score in ranked]
+
+    def test_large_batch(self, scorer):
+        """Test thousands of headlines are ranked in one call."""
+        topics = [
+            {'title': f'Story {i} about edge computing', 'source': str(i % 7)}
+            for i in range(5000)
+        ]
+
+        ranked = scorer.rank(topics, limit=3, now=NOW)
+
+        assert ranked[0].keyword == 'edge computing'
+        assert ranked[0].mentions == 5000
+        assert ranked[0].sources == 7
@@ -0,0 +1,54 @@
+"""
+Tests for lazy imports.
+"""
+
+import subprocess
+import sys
+from unittest.mock import patch
+
+import content_pipeline
+from content_pipeline.lazy import LazyModule, lazy_import
+
+
+class TestLazyImport:
+    """Test lazy module proxies and package exports."""
+
+    def test_loaded_module_returned_as_is(self):
+        """Test an imported module is not wrapped."""
+        assert lazy_import("json") is sys.modules["json"]
+
+    def test_proxy_loads_on_attribute_access(self):
+        """Test the module is imported on first use and the proxy is shared."""
+        sys.modules.pop("colorsys", None)
+        proxy = lazy_import("colorsys")
+
+        assert isinstance(proxy, LazyModule)
+        assert lazy_import("colorsys") is proxy
+        assert "colorsys" not in sys.modules
+        assert proxy.rgb_to_hsv(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+        assert "colorsys" in sys.modules
+
+    def test_patches_seen_through_proxy(self):
+        """Test patching the real module is visible through the proxy."""
+        proxy = LazyModule("json")
+
+        with patch("json.dumps", return_value="patched"):
+            assert proxy.dumps({}) == "patched"
+        assert proxy.dumps({}) == "{}"
+
+    def test_package_exports(self):
+        """Test public classes resolve on access."""
+        from content_pipeline.publisher import Publisher
+
+        assert content_pipeline.Publisher is Publisher
+        assert "ImageGenerator" in dir(content_pipeline)
+
+    def test_import_does_not_load_heavy_dependencies(self):
+        """Test importing the pipeline modules defers the SDKs."""
+        code = (
+            "import sys, content_pipeline.generator, content_pipeline.publisher; "
+            "print(sorted(n for n in ('openai', 'PIL', 'git', 'feedparser', 'requests', 'yaml') if n in sys.modules))"
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+        assert result.stdout.strip() == "[]"
@@ -0,0 +1,80 @@
+"""
+Tests for the LLM response cache.
+"""
+
+import os
+import time
+
+import pytest
+
+from content_pipeline.llm_cache import ResponseCache
+
+
+class TestResponseCache:
+    """Test ResponseCache behaviour."""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        """Create a ResponseCache in a temporary directory."""
+        return ResponseCache(tmp_path / "llm")
+
+    def test_key_is_canonical(self):
+        """Test keys ignore dict ordering but not parameter values."""
+        first = ResponseCache.make_key({"model": "gpt-4o", "temperature": 0.7})
+        second = ResponseCache.make_key({"temperature": 0.7, "model": "gpt-4o"})
+        third = ResponseCache.make_key({"temperature": 0.3, "model": "gpt-4o"})
+
+        assert first == second
+        assert first != third
+
+    def test_round_trip(self, cache):
+        """Test a stored response is returned and counted as a hit."""
+        cache.put("abc123", {"content": "Outline"})
+
+        assert cache.get("abc123") == {"content": "Outline"}
+        assert cache.get("missing") is None
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_ttl_expiry(self, tmp_path):
+        """Test expired responses are dropped."""
+        cache = ResponseCache(tmp_path / "llm", ttl=0.05)
+        cache.put("abc123", {"content": "Outline"})
+        time.sleep(0.1)
+
+        assert cache.get("abc123") is None
+        assert not list((tmp_path / "llm").glob("*/*.json"))
+
+    def test_lru_eviction(self, tmp_path):
+        """Test least-recently-used entries are evicted over the byte budget."""
+        cache = ResponseCache(tmp_path / "llm", max_bytes=1500)
+        payload = {"content": "x" * 400}
+        for i, key in enumerate(["aa1", "bb2", "cc3"]):
+            cache.put(key, payload)
+            path = tmp_path / "llm" / key[:2] / f"{key}.json"
+            os.utime(path, (1000 + i, 1000 + i))
+
+        # Reading the oldest entry makes it the most recently used
+        assert cache.get("aa1") == payload
+        cache.put("dd4", payload)
+
+        assert cache.get("bb2") is None
+        assert cache.get("aa1") == payload
+        assert cache.stats()["evictions"] >= 1
+        assert cache.stats()["bytes"] <= 1500
+
+    def test_disabled_bypass(self, tmp_path):
+        """Test a disabled cache never stores or returns responses."""
+        cache = ResponseCache(tmp_path / "llm", enabled=False)
+        cache.put("abc123", {"content": "Outline"})
+
+        assert cache.get("abc123") is None
+        assert not (tmp_path / "llm").exists()
+
+    def test_clear(self, cache):
+        """Test clear removes all entries."""
+        cache.put("abc123", {"content": "Outline"})
+        cache.clear()
+
+        assert cache.get("abc123") is None
+        assert cache.stats()["bytes"] == 0
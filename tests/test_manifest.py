@@ -0,0 +1,161 @@
+"""
+Tests for the content manifest.
+"""
+
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+
+from content_pipeline.manifest import ContentManifest, parse_front_matter
+
+YAML_POST = """---
+title: Rust Ownership
+date: 2024-01-02T06:00:00
+tags:
+- rust
+- memory
+---
+
+Body text.
+"""
+
+PELICAN_POST = """Title: Welcome
+Date: 2024-01-01
+Tags: welcome, ai
+
+# Welcome
+"""
+
+
+@pytest.fixture
+def content_dir(tmp_path):
+    """Content directory with a YAML and a Pelican post."""
+    root = tmp_path / "content" / "2024"
+    root.mkdir(parents=True)
+    (root / "rust-ownership.md").write_text(YAML_POST)
+    (root / "welcome.md").write_text(PELICAN_POST)
+    return tmp_path / "content"
+
+
+@pytest.fixture
+def manifest(tmp_path, content_dir):
+    """Manifest over the content directory."""
+    manifest = ContentManifest(tmp_path / "manifest.sqlite3", content_dir)
+    yield manifest
+    manifest.close()
+
+
+class TestFrontMatter:
+    """Test front matter parsing."""
+
+    def test_yaml(self):
+        """Test YAML front matter."""
+        data = parse_front_matter(YAML_POST)
+
+        assert data["title"] == "Rust Ownership"
+        assert data["tags"] == ["rust", "memory"]
+
+    def test_pelican(self):
+        """Test Pelican metadata lines, with list fields split."""
+        data = parse_front_matter(PELICAN_POST)
+
+        assert data == {"title": "Welcome", "date": "2024-01-01", "tags": ["welcome", "ai"]}
+
+    def test_invalid_yaml(self):
+        """Test broken YAML yields no front matter instead of raising."""
+        assert parse_front_matter("---\ntitle: [unclosed\n---\nBody") == {}
+
+
+class TestContentManifest:
+    """Test manifest maintenance and queries."""
+
+    def test_rescan(self, manifest, content_dir):
+        """Test a rescan indexes every post and stores parsed front matter."""
+        counts = manifest.rescan()
+
+        assert counts["added"] == 2
+        entry = manifest.get(content_dir / "2024" / "rust-ownership.md")
+        assert entry.title == "Rust Ownership"
+        assert entry.front_matter["date"] == "2024-01-02T06:00:00"
+        assert len(entry.sha256) == 64
+
+    def test_rescan_only_reads_changed_files(self, manifest, content_dir):
+        """Test unchanged files are not opened again."""
+        manifest.rescan()
+        post = content_dir / "2024" / "welcome.md"
+        post.write_text(PELICAN_POST.replace("Welcome", "Hello"))
+
+        with patch("content_pipeline.manifest.parse_front_matter", wraps=parse_front_matter) as parse:
+            counts = manifest.rescan()
+
+        assert counts == {"added": 0, "updated": 1, "touched": 0, "unchanged": 1, "removed": 0}
+        assert parse.call_count == 1
+        assert manifest.get(post).title == "Hello"
+
+    def test_rescan_touched_file_keeps_front_matter(self, manifest, content_dir):
+        """Test a new mtime with the same content does not re-parse."""
+        manifest.rescan()
+        post = content_dir / "2024" / "welcome.md"
+        os.utime(post, (time.time() + 10, time.time() + 10))
+
+        with patch("content_pipeline.manifest.parse_front_matter") as parse:
+            counts = manifest.rescan()
+
+        assert counts["touched"] == 1
+        parse.assert_not_called()
+
+    def test_rescan_removes_deleted_posts(self, manifest, content_dir):
+        """Test deleted posts leave the manifest."""
+        manifest.rescan()
+        (content_dir / "2024" / "welcome.md").unlink()
+
+        assert manifest.rescan()["removed"] == 1
+        assert manifest.count() == 1
+
+    def test_record_with_front_matter(self, manifest, content_dir):
+        """Test recording a just-written post uses the given front matter."""
+        post = content_dir / "2024" / "rust-ownership.md"
+
+        with patch("content_pipeline.manifest.parse_front_matter") as parse:
+            entry = manifest.record(post, {"title": "Rust Ownership"})
+
+        parse.assert_not_called()
+        assert manifest.get(post) == entry
+
+    def test_lookup_refreshes_stale_entry(self, manifest, content_dir):
+        """Test lookup re-parses a post that changed since it was recorded."""
+        post = content_dir / "2024" / "welcome.md"
+        manifest.record(post)
+        post.write_text(PELICAN_POST.replace("Welcome", "Hello again"))
+
+        assert manifest.lookup(post).title == "Hello again"
+        assert manifest.lookup(content_dir / "missing.md") is None
+
+    def test_recent(self, manifest, content_dir):
+        """Test recent posts come from stored modification times."""
+        manifest.rescan()
+        old = content_dir / "2024" / "welcome.md"
+        os.utime(old, (time.time() - 7200, time.time() - 7200))
+        manifest.rescan()
+
+        assert [entry.path for entry in manifest.recent(3600)] == [
+            str(content_dir / "2024" / "rust-ownership.md")
+        ]
+
+    def test_relative_and_absolute_paths_share_rows(self, tmp_path, content_dir, monkeypatch):
+        """Test a generator using "content" and a publisher using the absolute path agree on keys."""
+        monkeypatch.chdir(tmp_path)
+        generator_side = ContentManifest(tmp_path / "shared.sqlite3", content_dir.relative_to(tmp_path))
+        publisher_side = ContentManifest(tmp_path / "shared.sqlite3", content_dir)
+        generator_side.rescan()
+
+        entry = generator_side.record(content_dir.relative_to(tmp_path) / "2024" / "welcome.md")
+
+        assert publisher_side.rescan()["unchanged"] == 2
+        assert generator_side.rescan() == {"added": 0, "updated": 0, "touched": 0, "unchanged": 2, "removed": 0}
+        assert publisher_side.get(content_dir / "2024" / "welcome.md").sha256 == entry.sha256
+        assert publisher_side.count() == 2
+        generator_side.close()
+        publisher_side.close()
@@ -0,0 +1,130 @@
+"""
+Tests for the offline OpenAI stand-in server and pipeline benchmark.
+"""
+
+import openai
+import pytest
+
+from benchmarks.openai_stub import Latency, StubConfig, StubOpenAIServer
+from benchmarks.pipeline import percentile, run_benchmark
+from content_pipeline.api_client import RateLimitedClient, RetryPolicy
+from content_pipeline.generator import ContentGenerator
+from content_pipeline.llm_cache import ResponseCache
+
+
+@pytest.fixture
+def server():
+    """Run a fast stand-in server."""
+    with StubOpenAIServer(StubConfig(image_size=(64, 64), article_words=240, seed=7)) as stub:
+        yield stub
+
+
+def make_client(server, **config):
+    """Build a rate-limited client pointed at the stand-in."""
+    return RateLimitedClient(
+        client=openai.OpenAI(api_key="stub", base_url=server.base_url, max_retries=0),
+        retry_policy=RetryPolicy(base_delay=0.01),
+        **config
+    )
+
+
+class TestStubServer:
+    """Test the stand-in endpoints through the real OpenAI client."""
+
+    def test_chat_completion_with_usage(self, server):
+        """Test non-streamed completions carry usage."""
+        response = make_client(server).chat(
+            model="gpt-4o", messages=[{"role": "user", "content": 'Create a detailed outline about "Rust"'}]
+        )
+
+        assert "I. Introduction" in response.choices[0].message.content
+        assert response.usage.total_tokens > 0
+
+    def test_streamed_article(self, server):
+        """Test streamed completions arrive in several chunks."""
+        stream = make_client(server).chat(
+            model="gpt-4o", stream=True,
+            messages=[{"role": "user", "content": "Write a post based on this outline:\nTopic: Rust"}]
+        )
+        pieces = [chunk.choices[0].delta.content for chunk in stream if chunk.choices and chunk.choices[0].delta.content]
+
+        assert len(pieces) > 1
+        assert "".join(pieces).startswith("## Section 1")
+
+    def test_streamed_usage(self, server):
+        """Test streams end with a usage chunk when include_usage is requested."""
+        stream = make_client(server).chat(
+            model="gpt-4o", stream=True, stream_options={"include_usage": True},
+            messages=[{"role": "user", "content": "Write a post based on this outline:\nTopic: Rust"}]
+        )
+        chunks = list(stream)
+
+        assert chunks[-1].choices == []
+        assert chunks[-1].usage.completion_tokens > 0
+
+    def test_prompt_prefix_cached(self):
+        """Test repeated prompt prefixes report cached tokens like the real API."""
+        static = "Static instructions. " * 60
+        with StubOpenAIServer(StubConfig(prompt_cache_min_tokens=128, seed=1)) as stub:
+            api_client = make_client(stub)
+            usages = [
+                api_client.chat(model="gpt-4o", messages=[
+                    {"role": "system", "content": static},
+                    {"role": "user", "content": f'Create a detailed outline about "{keyword}"'}
+                ]).usage
+                for keyword in ("Rust", "Kotlin")
+            ]
+
+        assert usages[0].prompt_tokens_details.cached_tokens == 0
+        assert usages[1].prompt_tokens_details.cached_tokens == 256
+
+    def test_injected_rate_limit_is_retried(self):
+        """Test injected 429s are retried by the shared client."""
+        config = StubConfig(image_size=(64, 64), error_rate=0.5, retry_after_ms=1, seed=3)
+        with StubOpenAIServer(config) as stub:
+            api_client = make_client(stub)
+            for _ in range(5):
+                api_client.chat(model="gpt-4o", messages=[{"role": "user", "content": "hi"}])
+
+        assert stub.counts["chat"] == 5
+        assert stub.counts["chat.errors"] == api_client.stats()["retries"] > 0
+
+    def test_generator_end_to_end(self, server, tmp_path, monkeypatch):
+        """Test a full daily post runs offline against the stand-in."""
+        monkeypatch.chdir(tmp_path)
+        generator = ContentGenerator(
+            "stub",
+            server.feed_urls(2),
+            response_cache=ResponseCache(enabled=False),
+            api_client=make_client(server)
+        )
+
+        filepath = generator.generate_daily_post()
+
+        assert filepath is not None
+        assert (tmp_path / filepath).read_text().count("## Section") == 2
+        assert server.counts["chat"] == 3
+
+
+class TestBenchmark:
+    """Test the benchmark harness."""
+
+    def test_percentile(self):
+        """Test nearest-rank percentiles."""
+        values = [float(i) for i in range(1, 101)]
+
+        assert percentile(values, 0.5) == 50.0
+        assert percentile(values, 0.95) == 95.0
+        assert percentile([], 0.95) == 0.0
+
+    def test_report(self, monkeypatch):
+        """Test the report covers every stage and counts posts."""
+        monkeypatch.setenv("OPENAI_IMAGES_RPM", "6000")
+        config = StubConfig(chat_latency=Latency(0.01), image_size=(64, 64), article_words=240)
+
+        report = run_benchmark(config, mode="batch", runs=1, batch=2, concurrency=2)
+
+        assert report["posts"] == 2
+        assert report["posts_per_minute"] > 0
+        assert {"feeds", "outline", "article", "seo", "image", "save"} <= set(report["stages"])
+        assert report["stages"]["outline"]["count"] == 2
@@ -0,0 +1,39 @@
+"""
+Tests for the versioned prompt templates.
+"""
+
+from content_pipeline.prompts import ARTICLE, HOUSE_STYLE, OUTLINE, PROMPTS, SEO, SOURCES_SECTION
+
+
+class TestPromptTemplates:
+    """Test PromptTemplate rendering."""
+
+    def test_static_prefix_shared_across_requests(self):
+        """Test per-post values only appear after the static system message."""
+        first = ARTICLE.messages(keyword="Rust", outline="I. Intro")
+        second = ARTICLE.messages(keyword="Kotlin", outline="I. Overview")
+
+        assert first[0] == second[0]
+        assert first[0]["role"] == "system"
+        assert "Rust" in first[1]["content"] and "Rust" not in first[0]["content"]
+
+    def test_stages_share_house_style(self):
+        """Test every stage's system message starts with the house style."""
+        for template in PROMPTS.values():
+            assert template.system.startswith(HOUSE_STYLE)
+        assert len({template.id for template in PROMPTS.values()}) == len(PROMPTS)
+
+    def test_outline_sources_optional(self):
+        """Test the outline request carries the source digest only when given."""
+        plain = OUTLINE.messages(keyword="Rust", sources="")
+        grounded = OUTLINE.messages(keyword="Rust", sources=SOURCES_SECTION.format(sources="- Rust 1.80"))
+
+        assert plain[1]["content"] == 'Write the outline for a blog post about "Rust".'
+        assert grounded[1]["content"].endswith("- Rust 1.80")
+
+    def test_values_with_braces(self):
+        """Test values containing braces are inserted verbatim."""
+        messages = SEO.messages(keyword="Go", categories="Tech News", preview='{"a": 1}')
+
+        assert '{"a": 1}...' in messages[1]["content"]
+        assert '"meta_description": "..."' in messages[0]["content"]
@@ -0,0 +1,48 @@
+"""
+Tests for the Git publisher.
+"""
+
+import os
+import time
+
+import git
+import pytest
+
+from content_pipeline.publisher import Publisher
+
+
+@pytest.fixture
+def repo_path(tmp_path):
+    """Git repository with one committed post."""
+    repo = git.Repo.init(tmp_path, initial_branch="main")
+    post = tmp_path / "content" / "2024" / "welcome.md"
+    post.parent.mkdir(parents=True)
+    post.write_text("Title: Welcome\nDate: 2024-01-01\n\nHello\n")
+    repo.index.add([str(post)])
+    repo.index.commit("Initial post")
+    return tmp_path
+
+
+class TestPublisherManifest:
+    """Test the manifest the publisher uses to find new posts."""
+
+    def test_manifest_rooted_at_repo(self, repo_path):
+        """Test the default manifest indexes the repository's content, not the cwd's."""
+        publisher = Publisher(repo_path)
+
+        assert publisher.manifest.content_dir == repo_path / "content"
+        assert publisher.manifest.path == repo_path / ".cache" / "manifest.sqlite3"
+
+    def test_rescan_finds_posts_written_outside_the_generator(self, repo_path):
+        """Test a post added by hand shows up as recent once the manifest has rows."""
+        publisher = Publisher(repo_path)
+        old = repo_path / "content" / "2024" / "welcome.md"
+        os.utime(old, (time.time() - 7200, time.time() - 7200))
+        publisher.manifest.rescan()
+        assert publisher.manifest.recent(3600) == []
+
+        manual = repo_path / "content" / "2024" / "manual.md"
+        manual.write_text("Title: Manual\nDate: 2024-01-02\n\nWritten by hand\n")
+        publisher.manifest.rescan()
+
+        assert [entry.path for entry in publisher.manifest.recent(3600)] == [str(manual)]
@@ -0,0 +1,95 @@
+"""
+Tests for per-stage model routing.
+"""
+
+import pytest
+
+from content_pipeline.routing import DEFAULT_ROUTES, ModelRouter, StageRoute
+
+
+@pytest.fixture
+def router():
+    """Router with a primary and a fallback model for the SEO stage."""
+    return ModelRouter(
+        {"seo": StageRoute("small", fallbacks=("large",), max_tokens=800, timeout=10)},
+        min_samples=3,
+        failure_threshold=2,
+        cooldown=60
+    )
+
+
+class TestModelRouter:
+    """Test ModelRouter."""
+
+    def test_light_stages_use_cheaper_models(self):
+        """Test the defaults keep the article on the full model."""
+        router = ModelRouter()
+        assert router.route("article").model == "gpt-4o"
+        assert router.route("outline").model == "gpt-4o-mini"
+        assert router.route("seo").model == "gpt-4o-mini"
+        assert router.candidates("seo") == ["gpt-4o-mini", "gpt-4o"]
+
+    def test_failures_demote_model(self, router):
+        """Test consecutive failures move a model behind its fallback."""
+        router.record("seo", "small", 1.0, failed=True)
+        assert router.candidates("seo") == ["small", "large"]
+
+        router.record("seo", "small", 1.0, failed=True)
+
+        assert router.candidates("seo") == ["large", "small"]
+        assert router.stats()["seo/small"]["demoted"] is True
+
+    def test_success_resets_failure_streak(self, router):
+        """Test a success between failures keeps the model in place."""
+        router.record("seo", "small", 1.0, failed=True)
+        router.record("seo", "small", 1.0)
+        router.record("seo", "small", 1.0, failed=True)
+
+        assert router.candidates("seo") == ["small", "large"]
+
+    def test_slow_model_demoted(self, router):
+        """Test a p95 latency close to the timeout demotes the model."""
+        for _ in range(3):
+            router.record("seo", "small", 9.0)
+
+        assert router.candidates("seo") == ["large", "small"]
+        assert router.stats()["seo/small"]["demotions"] == 1
+
+    def test_demotion_expires(self, router, monkeypatch):
+        """Test a demoted model is promoted again after the cooldown."""
+        clock = [1000.0]
+        monkeypatch.setattr("content_pipeline.routing.time.monotonic", lambda: clock[0])
+        router.record("seo", "small", 1.0, failed=True)
+        router.record("seo", "small", 1.0, failed=True)
+        assert router.candidates("seo")[0] == "large"
+
+        clock[0] += 61
+
+        assert router.candidates("seo")[0] == "small"
+
+    def test_observe_records_outcome(self, router):
+        """Test observe() records successes and failures."""
+        with router.observe("seo", "small"):
+            pass
+        with pytest.raises(RuntimeError):
+            with router.observe("seo", "small"):
+                raise RuntimeError("timeout")
+
+        stats = router.stats()["seo/small"]
+        assert stats["calls"] == 2
+        assert stats["failures"] == 1
+
+    def test_from_env(self):
+        """Test routes are overridden from MODEL_* variables."""
+        router = ModelRouter.from_env({
+            "MODEL_OUTLINE": "gpt-4.1-mini, gpt-4o",
+            "MODEL_ARTICLE_STRUCTURED_TIMEOUT": "240",
+            "MODEL_SEO_TEMPERATURE": "0.1",
+            "MODEL_FAILURE_THRESHOLD": "5"
+        })
+
+        assert router.route("outline").models == ("gpt-4.1-mini", "gpt-4o")
+        assert router.route("outline").max_tokens == DEFAULT_ROUTES["outline"].max_tokens
+        assert router.route("article.structured").timeout == 240
+        assert router.route("seo").temperature == 0.1
+        assert router.failure_threshold == 5
@@ -0,0 +1,99 @@
+"""
+Tests for the seen-entry index.
+"""
+
+import pytest
+
+from content_pipeline.seen import SeenIndex, covered_topics, entry_keys, normalize_link
+
+
+class TestNormalization:
+    """Test link and headline normalization."""
+
+    def test_normalize_link_ignores_noise(self):
+        """Test scheme, www, tracking params and trailing slash are ignored."""
+        assert normalize_link("https://www.Example.com/story/?utm_source=rss&id=7#top") == \
+            normalize_link("http://example.com/story?id=7")
+
+    def test_normalize_link_keeps_identity_params(self):
+        """Test meaningful query parameters still distinguish links."""
+        assert normalize_link("https://example.com/story?id=7") != \
+            normalize_link("https://example.com/story?id=8")
+
+    def test_entry_keys_match_reworded_punctuation(self):
+        """Test headlines differing only in case and punctuation share a key."""
+        first = entry_keys({"title": "OpenAI ships GPT-5!"})
+        second = entry_keys({"title": "openai ships gpt 5"})
+
+        assert first == second
+
+    def test_entry_keys_sparse_entry(self):
+        """Test entries without link or title produce no keys."""
+        assert entry_keys({"title": "", "link": ""}) == []
+
+
+class TestSeenIndex:
+    """Test SeenIndex persistence and filtering."""
+
+    @pytest.fixture
+    def index(self, tmp_path):
+        """Create a SeenIndex in a temporary directory."""
+        index = SeenIndex(tmp_path / "seen.sqlite3")
+        yield index
+        index.close()
+
+    def test_filter_unseen_drops_covered_entries(self, index):
+        """Test entries covered by a post are filtered out."""
+        covered = {"title": "Rust 2.0 released", "link": "https://example.com/rust"}
+        fresh = {"title": "Python 4 announced", "link": "https://example.com/python"}
+        index.record_post("rust", "rust-guide", [covered])
+
+        assert index.filter_unseen([covered, fresh]) == [fresh]
+
+    def test_filter_matches_on_link_or_title(self, index):
+        """Test a re-titled link or a re-linked headline is still recognized."""
+        index.record_post("rust", "rust-guide", [{"title": "Rust 2.0 released", "link": "https://example.com/rust"}])
+
+        relinked = {"title": "Rust 2.0 Released", "link": "https://mirror.example/rust"}
+        retitled = {"title": "Rust hits 2.0", "link": "https://www.example.com/rust/"}
+
+        assert index.filter_unseen([relinked, retitled]) == []
+
+    def test_ingested_entries_are_not_filtered(self, index):
+        """Test merely ingested entries still count for topic selection."""
+        topic = {"title": "Rust 2.0 released", "link": "https://example.com/rust"}
+        index.record_entries([topic])
+
+        assert index.filter_unseen([topic]) == [topic]
+
+    def test_published_keywords_persist(self, tmp_path):
+        """Test published keywords survive reopening the index."""
+        index = SeenIndex(tmp_path / "seen.sqlite3")
+        index.record_post("Kubernetes", "kubernetes-guide")
+        index.close()
+
+        reopened = SeenIndex(tmp_path / "seen.sqlite3")
+        assert reopened.published_keywords() == {"kubernetes"}
+        assert reopened.published_slug("KUBERNETES") == "kubernetes-guide"
+        reopened.close()
+
+    def test_filter_large_batch(self, index):
+        """Test batches larger than one query chunk are handled."""
+        topics = [{"title": f"Story {i}", "link": f"https://example.com/{i}"} for i in range(1200)]
+        index.record_post("story", "story", topics[::2])
+
+        assert index.filter_unseen(topics) == topics[1::2]
+
+
+class TestCoveredTopics:
+    """Test keyword coverage matching."""
+
+    def test_matches_whole_words_only(self):
+        """Test short keywords do not match inside other words."""
+        topics = [
+            {"title": "AI chips are everywhere"},
+            {"title": "Maintain your laptop", "description": ""},
+            {"title": "Cloud costs", "description": "How AI inflates bills"},
+        ]
+
+        assert covered_topics("AI", topics) == [topics[0], topics[2]]
@@ -0,0 +1,152 @@
+"""
+Tests for run telemetry.
+"""
+
+import json
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from content_pipeline.telemetry import SamplingProfiler, Telemetry, instrumented, percentile, telemetry
+
+
+@pytest.fixture
+def collector():
+    """Fresh collector."""
+    return Telemetry()
+
+
+class TestTelemetry:
+    """Test span, usage and counter collection."""
+
+    def test_span_aggregates(self, collector):
+        """Test spans are aggregated per stage."""
+        for _ in range(3):
+            with collector.span("outline", keyword="Rust"):
+                pass
+
+        report = collector.report()
+
+        assert report["stages"]["outline"]["count"] == 3
+        assert report["spans"][0]["attributes"] == {"keyword": "Rust"}
+
+    def test_span_records_errors(self, collector):
+        """Test failing spans are recorded and counted."""
+        with pytest.raises(ValueError):
+            with collector.span("seo"):
+                raise ValueError("bad json")
+
+        report = collector.report()
+
+        assert report["spans"][0]["error"] == "ValueError"
+        assert report["counters"]["seo.errors"] == 1
+
+    def test_timed_decorator(self, collector):
+        """Test decorated functions are timed and keep their return value."""
+        @collector.timed("save")
+        def save():
+            return "saved"
+
+        assert save() == "saved"
+        assert collector.report()["stages"]["save"]["count"] == 1
+
+    def test_record_usage(self, collector):
+        """Test token usage is summed per model, including cached prompt tokens."""
+        collector.record_usage("gpt-4o", {"prompt_tokens": 100, "completion_tokens": 20, "total_tokens": 120})
+        usage = Mock(prompt_tokens=50, completion_tokens=10, total_tokens=60)
+        usage.prompt_tokens_details = Mock(cached_tokens=32)
+        collector.record_usage("gpt-4o", usage)
+        collector.record_usage("gpt-4o", None)
+
+        tokens = collector.report()["tokens"]["gpt-4o"]
+
+        assert tokens == {
+            "prompt_tokens": 150, "completion_tokens": 30, "total_tokens": 180,
+            "cached_tokens": 32, "requests": 2
+        }
+
+    def test_prompt_cache_ratio(self, collector):
+        """Test the share of cached prompt tokens is reported per model."""
+        collector.record_usage("gpt-4o", {"prompt_tokens": 400, "prompt_tokens_details": {"cached_tokens": 100}})
+        collector.record_usage("gpt-4o-mini", {"prompt_tokens": 50})
+
+        cache = collector.report()["prompt_cache"]
+
+        assert cache["gpt-4o"] == {"prompt_tokens": 400, "cached_tokens": 100, "ratio": 0.25}
+        assert cache["gpt-4o-mini"]["ratio"] == 0.0
+        assert 'aiblog_prompt_cache_ratio{model="gpt-4o"} 0.25' in collector.prometheus()
+
+    def test_prometheus(self, collector, tmp_path):
+        """Test the Prometheus textfile covers stages, tokens and counters."""
+        with collector.span("outline"):
+            pass
+        collector.record_usage("gpt-4o", {"total_tokens": 5})
+        collector.incr("api.chat.retries", 2)
+
+        path = tmp_path / "aiblog.prom"
+        collector.write_prometheus(path)
+        text = path.read_text()
+
+        assert 'aiblog_stage_duration_seconds_count{stage="outline"} 1' in text
+        assert 'aiblog_tokens{model="gpt-4o",kind="total_tokens"} 5' in text
+        assert 'aiblog_events{name="api.chat.retries"} 2' in text
+
+    def test_percentile(self):
+        """Test nearest-rank percentiles."""
+        assert percentile([3.0, 1.0, 2.0], 0.5) == 2.0
+        assert percentile([], 0.5) == 0.0
+
+
+class TestInstrumented:
+    """Test CLI entry point instrumentation."""
+
+    def test_writes_report(self, tmp_path, monkeypatch):
+        """Test the run report is written when PIPELINE_REPORT is set."""
+        report_path = tmp_path / "report.json"
+        monkeypatch.setenv("PIPELINE_REPORT", str(report_path))
+        monkeypatch.delenv("PIPELINE_METRICS", raising=False)
+        monkeypatch.delenv("PIPELINE_PROFILE", raising=False)
+        telemetry.reset()
+
+        @instrumented("cli")
+        def main():
+            return 0
+
+        assert main() == 0
+        assert json.loads(report_path.read_text())["stages"]["cli"]["count"] == 1
+
+    def test_writes_report_on_failure(self, tmp_path, monkeypatch):
+        """Test the report is still written when the entry point fails."""
+        report_path = tmp_path / "report.json"
+        monkeypatch.setenv("PIPELINE_REPORT", str(report_path))
+        telemetry.reset()
+
+        @instrumented("cli")
+        def main():
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            main()
+        assert json.loads(report_path.read_text())["counters"]["cli.errors"] == 1
+
+
+class TestSamplingProfiler:
+    """Test the sampling profiler."""
+
+    def test_collapsed_stacks(self, tmp_path):
+        """Test samples are written as collapsed stacks."""
+        profiler = SamplingProfiler(interval=0.001)
+        profiler.start()
+        deadline = time.time() + 0.1
+        while time.time() < deadline:
+            sum(range(1000))
+        profiler.stop()
+
+        path = tmp_path / "profile.txt"
+        profiler.write(path)
+        lines = path.read_text().splitlines()
+
+        assert lines
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+        assert any("test_collapsed_stacks" in line for line in lines)
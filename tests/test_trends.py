@@ -0,0 +1,85 @@
+"""
+Tests for the keyword trend store.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from content_pipeline.trends import TrendStore
+
+NOW = datetime(2024, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def headlines(day, titles, prefix):
+    """Build topics published on a given day."""
+    published = (NOW - timedelta(days=day)).isoformat()
+    return [
+        {"title": title, "link": f"https://example.com/{prefix}/{day}/{i}", "published": published}
+        for i, title in enumerate(titles)
+    ]
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Trend store with four weeks of history.
+
+    "Apple" appears in a third of the headlines every day; "Mojo" only
+    shows up today.
+    """
+    store = TrendStore(tmp_path / "trends.sqlite3")
+    for day in range(28, 0, -1):
+        store.ingest(headlines(day, [
+            f"Apple ships update {day}", f"Kernel release notes {day}", f"Database tuning tips {day}"
+        ], "history"), now=NOW)
+    store.ingest(headlines(0, [
+        "Apple earnings call", "Mojo language hits beta", "Why Mojo matters for Python",
+        "Mojo benchmarks against Rust", "Kernel scheduler rewrite", "Storage pricing drops"
+    ], "today"), now=NOW)
+    yield store
+    store.close()
+
+
+class TestTrendStore:
+    """Test ingestion and trend queries."""
+
+    def test_ingest_counts_each_entry_once(self, store):
+        """Test re-ingesting the same entries does not inflate counts."""
+        again = headlines(0, ["Mojo language hits beta"], "today")
+
+        assert store.ingest(again, now=NOW) == 0
+        assert store.series("mojo", days=2, now=NOW)[-1][1] == 3
+
+    def test_rising_prefers_spikes_over_constant_terms(self, store):
+        """Test a new spike outranks an always-frequent term."""
+        rising = store.rising(now=NOW)
+
+        assert rising[0].keyword == "mojo"
+        assert rising[0].recent == 3 and rising[0].baseline == 0
+        assert "apple" not in [score.keyword for score in rising]
+
+    def test_momentum_of_constant_term(self, store):
+        """Test a steady term has no momentum."""
+        momentum = store.momentum(["Apple", "Mojo"], min_mentions=1, now=NOW)
+
+        assert momentum["apple"].z_score < 1
+        assert momentum["mojo"].z_score > 3
+        assert momentum["mojo"].velocity > 5
+
+    def test_series_is_zero_filled(self, store):
+        """Test days without mentions are reported as zero."""
+        series = store.series("mojo", days=3, now=NOW)
+
+        assert [mentions for _, mentions in series] == [0, 0, 3]
+
+    def test_compact(self, store):
+        """Test old history is dropped."""
+        assert store.compact(keep_days=7, now=NOW) > 0
+        assert store.series("apple", days=30, now=NOW)[0][1] == 0
+
+    def test_no_history(self, tmp_path):
+        """Test a fresh store ranks nothing as rising."""
+        store = TrendStore(tmp_path / "empty.sqlite3")
+
+        assert store.rising(now=NOW) == []
+        store.close()
@@ -0,0 +1,114 @@
+"""
+Tests for responsive image variants.
+"""
+
+import pytest
+from PIL import Image
+
+from content_pipeline.covers import render_cover
+from content_pipeline.images import ImageGenerator
+from content_pipeline.variants import (
+    RESPONSIVE_SIZES,
+    VariantBuilder,
+    VariantManifest,
+    available_formats,
+    downscale_chain,
+    render_variants,
+)
+
+
+@pytest.fixture(scope="module")
+def cover():
+    """Procedural 1200x630 cover."""
+    return render_cover("Responsive Images Without the Pain", "Web Development")
+
+
+class TestRenderVariants:
+    """Test render_variants() and the downscale chain."""
+
+    def test_chain_descends_without_upscaling(self, cover):
+        """Test widths come largest first and wider ones are skipped."""
+        steps = [(width, image.size) for width, image in downscale_chain(cover, (300, 1200, 600, 2400))]
+
+        assert steps == [(1200, (1200, 630)), (600, (600, 315)), (300, (300, 158))]
+
+    def test_every_width_and_format(self, cover, tmp_path):
+        """Test one variant per width and format, with matching files."""
+        variants = render_variants(cover, "cover", tmp_path, formats=("webp", "jpeg"))
+
+        assert {(v.width, v.format) for v in variants} == {
+            (width, name) for width in RESPONSIVE_SIZES for name in ("webp", "jpeg")
+        }
+        for variant in variants:
+            path = tmp_path / variant.path
+            assert path.stat().st_size == variant.bytes
+            assert Image.open(path).size == (variant.width, variant.height)
+
+    def test_source_reused_at_full_width(self, cover, tmp_path):
+        """Test the existing cover stands in for the full-width JPEG."""
+        cover.save(tmp_path / "cover.jpg", format="JPEG")
+
+        variants = render_variants(cover, "cover", tmp_path, widths=(1200, 600), formats=("jpeg",), source="cover.jpg")
+
+        assert [v.path for v in variants] == ["cover.jpg", "cover-600w.jpg"]
+        assert not (tmp_path / "cover-1200w.jpg").exists()
+
+    def test_jpeg_always_available(self):
+        """Test JPEG is the last-resort format."""
+        assert available_formats()[-1] == "jpeg"
+
+
+class TestVariantBuilder:
+    """Test VariantBuilder and its manifest."""
+
+    def test_build_records_srcsets(self, cover, tmp_path):
+        """Test a built cover gets a srcset per format, narrowest first."""
+        builder = VariantBuilder(tmp_path, widths=(600, 300), formats=("webp", "jpeg"))
+        cover.save(tmp_path / "a.jpg", format="JPEG")
+
+        builder.build(cover, "a.jpg")
+
+        srcsets = VariantManifest(tmp_path / "variants.json").srcsets("a.jpg")
+        assert srcsets == {
+            "webp": "images/a-300w.webp 300w, images/a-600w.webp 600w",
+            "jpeg": "images/a-300w.jpg 300w, images/a-600w.jpg 600w",
+        }
+
+    def test_build_all_on_process_pool(self, cover, tmp_path):
+        """Test bulk runs render every pending cover and skip variant files."""
+        for name in ("a", "b", "c"):
+            cover.save(tmp_path / f"{name}.jpg", format="JPEG")
+        builder = VariantBuilder(tmp_path, widths=(300,), formats=("jpeg",), workers=2)
+
+        results = builder.build_all(builder.pending())
+
+        assert sorted(results) == ["a.jpg", "b.jpg", "c.jpg"]
+        assert builder.pending() == []
+        assert len(builder.pending(force=True)) == 3
+
+    def test_from_env(self, tmp_path):
+        """Test RESPONSIVE_* variables configure or disable the builder."""
+        builder = VariantBuilder.from_env(tmp_path, {"RESPONSIVE_SIZES": "480, 960", "RESPONSIVE_FORMATS": "jpeg"})
+
+        assert builder.widths == (480, 960)
+        assert builder.formats == ("jpeg",)
+        assert VariantBuilder.from_env(tmp_path, {"RESPONSIVE_IMAGES": "off"}) is None
+
+
+class TestImageGeneratorVariants:
+    """Test ImageGenerator with a VariantBuilder."""
+
+    def test_placeholder_gets_variants(self, tmp_path):
+        """Test procedural covers are rendered at every width."""
+        generator = ImageGenerator(
+            "test_key",
+            output_dir=tmp_path,
+            variants=VariantBuilder(tmp_path, widths=(300, 1200), formats=("jpeg",))
+        )
+
+        path = generator.generate_placeholder_image("Title", category="Productivity")
+
+        name = path.split("/")[-1]
+        assert generator.srcsets(path) == {
+            "jpeg": f"images/{name[:-4]}-300w.jpg 300w, images/{name} 1200w"
+        }